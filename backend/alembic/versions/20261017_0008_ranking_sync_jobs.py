@@ -0,0 +1,62 @@
+"""create ranking_sync_jobs table for the coalesced background sync queue
+
+Revision ID: 20261017_0008
+Revises: 20260601_0007
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0008"
+down_revision = "20260601_0007"
+branch_labels = None
+depends_on = None
+
+TABLE_ARGS = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def _table_exists(table: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    return table in inspector.get_table_names()
+
+
+def upgrade():
+    if _table_exists("ranking_sync_jobs"):
+        return
+
+    op.create_table(
+        "ranking_sync_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("triggers", sa.Text(), nullable=False),
+        sa.Column("scope_json", sa.Text(), nullable=False),
+        sa.Column("coalesced_count", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("actor", sa.String(length=100), nullable=False, server_default="system"),
+        sa.Column("run_id", sa.String(length=36), nullable=False),
+        sa.Column("updated_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("timings_summary", sa.Text(), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=False),
+        sa.Column("not_before", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        **TABLE_ARGS,
+    )
+    op.create_index(
+        "idx_ranking_sync_jobs_status_not_before",
+        "ranking_sync_jobs",
+        ["status", "not_before"],
+    )
+
+
+def downgrade():
+    if _table_exists("ranking_sync_jobs"):
+        op.drop_index("idx_ranking_sync_jobs_status_not_before", table_name="ranking_sync_jobs")
+        op.drop_table("ranking_sync_jobs")
@@ -0,0 +1,48 @@
+"""create data_versions table for versioned public read caches
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0009"
+down_revision = "20261017_0008"
+branch_labels = None
+depends_on = None
+
+TABLE_ARGS = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def _table_exists(table: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    return table in inspector.get_table_names()
+
+
+def upgrade():
+    if _table_exists("data_versions"):
+        return
+
+    data_versions = op.create_table(
+        "data_versions",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        **TABLE_ARGS,
+    )
+    op.bulk_insert(data_versions, [{"name": "rankings", "version": 0, "updated_at": datetime.utcnow()}])
+
+
+def downgrade():
+    if _table_exists("data_versions"):
+        op.drop_table("data_versions")
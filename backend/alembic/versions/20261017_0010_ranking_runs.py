@@ -0,0 +1,73 @@
+"""create ranking_runs catalog and backfill it from historical_rankings
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17
+
+One row per (ranking_config_id, period_date, run_id) so "latest run for a
+date" and "available dates" become indexed lookups instead of scans over
+historical_rankings.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0010"
+down_revision = "20261017_0009"
+branch_labels = None
+depends_on = None
+
+TABLE_ARGS = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def _table_exists(table: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    return table in inspector.get_table_names()
+
+
+def upgrade():
+    if _table_exists("ranking_runs"):
+        return
+
+    op.create_table(
+        "ranking_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("ranking_config_id", sa.String(length=50), nullable=False),
+        sa.Column("period_date", sa.Date(), nullable=False),
+        sa.Column("run_id", sa.String(length=36), nullable=True),
+        sa.Column("row_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("is_published", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("duration_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("ranking_config_id", "period_date", "run_id", name="uq_ranking_runs_config_period_run"),
+        **TABLE_ARGS,
+    )
+    op.create_index(
+        "idx_ranking_runs_config_period_created",
+        "ranking_runs",
+        ["ranking_config_id", "period_date", "created_at"],
+    )
+
+    # 历史快照按批次汇总回填；批次创建时间取该批次最早一行的写入时间
+    op.execute(
+        """
+        INSERT INTO ranking_runs
+            (ranking_config_id, period_date, run_id, row_count, is_published, duration_ms, created_at, updated_at)
+        SELECT ranking_config_id, period_date, run_id, COUNT(*), 0, 0, MIN(created_at), MAX(created_at)
+        FROM historical_rankings
+        GROUP BY ranking_config_id, period_date, run_id
+        """
+    )
+
+
+def downgrade():
+    if _table_exists("ranking_runs"):
+        op.drop_index("idx_ranking_runs_config_period_created", table_name="ranking_runs")
+        op.drop_table("ranking_runs")
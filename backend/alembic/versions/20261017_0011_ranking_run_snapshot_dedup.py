@@ -0,0 +1,42 @@
+"""add content hash / snapshot pointer columns to ranking_runs
+
+Revision ID: 20261017_0011
+Revises: 20261017_0010
+Create Date: 2026-10-17
+
+A run whose snapshot is identical to the previous run of the same config
+and date records only a catalog row pointing at that earlier snapshot
+(snapshot_run_id) instead of copying every historical_rankings row again.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0011"
+down_revision = "20261017_0010"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns(table)]
+    return column in cols
+
+
+def upgrade():
+    if not _column_exists("ranking_runs", "content_hash"):
+        op.add_column("ranking_runs", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    if not _column_exists("ranking_runs", "snapshot_run_id"):
+        op.add_column("ranking_runs", sa.Column("snapshot_run_id", sa.String(length=36), nullable=True))
+        # 既有批次都自带快照行
+        op.execute("UPDATE ranking_runs SET snapshot_run_id = run_id WHERE run_id IS NOT NULL")
+
+
+def downgrade():
+    if _column_exists("ranking_runs", "snapshot_run_id"):
+        op.drop_column("ranking_runs", "snapshot_run_id")
+    if _column_exists("ranking_runs", "content_hash"):
+        op.drop_column("ranking_runs", "content_hash")
@@ -0,0 +1,78 @@
+"""create ranking_active_runs pointer table for shadow publish
+
+Revision ID: 20261017_0012
+Revises: 20261017_0011
+Create Date: 2026-10-17
+
+Realtime leaderboard reads follow a per-config pointer to an immutable
+historical snapshot. Sync writes the new run's snapshot first and flips
+the pointer afterwards in a separate short transaction. Existing active
+configs are backfilled with their latest catalogued run.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0012"
+down_revision = "20261017_0011"
+branch_labels = None
+depends_on = None
+
+TABLE_ARGS = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def _table_exists(table: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    return table in inspector.get_table_names()
+
+
+def upgrade():
+    if _table_exists("ranking_active_runs"):
+        return
+
+    active_runs = op.create_table(
+        "ranking_active_runs",
+        sa.Column("ranking_config_id", sa.String(length=50), primary_key=True),
+        sa.Column("run_id", sa.String(length=36), nullable=False),
+        sa.Column("snapshot_run_id", sa.String(length=36), nullable=False),
+        sa.Column("period_date", sa.Date(), nullable=False),
+        sa.Column("run_created_at", sa.DateTime(), nullable=True),
+        sa.Column("activated_at", sa.DateTime(), nullable=True),
+        **TABLE_ARGS,
+    )
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT r.ranking_config_id, r.run_id, COALESCE(r.snapshot_run_id, r.run_id), r.period_date, r.created_at "
+            "FROM ranking_runs r JOIN ranking_configs c ON c.id = r.ranking_config_id "
+            "WHERE c.is_active = 1 AND r.run_id IS NOT NULL "
+            "ORDER BY r.ranking_config_id, r.created_at DESC, r.id DESC"
+        )
+    ).fetchall()
+    now = datetime.utcnow()
+    latest: dict[str, dict] = {}
+    for config_id, run_id, snapshot_run_id, period_date, created_at in rows:
+        latest.setdefault(config_id, {
+            "ranking_config_id": config_id,
+            "run_id": run_id,
+            "snapshot_run_id": snapshot_run_id,
+            "period_date": period_date,
+            "run_created_at": created_at,
+            "activated_at": now,
+        })
+    if latest:
+        op.bulk_insert(active_runs, list(latest.values()))
+
+
+def downgrade():
+    if _table_exists("ranking_active_runs"):
+        op.drop_table("ranking_active_runs")
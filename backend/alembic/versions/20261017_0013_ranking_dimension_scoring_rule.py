@@ -0,0 +1,43 @@
+"""add declarative scoring_rule column to ranking_dimensions
+
+Revision ID: 20261017_0013
+Revises: 20261017_0012
+Create Date: 2026-10-17
+
+Each dimension may carry a JSON scoring rule (lookup table, linear clamp
+on an App metric, growth ratio, constant). Rows without a rule score
+through the built-in rule of the same name. That is not a no-op for every
+seeded dimension: 增长趋势, 用户增长 and 市场热度 previously fell through to
+the flat default of 50 and now get the built-in growth_ratio / linear
+rules (monthly_calls vs last_month_calls, new_users_count, search / share /
+favorite counts), so their dimension scores, and the ranking scores that
+weight them, change on the next ranking sync. The other seeded dimensions
+keep their previous scores. `python -m app.bootstrap sync-system-presets`
+writes the built-in rules onto the system dimensions explicitly.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0013"
+down_revision = "20261017_0012"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns(table)]
+    return column in cols
+
+
+def upgrade():
+    if not _column_exists("ranking_dimensions", "scoring_rule"):
+        op.add_column("ranking_dimensions", sa.Column("scoring_rule", sa.Text(), nullable=True))
+
+
+def downgrade():
+    if _column_exists("ranking_dimensions", "scoring_rule"):
+        op.drop_column("ranking_dimensions", "scoring_rule")
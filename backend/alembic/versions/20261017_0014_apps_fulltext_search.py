@@ -0,0 +1,52 @@
+"""add ngram FULLTEXT indexes for app search
+
+Revision ID: 20261017_0014
+Revises: 20261017_0013
+Create Date: 2026-10-17
+
+/api/apps and /api/admin/apps keyword search switches from OR'd
+LIKE '%q%' predicates (full table scan) to MATCH ... AGAINST on ngram
+FULLTEXT indexes: one over all searchable columns for filtering, one over
+name alone for relevance weighting. InnoDB maintains both on commit, so
+app create / update / approve need no extra sync step.
+
+Stopwords are disabled for the index build: with the ngram parser any
+token containing a stopword (e.g. "a" in "AI") would otherwise be dropped.
+The SET SESSION below only covers this migration's own build; any later
+DDL that rebuilds the index (ALTER / OPTIMIZE TABLE apps) uses the server
+setting, so the server must run with innodb_ft_enable_stopword=OFF (see
+docs/db-migration-sop.md; docker-compose sets it).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0014"
+down_revision = "20261017_0013"
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ("name", "description", "org", "company", "department", "category")
+
+
+def _index_exists(table: str, index: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    idxs = [i["name"] for i in inspector.get_indexes(table)]
+    return index in idxs
+
+
+def upgrade():
+    op.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+    if not _index_exists("apps", "ft_apps_search"):
+        op.execute(f"CREATE FULLTEXT INDEX ft_apps_search ON apps ({', '.join(SEARCH_COLUMNS)}) WITH PARSER ngram")
+    if not _index_exists("apps", "ft_apps_name"):
+        op.execute("CREATE FULLTEXT INDEX ft_apps_name ON apps (name) WITH PARSER ngram")
+
+
+def downgrade():
+    if _index_exists("apps", "ft_apps_name"):
+        op.drop_index("ft_apps_name", table_name="apps")
+    if _index_exists("apps", "ft_apps_search"):
+        op.drop_index("ft_apps_search", table_name="apps")
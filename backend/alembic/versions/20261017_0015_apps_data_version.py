@@ -0,0 +1,36 @@
+"""register the `apps` data version
+
+Revision ID: 20261017_0015
+Revises: 20261017_0014
+Create Date: 2026-10-17
+
+Every committed insert / update / delete of an `apps` row bumps this
+version (session after_flush hook in services/cache_service.py). Worker
+processes poll it to refresh in-memory app indexes such as the typeahead
+trie behind /api/apps/suggest.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0015"
+down_revision = "20261017_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    exists = conn.execute(sa.text("SELECT 1 FROM data_versions WHERE name = 'apps'")).first()
+    if exists is None:
+        conn.execute(
+            sa.text("INSERT INTO data_versions (name, version, updated_at) VALUES ('apps', 0, :now)"),
+            {"now": datetime.utcnow()},
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM data_versions WHERE name = 'apps'")
@@ -0,0 +1,40 @@
+"""register the `ranking_configs` and `submissions` data versions
+
+Revision ID: 20261017_0016
+Revises: 20261017_0015
+Create Date: 2026-10-17
+
+Like `apps`, these versions are bumped by the session hooks in
+services/cache_service.py whenever their rows change (including bulk
+query.update()/delete()). Public read endpoints derive their ETags from them.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0016"
+down_revision = "20261017_0015"
+branch_labels = None
+depends_on = None
+
+VERSION_NAMES = ("ranking_configs", "submissions")
+
+
+def upgrade():
+    conn = op.get_bind()
+    for name in VERSION_NAMES:
+        exists = conn.execute(sa.text("SELECT 1 FROM data_versions WHERE name = :name"), {"name": name}).first()
+        if exists is None:
+            conn.execute(
+                sa.text("INSERT INTO data_versions (name, version, updated_at) VALUES (:name, 0, :now)"),
+                {"name": name, "now": datetime.utcnow()},
+            )
+
+
+def downgrade():
+    conn = op.get_bind()
+    for name in VERSION_NAMES:
+        conn.execute(sa.text("DELETE FROM data_versions WHERE name = :name"), {"name": name})
@@ -0,0 +1,90 @@
+"""materialise per-company positions on historical ranking snapshots
+
+Revision ID: 20261017_0017
+Revises: 20261017_0016
+Create Date: 2026-10-17
+
+Publishing now stores each snapshot row's display company (company, or org
+when company is empty) and its position within that company, indexed by
+(config, period, run, company, company position), so company leaderboards
+are a range read instead of a filtered scan of the whole board. Snapshots
+currently referenced by ranking_active_runs are backfilled here; older
+snapshots keep NULL and are only read through the historical endpoints,
+which do not use these columns.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0017"
+down_revision = "20261017_0016"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_historical_rankings_run_company_position"
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns(table)]
+    return column in cols
+
+
+def _index_exists(table: str, index: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    idxs = [i["name"] for i in inspector.get_indexes(table)]
+    return index in idxs
+
+
+def upgrade():
+    if not _column_exists("historical_rankings", "app_company"):
+        op.add_column("historical_rankings", sa.Column("app_company", sa.String(length=120), nullable=True))
+    if not _column_exists("historical_rankings", "company_position"):
+        op.add_column("historical_rankings", sa.Column("company_position", sa.Integer(), nullable=True))
+    if not _index_exists("historical_rankings", INDEX_NAME):
+        op.create_index(
+            INDEX_NAME,
+            "historical_rankings",
+            ["ranking_config_id", "period_date", "run_id", "app_company", "company_position"],
+        )
+
+    # 回填当前生效的快照（MySQL 5.7 无窗口函数，公司内名次在此按名次顺序计数）
+    conn = op.get_bind()
+    pointers = conn.execute(
+        sa.text("SELECT ranking_config_id, period_date, snapshot_run_id FROM ranking_active_runs")
+    ).fetchall()
+    for ranking_config_id, period_date, snapshot_run_id in pointers:
+        rows = conn.execute(
+            sa.text(
+                "SELECT h.id, COALESCE(NULLIF(a.company, ''), a.org) AS company "
+                "FROM historical_rankings h JOIN apps a ON a.id = h.app_id "
+                "WHERE h.ranking_config_id = :config_id AND h.period_date = :period_date AND h.run_id = :run_id "
+                "ORDER BY h.position, h.app_id"
+            ),
+            {"config_id": ranking_config_id, "period_date": period_date, "run_id": snapshot_run_id},
+        ).fetchall()
+        counts: dict[str, int] = {}
+        updates = []
+        for row_id, company in rows:
+            counts[company] = counts.get(company, 0) + 1
+            updates.append({"row_id": row_id, "company": company, "company_position": counts[company]})
+        if updates:
+            conn.execute(
+                sa.text(
+                    "UPDATE historical_rankings SET app_company = :company, company_position = :company_position "
+                    "WHERE id = :row_id"
+                ),
+                updates,
+            )
+
+
+def downgrade():
+    if _index_exists("historical_rankings", INDEX_NAME):
+        op.drop_index(INDEX_NAME, table_name="historical_rankings")
+    if _column_exists("historical_rankings", "company_position"):
+        op.drop_column("historical_rankings", "company_position")
+    if _column_exists("historical_rankings", "app_company"):
+        op.drop_column("historical_rankings", "app_company")
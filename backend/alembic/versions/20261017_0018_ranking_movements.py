@@ -0,0 +1,46 @@
+"""record position movements on snapshots
+
+Revision ID: 20261017_0018
+Revises: 20261017_0017
+Create Date: 2026-10-17
+
+Sync stores, on every historical_rankings row it writes, the app's position
+and score in the baseline run (the latest published run of an earlier date),
+the position delta and a movement marker (new / up / down / same). Existing
+snapshots keep NULL movement columns until the next sync writes a new snapshot.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0018"
+down_revision = "20261017_0017"
+branch_labels = None
+depends_on = None
+
+MOVEMENT_COLUMNS = (
+    ("previous_position", sa.Integer()),
+    ("previous_score", sa.Integer()),
+    ("position_delta", sa.Integer()),
+    ("movement", sa.String(length=10)),
+)
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns(table)]
+    return column in cols
+
+
+def upgrade():
+    for name, column_type in MOVEMENT_COLUMNS:
+        if not _column_exists("historical_rankings", name):
+            op.add_column("historical_rankings", sa.Column(name, column_type, nullable=True))
+
+
+def downgrade():
+    for name, _ in reversed(MOVEMENT_COLUMNS):
+        if _column_exists("historical_rankings", name):
+            op.drop_column("historical_rankings", name)
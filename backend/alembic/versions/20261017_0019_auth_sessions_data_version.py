@@ -0,0 +1,40 @@
+"""register the `auth_sessions` data version
+
+Revision ID: 20261017_0019
+Revises: 20261017_0018
+Create Date: 2026-10-17
+
+Bumped by the session hooks in services/cache_service.py whenever a users or
+auth_sessions row is updated or deleted (logout, password change, role change,
+enable/disable, including bulk query.update()). Inserts (logins) do not bump it.
+Workers poll it to drop their cached session validations, so it doubles as the
+cross-worker revocation version.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0019"
+down_revision = "20261017_0018"
+branch_labels = None
+depends_on = None
+
+VERSION_NAME = "auth_sessions"
+
+
+def upgrade():
+    conn = op.get_bind()
+    exists = conn.execute(sa.text("SELECT 1 FROM data_versions WHERE name = :name"), {"name": VERSION_NAME}).first()
+    if exists is None:
+        conn.execute(
+            sa.text("INSERT INTO data_versions (name, version, updated_at) VALUES (:name, 0, :now)"),
+            {"name": VERSION_NAME, "now": datetime.utcnow()},
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    conn.execute(sa.text("DELETE FROM data_versions WHERE name = :name"), {"name": VERSION_NAME})
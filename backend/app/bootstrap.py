@@ -1,12 +1,27 @@
 import argparse
+from datetime import datetime
 
 from .database import SessionLocal, ensure_database_schema_ready
 from .seed import reset_default_users, seed_base_data, seed_demo_data, sync_system_presets
+from .services.ranking_retention_service import purge_ranking_snapshots
+from .services.ranking_static_service import export_ranking_static_files
+from .services.ranking_sync_service import RankingSyncLockBusy, acquire_ranking_sync_lock
 
 
 def run_bootstrap(command: str) -> int:
     ensure_database_schema_ready()
 
+    if command == "purge-ranking-snapshots":
+        # 与同步 / 发布互斥，避免删掉正在被发布标记的批次
+        try:
+            with acquire_ranking_sync_lock("bootstrap"):
+                result = purge_ranking_snapshots(SessionLocal, actor="bootstrap")
+        except RankingSyncLockBusy:
+            print("ranking sync in progress; retry purge-ranking-snapshots later")
+            return 1
+        print(f"purged_runs={result.purged_runs} purged_rows={result.purged_rows} batches={result.batches}")
+        return 0
+
     db = SessionLocal()
     try:
         if command == "init-base":
@@ -17,6 +32,9 @@ def run_bootstrap(command: str) -> int:
             sync_system_presets(db)
         elif command == "seed-demo":
             seed_demo_data(db)
+        elif command == "export-static-rankings":
+            manifest = export_ranking_static_files(db, f"manual-{datetime.utcnow():%Y%m%d%H%M%S}")
+            print(f"version={manifest['version']} rankings={len(manifest['rankings'])}")
         else:
             raise ValueError(f"Unsupported bootstrap command: {command}")
     finally:
@@ -29,12 +47,21 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Bootstrap MySQL data for AI App Square")
     parser.add_argument(
         "command",
-        choices=("init-base", "reset-default-users", "sync-system-presets", "seed-demo"),
+        choices=(
+            "init-base",
+            "reset-default-users",
+            "sync-system-presets",
+            "seed-demo",
+            "purge-ranking-snapshots",
+            "export-static-rankings",
+        ),
         help=(
             "init-base seeds system catalogs/users, "
             "reset-default-users rewrites default user accounts, "
             "sync-system-presets rewrites built-in ranking dimensions/configs, "
-            "seed-demo also loads demo business data"
+            "seed-demo also loads demo business data, "
+            "purge-ranking-snapshots applies the historical snapshot retention policy, "
+            "export-static-rankings re-renders the static leaderboard files under STATIC_DIR/rankings"
         ),
     )
     args = parser.parse_args()
@@ -0,0 +1,235 @@
+"""进程内版本化读缓存：LRU 淘汰 + 容量上限 + 同键单飞（single-flight）；以及带 TTL 的版本化对象缓存。"""
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Hashable
+
+
+def version_is_older(version: Hashable, current: Hashable | None) -> bool:
+    """version 是否严格旧于 current；元组版本逐项比较，各项互有新旧时不视为更旧。"""
+    if current is None or version == current:
+        return False
+    if isinstance(version, tuple) and isinstance(current, tuple) and len(version) == len(current):
+        return all(mine <= theirs for mine, theirs in zip(version, current))
+    try:
+        return version < current
+    except TypeError:
+        return False
+
+
+class _InFlight:
+    """同一缓存键正在计算中的占位，后到的请求在此等待结果。"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: bytes | None = None
+        self.error: BaseException | None = None
+
+
+class VersionedLRUCache:
+    """
+    以 (数据版本, 业务键) 为键缓存序列化后的响应体。
+    - 条目数与总字节数双重上限，超限按 LRU 淘汰；单条超过 max_entry_bytes 的结果不入缓存
+    - 观察到新数据版本时一次性丢弃旧版本条目；携带更旧版本的请求（读到陈旧版本号）不回退当前版本
+    - 同一键的并发未命中只计算一次，其余请求等待并复用结果
+    """
+
+    def __init__(self, name: str, *, max_entries: int, max_bytes: int, max_entry_bytes: int | None = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._inflight: dict[tuple, _InFlight] = {}
+        self._bytes = 0
+        self._version: Hashable | None = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    def _observe_version(self, version: Hashable) -> None:
+        # 调用方需持有 self._lock
+        if self._version == version or version_is_older(version, self._version):
+            return
+        self._version = version
+        stale_keys = [key for key in self._entries if key[0] != version]
+        for key in stale_keys:
+            self._bytes -= len(self._entries.pop(key))
+
+    def _store(self, key: tuple, value: bytes) -> None:
+        # 调用方需持有 self._lock
+        if len(value) > self.max_entry_bytes:
+            self.oversized += 1
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def get_or_compute(self, version: Hashable, key: Hashable, compute: Callable[[], bytes]) -> bytes:
+        """命中直接返回；未命中时由首个请求执行 compute，并发的同键请求等待其结果。"""
+        full_key = (version, key)
+        with self._lock:
+            self._observe_version(version)
+            cached = self._entries.get(full_key)
+            if cached is not None:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return cached
+            flight = self._inflight.get(full_key)
+            if flight is None:
+                flight = _InFlight()
+                self._inflight[full_key] = flight
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value  # type: ignore[return-value]
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._inflight.pop(full_key, None)
+            flight.event.set()
+            raise
+
+        flight.value = value
+        with self._lock:
+            self._inflight.pop(full_key, None)
+            # 请求版本已旧于当前版本（含计算期间观察到新版本）：结果只返回给本轮请求，不再入缓存
+            if self._version == version:
+                self._store(full_key, value)
+        flight.event.set()
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "name": self.name,
+                "version": self._version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "oversized": self.oversized,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
+
+
+class VersionedTTLCache:
+    """
+    以 (数据版本, 业务键) 缓存任意对象。
+    - 条目数上限，超限按 LRU 淘汰；每条写入后 ttl_seconds 秒过期
+    - 观察到新数据版本时一次性丢弃旧版本条目；更旧的版本号不回退当前版本
+    - 不做单飞：未命中由调用方各自回源（回源代价低、调用极频繁的场景）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[object, float]] = OrderedDict()
+        self._version: Hashable | None = None
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def _observe_version(self, version: Hashable) -> None:
+        # 调用方需持有 self._lock
+        if self._version != version and not version_is_older(version, self._version):
+            self._version = version
+            self._entries.clear()
+
+    def get(self, version: Hashable, key: Hashable) -> object | None:
+        with self._lock:
+            self._observe_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, version: Hashable, key: Hashable, value: object) -> None:
+        """写入本版本的条目；version 已不是最新观察到的版本时丢弃（回源期间数据已变更）。"""
+        with self._lock:
+            if self._version is not None and self._version != version:
+                return
+            self._version = version
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
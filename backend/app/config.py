@@ -8,6 +8,7 @@ from .auth_utils import validate_password_strength
 BACKEND_DIR = Path(__file__).resolve().parents[1]
 MYSQL_URL_PREFIX = "mysql+pymysql://"
 PRODUCTION_ENVIRONMENTS = {"prod", "production"}
+RANKING_SYNC_MODES = {"background", "inline"}
 
 
 class Settings(BaseSettings):
@@ -44,6 +45,32 @@ class Settings(BaseSettings):
     admin_default_password: str = "ChangeMe_Admin_123!"
     user_sync_token: str = ""
     app_category_options: str = "前端市场类,客户服务类,云网运营类,管理支撑类"
+    ranking_sync_mode: str = "background"
+    ranking_sync_debounce_ms: int = 800
+    ranking_sync_max_delay_ms: int = 5000
+    ranking_sync_job_timeout_seconds: int = 600
+    ranking_sync_lock_wait_seconds: int = 10
+    ranking_cache_enabled: bool = True
+    ranking_cache_max_entries: int = 512
+    ranking_cache_max_bytes: int = 64 * 1024 * 1024
+    ranking_cache_max_entry_bytes: int = 4 * 1024 * 1024
+    ranking_cache_version_poll_ms: int = 1000
+    ranking_snapshot_keep_per_day: int = 3
+    ranking_snapshot_purge_chunk_size: int = 500
+    ranking_snapshot_purge_interval_seconds: int = 3600
+    ranking_simulation_cache_max_entries: int = 16
+    ranking_simulation_cache_ttl_seconds: int = 300
+    app_search_ngram_token_size: int = 2
+    ranking_static_export_enabled: bool = True
+    ranking_static_keep_versions: int = 3
+    public_cache_enabled: bool = True
+    public_cache_s_maxage_seconds: int = 5
+    public_cache_static_max_age_seconds: int = 3600
+    home_bootstrap_workers: int = 4
+    app_profile_cache_max_entries: int = 1024
+    app_profile_cache_max_bytes: int = 16 * 1024 * 1024
+    auth_session_cache_ttl_seconds: int = 30
+    auth_session_cache_max_entries: int = 4096
 
     model_config = SettingsConfigDict(
         env_file=str(BACKEND_DIR / ".env"),
@@ -77,6 +104,55 @@ def validate_settings(settings_obj: Settings) -> None:
     ):
         if value < 1:
             raise ValueError(f"{name} must be >= 1")
+    if settings_obj.ranking_sync_mode not in RANKING_SYNC_MODES:
+        raise ValueError("RANKING_SYNC_MODE must be one of: background, inline")
+    if settings_obj.ranking_sync_debounce_ms < 0:
+        raise ValueError("RANKING_SYNC_DEBOUNCE_MS must be >= 0")
+    if settings_obj.ranking_sync_max_delay_ms < settings_obj.ranking_sync_debounce_ms:
+        raise ValueError("RANKING_SYNC_MAX_DELAY_MS must be >= RANKING_SYNC_DEBOUNCE_MS")
+    if settings_obj.ranking_sync_job_timeout_seconds < 1:
+        raise ValueError("RANKING_SYNC_JOB_TIMEOUT_SECONDS must be >= 1")
+    if settings_obj.ranking_sync_lock_wait_seconds < 0:
+        raise ValueError("RANKING_SYNC_LOCK_WAIT_SECONDS must be >= 0")
+    for name, value in (
+        ("RANKING_CACHE_MAX_ENTRIES", settings_obj.ranking_cache_max_entries),
+        ("RANKING_CACHE_MAX_BYTES", settings_obj.ranking_cache_max_bytes),
+        ("RANKING_CACHE_MAX_ENTRY_BYTES", settings_obj.ranking_cache_max_entry_bytes),
+    ):
+        if value < 1:
+            raise ValueError(f"{name} must be >= 1")
+    if settings_obj.ranking_cache_version_poll_ms < 0:
+        raise ValueError("RANKING_CACHE_VERSION_POLL_MS must be >= 0")
+    if settings_obj.ranking_snapshot_keep_per_day < 1:
+        raise ValueError("RANKING_SNAPSHOT_KEEP_PER_DAY must be >= 1")
+    if settings_obj.ranking_snapshot_purge_chunk_size < 1:
+        raise ValueError("RANKING_SNAPSHOT_PURGE_CHUNK_SIZE must be >= 1")
+    if settings_obj.ranking_snapshot_purge_interval_seconds < 0:
+        raise ValueError("RANKING_SNAPSHOT_PURGE_INTERVAL_SECONDS must be >= 0")
+    if settings_obj.ranking_simulation_cache_max_entries < 1:
+        raise ValueError("RANKING_SIMULATION_CACHE_MAX_ENTRIES must be >= 1")
+    if settings_obj.ranking_simulation_cache_ttl_seconds < 0:
+        raise ValueError("RANKING_SIMULATION_CACHE_TTL_SECONDS must be >= 0")
+    if settings_obj.app_search_ngram_token_size < 1:
+        raise ValueError("APP_SEARCH_NGRAM_TOKEN_SIZE must be >= 1")
+    if settings_obj.ranking_static_keep_versions < 1:
+        raise ValueError("RANKING_STATIC_KEEP_VERSIONS must be >= 1")
+    if settings_obj.public_cache_s_maxage_seconds < 0:
+        raise ValueError("PUBLIC_CACHE_S_MAXAGE_SECONDS must be >= 0")
+    if settings_obj.public_cache_static_max_age_seconds < 0:
+        raise ValueError("PUBLIC_CACHE_STATIC_MAX_AGE_SECONDS must be >= 0")
+    if settings_obj.home_bootstrap_workers < 1:
+        raise ValueError("HOME_BOOTSTRAP_WORKERS must be >= 1")
+    for name, value in (
+        ("APP_PROFILE_CACHE_MAX_ENTRIES", settings_obj.app_profile_cache_max_entries),
+        ("APP_PROFILE_CACHE_MAX_BYTES", settings_obj.app_profile_cache_max_bytes),
+    ):
+        if value < 1:
+            raise ValueError(f"{name} must be >= 1")
+    if settings_obj.auth_session_cache_ttl_seconds < 0:
+        raise ValueError("AUTH_SESSION_CACHE_TTL_SECONDS must be >= 0")
+    if settings_obj.auth_session_cache_max_entries < 1:
+        raise ValueError("AUTH_SESSION_CACHE_MAX_ENTRIES must be >= 1")
     if settings_obj.auth_provider_mode not in {"local", "oa", "external_sso"}:
         raise ValueError("AUTH_PROVIDER_MODE must be one of: local, oa, external_sso")
     _ = get_app_category_options(settings_obj)
@@ -3,6 +3,8 @@
 从 main.py 提取，作为路由器和服务层共用的基础设施。
 """
 
+import base64
+import binascii
 import json
 import logging
 import math
@@ -13,7 +15,7 @@ from time import monotonic
 from typing import Optional
 
 from fastapi import Cookie, Depends, Header, HTTPException, Request
-from sqlalchemy import func
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session, joinedload
 
 from .auth_utils import hash_password, validate_password_strength
@@ -30,11 +32,13 @@ from .models import (
     User,
 )
 from .schemas import (
+    CursorPaginatedResponse,
     PaginatedResponse,
     UserImportRequest,
     UserImportResponse,
     UserPublic,
 )
+from .services.auth_session_cache_service import lookup_auth_session
 
 logger = logging.getLogger(__name__)
 
@@ -63,24 +67,35 @@ def extract_bearer_token(authorization: str | None) -> str | None:
     return authorization[7:].strip() or None
 
 
-def load_active_session(db: Session, token: str | None) -> AuthSession | None:
-    if not token:
-        return None
+def _session_is_valid(session: AuthSession | None) -> bool:
+    if not session:
+        return False
+    if session.revoked_at is not None:
+        return False
+    if session.expires_at <= datetime.utcnow():
+        return False
+    if not session.user or not session.user.is_active:
+        return False
+    return True
+
+
+def _load_valid_session(db: Session, token: str) -> AuthSession | None:
     session = (
         db.query(AuthSession)
         .options(joinedload(AuthSession.user))
         .filter(AuthSession.token_jti == token)
         .first()
     )
-    if not session:
-        return None
-    if session.revoked_at is not None:
-        return None
-    if session.expires_at <= datetime.utcnow():
-        return None
-    if not session.user or not session.user.is_active:
+    return session if _session_is_valid(session) else None
+
+
+def load_active_session(db: Session, token: str | None) -> AuthSession | None:
+    """校验登录令牌；经请求内备忘与进程级 TTL 缓存（见 auth_session_cache_service），命中时不查库。"""
+    if not token:
         return None
-    return session
+    session = lookup_auth_session(db, token, _load_valid_session)
+    # 缓存只在写入时校验过；过期时间与同请求内的吊销按当前状态再判一次
+    return session if _session_is_valid(session) else None
 
 
 # ---------------------------------------------------------------------------
@@ -200,8 +215,36 @@ def validate_new_password_or_422(password: str) -> None:
 # 通用数据工具
 # ---------------------------------------------------------------------------
 
-def paginate_query(query, page: int, page_size: int):
-    total = query.order_by(None).count()
+def estimate_query_total(query) -> int | None:
+    """
+    无筛选条件的单表查询用 information_schema.TABLES.TABLE_ROWS 估算总数（InnoDB 统计值，
+    不扫表）；带筛选条件或读取失败时返回 None。
+    """
+    if query.whereclause is not None or len(query.column_descriptions) != 1:
+        return None
+    entity = query.column_descriptions[0].get("entity")
+    table = getattr(entity, "__table__", None)
+    if table is None:
+        return None
+    try:
+        estimate = query.session.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            ),
+            {"table_name": table.name},
+        ).scalar()
+    except Exception:
+        logger.warning("table row estimate failed for %s", table.name, exc_info=True)
+        return None
+    return None if estimate is None else int(estimate)
+
+
+def paginate_query(query, page: int, page_size: int, include_total: bool = True):
+    total = None if include_total else estimate_query_total(query)
+    total_is_exact = total is None
+    if total is None:
+        total = query.order_by(None).count()
     total_pages = math.ceil(total / page_size) if total else 0
     items = query.offset((page - 1) * page_size).limit(page_size).all()
     return PaginatedResponse(
@@ -210,6 +253,58 @@ def paginate_query(query, page: int, page_size: int):
         page_size=page_size,
         total=total,
         total_pages=total_pages,
+        total_is_exact=total_is_exact,
+    )
+
+
+def encode_page_cursor(value) -> str:
+    raw = json.dumps({"after": value}, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str, value_type: type):
+    """解析游标，返回上一页最后一行的排序键；格式不符时 422。"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value = json.loads(raw.decode("utf-8"))["after"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        value = None
+    if type(value) is not value_type:
+        raise HTTPException(
+            status_code=422,
+            detail=structured_error_detail(
+                code="invalid_page_cursor",
+                message="分页游标无效，请从第一页重新加载",
+                field_errors=[{"field": "cursor", "message": "无法解析的游标"}],
+            ),
+        )
+    return value
+
+
+def paginate_keyset(query, key_column, cursor: str, page_size: int, include_total: bool = False):
+    """
+    按唯一递增列 key_column 做游标分页：`WHERE key > 上页末行 ORDER BY key LIMIT n+1`，
+    耗时与翻页深度无关。cursor 为空串表示第一页。
+    """
+    filtered = query
+    if cursor:
+        after = decode_page_cursor(cursor, key_column.type.python_type)
+        query = query.filter(key_column > after)
+    rows = query.order_by(None).order_by(key_column.asc()).limit(page_size + 1).all()
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        next_cursor = encode_page_cursor(getattr(items[-1], key_column.key))
+    if include_total:
+        total, total_is_exact = filtered.order_by(None).count(), True
+    else:
+        total, total_is_exact = estimate_query_total(filtered), False
+    return CursorPaginatedResponse(
+        items=items,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        total=total,
+        total_is_exact=total_is_exact,
     )
 
 
@@ -25,6 +25,7 @@ from .config import (
     settings,
 )
 from .database import ensure_database_schema_ready
+from .services.ranking_sync_service import start_ranking_sync_worker, stop_ranking_sync_worker
 
 # ── Router imports ──────────────────────────────────────────────────────────
 from .routers.auth import router as auth_router
@@ -163,7 +164,11 @@ def ensure_runtime_directories() -> None:
 async def lifespan(_: FastAPI):
     ensure_runtime_directories()
     ensure_database_schema_ready()
-    yield
+    start_ranking_sync_worker()
+    try:
+        yield
+    finally:
+        stop_ranking_sync_worker()
 
 
 # ── App creation ────────────────────────────────────────────────────────────
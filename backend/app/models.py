@@ -67,6 +67,12 @@ class App(Base):
     __tablename__ = "apps"
     __table_args__ = (
         UniqueConstraint("section", "name", "org", name="uq_apps_section_name_org"),
+        # 关键词检索用 ngram 全文索引（见 services/app_search_service.py）
+        Index(
+            "ft_apps_search", "name", "description", "org", "company", "department", "category",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ),
+        Index("ft_apps_name", "name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -252,6 +258,8 @@ class RankingDimension(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     calculation_method: Mapped[str] = mapped_column(Text, nullable=False)
+    # 声明式评分规则 JSON（见 services/scoring_engine.py）；为空时按名称取系统预置规则
+    scoring_rule: Mapped[str | None] = mapped_column(Text, nullable=True)
     weight: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -284,6 +292,71 @@ class RankingAuditLog(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class RankingRun(Base):
+    """榜单发布批次目录：每个 (榜单, 日期, run_id) 一行，供最新批次 / 可用日期的索引查询"""
+    __tablename__ = "ranking_runs"
+    __table_args__ = (
+        UniqueConstraint("ranking_config_id", "period_date", "run_id", name="uq_ranking_runs_config_period_run"),
+        Index("idx_ranking_runs_config_period_created", "ranking_config_id", "period_date", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ranking_config_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    period_date: Mapped[date] = mapped_column(Date, nullable=False)
+    run_id: Mapped[str | None] = mapped_column(String(36), nullable=True)  # 旧版快照无批次ID时为空
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)  # 快照内容 SHA-256
+    snapshot_run_id: Mapped[str | None] = mapped_column(String(36), nullable=True)  # 实际承载快照行的批次；内容未变时指向上一批次
+    is_published: Mapped[bool] = mapped_column(Boolean, default=False)  # 经发布入口产出的批次
+    duration_ms: Mapped[int] = mapped_column(Integer, default=0)  # 该榜单本批次的同步耗时
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RankingActiveRun(Base):
+    """实时榜单生效批次指针：新批次快照提交后以独立小事务切换，读路径只读指针指向的不可变快照"""
+    __tablename__ = "ranking_active_runs"
+
+    ranking_config_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    snapshot_run_id: Mapped[str] = mapped_column(String(36), nullable=False)  # 实际承载快照行的批次
+    period_date: Mapped[date] = mapped_column(Date, nullable=False)
+    run_created_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # 拒绝较旧批次覆盖较新批次
+    activated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class RankingSyncJob(Base):
+    """榜单后台同步任务（去抖合并链路变更，供前端轮询状态）"""
+    __tablename__ = "ranking_sync_jobs"
+    __table_args__ = (
+        Index("idx_ranking_sync_jobs_status_not_before", "status", "not_before"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued | running | done | failed
+    triggers: Mapped[str] = mapped_column(Text, default="")  # 合并进本任务的触发来源，逗号分隔
+    scope_json: Mapped[str] = mapped_column(Text, default="")  # 合并后的影响范围；空串表示全量
+    coalesced_count: Mapped[int] = mapped_column(Integer, default=1)
+    actor: Mapped[str] = mapped_column(String(100), default="system")
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    updated_count: Mapped[int] = mapped_column(Integer, default=0)
+    timings_summary: Mapped[str] = mapped_column(Text, default="")
+    error_message: Mapped[str] = mapped_column(Text, default="")
+    not_before: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 去抖截止时间
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class DataVersion(Base):
+    """公共读数据版本号：写路径提交时自增，各 worker 轮询该行判断进程内缓存是否失效"""
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class AppDimensionScore(Base):
     """应用在各维度的评分数据"""
     __tablename__ = "app_dimension_scores"
@@ -330,6 +403,14 @@ class HistoricalRanking(Base):
             name="uq_historical_rankings_period_run_app",
         ),
         Index("idx_historical_rankings_config_period_run", "ranking_config_id", "period_date", "run_id"),
+        Index(
+            "idx_historical_rankings_run_company_position",
+            "ranking_config_id",
+            "period_date",
+            "run_id",
+            "app_company",
+            "company_position",
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -341,6 +422,13 @@ class HistoricalRanking(Base):
     app_id: Mapped[int] = mapped_column(ForeignKey("apps.id"), nullable=False)
     app_name: Mapped[str] = mapped_column(String(120), nullable=False)
     app_org: Mapped[str] = mapped_column(String(60), nullable=False)
+    app_company: Mapped[str | None] = mapped_column(String(120), nullable=True)  # 发布时的展示口径公司名（company 为空取 org）
+    company_position: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 公司内名次；迁移前的旧快照为空
+    # 相对基准批次（更早日期最近一次发布）的变动；迁移前的旧快照为空
+    previous_position: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    previous_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    position_delta: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 基准名次 - 当前名次，正数为上升
+    movement: Mapped[str | None] = mapped_column(String(10), nullable=True)  # new | up | down | same
     tag: Mapped[str] = mapped_column(String(20), default="推荐")
     score: Mapped[int] = mapped_column(Integer, default=0)
     metric_type: Mapped[str] = mapped_column(String(20), default="composite")
@@ -16,7 +16,9 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.app_search_service import apply_app_search, build_search_hit
 from ..services.ranking_service import *
+from ..services.ranking_sync_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
@@ -173,18 +175,21 @@ def approve_submission_and_create_app(
             request_id=request.headers.get("X-Request-Id", ""),
             payload_summary=f"app_id={app.id},app_name={app.name}",
         )
-        updated_count, run_id = sync_after_chain_mutation(
+        sync_ticket = sync_after_chain_mutation(
             db,
             "submission_approved_and_created_app",
             actor=ranking_audit_actor(admin_user),
+            scope=RankingSyncScope.for_app(app.id),
         )
         db.refresh(app)
 
         return {
             "message": "审批成功并创建应用",
             "app_id": app.id,
-            "synced": updated_count,
-            "run_id": run_id,
+            "synced": sync_ticket.updated_count,
+            "run_id": sync_ticket.run_id,
+            "sync_job_id": sync_ticket.job_id,
+            "sync_status": sync_ticket.status,
         }
     except HTTPException:
         raise
@@ -327,17 +332,20 @@ def approve_app_change_request(
         request_id=request.headers.get("X-Request-Id", ""),
         payload_summary=f"app_id={app_row.id},app_name={app_row.name}",
     )
-    updated_count, run_id = sync_after_chain_mutation(
+    sync_ticket = sync_after_chain_mutation(
         db,
         "app_change_request_approved",
         actor=ranking_audit_actor(admin_user),
+        scope=RankingSyncScope.for_app(app_row.id),
     )
     return {
         "message": "应用变更已通过",
         "change_request_id": change_request.id,
         "app_id": app_row.id,
-        "synced": updated_count,
-        "run_id": run_id,
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
     }
 
 
@@ -444,7 +452,7 @@ def create_group_app(
         raise HTTPException(status_code=500, detail=f"创建集团应用失败: {str(e)}")
 
 
-@router.get(f"/admin/apps", response_model=PaginatedResponse[AppDetail])
+@router.get(f"/admin/apps", response_model=PaginatedResponse[AppDetail] | CursorPaginatedResponse[AppDetail])
 def admin_list_apps(
     section: str | None = Query(default=None, description="group/province"),
     status: str | None = Query(default=None, description="available/approval/beta/offline"),
@@ -452,6 +460,8 @@ def admin_list_apps(
     q: str | None = Query(default=None, description="按名称或描述搜索"),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="游标分页：首页传空串，之后传上一页的 next_cursor"),
+    include_total: bool | None = Query(default=None, description="是否精确计数；游标分页默认只返回估算值"),
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
@@ -467,17 +477,27 @@ def admin_list_apps(
     if company:
         query = query.filter(App.company == company)
     if q:
-        query = query.filter(
-            or_(
-                App.name.contains(q),
-                App.description.contains(q),
-                App.org.contains(q),
-                App.company.contains(q),
-                App.department.contains(q),
-                App.category.contains(q),
+        if cursor is not None:
+            # 相关度排序不是唯一递增键，关键词检索仍按页码分页
+            raise HTTPException(
+                status_code=422,
+                detail=structured_error_detail(
+                    code="invalid_page_cursor",
+                    message="关键词检索不支持游标分页，请使用 page 参数",
+                    field_errors=[{"field": "cursor", "message": "不能与 q 同时使用"}],
+                ),
             )
-        )
-    return paginate_query(query.order_by(App.id), page, page_size)
+        result = paginate_query(apply_app_search(query, q), page, page_size, include_total=include_total is not False)
+        result.items = [
+            AppDetail.model_validate(app).model_copy(
+                update={"search_hit": AppSearchHit(**build_search_hit(app, q, relevance))}
+            )
+            for app, relevance in result.items
+        ]
+        return result
+    if cursor is not None:
+        return paginate_keyset(query, App.id, cursor, page_size, include_total=bool(include_total))
+    return paginate_query(query.order_by(App.id), page, page_size, include_total=include_total is not False)
 
 
 @router.put(f"/admin/apps/{{app_id}}/status")
@@ -530,13 +550,13 @@ def admin_update_app_status(
         ),
     )
 
-    synced = 0
-    run_id = ""
+    sync_ticket = None
     if app.section == "province":
-        synced, run_id = sync_after_chain_mutation(
+        sync_ticket = sync_after_chain_mutation(
             db,
             "app_status_updated",
             actor=ranking_audit_actor(admin_user),
+            scope=RankingSyncScope.for_app(app.id),
         )
     else:
         db.commit()
@@ -547,8 +567,10 @@ def admin_update_app_status(
         "old_status": old_status,
         "new_status": app.status,
         "disabled_settings": disabled_settings,
-        "synced": synced,
-        "run_id": run_id,
+        "synced": sync_ticket.updated_count if sync_ticket else 0,
+        "run_id": sync_ticket.run_id if sync_ticket else "",
+        "sync_job_id": sync_ticket.job_id if sync_ticket else None,
+        "sync_status": sync_ticket.status if sync_ticket else None,
     }
 
 
@@ -22,13 +22,15 @@ from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix=settings.api_prefix)
 
-@router.get(f"/admin/users", response_model=PaginatedResponse[UserPublic])
+@router.get(f"/admin/users", response_model=PaginatedResponse[UserPublic] | CursorPaginatedResponse[UserPublic])
 def list_users(
     q: str | None = Query(default=None),
     role: str | None = Query(default=None),
     is_active: bool | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="游标分页：首页传空串，之后传上一页的 next_cursor"),
+    include_total: bool | None = Query(default=None, description="是否精确计数；游标分页默认只返回估算值"),
     _: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
@@ -50,13 +52,18 @@ def list_users(
     if is_active is not None:
         query = query.filter(User.is_active.is_(is_active))
 
-    rows = paginate_query(query.order_by(User.id.asc()), page, page_size)
+    if cursor is not None:
+        rows = paginate_keyset(query, User.id, cursor, page_size, include_total=bool(include_total))
+        rows.items = [to_public_user(user) for user in rows.items]
+        return rows
+    rows = paginate_query(query.order_by(User.id.asc()), page, page_size, include_total=include_total is not False)
     return PaginatedResponse(
         items=[to_public_user(user) for user in rows.items],
         page=rows.page,
         page_size=rows.page_size,
         total=rows.total,
         total_pages=rows.total_pages,
+        total_is_exact=rows.total_is_exact,
     )
 
 
@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import FileResponse
 from PIL import Image
+from pydantic import TypeAdapter
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
@@ -16,6 +17,19 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.app_catalog_service import APP_COMPACT_COLUMNS, APP_COMPACT_ITEMS_ADAPTER, compact_app_items
+from ..services.app_facet_service import app_catalog_facets
+from ..services.app_profile_service import (
+    PROFILE_HISTORY_DAYS,
+    PROFILE_HISTORY_POINTS,
+    PROFILE_VERSION_NAMES,
+    app_profile_body,
+    profile_today,
+)
+from ..services.app_search_service import apply_app_search, build_search_hit
+from ..services.app_suggest_service import SUGGEST_TOP_K, ensure_suggest_index_current
+from ..services.cache_service import APPS_DATA_VERSION, public_read_cache
+from ..services.json_stream_service import json_array_response, row_mapping, schema_columns
 from ..services.ranking_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
@@ -24,16 +38,40 @@ router = APIRouter(prefix=settings.api_prefix)
 
 APP_STATUS_VALUES = {"available", "approval", "beta", "offline"}
 
-@router.get(f"/apps", response_model=list[AppDetail])
+# 快速路径（stream=true）：完整字段的列查询 + 流式序列化
+APP_DETAIL_COLUMNS = schema_columns(App, AppDetail)
+APP_DETAIL_ITEMS_ADAPTER = TypeAdapter(list[AppDetail])
+
+
+@router.get(
+    f"/apps",
+    response_model=list[AppDetail] | AppListWithFacets | list[AppCompact] | AppCompactListWithFacets,
+)
 def list_apps(
     section: str | None = Query(default=None),
     status: str | None = Query(default=None),
     category: str | None = Query(default=None),
     company: str | None = Query(default=None),
     q: str | None = Query(default=None),
+    include_facets: bool = Query(default=False),
+    view: str = Query(default="full", pattern="^(full|compact)$", description="compact 只返回目录卡片所需字段"),
+    stream: bool = Query(default=False, description="列查询 + 流式序列化的快速路径（不与 include_facets 同用）"),
+    cache_headers: dict[str, str] = Depends(public_read_cache("apps", APPS_DATA_VERSION)),
     db: Session = Depends(get_db),
 ):
-    query = db.query(App)
+    """
+    应用目录列表
+    - view=compact 时只 SELECT 卡片字段（简介截断为 APP_COMPACT_DESCRIPTION_CHARS 字），不构造 ORM 实体，
+      带关键词时仍按相关度排序但不返回命中高亮
+    - stream=true（完整视图、未带 include_facets）时按列查询并分块流式输出，响应内容与默认路径一致
+    """
+    fast_path = stream and view == "full" and not include_facets
+    if view == "compact":
+        query = db.query(*APP_COMPACT_COLUMNS)
+    elif fast_path:
+        query = db.query(*APP_DETAIL_COLUMNS)
+    else:
+        query = db.query(App)
     if section:
         query = query.filter(App.section == section)
     if status:
@@ -47,21 +85,74 @@ def list_apps(
         query = query.filter(App.category == category)
     if company:
         query = query.filter(App.company == company)
+    if view == "compact":
+        rows = apply_app_search(query, q).all() if q else query.order_by(App.id).all()
+        items = compact_app_items(rows)
+        if include_facets:
+            facets = app_catalog_facets(db, section=section, category=category, company=company, status=status, q=q)
+            body = AppCompactListWithFacets(items=items, facets=AppFacets(**facets)).model_dump_json().encode("utf-8")
+        else:
+            body = APP_COMPACT_ITEMS_ADAPTER.dump_json(items)
+        return Response(content=body, media_type="application/json", headers=cache_headers)
+    if fast_path:
+        if not q:
+            return json_array_response(query.order_by(App.id).all(), APP_DETAIL_ITEMS_ADAPTER, headers=cache_headers)
+        return json_array_response(
+            apply_app_search(query, q).all(),
+            APP_DETAIL_ITEMS_ADAPTER,
+            to_item=lambda row: {**row_mapping(row), "search_hit": build_search_hit(row, q, row.search_relevance)},
+            headers=cache_headers,
+        )
     if q:
-        query = query.filter(
-            or_(
-                App.name.contains(q),
-                App.description.contains(q),
-                App.org.contains(q),
-                App.company.contains(q),
-                App.department.contains(q),
+        # 全文索引检索，按相关度排序并附带命中高亮
+        items = [
+            AppDetail.model_validate(app).model_copy(
+                update={"search_hit": AppSearchHit(**build_search_hit(app, q, relevance))}
             )
-        )
+            for app, relevance in apply_app_search(query, q).all()
+        ]
+    else:
+        items = query.order_by(App.id).all()
+    if include_facets:
+        # 列表与分面一次返回：{"items": [...], "facets": {...}}
+        facets = app_catalog_facets(db, section=section, category=category, company=company, status=status, q=q)
+        return AppListWithFacets(items=items, facets=AppFacets(**facets))
+    return items
 
-    return query.order_by(App.id).all()
+
+@router.get(f"/apps/facets", response_model=AppFacets)
+def get_app_facets(
+    section: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    category: str | None = Query(default=None),
+    company: str | None = Query(default=None),
+    q: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    """应用目录分面计数（板块 / 分类 / 公司 / 状态），筛选参数与 `GET /api/apps` 一致。"""
+    if status and status not in APP_STATUS_VALUES:
+        raise HTTPException(status_code=422, detail="Invalid status")
+    return app_catalog_facets(db, section=section, category=category, company=company, status=status, q=q)
+
+
+@router.get(f"/apps/suggest", response_model=list[AppSuggestion])
+def suggest_apps(
+    prefix: str = Query(min_length=1, max_length=50),
+    limit: int = Query(default=8, ge=1, le=SUGGEST_TOP_K),
+    db: Session = Depends(get_db),
+):
+    """搜索框联想：按名称 / 公司的汉字、全拼或拼音首字母前缀匹配，调用量高者在前。"""
+    return [
+        AppSuggestion(id=entry.id, name=entry.name, company=entry.company, section=entry.section, category=entry.category)
+        for entry in ensure_suggest_index_current(db).suggest(prefix, limit)
+    ]
 
 
-@router.get(f"/apps/{{app_id}}", response_model=AppDetail)
+@router.get(
+    f"/apps/{{app_id}}",
+    response_model=AppDetail,
+    dependencies=[Depends(public_read_cache("app_detail", APPS_DATA_VERSION))],
+)
 def get_app_detail(app_id: int, db: Session = Depends(get_db)):
     item = db.query(App).filter(App.id == app_id).first()
     if not item:
@@ -69,3 +160,20 @@ def get_app_detail(app_id: int, db: Session = Depends(get_db)):
     return item
 
 
+@router.get(f"/apps/{{app_id}}/profile", response_model=AppProfile)
+def get_app_profile(
+    app_id: int,
+    days: int = Query(default=PROFILE_HISTORY_DAYS, ge=1, le=730, description="历史走势回溯天数"),
+    points: int = Query(default=PROFILE_HISTORY_POINTS, ge=2, le=365, description="每个榜单走势的最多点数"),
+    cache_headers: dict[str, str] = Depends(
+        public_read_cache("app_profile", *PROFILE_VERSION_NAMES, key=profile_today)
+    ),
+    db: Session = Depends(get_db),
+):
+    """应用详情页聚合：应用信息、各启用榜单当前名次、维度评分明细与历史走势，一次请求返回。"""
+    body = app_profile_body(db, app_id, days=days, points=points)
+    if body is None:
+        raise HTTPException(status_code=404, detail="App not found")
+    return Response(content=body, media_type="application/json", headers=cache_headers)
+
+
@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import FileResponse
 from PIL import Image
+from pydantic import TypeAdapter
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
@@ -16,6 +17,7 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.json_stream_service import json_array_response, schema_columns
 from ..services.ranking_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
@@ -35,14 +37,24 @@ AUDIT_EVENT_WHITELIST = {
     "route.guard.denied_admin",
 }
 
+ACTION_LOGS_ADAPTER = TypeAdapter(list[ActionLogOut])
+
+
 @router.get(f"/action-logs", response_model=list[ActionLogOut])
 def get_action_logs(
     limit: int = Query(default=100, ge=1, le=500),
     action: str | None = Query(default=None),
+    stream: bool = Query(default=False, description="列查询 + 流式序列化的快速路径"),
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
-    query = db.query(ActionLog).options(joinedload(ActionLog.actor_user))
+    if stream:
+        query = db.query(
+            *schema_columns(ActionLog, ActionLogOut),
+            func.coalesce(User.username, "").label("actor_username"),
+        ).outerjoin(User, User.id == ActionLog.actor_user_id)
+    else:
+        query = db.query(ActionLog).options(joinedload(ActionLog.actor_user))
     if action:
         query = query.filter(ActionLog.action == action)
     rows = (
@@ -50,6 +62,8 @@ def get_action_logs(
         .limit(limit)
         .all()
     )
+    if stream:
+        return json_array_response(rows, ACTION_LOGS_ADAPTER)
     return [
         ActionLogOut(
             id=row.id,
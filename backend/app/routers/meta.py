@@ -1,6 +1,6 @@
-"""元数据路由: health, enums, venv info."""
+"""元数据路由: health, enums, home bootstrap, venv info."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from ..config import (
     get_app_category_options,
@@ -8,6 +8,15 @@ from ..config import (
     settings,
 )
 from ..dependencies import require_development_mode
+from ..schemas import HomeBootstrap
+from ..services.cache_service import (
+    PUBLIC_STATIC_CACHE_CONTROL,
+    RANKING_BODY_VERSION_NAMES,
+    RANKING_CONFIGS_DATA_VERSION,
+    SUBMISSIONS_DATA_VERSION,
+    public_read_cache,
+)
+from ..services.home_service import HOME_APPS_PAGE_SIZE, HOME_PARTS, build_home_payload
 from ..venv_utils import venv_reader
 
 router = APIRouter(prefix=settings.api_prefix)
@@ -25,7 +34,13 @@ def health_check():
     return {"status": "ok"}
 
 
-@router.get("/meta/enums")
+@router.get(
+    "/meta/enums",
+    # 枚举只随配置与代码变化：以选项内容本身作为 ETag 键
+    dependencies=[Depends(public_read_cache(
+        "meta_enums", cache_control=PUBLIC_STATIC_CACHE_CONTROL, key=tuple(APP_CATEGORY_OPTIONS),
+    ))],
+)
 def list_enums():
     return {
         "app_status": sorted(APP_STATUS_VALUES),
@@ -37,6 +52,39 @@ def list_enums():
     }
 
 
+@router.get("/home", response_model=HomeBootstrap)
+def home_bootstrap(
+    view: str = Query(default="full", pattern="^(full|compact)$", description="榜单与首屏应用的视图，同 /api/rankings"),
+    apps_limit: int = Query(default=HOME_APPS_PAGE_SIZE, ge=0, le=100, description="首屏应用条数"),
+    parts: str | None = Query(
+        default=None,
+        pattern=f"^({'|'.join(HOME_PARTS)})(,({'|'.join(HOME_PARTS)}))*$",
+        description="只返回其中几部分（逗号分隔：rankings / ranking_configs / stats / apps），其余为 null；不传返回全部",
+    ),
+    cache_headers: dict[str, str] = Depends(public_read_cache(
+        "home",
+        *RANKING_BODY_VERSION_NAMES,
+        RANKING_CONFIGS_DATA_VERSION,
+        SUBMISSIONS_DATA_VERSION,
+        key=(tuple(APP_CATEGORY_OPTIONS), settings.oa_rule_base_url),
+    )),
+):
+    """
+    首页聚合：榜单（excellent / trend）、启用榜单配置、统计、枚举、规则链接与首屏应用一次返回
+    - ETag 覆盖各部分依赖的全部数据版本号，重复访问命中时直接 304
+    - 有部分读取失败时响应带 degraded 且不缓存（no-store），避免浏览器复用残缺结果
+    - parts 只取所需部分，未请求的部分不查库；ETag 按查询参数区分
+    """
+    body, degraded = build_home_payload(
+        enums=list_enums(),
+        view=view,
+        apps_limit=apps_limit,
+        parts=HOME_PARTS if parts is None else parts.split(","),
+    )
+    headers = {"Cache-Control": "no-store"} if degraded else cache_headers
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/venv/info")
 def get_venv_info():
     """获取虚拟环境信息"""
@@ -16,8 +16,11 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..models import RankingConfigDimension
 from ..schemas import *
+from ..scoring_rules import dump_scoring_rule
 from ..dependencies import *
+from ..services.cache_service import RANKING_CONFIGS_DATA_VERSION, public_read_cache
 from ..services.ranking_service import *
+from ..services.ranking_sync_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
@@ -140,13 +143,21 @@ def update_app_ranking_params(
         app.ranking_tags = ranking_tags
     app.last_ranking_update = datetime.utcnow()
     
-    updated_count, run_id = sync_after_chain_mutation(
+    sync_ticket = sync_after_chain_mutation(
         db,
         "app_ranking_params_updated",
         actor=ranking_audit_actor(admin_user),
+        scope=RankingSyncScope.for_app(app_id),
     )
     db.refresh(app)
-    return {"message": "排行参数更新成功", "app_id": app_id, "synced": updated_count, "run_id": run_id}
+    return {
+        "message": "排行参数更新成功",
+        "app_id": app_id,
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
+    }
 
 
 @router.put(f"/apps/{{app_id}}/dimension-scores/{{dimension_id}}")
@@ -222,15 +233,22 @@ def update_app_dimension_score_api(
             f"before={before_score},after={resolved_score}"
         ),
     )
-    updated_count, run_id = sync_after_chain_mutation(db, "dimension_score_updated", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "dimension_score_updated",
+        actor=actor,
+        scope=RankingSyncScope.for_app(app_id, config_id),
+    )
     db.refresh(score_record)
     return {
         "message": "维度评分更新成功",
         "app_id": app_id,
         "dimension_id": dimension_id,
         "score": resolved_score,
-        "synced": updated_count,
-        "run_id": run_id,
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
     }
 
 
@@ -342,6 +360,7 @@ def get_ranking_dimension(
 @router.post(f"/ranking-dimensions", response_model=RankingDimensionOut)
 def create_ranking_dimension(
     payload: RankingDimensionCreate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -354,7 +373,8 @@ def create_ranking_dimension(
         raise HTTPException(status_code=400, detail="排行维度名称已存在")
     
     # 创建排行维度
-    dimension = RankingDimension(**payload.model_dump())
+    dimension = RankingDimension(**payload.model_dump(exclude={"scoring_rule"}))
+    dimension.scoring_rule = dump_scoring_rule(payload.scoring_rule)
     db.add(dimension)
     db.flush()
     
@@ -375,7 +395,13 @@ def create_ranking_dimension(
         actor=actor,
         payload_summary=f"dimension_id={dimension.id},name={dimension.name}",
     )
-    sync_after_chain_mutation(db, "ranking_dimension_created", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_dimension_created",
+        actor=actor,
+        scope=RankingSyncScope.for_dimension(dimension.id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(dimension)
 
     return dimension
@@ -385,6 +411,7 @@ def create_ranking_dimension(
 def update_ranking_dimension(
     dimension_id: int,
     payload: RankingDimensionUpdate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -415,6 +442,12 @@ def update_ranking_dimension(
     if payload.calculation_method is not None and payload.calculation_method != dimension.calculation_method:
         changes.append("计算方法已更新")
         dimension.calculation_method = payload.calculation_method
+    # scoring_rule 显式传 null 表示清除自定义规则，回落到系统预置 / 默认规则
+    if "scoring_rule" in payload.model_fields_set:
+        scoring_rule = dump_scoring_rule(payload.scoring_rule)
+        if scoring_rule != dimension.scoring_rule:
+            changes.append("评分规则已更新")
+            dimension.scoring_rule = scoring_rule
     if payload.weight is not None and payload.weight != dimension.weight:
         changes.append(f"权重: {dimension.weight} → {payload.weight}")
         dimension.weight = payload.weight
@@ -447,7 +480,13 @@ def update_ranking_dimension(
             actor=actor,
             payload_summary=f"dimension_id={dimension.id},changes={' | '.join(changes)}",
         )
-    sync_after_chain_mutation(db, "ranking_dimension_updated", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_dimension_updated",
+        actor=actor,
+        scope=RankingSyncScope.for_dimension(dimension.id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(dimension)
 
     return dimension
@@ -466,7 +505,13 @@ def delete_ranking_dimension(
     if not dimension:
         raise HTTPException(status_code=404, detail="排行维度不存在")
     
-    # 从榜单配置关联表中剔除被删除维度
+    # 从榜单配置关联表中剔除被删除维度（先记录受影响榜单，供增量重算）
+    touched_config_ids = [
+        row[0]
+        for row in db.query(RankingConfigDimension.ranking_config_id)
+        .filter(RankingConfigDimension.dimension_id == dimension_id)
+        .all()
+    ]
     touched_configs = db.query(RankingConfigDimension).filter(
         RankingConfigDimension.dimension_id == dimension_id
     ).delete(synchronize_session=False)
@@ -501,14 +546,21 @@ def delete_ranking_dimension(
 
     # 删除排行维度
     db.delete(dimension)
-    synced, run_id = sync_after_chain_mutation(db, "ranking_dimension_deleted", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_dimension_deleted",
+        actor=actor,
+        scope=RankingSyncScope.for_configs(*touched_config_ids),
+    )
 
     return {
         "message": "排行维度已删除",
         "removed_scores": removed_scores,
         "touched_configs": touched_configs,
-        "synced": synced,
-        "run_id": run_id,
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
     }
 
 
@@ -534,7 +586,11 @@ def get_ranking_audit_logs(
     return db.query(RankingAuditLog).order_by(RankingAuditLog.created_at.desc()).limit(limit).all()
 
 
-@router.get(f"/ranking-configs", response_model=list[RankingConfigOut])
+@router.get(
+    f"/ranking-configs",
+    response_model=list[RankingConfigOut],
+    dependencies=[Depends(public_read_cache("ranking_configs", RANKING_CONFIGS_DATA_VERSION))],
+)
 def list_ranking_configs(
     is_active: bool | None = Query(default=None, description="按启用状态筛选"),
     db: Session = Depends(get_db)
@@ -548,12 +604,17 @@ def list_ranking_configs(
     return query.order_by(RankingConfig.id).all()
 
 
-@router.get(f"/admin/ranking-configs", response_model=PaginatedResponse[RankingConfigOut])
+@router.get(
+    f"/admin/ranking-configs",
+    response_model=PaginatedResponse[RankingConfigOut] | CursorPaginatedResponse[RankingConfigOut],
+)
 def admin_list_ranking_configs(
     is_active: bool | None = Query(default=None, description="按启用状态筛选"),
     q: str | None = Query(default=None, description="按ID、名称或描述搜索"),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="游标分页：首页传空串，之后传上一页的 next_cursor"),
+    include_total: bool | None = Query(default=None, description="是否精确计数；游标分页默认只返回估算值"),
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
@@ -568,7 +629,9 @@ def admin_list_ranking_configs(
                 RankingConfig.description.contains(q),
             )
         )
-    return paginate_query(query.order_by(RankingConfig.id), page, page_size)
+    if cursor is not None:
+        return paginate_keyset(query, RankingConfig.id, cursor, page_size, include_total=bool(include_total))
+    return paginate_query(query.order_by(RankingConfig.id), page, page_size, include_total=include_total is not False)
 
 
 @router.get(f"/ranking-configs/{{config_id}}", response_model=RankingConfigOut)
@@ -615,6 +678,7 @@ def get_ranking_config_with_dimensions(
 @router.post(f"/ranking-configs", response_model=RankingConfigOut)
 def create_ranking_config(
     payload: RankingConfigCreate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -641,7 +705,13 @@ def create_ranking_config(
         actor=actor,
         payload_summary=f"name={config.name},is_active={config.is_active}",
     )
-    sync_after_chain_mutation(db, "ranking_config_created", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_config_created",
+        actor=actor,
+        scope=RankingSyncScope.for_configs(config.id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(config)
     return config
 
@@ -650,6 +720,7 @@ def create_ranking_config(
 def update_ranking_config(
     config_id: str,
     payload: RankingConfigUpdate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -680,7 +751,13 @@ def update_ranking_config(
         actor=actor,
         payload_summary="fields=name/description/dimensions/calculation_method/is_active",
     )
-    sync_after_chain_mutation(db, "ranking_config_updated", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_config_updated",
+        actor=actor,
+        scope=RankingSyncScope.for_configs(config.id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(config)
     return config
 
@@ -713,6 +790,8 @@ def delete_ranking_config(
         .filter(HistoricalRanking.ranking_config_id == config_id)
         .delete(synchronize_session=False)
     )
+    db.query(RankingRun).filter(RankingRun.ranking_config_id == config_id).delete(synchronize_session=False)
+    db.query(RankingActiveRun).filter(RankingActiveRun.ranking_config_id == config_id).delete(synchronize_session=False)
 
     actor = ranking_audit_actor(admin_user)
     write_ranking_audit_log(
@@ -727,14 +806,21 @@ def delete_ranking_config(
         ),
     )
     db.delete(config)
-    synced, run_id = sync_after_chain_mutation(db, "ranking_config_deleted", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "ranking_config_deleted",
+        actor=actor,
+        scope=RankingSyncScope.for_configs(config_id),
+    )
     return {
         "message": "榜单配置已删除",
         "removed_settings": removed_settings,
         "removed_realtime": removed_realtime,
         "removed_historical": removed_historical,
-        "synced": synced,
-        "run_id": run_id,
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
     }
 
 
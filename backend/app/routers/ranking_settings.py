@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import FileResponse
 from PIL import Image
+from pydantic import TypeAdapter
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
@@ -16,7 +17,9 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.json_stream_service import json_array_response, row_mapping, schema_columns
 from ..services.ranking_service import *
+from ..services.ranking_sync_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
@@ -231,13 +234,20 @@ def save_app_ranking_setting_atomically(
                 f"updated_dimensions={updated_dimensions}"
             ),
         )
-        synced, run_id = sync_after_chain_mutation(db, "app_ranking_setting_saved_atomic", actor=actor)
+        sync_ticket = sync_after_chain_mutation(
+            db,
+            "app_ranking_setting_saved_atomic",
+            actor=actor,
+            scope=RankingSyncScope.for_app(app_id, config_id, before_snapshot.get("ranking_config_id")),
+        )
         db.refresh(target_setting)
         return {
             "setting": target_setting,
             "updated_dimensions": updated_dimensions,
-            "synced": synced,
-            "run_id": run_id,
+            "synced": sync_ticket.updated_count,
+            "run_id": sync_ticket.run_id,
+            "sync_job_id": sync_ticket.job_id,
+            "sync_status": sync_ticket.status,
         }
     except HTTPException:
         db.rollback()
@@ -251,6 +261,7 @@ def save_app_ranking_setting_atomically(
 def create_app_ranking_setting(
     app_id: int,
     payload: AppRankingSettingCreate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -302,7 +313,13 @@ def create_app_ranking_setting(
             f"after={json.dumps(_serialize_setting(setting), ensure_ascii=False)}"
         ),
     )
-    sync_after_chain_mutation(db, "app_ranking_setting_created", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "app_ranking_setting_created",
+        actor=actor,
+        scope=RankingSyncScope.for_app(app_id, payload.ranking_config_id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(setting)
     return setting
 
@@ -312,6 +329,7 @@ def update_app_ranking_setting(
     app_id: int,
     setting_id: int,
     payload: AppRankingSettingUpdate,
+    response: Response,
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
@@ -387,7 +405,13 @@ def update_app_ranking_setting(
             f"after={json.dumps(after_snapshot, ensure_ascii=False)}"
         ),
     )
-    sync_after_chain_mutation(db, "app_ranking_setting_updated", actor=actor)
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "app_ranking_setting_updated",
+        actor=actor,
+        scope=RankingSyncScope.for_app(app_id, before_snapshot.get("ranking_config_id"), setting.ranking_config_id),
+    )
+    apply_sync_ticket_headers(response, sync_ticket)
     db.refresh(setting)
     return setting
 
@@ -427,19 +451,50 @@ def delete_app_ranking_setting(
         ),
     )
     db.delete(setting)
-    synced, run_id = sync_after_chain_mutation(db, "app_ranking_setting_deleted", actor=actor)
-    return {"message": "榜单设置已删除", "synced": synced, "run_id": run_id}
+    sync_ticket = sync_after_chain_mutation(
+        db,
+        "app_ranking_setting_deleted",
+        actor=actor,
+        scope=RankingSyncScope.for_app(app_id, before_snapshot.get("ranking_config_id")),
+    )
+    return {
+        "message": "榜单设置已删除",
+        "synced": sync_ticket.updated_count,
+        "run_id": sync_ticket.run_id,
+        "sync_job_id": sync_ticket.job_id,
+        "sync_status": sync_ticket.status,
+    }
+
+
+APP_RANKING_SETTINGS_ADAPTER = TypeAdapter(list[AppRankingSettingOut])
 
 
 @router.get(f"/app-ranking-settings", response_model=list[AppRankingSettingOut])
 def list_all_app_ranking_settings(
     ranking_config_id: Optional[str] = None,
+    stream: bool = Query(default=False, description="列查询 + 流式序列化的快速路径"),
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
     """
     获取所有应用榜单设置列表（支持按榜单配置筛选）
+    - stream=true 时设置行走列查询，榜单配置（数量少）每个只序列化一次后复用
     """
+    if stream:
+        config_query = db.query(RankingConfig)
+        setting_query = db.query(*schema_columns(AppRankingSetting, AppRankingSettingOut)).filter(
+            AppRankingSetting.ranking_config_id.is_not(None)
+        )
+        if ranking_config_id:
+            config_query = config_query.filter(RankingConfig.id == ranking_config_id)
+            setting_query = setting_query.filter(AppRankingSetting.ranking_config_id == ranking_config_id)
+        configs = {config.id: RankingConfigOut.model_validate(config) for config in config_query.all()}
+        return json_array_response(
+            setting_query.order_by(AppRankingSetting.id).all(),
+            APP_RANKING_SETTINGS_ADAPTER,
+            to_item=lambda row: {**row_mapping(row), "ranking_config": configs.get(row.ranking_config_id)},
+        )
+
     query = db.query(AppRankingSetting).options(
         joinedload(AppRankingSetting.app),
         joinedload(AppRankingSetting.ranking_config)
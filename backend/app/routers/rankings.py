@@ -2,13 +2,15 @@
 import json as _json, logging, math, uuid
 from datetime import date, datetime, timedelta
 from pathlib import Path
+from time import perf_counter
 from typing import Optional
 from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import FileResponse
 from PIL import Image
-from sqlalchemy import func
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only
 from ..auth_utils import generate_session_token, hash_password, verify_password
 from ..config import *
 from ..database import ensure_database_schema_ready, get_db
@@ -16,7 +18,31 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.cache_service import (
+    APPS_DATA_VERSION,
+    RANKING_BODY_VERSION_NAMES,
+    SUBMISSIONS_DATA_VERSION,
+    cached_ranking_body,
+    cached_ranking_response,
+    public_read_cache,
+    ranking_cache_stats,
+)
+from ..services.home_service import public_stats, rule_links
+from ..services.json_stream_service import schema_columns
+from ..services.ranking_read_service import (
+    apply_ranking_app_filters,
+    compact_ranking_items,
+    dump_compact_ranking_rows,
+    dump_ranking_items,
+    ranking_cache_key,
+    ranking_item_payload,
+    render_live_ranking,
+    render_ranking_diff,
+)
 from ..services.ranking_service import *
+from ..services.ranking_static_service import publish_ranking_static_files, read_static_ranking
+from ..services.ranking_simulation_service import get_simulation_base, simulate_rankings
+from ..services.ranking_sync_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
@@ -26,133 +52,127 @@ router = APIRouter(prefix=settings.api_prefix)
 # Module-level helpers
 
 def resolve_latest_run_id(db: Session, ranking_config_id: str, period_date: date) -> str | None:
-    """返回某榜单在指定日期最新发布的 run_id（旧数据可能为空）。"""
+    """
+    返回某榜单在指定日期最新批次的快照 run_id（旧数据可能为空），走 ranking_runs 目录索引。
+    最新批次内容与上一批次相同时未重复落快照，此时返回其复用的快照批次。
+    """
     scope_id = resolve_ranking_scope_id(ranking_config_id=ranking_config_id)
     latest_with_run = (
-        db.query(HistoricalRanking.run_id)
+        db.query(func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id))
         .filter(
-            HistoricalRanking.ranking_config_id == scope_id
+            RankingRun.ranking_config_id == scope_id
         )
-        .filter(HistoricalRanking.period_date == period_date)
-        .filter(HistoricalRanking.run_id.is_not(None))
-        .order_by(HistoricalRanking.created_at.desc())
+        .filter(RankingRun.period_date == period_date)
+        .filter(RankingRun.run_id.is_not(None))
+        .order_by(RankingRun.created_at.desc(), RankingRun.id.desc())
         .first()
     )
     return latest_with_run[0] if latest_with_run else None
 
-@router.get(f"/rankings", response_model=list[RankingItem])
+
+def resolve_snapshot_run_id(db: Session, ranking_config_id: str, period_date: date, run_id: str) -> str:
+    """把调用方指定的 run_id 映射为实际承载快照行的批次；目录中无记录时原样返回。"""
+    snapshot = (
+        db.query(func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id))
+        .filter(RankingRun.ranking_config_id == ranking_config_id)
+        .filter(RankingRun.period_date == period_date)
+        .filter(RankingRun.run_id == run_id)
+        .first()
+    )
+    return snapshot[0] if snapshot else run_id
+
+HISTORICAL_RANKINGS_ADAPTER = TypeAdapter(list[HistoricalRankingOut])
+HISTORICAL_RANKING_COLUMNS = schema_columns(HistoricalRanking, HistoricalRankingOut)
+
+
+@router.get(f"/rankings", response_model=list[RankingItem] | list[RankingItemCompact])
 def list_rankings(
     ranking_type: str = "excellent",
     ranking_config_id: str | None = Query(default=None, description="榜单配置ID（兼容前端 ranking_config_id 参数）"),
     company: str | None = Query(default=None, description="按公司筛选省内榜单"),
     period_date: date | None = Query(default=None, description="查询历史榜单日期，格式：YYYY-MM-DD；不传则返回实时榜单"),
+    limit: int | None = Query(default=None, ge=1, le=500, description="返回条数上限；不传返回整榜"),
+    offset: int = Query(default=0, ge=0, description="跳过的条数（按名次）"),
+    view: str = Query(default="full", pattern="^(full|compact)$", description="compact 只返回榜单卡片所需字段"),
+    cache_headers: dict[str, str] = Depends(public_read_cache("rankings", *RANKING_BODY_VERSION_NAMES)),
     db: Session = Depends(get_db)
 ):
     """
     获取应用榜单
     - 榜单仅展示省内应用
     - 支持按日期查询历史榜单
-    - 不传日期则返回实时榜单（Ranking 表），用于首页/管理页即时展示
+    - 不传日期则返回实时榜单：读取生效指针指向的批次快照（影子发布，切换前始终是上一批次）；
+      尚无生效指针的榜单回落到 Ranking 表，用于首页/管理页即时展示
+    - 榜单行与应用信息单条 JOIN 查询，省内 / 公司筛选与分页均在 SQL 中完成
+    - view=compact 时只查询名次、标签、指标与应用 ID / 名称 / 公司，响应为 RankingItemCompact 列表
+    - 响应体按数据版本号缓存在进程内，同步 / 发布提交后失效；ETag 由版本号与查询参数计算，
+      If-None-Match 命中时不查库直接返回 304
     """
     scope_id = resolve_ranking_scope_id(ranking_type=ranking_type, ranking_config_id=ranking_config_id)
 
-    def _to_ranking_item(
-        *,
-        app: App,
-        ranking_config_id_value: str | None,
-        position: int,
-        tag: str,
-        score: int,
-        metric_type: str,
-        value_dimension: str,
-        usage_30d: int,
-        declared_at: date,
-        updated_at: datetime | None = None,
-    ) -> dict:
-        return {
-            "ranking_config_id": ranking_config_id_value,
-            "position": position,
-            "tag": tag,
-            "score": score,
-            "likes": None,
-            "metric_type": metric_type,
-            "value_dimension": value_dimension,
-            "usage_30d": usage_30d,
-            "declared_at": declared_at,
-            "updated_at": updated_at,
-            "app": app,
-        }
+    def _build() -> bytes:
+        if not period_date:
+            return render_live_ranking(db, scope_id, company=company, limit=limit, offset=offset, view=view)
+        # 查询指定日期的历史榜单
+        selected_run_id = resolve_latest_run_id(db, scope_id, period_date)
+        historical_query = (
+            db.query(HistoricalRanking, App)
+            .join(App, App.id == HistoricalRanking.app_id)
+            .filter(HistoricalRanking.period_date == period_date)
+            .filter(HistoricalRanking.ranking_config_id == scope_id)
+        )
+        if selected_run_id is not None:
+            historical_query = historical_query.filter(HistoricalRanking.run_id == selected_run_id)
+        else:
+            historical_query = historical_query.filter(HistoricalRanking.run_id.is_(None))
+        historical_rows = apply_ranking_app_filters(
+            historical_query, HistoricalRanking.position, company=company, limit=limit, offset=offset, view=view
+        ).all()
+        if view == "compact":
+            return dump_compact_ranking_rows(historical_rows)
 
-    try:
-        if period_date:
-            # 查询指定日期的历史榜单
-            selected_run_id = resolve_latest_run_id(db, scope_id, period_date)
-            historical_query = (
-                db.query(HistoricalRanking)
-                .filter(HistoricalRanking.period_date == period_date)
-                .filter(HistoricalRanking.ranking_config_id == scope_id)
-            )
-            if selected_run_id is not None:
-                historical_query = historical_query.filter(HistoricalRanking.run_id == selected_run_id)
-            else:
-                historical_query = historical_query.filter(HistoricalRanking.run_id.is_(None))
-
-            historical_rankings = historical_query.order_by(HistoricalRanking.position).all()
-            result = []
-            for hr in historical_rankings:
-                app = db.query(App).filter(App.id == hr.app_id).first()
-                if app and app.section == "province":
-                    if company and (app.company or app.org) != company:
-                        continue
-                    result.append(
-                        _to_ranking_item(
-                            app=app,
-                            ranking_config_id_value=hr.ranking_config_id,
-                            position=hr.position,
-                            tag=hr.tag,
-                            score=hr.score,
-                            metric_type=hr.metric_type,
-                            value_dimension=hr.value_dimension,
-                            usage_30d=hr.usage_30d,
-                            declared_at=hr.period_date,
-                            updated_at=getattr(hr, "updated_at", None),
-                        )
-                    )
-            return result
-        # 查询实时榜单（Ranking 表）
-        realtime_query = (
-            db.query(Ranking)
-            .filter(
-                Ranking.ranking_config_id == scope_id
+        return dump_ranking_items([
+            ranking_item_payload(
+                app=app,
+                ranking_config_id_value=hr.ranking_config_id,
+                position=hr.position,
+                tag=hr.tag,
+                score=hr.score,
+                metric_type=hr.metric_type,
+                value_dimension=hr.value_dimension,
+                usage_30d=hr.usage_30d,
+                declared_at=hr.period_date,
+                updated_at=getattr(hr, "updated_at", None),
+                snapshot=hr,
             )
-        )
+            for hr, app in historical_rows
+        ])
 
-        realtime_rows = realtime_query.order_by(Ranking.position).all()
-        result = []
-        for row in realtime_rows:
-            app = db.query(App).filter(App.id == row.app_id).first()
-            if app and app.section == "province":
-                if company and (app.company or app.org) != company:
-                    continue
-                result.append(
-                    _to_ranking_item(
-                        app=app,
-                        ranking_config_id_value=row.ranking_config_id,
-                        position=row.position,
-                        tag=row.tag,
-                        score=row.score,
-                        metric_type=row.metric_type,
-                        value_dimension=row.value_dimension,
-                        usage_30d=row.usage_30d,
-                        declared_at=row.declared_at,
-                        updated_at=row.updated_at,
-                    )
-                )
-        return result
-    except Exception as e:
-        # 数据库表结构可能不完整，返回空列表
-        print(f"Error in list_rankings: {e}")
-        return []
+    try:
+        return cached_ranking_response(
+            ranking_cache_key(
+                scope_id, company=company, period_date=period_date, limit=limit, offset=offset, view=view
+            ),
+            _build,
+            headers=cache_headers,
+        )
+    except Exception:
+        logger.exception("list_rankings failed")
+        # 数据库不可用 / 超时：实时榜单回落到最近一次发布导出的静态文件
+        static_body = None if period_date else read_static_ranking(scope_id, company)
+        if static_body is not None:
+            if offset or limit is not None or view == "compact":
+                items = _json.loads(static_body)[offset:None if limit is None else offset + limit]
+                if view == "compact":
+                    items = compact_ranking_items(items)
+                static_body = _json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            return Response(
+                content=static_body,
+                media_type="application/json",
+                headers={"X-Ranking-Source": "static", "Cache-Control": "no-store"},
+            )
+        # 数据库表结构可能不完整，返回空列表；不得带上缓存头，否则恢复后 304 仍会复用这份空榜单
+        return Response(content=b"[]", media_type="application/json", headers={"Cache-Control": "no-store"})
 
 
 @router.get(f"/recommendations", response_model=list[Recommendation])
@@ -164,7 +184,11 @@ def recommendations():
     ]
 
 
-@router.get(f"/stats", response_model=Stats)
+@router.get(
+    f"/stats",
+    response_model=Stats,
+    dependencies=[Depends(public_read_cache("stats", APPS_DATA_VERSION, SUBMISSIONS_DATA_VERSION))],
+)
 def app_stats(db: Session = Depends(get_db)):
     """
     获取申报统计数据
@@ -173,20 +197,12 @@ def app_stats(db: Session = Depends(get_db)):
     - approved_period: 数据库中状态为"approved"的申报数量
     - total_apps: 数据库中所有应用的数量
     """
-    pending = db.query(Submission).filter(Submission.status == "pending").count()
-    approved_period = db.query(Submission).filter(Submission.status == "approved").count()
-    total_apps = db.query(App).count()
-    return Stats(pending=pending, approved_period=approved_period, total_apps=total_apps)
+    return public_stats(db)
 
 
 @router.get(f"/rules", response_model=list[RuleLink])
 def rules():
-    base = settings.oa_rule_base_url.rstrip("/")
-    return [
-        RuleLink(title="如何申报应用", href=f"{base}/ai-app-square/rules/submission"),
-        RuleLink(title="上榜评选标准", href=f"{base}/ai-app-square/rules/ranking"),
-        RuleLink(title="API接入指南", href=f"{base}/ai-app-square/rules/api-integration"),
-    ]
+    return rule_links()
 
 
 @router.get(f"/rankings/historical", response_model=list[HistoricalRankingOut])
@@ -200,58 +216,61 @@ def list_historical_rankings(
     """
     获取历史榜单数据（默认返回最新发布批次的只读快照）
     """
-    try:
-        scope_id = resolve_ranking_scope_id(ranking_type=ranking_type)
-        query = db.query(HistoricalRanking).filter(
+    scope_id = resolve_ranking_scope_id(ranking_type=ranking_type)
+
+    def _build() -> bytes:
+        # 列查询，不构造 ORM 实体；应用当前公司 / 部门按 app_id 批量取一次，不逐行懒加载 row.app
+        query = db.query(*HISTORICAL_RANKING_COLUMNS).filter(
             HistoricalRanking.ranking_config_id == scope_id
         )
         target_date = period_date
         if target_date is None:
             latest_date_row = (
-                db.query(HistoricalRanking.period_date)
-                .filter(HistoricalRanking.ranking_config_id == scope_id)
-                .order_by(HistoricalRanking.period_date.desc())
+                db.query(RankingRun.period_date)
+                .filter(RankingRun.ranking_config_id == scope_id)
+                .order_by(RankingRun.period_date.desc())
                 .first()
             )
             if latest_date_row is None:
-                return []
+                return b"[]"
             target_date = latest_date_row[0]
 
         query = query.filter(HistoricalRanking.period_date == target_date)
         if company:
             query = query.filter(HistoricalRanking.app_org == company)
-        selected_run_id = run_id if run_id is not None else resolve_latest_run_id(db, scope_id, target_date)
+        if run_id is not None:
+            selected_run_id = resolve_snapshot_run_id(db, scope_id, target_date, run_id)
+        else:
+            selected_run_id = resolve_latest_run_id(db, scope_id, target_date)
         if selected_run_id is not None:
             query = query.filter(HistoricalRanking.run_id == selected_run_id)
         else:
             query = query.filter(HistoricalRanking.run_id.is_(None))
         rows = query.order_by(HistoricalRanking.position).all()
-        result: list[HistoricalRankingOut] = []
+        if not rows:
+            return b"[]"
+        current_apps = {
+            app_id: (company, department)
+            for app_id, company, department in db.query(App.id, App.company, App.department)
+            .filter(App.id.in_({row.app_id for row in rows}))
+            .all()
+        }
+        result = []
         for row in rows:
-            app_company = row.app.company if row.app else row.app_org
-            app_department = row.app.department if row.app else ""
-            result.append(
-                HistoricalRankingOut(
-                    id=row.id,
-                    ranking_type=row.ranking_config_id,
-                    ranking_config_id=row.ranking_config_id,
-                    period_date=row.period_date,
-                    run_id=row.run_id,
-                    position=row.position,
-                    app_id=row.app_id,
-                    app_name=row.app_name,
-                    app_org=row.app_org,
-                    company=app_company or row.app_org,
-                    department=app_department or "",
-                    tag=row.tag,
-                    score=row.score,
-                    metric_type=row.metric_type,
-                    value_dimension=row.value_dimension,
-                    usage_30d=row.usage_30d,
-                    created_at=row.created_at,
-                )
-            )
-        return result
+            app_company, app_department = current_apps.get(row.app_id, (row.app_org, ""))
+            result.append({
+                **row._mapping,
+                "ranking_type": row.ranking_config_id,
+                "company": app_company or row.app_org,
+                "department": app_department or "",
+            })
+        return HISTORICAL_RANKINGS_ADAPTER.dump_json(HISTORICAL_RANKINGS_ADAPTER.validate_python(result))
+
+    try:
+        return cached_ranking_response(
+            ("historical", scope_id, company, period_date, run_id),
+            _build,
+        )
     except Exception as e:
         return []
 
@@ -262,24 +281,85 @@ def list_available_ranking_dates(
     db: Session = Depends(get_db)
 ):
     """
-    获取可用的榜单日期列表
+    获取可用的榜单日期列表（读取 ranking_runs 目录，按索引去重）
     """
-    try:
-        scope_id = resolve_ranking_scope_id(ranking_type=ranking_type)
+    scope_id = resolve_ranking_scope_id(ranking_type=ranking_type)
+
+    def _build() -> bytes:
         dates = (
-            db.query(HistoricalRanking.period_date)
+            db.query(RankingRun.period_date)
             .filter(
-                HistoricalRanking.ranking_config_id == scope_id
+                RankingRun.ranking_config_id == scope_id
             )
             .distinct()
-            .order_by(HistoricalRanking.period_date.desc())
+            .order_by(RankingRun.period_date.desc())
             .all()
         )
-        return {"dates": [d[0].isoformat() for d in dates]}
+        return _json.dumps(
+            {"dates": [d[0].isoformat() for d in dates]},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    try:
+        return cached_ranking_response(("available-dates", scope_id), _build)
     except Exception as e:
         return {"dates": []}
 
 
+@router.get(f"/rankings/diff", response_model=RankingDiff)
+def diff_rankings(
+    from_run: str = Query(..., description="基准批次 run_id"),
+    to_run: str = Query(..., description="对比批次 run_id"),
+    ranking_type: str = "excellent",
+    ranking_config_id: str | None = Query(default=None, description="榜单配置ID"),
+    cache_headers: dict[str, str] = Depends(public_read_cache("rankings_diff", *RANKING_BODY_VERSION_NAMES)),
+    db: Session = Depends(get_db),
+):
+    """
+    对比同一榜单任意两个批次的快照：逐应用返回两批次名次 / 分数及变化，
+    跌出的应用标记为 dropped。批次快照不可变，结果按 rankings 数据版本缓存在进程内。
+    """
+    scope_id = resolve_ranking_scope_id(ranking_type=ranking_type, ranking_config_id=ranking_config_id)
+    body = cached_ranking_body(
+        ("rankings_diff", scope_id, from_run, to_run),
+        lambda: render_ranking_diff(db, scope_id, from_run, to_run) or b"null",
+    )
+    if body == b"null":
+        raise HTTPException(
+            status_code=404,
+            detail=structured_error_detail(code="ranking_run_not_found", message="榜单批次不存在"),
+        )
+    return Response(content=body, media_type="application/json", headers=cache_headers)
+
+
+@router.get(f"/rankings/cache-stats")
+def get_ranking_cache_stats(_: User | None = Depends(require_admin_token)):
+    """榜单读缓存命中 / 未命中 / 淘汰计数，供监控采集。"""
+    return ranking_cache_stats()
+
+
+@router.post(f"/rankings/simulate", response_model=RankingSimulationOut)
+def simulate_ranking_weights(
+    payload: RankingSimulationRequest,
+    _: User | None = Depends(require_admin_token),
+    db: Session = Depends(get_db),
+):
+    """
+    榜单权重试算：按候选维度权重 / 应用参与设置在内存中重算名次，返回榜单与名次变化。
+    只读缓存的评分矩阵，不写 rankings / historical_rankings / app_dimension_scores，也不产生批次。
+    """
+    started = perf_counter()
+    base, cache_hit = get_simulation_base(db, payload.ranking_config_id)
+    result = simulate_rankings(
+        base,
+        dimensions=None if payload.dimensions is None else [(d.dim_id, d.weight) for d in payload.dimensions],
+        app_settings=payload.app_settings,
+        limit=payload.limit,
+    )
+    return {**result, "cache_hit": cache_hit, "elapsed_ms": round((perf_counter() - started) * 1000, 2)}
+
+
 @router.post(f"/rankings/sync")
 def sync_rankings(
     run_id: str | None = Query(default=None, description="可选发布批次ID；不传则自动生成 UUID"),
@@ -287,68 +367,48 @@ def sync_rankings(
     db: Session = Depends(get_db)
 ):
     """
-    同步排行榜数据，确保集团应用和省内应用信息保持一致
+    同步排行榜数据，确保集团应用和省内应用信息保持一致。
+    多实例并发时持集群锁串行执行；排队期间已有其他请求完成全量同步则直接复用其结果。
     """
     try:
-        updated_count, generated_run_id = sync_rankings_service(
-            db,
-            run_id=run_id,
-            actor=ranking_audit_actor(admin_user),
-        )
-        return {"message": "排行榜数据同步成功", "updated_count": updated_count, "run_id": generated_run_id}
+        requested_at = datetime.utcnow()
+        actor = ranking_audit_actor(admin_user)
+        with ranking_sync_guard(db, actor) as lock:
+            job, joined = run_locked_full_sync(
+                db,
+                lock,
+                MANUAL_SYNC_TRIGGER,
+                actor,
+                requested_at=requested_at,
+                run_id=run_id,
+                joinable_triggers=(MANUAL_SYNC_TRIGGER, PUBLISH_SYNC_TRIGGER),
+            )
+        return {
+            "message": "排行榜数据同步成功",
+            "updated_count": job.updated_count,
+            "run_id": job.run_id,
+            "sync_job_id": job.id,
+            "joined": joined,
+        }
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as exc:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"同步失败: {str(exc)}") from exc
 
 
-def validate_publish_preconditions(db: Session) -> dict[str, int]:
-    active_configs = db.query(RankingConfig).filter(RankingConfig.is_active.is_(True)).all()
-    if not active_configs:
-        raise HTTPException(
-            status_code=409,
-            detail=structured_error_detail(
-                code="publish_precheck_failed",
-                message="无可发布榜单：请先启用至少一个榜单配置",
-            ),
-        )
-
-    config_ids = [cfg.id for cfg in active_configs]
-    enabled_settings = (
-        db.query(AppRankingSetting)
-        .filter(
-            AppRankingSetting.ranking_config_id.in_(config_ids),
-            AppRankingSetting.is_enabled.is_(True),
-        )
-        .count()
-    )
-    if enabled_settings == 0:
-        raise HTTPException(
-            status_code=409,
-            detail=structured_error_detail(
-                code="publish_precheck_failed",
-                message="无可发布应用：请先在“应用参与”中启用至少一个应用",
-            ),
-        )
-
-    invalid_configs = []
-    for config in active_configs:
-        configured_dims = _collect_config_dimension_ids(config)
-        if not configured_dims:
-            invalid_configs.append(config.id)
-    if invalid_configs:
-        raise HTTPException(
-            status_code=409,
-            detail=structured_error_detail(
-                code="publish_precheck_failed",
-                message="存在未配置维度的启用榜单，请先完善榜单配置",
-                field_errors=[{"field": "ranking_config_id", "message": cid} for cid in invalid_configs],
-            ),
-        )
-
-    return {
-        "active_configs": len(active_configs),
-        "enabled_settings": enabled_settings,
-    }
+@router.get(f"/rankings/sync-jobs/{{job_id}}", response_model=RankingSyncJobOut)
+def get_ranking_sync_job(
+    job_id: int,
+    _: User | None = Depends(require_admin_token),
+    db: Session = Depends(get_db),
+):
+    """查询链路变更触发的榜单同步任务状态（queued / running / done / failed）。"""
+    job = db.query(RankingSyncJob).filter(RankingSyncJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="同步任务不存在")
+    return serialize_sync_job(job)
 
 
 @router.post(f"/rankings/publish")
@@ -357,31 +417,54 @@ def publish_rankings(
     admin_user: User | None = Depends(require_admin_token),
     db: Session = Depends(get_db),
 ):
-    """榜单发布入口：预校验 + 同步 + 发布审计。"""
+    """
+    榜单发布入口：预校验 + 同步 + 发布审计。
+    同步与发布标记在集群锁内完成；排队期间已有其他发布完成时复用其批次，不重复发布。
+    """
     try:
+        requested_at = datetime.utcnow()
         checked = validate_publish_preconditions(db)
         actor = ranking_audit_actor(admin_user)
-        updated_count, generated_run_id = sync_rankings_service(db, run_id=run_id, actor=actor)
-        write_ranking_audit_log(
-            db,
-            action="ranking_publish_completed",
-            ranking_config_id=None,
-            period_date=datetime.utcnow().date(),
-            run_id=generated_run_id,
-            actor=actor,
-            payload_summary=(
-                f"active_configs={checked['active_configs']},"
-                f"enabled_settings={checked['enabled_settings']},"
-                f"updated_count={updated_count}"
-            ),
-        )
-        db.commit()
+        with ranking_sync_guard(db, actor) as lock:
+            job, joined = run_locked_full_sync(
+                db,
+                lock,
+                PUBLISH_SYNC_TRIGGER,
+                actor,
+                requested_at=requested_at,
+                run_id=run_id,
+                joinable_triggers=(PUBLISH_SYNC_TRIGGER,),
+            )
+            if not joined:
+                mark_ranking_runs_published(db, job.run_id)
+                write_ranking_audit_log(
+                    db,
+                    action="ranking_publish_completed",
+                    ranking_config_id=None,
+                    period_date=datetime.utcnow().date(),
+                    run_id=job.run_id,
+                    actor=actor,
+                    payload_summary=(
+                        f"active_configs={checked['active_configs']},"
+                        f"enabled_settings={checked['enabled_settings']},"
+                        f"updated_count={job.updated_count},"
+                        f"sync_job_id={job.id},lock_wait_ms={lock.wait_ms:.1f}"
+                    ),
+                )
+                db.commit()
+                # 仍在集群锁内导出，多次发布的静态快照按发布顺序落盘
+                static_export = publish_ranking_static_files(db, job.run_id)
+            else:
+                static_export = None
         return {
             "message": "榜单发布成功",
-            "updated_count": updated_count,
-            "run_id": generated_run_id,
+            "updated_count": job.updated_count,
+            "run_id": job.run_id,
             "published_date": datetime.utcnow().date().isoformat(),
             "checked": checked,
+            "sync_job_id": job.id,
+            "joined": joined,
+            "static_export": static_export,
         }
     except HTTPException:
         db.rollback()
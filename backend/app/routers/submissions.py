@@ -6,6 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import FileResponse
 from PIL import Image
+from pydantic import TypeAdapter
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
@@ -16,25 +17,34 @@ from ..identity import get_identity_provider
 from ..models import *
 from ..schemas import *
 from ..dependencies import *
+from ..services.json_stream_service import json_array_response, schema_columns
 from ..services.ranking_service import *
 from ..services.submission_service import *
 from ..venv_utils import venv_reader
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix=settings.api_prefix)
 
+SUBMISSION_OUT_COLUMNS = schema_columns(Submission, SubmissionOut)
+SUBMISSIONS_ADAPTER = TypeAdapter(list[SubmissionOut])
+
+
 @router.get(f"/submissions", response_model=list[SubmissionOut])
 def list_submissions(
     status: str | None = Query(default=None, description="按状态筛选：pending, approved, rejected, withdrawn"),
+    stream: bool = Query(default=False, description="列查询 + 流式序列化的快速路径"),
     _: None = Depends(require_admin_token),
     db: Session = Depends(get_db)
 ):
     """
     获取申报列表
     """
-    query = db.query(Submission)
+    query = db.query(*SUBMISSION_OUT_COLUMNS) if stream else db.query(Submission)
     if status:
         query = query.filter(Submission.status == status)
-    return query.order_by(Submission.created_at.desc()).all()
+    query = query.order_by(Submission.created_at.desc())
+    if stream:
+        return json_array_response(query.all(), SUBMISSIONS_ADAPTER)
+    return query.all()
 
 
 @router.post(f"/submissions", response_model=SubmissionOut)
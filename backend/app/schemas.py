@@ -5,6 +5,8 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from .scoring_rules import parse_scoring_rule
+
 
 T = TypeVar("T")
 
@@ -23,6 +25,21 @@ class AppBase(BaseModel):
     release_date: date
 
 
+class AppSearchHit(BaseModel):
+    """关键词检索命中信息：相关度与各字段高亮区间 [起, 止)"""
+    relevance: float
+    highlights: dict[str, list[list[int]]] = Field(default_factory=dict)
+
+
+class AppSuggestion(BaseModel):
+    """应用名称联想候选"""
+    id: int
+    name: str
+    company: str = ""
+    section: str
+    category: str
+
+
 class AppDetail(AppBase):
     api_open: bool
     difficulty: str
@@ -47,13 +64,59 @@ class AppDetail(AppBase):
     ranking_weight: float | None = None
     ranking_tags: str | None = None
     last_ranking_update: datetime | None = None
+    # 仅带关键词 q 检索时返回
+    search_hit: AppSearchHit | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class AppFacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class AppFacets(BaseModel):
+    """应用目录分面计数；各分面按「排除自身筛选」口径统计"""
+    total: int
+    section: list[AppFacetCount] = Field(default_factory=list)
+    category: list[AppFacetCount] = Field(default_factory=list)
+    company: list[AppFacetCount] = Field(default_factory=list)
+    status: list[AppFacetCount] = Field(default_factory=list)
+
+
+class AppCompact(BaseModel):
+    """应用目录卡片精简视图（view=compact）：只含卡片展示字段，简介按字数截断"""
+    id: int
+    name: str
+    org: str
+    company: str = ""
+    department: str = ""
+    section: str
+    category: str
+    description: str
+    status: str
+    monthly_calls: float
+    release_date: date
+    cover_image_url: str = ""
+
+
+class AppListWithFacets(BaseModel):
+    items: list[AppDetail]
+    facets: AppFacets
+
+
+class AppCompactListWithFacets(BaseModel):
+    items: list[AppCompact]
+    facets: AppFacets
+
+
 class RankingItem(BaseModel):
     ranking_config_id: str | None = None
     position: int
+    company_position: int | None = None  # 公司内名次（实时榜单快照）
+    previous_position: int | None = None  # 基准批次（更早日期最近一次发布）中的名次
+    position_delta: int | None = None  # 基准名次 - 当前名次，正数为上升
+    movement: str | None = None  # new | up | down | same
     tag: str
     score: int
     likes: int | None
@@ -65,6 +128,27 @@ class RankingItem(BaseModel):
     app: AppBase
 
 
+class RankingAppCompact(BaseModel):
+    id: int
+    name: str
+    company: str  # 展示口径：company 为空时为 org
+
+
+class RankingItemCompact(BaseModel):
+    """榜单条目精简视图（view=compact）：首页榜单卡片所需的名次、标签、指标与应用名"""
+    position: int
+    company_position: int | None = None
+    previous_position: int | None = None
+    position_delta: int | None = None
+    movement: str | None = None
+    tag: str
+    score: int
+    metric_type: str
+    value_dimension: str
+    usage_30d: int
+    app: RankingAppCompact
+
+
 class Recommendation(BaseModel):
     title: str
     scene: str
@@ -218,6 +302,17 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page_size: int
     total: int
     total_pages: int
+    # include_total=false 时 total 取 information_schema 估算值
+    total_is_exact: bool = True
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """游标（keyset）分页：next_cursor 为空表示已到末页；total 仅在 include_total=true 或可估算时返回"""
+    items: list[T]
+    page_size: int
+    next_cursor: str | None = None
+    total: int | None = None
+    total_is_exact: bool = False
 
 
 class SubmissionCreate(BaseModel):
@@ -356,9 +451,16 @@ class RankingDimensionBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: str = Field(..., min_length=1)
     calculation_method: str = Field(..., min_length=1)
+    scoring_rule: dict[str, Any] | None = None
     weight: float = Field(..., ge=0.1, le=10.0)
     is_active: bool = True
 
+    @field_validator("scoring_rule", mode="before")
+    @classmethod
+    def _parse_scoring_rule(cls, v: Any) -> dict[str, Any] | None:
+        """ORM 中为 JSON 文本，请求中为对象；两者都按声明式规则校验。"""
+        return parse_scoring_rule(v)
+
 
 class RankingDimensionCreate(RankingDimensionBase):
     pass
@@ -368,9 +470,15 @@ class RankingDimensionUpdate(BaseModel):
     name: str | None = Field(None, min_length=1, max_length=100)
     description: str | None = Field(None, min_length=1)
     calculation_method: str | None = Field(None, min_length=1)
+    scoring_rule: dict[str, Any] | None = None
     weight: float | None = Field(None, ge=0.1, le=10.0)
     is_active: bool | None = None
 
+    @field_validator("scoring_rule", mode="before")
+    @classmethod
+    def _parse_scoring_rule(cls, v: Any) -> dict[str, Any] | None:
+        return parse_scoring_rule(v)
+
 
 class RankingDimensionOut(RankingDimensionBase):
     id: int
@@ -405,6 +513,83 @@ class RankingAuditLogOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RankingSyncJobOut(BaseModel):
+    """榜单同步任务状态（供前端轮询）"""
+    id: int
+    status: str
+    triggers: list[str]
+    scope: str
+    coalesced_count: int
+    actor: str
+    run_id: str
+    updated_count: int
+    timings_summary: str
+    error_message: str
+    not_before: datetime
+    created_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+    queue_wait_ms: int | None
+    duration_ms: int | None
+
+
+class RankingSimulationDimension(BaseModel):
+    """试算用维度权重"""
+    dim_id: int = Field(..., ge=1)
+    weight: float = Field(..., ge=0.0, le=100.0)
+
+
+class RankingSimulationSetting(BaseModel):
+    """试算用应用参与设置，未给出的字段沿用当前值"""
+    app_id: int = Field(..., ge=1)
+    is_enabled: bool | None = None
+    weight_factor: float | None = Field(None, ge=0.1, le=10.0)
+
+
+class RankingSimulationRequest(BaseModel):
+    """榜单权重试算请求（只读，不落库）"""
+    ranking_config_id: str = Field(..., min_length=1, max_length=50)
+    dimensions: list[RankingSimulationDimension] | None = Field(
+        default=None, description="整体替换榜单维度配置；不传沿用当前配置"
+    )
+    app_settings: list[RankingSimulationSetting] = Field(default_factory=list, max_length=10000)
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class RankingSimulationItem(BaseModel):
+    position: int
+    app_id: int
+    app_name: str
+    app_org: str
+    score: int
+    baseline_position: int | None = None
+    baseline_score: int | None = None
+    position_delta: int | None = None
+
+
+class RankingSimulationDropout(BaseModel):
+    app_id: int
+    app_name: str
+    app_org: str
+    baseline_position: int
+    baseline_score: int
+
+
+class RankingSimulationOut(BaseModel):
+    """试算结果：名次变化以当前配置重算的基线为参照，正数表示上升"""
+    ranking_config_id: str
+    period_date: date
+    participant_count: int
+    baseline_participant_count: int
+    moved_count: int
+    entered_count: int
+    items: list[RankingSimulationItem]
+    dropped: list[RankingSimulationDropout]
+    cache_hit: bool
+    matrix_build_ms: float
+    elapsed_ms: float
+
+
 class AppDimensionScoreOut(BaseModel):
     """应用维度评分输出"""
     id: int
@@ -426,6 +611,72 @@ class DimensionScoreUpdate(BaseModel):
     score: int = Field(..., ge=0, le=100)
 
 
+class RankingDiffRun(BaseModel):
+    run_id: str
+    period_date: date
+
+
+class RankingDiffItem(BaseModel):
+    """单个应用在两个批次间的名次 / 分数变化；movement 为 new | up | down | same | dropped"""
+    app_id: int
+    app_name: str
+    app_org: str
+    from_position: int | None = None
+    to_position: int | None = None
+    from_score: int | None = None
+    to_score: int | None = None
+    position_delta: int | None = None  # from_position - to_position，正数为上升
+    score_delta: int | None = None
+    movement: str
+
+
+class RankingDiff(BaseModel):
+    ranking_config_id: str
+    from_run: RankingDiffRun
+    to_run: RankingDiffRun
+    items: list[RankingDiffItem]
+
+
+class AppProfilePosition(BaseModel):
+    """应用在某个启用榜单中的当前名次；未上榜时名次 / 分数为空"""
+    ranking_config_id: str
+    ranking_config_name: str
+    position: int | None = None
+    score: int | None = None
+    tag: str | None = None
+    period_date: date | None = None
+
+
+class AppProfileDimensionScore(BaseModel):
+    ranking_config_id: str | None = None
+    dimension_id: int
+    dimension_name: str
+    score: int
+    weight: float
+
+
+class AppProfileHistoryPoint(BaseModel):
+    period_date: date
+    position: int
+    score: int
+
+
+class AppProfileHistory(BaseModel):
+    """某榜单的名次 / 分数走势（每日取当日最新批次，超过点数上限时降采样）"""
+    ranking_config_id: str
+    total_points: int
+    points: list[AppProfileHistoryPoint]
+
+
+class AppProfile(BaseModel):
+    """应用详情页聚合：应用信息、各启用榜单当前名次、维度评分明细与历史走势"""
+    app: AppDetail
+    positions: list[AppProfilePosition]
+    dimension_period_date: date | None = None
+    dimension_scores: list[AppProfileDimensionScore]
+    history: list[AppProfileHistory]
+
+
 class HistoricalRankingOut(BaseModel):
     """历史榜单输出"""
     id: int
@@ -585,6 +836,8 @@ class AppRankingSettingSaveResponse(BaseModel):
     updated_dimensions: int
     synced: int
     run_id: str
+    sync_job_id: int | None = None
+    sync_status: str | None = None
 
 
 
@@ -599,3 +852,14 @@ class RankingConfigWithDimensions(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+
+
+class HomeBootstrap(BaseModel):
+    """首页聚合响应（GET /api/home）；degraded 列出读取失败而置空的部分"""
+    rankings: dict[str, list[RankingItem] | list[RankingItemCompact] | None]
+    ranking_configs: list[RankingConfigOut] | None
+    stats: Stats | None
+    enums: dict[str, list[str]]
+    rules: list[RuleLink]
+    apps: list[AppDetail] | list[AppCompact] | None
+    degraded: list[str] = Field(default_factory=list)
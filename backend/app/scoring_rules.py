@@ -0,0 +1,161 @@
+"""声明式维度评分规则的校验——只依赖标准库，schemas 与 services/scoring_engine 共用。
+
+- `validate_scoring_rule` 校验规则 JSON 并返回 (规则类型, 构造参数)，由评分引擎据此编译规则对象
+- 规则中的整数（分值 / 上下限）与计算结果都限制在 ±SCORE_LIMIT 内，与 `score` 列（INT）一致
+"""
+
+import json
+import math
+from typing import Any
+
+DEFAULT_DIMENSION_SCORE = 50
+DEFAULT_DIMENSION_DETAIL = "默认评分50分"
+SCORE_LIMIT = 2**31 - 1
+
+# 规则可引用的 App 字段（白名单），值为详情文案中的中文名
+NUMERIC_APP_FIELDS = {
+    "monthly_calls": "月调用量",
+    "last_month_calls": "上月调用量",
+    "new_users_count": "新增用户数",
+    "search_count": "搜索次数",
+    "share_count": "分享次数",
+    "favorite_count": "收藏次数",
+}
+CATEGORICAL_APP_FIELDS = {
+    "effectiveness_type": "成效类型",
+    "difficulty": "难度等级",
+    "status": "应用状态",
+    "category": "应用分类",
+    "section": "应用归属",
+}
+SCORING_RULE_TYPES = ("lookup", "linear", "growth_ratio", "constant")
+
+
+def _require_int(spec: dict, key: str, default: Any = ...) -> int | None:
+    value = spec.get(key, default)
+    if value is ...:
+        raise ValueError(f"scoring_rule.{key} is required")
+    if value is None and default is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"scoring_rule.{key} must be an integer")
+    if abs(value) > SCORE_LIMIT:
+        raise ValueError(f"scoring_rule.{key} must be within ±{SCORE_LIMIT}")
+    return value
+
+
+def _require_number(spec: dict, key: str, default: float) -> float:
+    value = spec.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"scoring_rule.{key} must be a number")
+    return value
+
+
+def _require_field(value: Any, key: str, fields: dict[str, str]) -> str:
+    if value not in fields:
+        raise ValueError(f"scoring_rule.{key} must be one of: {', '.join(fields)}")
+    return value
+
+
+def _require_template(spec: dict, key: str, default: str, sample: dict[str, Any]) -> str:
+    template = spec.get(key, default)
+    if not isinstance(template, str) or not template:
+        raise ValueError(f"scoring_rule.{key} must be a non-empty string")
+    try:
+        template.format(**sample)
+    except (KeyError, IndexError, ValueError) as exc:
+        raise ValueError(f"scoring_rule.{key} has invalid placeholder: {exc}") from exc
+    return template
+
+
+def validate_scoring_rule(spec: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """校验规则 JSON，返回 (规则类型, 规则对象构造参数)；非法规则抛 ValueError。"""
+    if not isinstance(spec, dict):
+        raise ValueError("scoring_rule must be an object")
+    rule_type = spec.get("type")
+
+    if rule_type == "constant":
+        score = _require_int(spec, "score")
+        return rule_type, {
+            "score": score,
+            "detail": _require_template(spec, "detail", f"固定评分{score}分", {"score": score}),
+        }
+
+    if rule_type == "lookup":
+        field = _require_field(spec.get("field"), "field", CATEGORICAL_APP_FIELDS)
+        scores = spec.get("scores")
+        if not isinstance(scores, dict) or not scores:
+            raise ValueError("scoring_rule.scores must be a non-empty object")
+        for value in scores.values():
+            if isinstance(value, bool) or not isinstance(value, int) or abs(value) > SCORE_LIMIT:
+                raise ValueError(f"scoring_rule.scores values must be integers within ±{SCORE_LIMIT}")
+        details = spec.get("details", {})
+        if not isinstance(details, dict):
+            raise ValueError("scoring_rule.details must be an object")
+        sample = {"value": "", "score": 0}
+        for key in details:
+            _require_template(details, key, "", sample)
+        default_detail = _require_template(
+            spec, "default_detail", f"{CATEGORICAL_APP_FIELDS[field]}为{{value}}，获得{{score}}分", sample,
+        )
+        return rule_type, {
+            "field": field,
+            "table": dict(scores),
+            "default": _require_int(spec, "default"),
+            "details": dict(details),
+            "default_detail": default_detail,
+        }
+
+    if rule_type == "linear":
+        terms = spec.get("terms")
+        if not isinstance(terms, dict) or not terms:
+            raise ValueError("scoring_rule.terms must be a non-empty object")
+        for field in terms:
+            _require_field(field, "terms", NUMERIC_APP_FIELDS)
+            _require_number(terms, field, 1)
+        divisor = _require_number(spec, "divisor", 1)
+        if divisor == 0:
+            raise ValueError("scoring_rule.divisor must not be 0")
+        labels = "、".join(NUMERIC_APP_FIELDS[field] for field in terms)
+        sample = {"score": 0, **dict.fromkeys(terms, 0)}
+        return rule_type, {
+            "terms": dict(terms),
+            "divisor": divisor,
+            "lower": _require_int(spec, "min", None),
+            "upper": _require_int(spec, "max", None),
+            "detail": _require_template(spec, "detail", f"基于{labels}计算，获得{{score}}分", sample),
+        }
+
+    if rule_type == "growth_ratio":
+        field = _require_field(spec.get("field", "monthly_calls"), "field", NUMERIC_APP_FIELDS)
+        baseline = _require_field(spec.get("baseline", "last_month_calls"), "baseline", NUMERIC_APP_FIELDS)
+        sample = {"score": 0, "rate": 0.0, field: 0, baseline: 0}
+        return rule_type, {
+            "field": field,
+            "baseline": baseline,
+            "scale": _require_number(spec, "scale", 100),
+            "lower": _require_int(spec, "min", None),
+            "upper": _require_int(spec, "max", None),
+            "no_baseline_score": _require_int(spec, "no_baseline_score", DEFAULT_DIMENSION_SCORE),
+            "detail": _require_template(
+                spec, "detail", f"{NUMERIC_APP_FIELDS[field]}环比增长{{rate:.1%}}，获得{{score}}分", sample,
+            ),
+            "no_baseline_detail": _require_template(
+                spec, "no_baseline_detail", f"无{NUMERIC_APP_FIELDS[baseline]}基线，获得{{score}}分", sample,
+            ),
+        }
+
+    raise ValueError(f"scoring_rule.type must be one of: {', '.join(SCORING_RULE_TYPES)}")
+
+
+def parse_scoring_rule(raw: Any) -> dict[str, Any] | None:
+    """接受 dict / JSON 文本 / 空值，校验后返回规则 dict；空值表示沿用系统预置或默认规则。"""
+    if raw is None or raw == "":
+        return None
+    spec = json.loads(raw) if isinstance(raw, str) else raw
+    validate_scoring_rule(spec)
+    return spec
+
+
+def dump_scoring_rule(spec: dict[str, Any] | None) -> str | None:
+    return None if spec is None else json.dumps(spec, ensure_ascii=False, sort_keys=True)
@@ -14,6 +14,7 @@ from .models import (
     Submission,
     User,
 )
+from .services.scoring_engine import BUILTIN_RULE_SPECS, dump_scoring_rule, rule_for_dimension
 
 VALUE_DIMENSIONS = {"cost_reduction", "efficiency_gain", "perception_uplift", "revenue_growth"}
 DATA_LEVEL_VALUES = {"L1", "L2", "L3", "L4"}
@@ -344,6 +345,7 @@ DEFAULT_DIMENSIONS = [
         "name": "用户满意度",
         "description": "基于用户反馈和使用数据评估应用的满意度",
         "calculation_method": "基于应用的月调用量和用户评分计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["用户满意度"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -351,6 +353,7 @@ DEFAULT_DIMENSIONS = [
         "name": "业务价值",
         "description": "评估应用对业务的提升作用",
         "calculation_method": "基于应用的成效类型和指标计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["业务价值"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -358,6 +361,7 @@ DEFAULT_DIMENSIONS = [
         "name": "技术创新性",
         "description": "评估应用的技术方案和创新点",
         "calculation_method": "基于应用的难度等级计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["技术创新性"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -365,6 +369,7 @@ DEFAULT_DIMENSIONS = [
         "name": "使用活跃度",
         "description": "评估应用的使用频率和用户活跃度",
         "calculation_method": "基于应用的月调用量计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["使用活跃度"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -372,6 +377,7 @@ DEFAULT_DIMENSIONS = [
         "name": "稳定性和安全性",
         "description": "评估应用的可靠性和安全性",
         "calculation_method": "基于应用的状态和错误率计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["稳定性和安全性"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -380,6 +386,7 @@ DEFAULT_DIMENSIONS = [
         "name": "增长趋势",
         "description": "评估应用的增长速度和发展潜力",
         "calculation_method": "基于上月调用量增长率和新增用户计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["增长趋势"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -387,6 +394,7 @@ DEFAULT_DIMENSIONS = [
         "name": "用户增长",
         "description": "评估应用的用户增长速度",
         "calculation_method": "基于新增用户数和用户留存率计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["用户增长"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -394,6 +402,7 @@ DEFAULT_DIMENSIONS = [
         "name": "市场热度",
         "description": "评估应用在市场上的关注度和传播度",
         "calculation_method": "基于搜索次数、分享次数和收藏次数计算",
+        "scoring_rule": dump_scoring_rule(BUILTIN_RULE_SPECS["市场热度"]),
         "weight": 1.0,
         "is_active": True,
     },
@@ -585,50 +594,7 @@ def calculate_app_score(
         if dimension.id not in dim_weight_map:
             continue
 
-        dimension_score = 0
-        if dimension.name == "用户满意度":
-            dimension_score = min(int(app.monthly_calls * 10), 100)
-        elif dimension.name == "业务价值":
-            if app.effectiveness_type == "revenue_growth":
-                dimension_score = 100
-            elif app.effectiveness_type == "efficiency_gain":
-                dimension_score = 80
-            elif app.effectiveness_type == "cost_reduction":
-                dimension_score = 70
-            else:
-                dimension_score = 60
-        elif dimension.name == "技术创新性":
-            if app.difficulty == "High":
-                dimension_score = 100
-            elif app.difficulty == "Medium":
-                dimension_score = 70
-            else:
-                dimension_score = 40
-        elif dimension.name == "使用活跃度":
-            dimension_score = min(int(app.monthly_calls * 5), 100)
-        elif dimension.name == "稳定性和安全性":
-            if app.status == "available":
-                dimension_score = 100
-            elif app.status == "beta":
-                dimension_score = 80
-            else:
-                dimension_score = 60
-        elif dimension.name == "增长趋势":
-            # 基于上月调用量增长率计算
-            if app.last_month_calls > 0:
-                growth_rate = (app.monthly_calls - app.last_month_calls) / app.last_month_calls
-                dimension_score = min(max(int(growth_rate * 100), 0), 100)
-            else:
-                dimension_score = 50
-        elif dimension.name == "用户增长":
-            # 基于新增用户数计算
-            dimension_score = min(int(app.new_users_count / 10), 100)
-        elif dimension.name == "市场热度":
-            # 基于搜索、分享、收藏计算
-            heat_score = app.search_count + app.share_count * 2 + app.favorite_count * 3
-            dimension_score = min(int(heat_score / 10), 100)
-        else:
-            dimension_score = 50
+        dimension_score = rule_for_dimension(dimension).score_one(app)
 
         weight = dim_weight_map[dimension.id]
         base_score += dimension_score * weight
@@ -921,7 +887,7 @@ def sync_system_presets(db: Session) -> None:
             continue
 
         changed = False
-        for field_name in ("description", "calculation_method", "weight", "is_active"):
+        for field_name in ("description", "calculation_method", "scoring_rule", "weight", "is_active"):
             if getattr(dimension, field_name) != payload[field_name]:
                 setattr(dimension, field_name, payload[field_name])
                 changed = True
@@ -0,0 +1,32 @@
+"""应用目录读路径——公共列表精简视图（view=compact）的列投影，供 `/api/apps` 与 `/api/home` 共用。
+
+- 只 SELECT 目录卡片展示的列，简介在 SQL 中截断为 `APP_COMPACT_DESCRIPTION_CHARS` 字
+- 行为 Core Row，不构造 ORM 实体，经 `AppCompact` 校验后序列化
+"""
+
+from pydantic import TypeAdapter
+from sqlalchemy import func
+
+from ..models import App
+from ..schemas import AppCompact
+
+APP_COMPACT_DESCRIPTION_CHARS = 120
+APP_COMPACT_COLUMNS = (
+    App.id,
+    App.name,
+    App.org,
+    App.company,
+    App.department,
+    App.section,
+    App.category,
+    func.substr(App.description, 1, APP_COMPACT_DESCRIPTION_CHARS).label("description"),
+    App.status,
+    App.monthly_calls,
+    App.release_date,
+    App.cover_image_url,
+)
+APP_COMPACT_ITEMS_ADAPTER = TypeAdapter(list[AppCompact])
+
+
+def compact_app_items(rows) -> list[AppCompact]:
+    return APP_COMPACT_ITEMS_ADAPTER.validate_python([dict(row._mapping) for row in rows])
@@ -0,0 +1,117 @@
+"""应用目录分面计数——按板块 / 分类 / 公司 / 状态统计当前筛选条件下的应用数。
+
+- 一次 `GROUP BY section, category, company, status` 得到各组合的行数（快照），
+  四个分面的计数都在进程内由快照累加得出，不再为每个分面各查一次
+- 无关键词时快照按 `apps` 数据版本号缓存在进程内，应用新增 / 编辑 / 上下架后随版本失效；
+  带关键词 q 时在检索结果上现查一次分组
+- 分面采用「排除自身」口径：统计某分面时忽略该分面自己的筛选值，其余筛选照常生效，
+  以便前端在已选分类下仍能展示其他分类的数量
+- 可见性与 `GET /api/apps` 一致：未指定状态时不统计下架（offline）应用；状态分面只列对外可见状态
+"""
+
+import logging
+import threading
+from collections import Counter
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import App
+from .app_search_service import app_search_relevance
+from .cache_service import APPS_DATA_VERSION, data_version_poller
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("section", "category", "company", "status")
+HIDDEN_STATUS = "offline"
+
+# 快照行：(section, category, company, status, 应用数)
+FacetRow = tuple[str, str, str, str, int]
+
+
+def load_facet_rows(db: Session, q: str | None = None) -> list[FacetRow]:
+    query = db.query(App.section, App.category, App.company, App.status, func.count(App.id))
+    if q:
+        query = query.filter(app_search_relevance(q)[0])
+    rows = query.group_by(App.section, App.category, App.company, App.status).all()
+    return [(section, category, company or "", status, int(count)) for section, category, company, status, count in rows]
+
+
+def _row_matches(row: FacetRow, filters: dict[str, str | None], skip: str | None = None) -> bool:
+    for position, field in enumerate(FACET_FIELDS):
+        if field == skip:
+            continue
+        expected = filters.get(field)
+        if expected:
+            if row[position] != expected:
+                return False
+        elif field == "status" and row[position] == HIDDEN_STATUS:
+            return False
+    return True
+
+
+def compute_facets(rows: list[FacetRow], filters: dict[str, str | None]) -> dict[str, object]:
+    """由分组快照计算总数与四个分面的计数（计数降序、同数按取值升序）。"""
+    total = sum(row[-1] for row in rows if _row_matches(row, filters))
+    facets: dict[str, object] = {"total": total}
+    for position, field in enumerate(FACET_FIELDS):
+        counter: Counter[str] = Counter()
+        for row in rows:
+            value = row[position]
+            if not value or (field == "status" and value == HIDDEN_STATUS):
+                continue
+            if _row_matches(row, filters, skip=field):
+                counter[value] += row[-1]
+        facets[field] = [
+            {"value": value, "count": count}
+            for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    return facets
+
+
+class FacetSnapshotCache:
+    """按 `apps` 数据版本号缓存的单份分组快照；同版本的并发未命中只查询一次。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._rows: list[FacetRow] | None = None
+
+    def get(self, db: Session) -> list[FacetRow]:
+        try:
+            version = data_version_poller.current(APPS_DATA_VERSION)
+        except Exception:
+            logger.exception("app facet version poll failed; counting uncached")
+            return load_facet_rows(db)
+        with self._lock:
+            if self._rows is None or self._version != version:
+                self._rows = load_facet_rows(db)
+                self._version = version
+            return self._rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._rows = None
+
+
+facet_snapshot_cache = FacetSnapshotCache()
+
+
+def app_catalog_facets(
+    db: Session,
+    *,
+    section: str | None = None,
+    category: str | None = None,
+    company: str | None = None,
+    status: str | None = None,
+    q: str | None = None,
+) -> dict[str, object]:
+    rows = load_facet_rows(db, q) if q else facet_snapshot_cache.get(db)
+    filters = {
+        "section": section,
+        "category": None if category == "全部" else category,
+        "company": company,
+        "status": status,
+    }
+    return compute_facets(rows, filters)
@@ -0,0 +1,241 @@
+"""应用详情聚合——`GET /api/apps/{id}/profile` 一次返回详情页所需的全部数据。
+
+- 应用信息；每个启用榜单的当前名次 / 分数：读实时榜单生效指针指向的快照，尚无指针的榜单回落 Ranking 表
+- 维度评分明细：该应用最近一个统计日（不晚于今天）的各维度得分
+- 历史走势：近 days 天内每日最新批次快照中的名次 / 分数（批次取自 ranking_runs 目录，口径同
+  `/api/rankings/historical`），点数超过 points 时等间隔降采样并保留首尾
+- 各查询都命中主键或以 app_id / ranking_config_id 开头的唯一索引，查询次数与历史天数无关
+- 响应体按 (apps, rankings, ranking_configs) 数据版本缓存在进程内，任一版本变化即整体失效；
+  缓存键与 ETag 都带当天日期（`profile_today`），跨日自动重建，零点前的 ETag 不再命中 304
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from ..cache_utils import VersionedLRUCache
+from ..config import settings
+from ..models import App, AppDimensionScore, HistoricalRanking, Ranking, RankingActiveRun, RankingConfig, RankingRun
+from ..schemas import AppDetail, AppProfile
+from .cache_service import (
+    APPS_DATA_VERSION,
+    RANKING_CONFIGS_DATA_VERSION,
+    RANKINGS_DATA_VERSION,
+    data_version_poller,
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HISTORY_DAYS = 90
+PROFILE_HISTORY_POINTS = 60
+PROFILE_VERSION_NAMES = (APPS_DATA_VERSION, RANKINGS_DATA_VERSION, RANKING_CONFIGS_DATA_VERSION)
+
+def profile_today() -> date:
+    """详情聚合截取历史窗口 / 维度评分所用的当天日期，同时作为缓存键与 ETag 的一部分。"""
+    return datetime.now().date()
+
+
+app_profile_cache = VersionedLRUCache(
+    "app_profile",
+    max_entries=settings.app_profile_cache_max_entries,
+    max_bytes=settings.app_profile_cache_max_bytes,
+)
+
+
+def downsample(points: list, max_points: int) -> list:
+    """等间隔取 max_points 个点，首尾必取；点数不超过上限时原样返回。"""
+    if len(points) <= max_points:
+        return list(points)
+    if max_points == 1:
+        return [points[-1]]
+    step = (len(points) - 1) / (max_points - 1)
+    return [points[round(index * step)] for index in range(max_points)]
+
+
+def _current_positions(db: Session, app_id: int, configs: list[tuple[str, str]]) -> list[dict]:
+    config_ids = [config_id for config_id, _ in configs]
+    positions = {config_id: None for config_id in config_ids}
+    pointers = db.query(RankingActiveRun).filter(RankingActiveRun.ranking_config_id.in_(config_ids)).all()
+    if pointers:
+        rows = (
+            db.query(
+                HistoricalRanking.ranking_config_id,
+                HistoricalRanking.position,
+                HistoricalRanking.score,
+                HistoricalRanking.tag,
+                HistoricalRanking.period_date,
+            )
+            .filter(HistoricalRanking.app_id == app_id)
+            .filter(
+                tuple_(HistoricalRanking.ranking_config_id, HistoricalRanking.period_date, HistoricalRanking.run_id).in_(
+                    [(pointer.ranking_config_id, pointer.period_date, pointer.snapshot_run_id) for pointer in pointers]
+                )
+            )
+            .all()
+        )
+        for row in rows:
+            positions[row.ranking_config_id] = row
+    # 尚未发布过批次的榜单：回落到 Ranking 表
+    pointed = {pointer.ranking_config_id for pointer in pointers}
+    legacy_ids = [config_id for config_id in config_ids if config_id not in pointed]
+    if legacy_ids:
+        rows = (
+            db.query(
+                Ranking.ranking_config_id,
+                Ranking.position,
+                Ranking.score,
+                Ranking.tag,
+                Ranking.declared_at.label("period_date"),
+            )
+            .filter(Ranking.ranking_config_id.in_(legacy_ids), Ranking.app_id == app_id)
+            .all()
+        )
+        for row in rows:
+            positions[row.ranking_config_id] = row
+
+    result = []
+    for config_id, config_name in configs:
+        row = positions[config_id]
+        result.append({
+            "ranking_config_id": config_id,
+            "ranking_config_name": config_name,
+            "position": row.position if row else None,
+            "score": row.score if row else None,
+            "tag": row.tag if row else None,
+            "period_date": row.period_date if row else None,
+        })
+    return result
+
+
+def _dimension_scores(db: Session, app_id: int, config_ids: list[str], today: date) -> tuple[date | None, list[dict]]:
+    period_date = (
+        db.query(func.max(AppDimensionScore.period_date))
+        .filter(AppDimensionScore.app_id == app_id, AppDimensionScore.period_date <= today)
+        .scalar()
+    )
+    if period_date is None:
+        return None, []
+    rows = (
+        db.query(
+            AppDimensionScore.ranking_config_id,
+            AppDimensionScore.dimension_id,
+            AppDimensionScore.dimension_name,
+            AppDimensionScore.score,
+            AppDimensionScore.weight,
+        )
+        .filter(AppDimensionScore.app_id == app_id, AppDimensionScore.period_date == period_date)
+        .order_by(AppDimensionScore.ranking_config_id, AppDimensionScore.dimension_id)
+        .all()
+    )
+    active = set(config_ids)
+    return period_date, [
+        dict(row._mapping) for row in rows if row.ranking_config_id is None or row.ranking_config_id in active
+    ]
+
+
+def _history(db: Session, app_id: int, config_ids: list[str], since: date, max_points: int) -> list[dict]:
+    # 每个 (榜单, 日期) 的最新批次；同日多批次按创建时间取最后一个，内容未变时指向复用的快照批次
+    latest_runs: dict[tuple[str, date], str] = {}
+    runs = (
+        db.query(
+            RankingRun.ranking_config_id,
+            RankingRun.period_date,
+            func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id).label("snapshot_run_id"),
+        )
+        .filter(
+            RankingRun.ranking_config_id.in_(config_ids),
+            RankingRun.period_date >= since,
+            RankingRun.run_id.is_not(None),
+        )
+        .order_by(RankingRun.created_at, RankingRun.id)
+        .all()
+    )
+    for run in runs:
+        latest_runs[(run.ranking_config_id, run.period_date)] = run.snapshot_run_id
+
+    rows = (
+        db.query(
+            HistoricalRanking.ranking_config_id,
+            HistoricalRanking.period_date,
+            HistoricalRanking.run_id,
+            HistoricalRanking.position,
+            HistoricalRanking.score,
+        )
+        .filter(
+            HistoricalRanking.ranking_config_id.in_(config_ids),
+            HistoricalRanking.app_id == app_id,
+            HistoricalRanking.period_date >= since,
+        )
+        .order_by(HistoricalRanking.ranking_config_id, HistoricalRanking.period_date)
+        .all()
+    )
+    series: dict[str, list[dict]] = {config_id: [] for config_id in config_ids}
+    for row in rows:
+        # 目录中无记录的日期只认无批次 ID 的旧快照，与历史榜单接口一致
+        if row.run_id != latest_runs.get((row.ranking_config_id, row.period_date)):
+            continue
+        series[row.ranking_config_id].append(
+            {"period_date": row.period_date, "position": row.position, "score": row.score}
+        )
+    return [
+        {"ranking_config_id": config_id, "total_points": len(points), "points": downsample(points, max_points)}
+        for config_id, points in series.items()
+    ]
+
+
+def build_app_profile(
+    db: Session,
+    app_id: int,
+    *,
+    days: int = PROFILE_HISTORY_DAYS,
+    points: int = PROFILE_HISTORY_POINTS,
+    today: date | None = None,
+) -> AppProfile | None:
+    app = db.get(App, app_id)
+    if app is None:
+        return None
+    today = today or profile_today()
+    configs = [
+        (config_id, name)
+        for config_id, name in db.query(RankingConfig.id, RankingConfig.name)
+        .filter(RankingConfig.is_active.is_(True))
+        .order_by(RankingConfig.id)
+        .all()
+    ]
+    config_ids = [config_id for config_id, _ in configs]
+    dimension_period_date, dimension_scores = _dimension_scores(db, app_id, config_ids, today)
+    return AppProfile(
+        app=AppDetail.model_validate(app),
+        positions=_current_positions(db, app_id, configs) if configs else [],
+        dimension_period_date=dimension_period_date,
+        dimension_scores=dimension_scores,
+        history=_history(db, app_id, config_ids, today - timedelta(days=days - 1), points) if configs else [],
+    )
+
+
+def app_profile_body(
+    db: Session,
+    app_id: int,
+    *,
+    days: int,
+    points: int,
+    today: date | None = None,
+) -> bytes | None:
+    """详情聚合 JSON（按数据版本缓存）；应用不存在时返回 None。"""
+    # 历史窗口与维度评分都按当天截取，跨日后即使数据版本不变也要重建
+    today = today or profile_today()
+
+    def build() -> bytes:
+        profile = build_app_profile(db, app_id, days=days, points=points, today=today)
+        return b"null" if profile is None else profile.model_dump_json().encode("utf-8")
+
+    try:
+        version = tuple(data_version_poller.current(name) for name in PROFILE_VERSION_NAMES)
+    except Exception:
+        logger.exception("app profile version poll failed; serving uncached")
+        body = build()
+    else:
+        body = app_profile_cache.get_or_compute(version, (app_id, days, points, today), build)
+    return None if body == b"null" else body
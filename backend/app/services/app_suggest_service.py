@@ -0,0 +1,256 @@
+"""应用名称联想——进程内前缀树，支持汉字、全拼与拼音首字母（如 "znkf" → 智能客服）。
+
+- 每个应用以名称、公司及名称 / 公司的全拼、首字母作为索引键（小写、去空白，最长
+  `SUGGEST_MAX_KEY_LENGTH` 个字符）
+- 每个节点维护子树内排名前 `SUGGEST_TOP_K` 的应用，查询只需沿前缀走到节点后取其列表，
+  耗时与应用总数无关；键数少的子树以桶平铺存放（burst trie），控制节点数与内存
+- 排名：近 30 日调用量降序，同值按 app_id 升序
+- 可见性与 `GET /api/apps` 一致：下架（offline）应用不进索引
+- `apps` 数据版本号变化时只对内容有变化的应用增删索引键，不整树重建
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from pypinyin import Style, lazy_pinyin
+from sqlalchemy.orm import Session
+
+from ..models import App
+from .cache_service import APPS_DATA_VERSION, data_version_poller
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_TOP_K = 10
+SUGGEST_MAX_KEY_LENGTH = 24
+SUGGEST_BUCKET_SIZE = 8
+
+
+@dataclass(frozen=True)
+class SuggestEntry:
+    id: int
+    name: str
+    company: str
+    section: str
+    category: str
+    monthly_calls: float
+
+    @property
+    def rank(self) -> tuple[float, int]:
+        return (-self.monthly_calls, self.id)
+
+
+def normalize_suggest_text(text: str | None) -> str:
+    return "".join((text or "").lower().split())
+
+
+@lru_cache(maxsize=8192)
+def transliterations(text: str | None) -> tuple[str, str]:
+    """返回 (全拼, 首字母)；非汉字片段原样保留（小写、去空白）。公司名大量重复，结果按文本缓存。"""
+    if not text:
+        return "", ""
+    syllables = lazy_pinyin(text)
+    initials = lazy_pinyin(text, style=Style.FIRST_LETTER)
+    return normalize_suggest_text("".join(syllables)), normalize_suggest_text("".join(initials))
+
+
+def suggest_keys(entry: SuggestEntry) -> frozenset[str]:
+    keys = set()
+    for text in (entry.name, entry.company):
+        keys.add(normalize_suggest_text(text))
+        keys.update(transliterations(text))
+    return frozenset(key[:SUGGEST_MAX_KEY_LENGTH] for key in keys if key)
+
+
+class _TrieNode:
+    __slots__ = ("children", "bucket", "terminal", "top")
+
+    def __init__(self) -> None:
+        # 桶模式：键数不超过 SUGGEST_BUCKET_SIZE 时以 (剩余后缀, app_id) 平铺存放，避免为长尾字符逐个建节点；
+        # 超过后分裂为子节点（children 不为 None）
+        self.children: dict[str, _TrieNode] | None = None
+        self.bucket: set[tuple[str, int]] = set()
+        self.terminal: set[int] = set()  # 分裂后：索引键恰好止于此节点的应用
+        self.top: list[int] = []  # 子树内排名前 K 的应用（已排序）
+
+    def is_empty(self) -> bool:
+        return not (self.children or self.bucket or self.terminal)
+
+
+class AppSuggestIndex:
+    """应用联想前缀树（burst trie）；读写共用一把锁，单次查询只读取一个节点。"""
+
+    def __init__(self, top_k: int = SUGGEST_TOP_K) -> None:
+        self.top_k = top_k
+        # version 为最近一次构建时的 apps 版本（版本读取失败时构建记为 None），built 标记是否已构建过
+        self.version: int | None = None
+        self.built = False
+        self._root = _TrieNode()
+        self._entries: dict[int, SuggestEntry] = {}
+        self._keys: dict[int, frozenset[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _rank(self, app_id: int) -> tuple[float, int]:
+        return self._entries[app_id].rank
+
+    def _offer(self, node: _TrieNode, app_id: int) -> None:
+        if app_id in node.top:
+            return
+        if len(node.top) < self.top_k or self._rank(app_id) < self._rank(node.top[-1]):
+            node.top.append(app_id)
+            node.top.sort(key=self._rank)
+            del node.top[self.top_k:]
+
+    def _recompute_top(self, node: _TrieNode) -> None:
+        candidates = set(node.terminal)
+        candidates.update(app_id for _, app_id in node.bucket)
+        for child in (node.children or {}).values():
+            candidates.update(child.top)
+        node.top = sorted(candidates, key=self._rank)[: self.top_k]
+
+    def _insert_key(self, node: _TrieNode, app_id: int, suffix: str) -> None:
+        while True:
+            self._offer(node, app_id)
+            if node.children is None:
+                node.bucket.add((suffix, app_id))
+                if len(node.bucket) > SUGGEST_BUCKET_SIZE:
+                    self._burst(node)
+                return
+            if not suffix:
+                node.terminal.add(app_id)
+                return
+            node = node.children.setdefault(suffix[0], _TrieNode())
+            suffix = suffix[1:]
+
+    def _burst(self, node: _TrieNode) -> None:
+        bucket, node.bucket, node.children = node.bucket, set(), {}
+        for suffix, app_id in bucket:
+            if suffix:
+                self._insert_key(node.children.setdefault(suffix[0], _TrieNode()), app_id, suffix[1:])
+            else:
+                node.terminal.add(app_id)
+
+    def _remove_key(self, app_id: int, key: str) -> None:
+        path = [(self._root, "")]
+        node, suffix = self._root, key
+        while node.children is not None and suffix:
+            child = node.children.get(suffix[0])
+            if child is None:
+                return
+            node, suffix = child, suffix[1:]
+            path.append((node, suffix))
+        if node.children is None:
+            node.bucket.discard((suffix, app_id))
+        else:
+            node.terminal.discard(app_id)
+        # 自底向上：摘掉空节点，再为包含该应用的节点从子节点 / 桶中补位
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth][0]
+            if depth and node.is_empty():
+                parent = path[depth - 1][0]
+                del parent.children[key[depth - 1]]
+                continue
+            if app_id in node.top:
+                self._recompute_top(node)
+
+    def upsert(self, entry: SuggestEntry) -> None:
+        with self._lock:
+            self.remove(entry.id)
+            self._entries[entry.id] = entry
+            keys = suggest_keys(entry)
+            self._keys[entry.id] = keys
+            for key in keys:
+                self._insert_key(self._root, entry.id, key)
+
+    def remove(self, app_id: int) -> None:
+        with self._lock:
+            keys = self._keys.pop(app_id, None)
+            if keys is None:
+                return
+            # 先从各节点移除，排名比较仍需要旧条目
+            for key in keys:
+                self._remove_key(app_id, key)
+            self._entries.pop(app_id, None)
+
+    def sync(self, entries: list[SuggestEntry], version: int | None) -> tuple[int, int]:
+        """按最新的可见应用集合增量调整索引，返回 (新增或更新数, 移除数)。"""
+        with self._lock:
+            latest = {entry.id: entry for entry in entries}
+            removed = [app_id for app_id in self._entries if app_id not in latest]
+            for app_id in removed:
+                self.remove(app_id)
+            changed = 0
+            for entry in latest.values():
+                if self._entries.get(entry.id) != entry:
+                    self.upsert(entry)
+                    changed += 1
+            self.version = version
+            self.built = True
+            return changed, len(removed)
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_TOP_K) -> list[SuggestEntry]:
+        key = normalize_suggest_text(prefix)[:SUGGEST_MAX_KEY_LENGTH]
+        if not key:
+            return []
+        with self._lock:
+            node, rest = self._root, key
+            while node.children is not None and rest:
+                node = node.children.get(rest[0])
+                if node is None:
+                    return []
+                rest = rest[1:]
+            if not rest:
+                app_ids = node.top[:limit]
+            else:
+                matched = {app_id for suffix, app_id in node.bucket if suffix.startswith(rest)}
+                app_ids = sorted(matched, key=self._rank)[:limit]
+            return [self._entries[app_id] for app_id in app_ids]
+
+
+app_suggest_index = AppSuggestIndex()
+_refresh_lock = threading.Lock()
+
+
+def load_suggest_entries(db: Session) -> list[SuggestEntry]:
+    rows = (
+        db.query(App.id, App.name, App.company, App.section, App.category, App.monthly_calls)
+        .filter(App.status != "offline")
+        .all()
+    )
+    return [
+        SuggestEntry(
+            id=row.id,
+            name=row.name,
+            company=row.company or "",
+            section=row.section,
+            category=row.category,
+            monthly_calls=float(row.monthly_calls or 0.0),
+        )
+        for row in rows
+    ]
+
+
+def ensure_suggest_index_current(db: Session, index: AppSuggestIndex = app_suggest_index) -> AppSuggestIndex:
+    """
+    `apps` 数据版本变化时重新读取可见应用并增量更新索引。
+    版本读取失败时沿用已构建的索引；尚未构建过时先按当前数据构建一次（记为版本 None），
+    之后读取恢复、版本不同即再刷新。
+    """
+    try:
+        version = data_version_poller.current(APPS_DATA_VERSION)
+    except Exception:
+        logger.exception("app suggest version poll failed; serving current index")
+        if index.built:
+            return index
+        version = None
+    if index.built and index.version == version:
+        return index
+    with _refresh_lock:
+        if not index.built or index.version != version:
+            changed, removed = index.sync(load_suggest_entries(db), version)
+            logger.info("app suggest index refreshed version=%s changed=%d removed=%d", version, changed, removed)
+    return index
@@ -0,0 +1,89 @@
+"""登录会话校验缓存——两级缓存挡在 `load_active_session` 的 AuthSession + User 联表查询之前。
+
+- 请求级：同一请求内多个依赖（或 `require_admin_token` 的多个候选令牌）重复校验同一令牌时复用首次结果，
+  记在请求会话的 `db.info` 上
+- 进程级：按令牌 SHA-256 摘要缓存会话与用户的列快照，TTL（`AUTH_SESSION_CACHE_TTL_SECONDS`，0 关闭）
+  + LRU（`AUTH_SESSION_CACHE_MAX_ENTRIES`）；命中时以 `merge(load=False)` 把快照挂回请求会话，不查库，
+  路由对会话 / 用户的修改照常随请求会话提交
+- 吊销：users / auth_sessions 行的修改与删除（退出登录、改密、改角色、启停用，含批量 update）在同一事务内
+  自增 `data_versions` 中的 auth_sessions 版本号；本进程提交后立即失效，其他 worker 在
+  `RANKING_CACHE_VERSION_POLL_MS` 内感知。新登录只插入会话行，不使已缓存条目失效
+- 只缓存校验通过的会话；过期时间等在每次命中时仍由调用方按当前时间重新校验
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..cache_utils import VersionedTTLCache
+from ..config import settings
+from ..models import AuthSession, User
+from .cache_service import AUTH_SESSIONS_DATA_VERSION, data_version_poller
+
+logger = logging.getLogger(__name__)
+
+AUTH_SESSION_MEMO_KEY = "auth_session_memo"
+AUTH_SESSION_COLUMNS = tuple(attr.key for attr in sa_inspect(AuthSession).column_attrs)
+USER_COLUMNS = tuple(attr.key for attr in sa_inspect(User).column_attrs)
+
+auth_session_cache = VersionedTTLCache(
+    "auth_sessions",
+    max_entries=settings.auth_session_cache_max_entries,
+    ttl_seconds=settings.auth_session_cache_ttl_seconds,
+)
+
+
+def token_cache_key(token: str) -> str:
+    """缓存键只保存令牌摘要，进程内存中不留明文令牌。"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def snapshot_auth_session(auth_session: AuthSession) -> tuple[dict, dict]:
+    return (
+        {key: getattr(auth_session, key) for key in AUTH_SESSION_COLUMNS},
+        {key: getattr(auth_session.user, key) for key in USER_COLUMNS},
+    )
+
+
+def attach_auth_session(db: Session, snapshot: tuple[dict, dict]) -> AuthSession:
+    """把列快照还原为挂在请求会话上的持久化对象（不发 SELECT）；session.user 从身份映射取得。"""
+    session_columns, user_columns = snapshot
+    user = User(**user_columns)
+    make_transient_to_detached(user)
+    db.merge(user, load=False)
+    auth_session = AuthSession(**session_columns)
+    make_transient_to_detached(auth_session)
+    return db.merge(auth_session, load=False)
+
+
+def _lookup(db: Session, token: str, key: str, load: Callable[[Session, str], AuthSession | None]) -> AuthSession | None:
+    if settings.auth_session_cache_ttl_seconds <= 0:
+        return load(db, token)
+    try:
+        version = data_version_poller.current(AUTH_SESSIONS_DATA_VERSION)
+    except Exception:
+        logger.exception("auth session cache version poll failed; loading from database")
+        return load(db, token)
+    snapshot = auth_session_cache.get(version, key)
+    if snapshot is not None:
+        return attach_auth_session(db, snapshot)
+    auth_session = load(db, token)
+    if auth_session is not None:
+        auth_session_cache.put(version, key, snapshot_auth_session(auth_session))
+    return auth_session
+
+
+def lookup_auth_session(
+    db: Session,
+    token: str,
+    load: Callable[[Session, str], AuthSession | None],
+) -> AuthSession | None:
+    """按令牌取会话：请求内备忘 → 进程缓存 → load 回源（load 只应返回校验通过的会话）。"""
+    memo = db.info.setdefault(AUTH_SESSION_MEMO_KEY, {})
+    key = token_cache_key(token)
+    if key not in memo:
+        memo[key] = _lookup(db, token, key, load)
+    return memo[key]
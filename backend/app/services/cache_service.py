@@ -0,0 +1,302 @@
+"""公共读缓存服务——数据版本号登记、跨 worker 版本轮询、榜单读接口响应缓存与 HTTP 条件请求。
+
+写路径（榜单同步 / 发布 / 链路变更）在同一事务内自增 `data_versions` 中的版本号；
+读接口以「版本号 + 查询参数」为键缓存序列化后的响应体，并据此生成 ETag。多 worker
+部署时各进程最多每 `RANKING_CACHE_VERSION_POLL_MS` 读取一次版本行，因此跨进程的
+陈旧窗口以该间隔为上限；本进程内的提交则立即生效。
+"""
+
+import hashlib
+import logging
+import threading
+from time import monotonic
+from datetime import datetime
+from typing import Callable, Hashable
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .. import database as _database
+from ..cache_utils import VersionedLRUCache
+from ..config import settings
+from ..models import App, AuthSession, DataVersion, RankingConfig, RankingConfigDimension, Submission, User
+
+logger = logging.getLogger(__name__)
+
+RANKINGS_DATA_VERSION = "rankings"
+APPS_DATA_VERSION = "apps"
+RANKING_CONFIGS_DATA_VERSION = "ranking_configs"
+SUBMISSIONS_DATA_VERSION = "submissions"
+AUTH_SESSIONS_DATA_VERSION = "auth_sessions"
+PENDING_VERSION_BUMPS_KEY = "pending_data_version_bumps"
+# 榜单响应体内嵌应用名称 / 公司等字段，随应用编辑变化：响应体缓存键与 ETag 都按这组版本号计算
+RANKING_BODY_VERSION_NAMES = (RANKINGS_DATA_VERSION, APPS_DATA_VERSION)
+
+
+# ---------------------------------------------------------------------------
+# 数据版本号
+# ---------------------------------------------------------------------------
+
+def read_data_version(name: str) -> int:
+    """读取版本号；使用独立短连接，不占用请求会话的事务。"""
+    with _database.engine.connect() as connection:
+        version = connection.execute(
+            select(DataVersion.version).where(DataVersion.name == name)
+        ).scalar_one_or_none()
+    return int(version or 0)
+
+
+class DataVersionPoller:
+    """
+    按轮询间隔缓存各数据版本号，避免每次读请求都回源数据库。
+    回源在锁外进行，并发读取的结果取最大值登记：先发起、后返回的旧读数不会覆盖较新的版本或时间戳；
+    开始于本进程最近一次 expire 之前的读数可能漏掉该次提交，只返回给调用方，不登记。
+    """
+
+    def __init__(self, poll_seconds: float, reader: Callable[[str], int] = read_data_version) -> None:
+        self.poll_seconds = poll_seconds
+        self._reader = reader
+        self._lock = threading.Lock()
+        self._known: dict[str, tuple[int, float]] = {}
+        self._expired_at: dict[str, float] = {}
+        self.polls = 0
+
+    def current(self, name: str) -> int:
+        now = monotonic()
+        with self._lock:
+            known = self._known.get(name)
+            if known is not None and now - known[1] < self.poll_seconds:
+                return known[0]
+        version = self._reader(name)
+        with self._lock:
+            self.polls += 1
+            known = self._known.get(name)
+            if known is not None:
+                version, now = max(version, known[0]), max(now, known[1])
+            if now >= self._expired_at.get(name, float("-inf")):
+                self._known[name] = (version, now)
+        return version
+
+    def expire(self, name: str) -> None:
+        with self._lock:
+            self._known.pop(name, None)
+            self._expired_at[name] = monotonic()
+
+
+def bump_data_version(db: Session, name: str = RANKINGS_DATA_VERSION) -> None:
+    """
+    在当前事务内自增版本号，随业务写入一起提交或回滚。
+    提交成功后本进程立即放弃轮询缓存，其他 worker 在下一个轮询周期内感知。
+    """
+    now = datetime.utcnow()
+    updated = db.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1, updated_at=now)
+    ).rowcount
+    if not updated:
+        db.add(DataVersion(name=name, version=1, updated_at=now))
+        db.flush()
+    db.info.setdefault(PENDING_VERSION_BUMPS_KEY, set()).add(name)
+
+
+# 行级写入即自增版本号的模型：无需在各写路径手工调用 bump_data_version
+TRACKED_VERSION_MODELS: dict[type, str] = {
+    App: APPS_DATA_VERSION,
+    RankingConfig: RANKING_CONFIGS_DATA_VERSION,
+    RankingConfigDimension: RANKING_CONFIGS_DATA_VERSION,
+    Submission: SUBMISSIONS_DATA_VERSION,
+}
+# 只在修改 / 删除时自增的模型：新增行（如登录新建会话）不影响已缓存的内容
+TRACKED_CHANGE_VERSION_MODELS: dict[type, str] = {
+    AuthSession: AUTH_SESSIONS_DATA_VERSION,
+    User: AUTH_SESSIONS_DATA_VERSION,
+}
+
+
+def _tracked_version_name(model: type, *, inserted: bool = False) -> str | None:
+    name = TRACKED_VERSION_MODELS.get(model)
+    if name is None and not inserted:
+        name = TRACKED_CHANGE_VERSION_MODELS.get(model)
+    return name
+
+
+def _bump_versions_on_connection(session: Session, names: set[str]) -> None:
+    """直接在会话当前连接上执行 Core 语句自增版本号（flush 过程中不能再走 ORM flush）。"""
+    pending = session.info.setdefault(PENDING_VERSION_BUMPS_KEY, set())
+    names = names - pending
+    if not names:
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    table = DataVersion.__table__
+    for name in sorted(names):
+        updated = connection.execute(
+            update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+        ).rowcount
+        if not updated:
+            connection.execute(
+                mysql_insert(table)
+                .values(name=name, version=1, updated_at=now)
+                .on_duplicate_key_update(version=table.c.version + 1, updated_at=now)
+            )
+        pending.add(name)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_tracked_model_versions(session: Session, flush_context) -> None:
+    """本次 flush 新增 / 修改 / 删除了登记模型的行时，在同一事务内自增对应版本号（每个事务每个版本只增一次）。"""
+    pending = session.info.get(PENDING_VERSION_BUMPS_KEY, set())
+    names = set()
+    for obj in session.new:
+        name = _tracked_version_name(type(obj), inserted=True)
+        if name is not None and name not in pending:
+            names.add(name)
+    for obj in session.deleted:
+        name = _tracked_version_name(type(obj))
+        if name is not None and name not in pending:
+            names.add(name)
+    for obj in session.dirty:
+        name = _tracked_version_name(type(obj))
+        if name is None or name in pending or name in names:
+            continue
+        if session.is_modified(obj, include_collections=False):
+            names.add(name)
+    if names:
+        _bump_versions_on_connection(session, names)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_versions_for_bulk_writes(orm_execute_state: ORMExecuteState) -> None:
+    """`query(...).update()` / `.delete()` 等批量写入绕过 flush，按目标模型同样自增版本号。"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    name = _tracked_version_name(mapper.class_) if mapper is not None else None
+    if name is not None:
+        _bump_versions_on_connection(orm_execute_state.session, {name})
+
+
+@event.listens_for(Session, "after_commit")
+def _expire_committed_versions(session: Session) -> None:
+    for name in session.info.pop(PENDING_VERSION_BUMPS_KEY, ()):
+        data_version_poller.expire(name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_versions(session: Session) -> None:
+    session.info.pop(PENDING_VERSION_BUMPS_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# 榜单读缓存
+# ---------------------------------------------------------------------------
+
+data_version_poller = DataVersionPoller(settings.ranking_cache_version_poll_ms / 1000)
+ranking_read_cache = VersionedLRUCache(
+    "rankings",
+    max_entries=settings.ranking_cache_max_entries,
+    max_bytes=settings.ranking_cache_max_bytes,
+    max_entry_bytes=settings.ranking_cache_max_entry_bytes,
+)
+
+
+def cached_ranking_response(
+    key: Hashable,
+    build: Callable[[], bytes],
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    返回榜单读接口的 JSON 响应体：命中缓存直接复用，未命中由 build 生成。
+    版本号读取失败时退化为直接查询，不因缓存层故障影响读接口可用性。
+    """
+    return Response(content=cached_ranking_body(key, build), media_type="application/json", headers=headers)
+
+
+def cached_ranking_body(key: Hashable, build: Callable[[], bytes]) -> bytes:
+    """榜单 JSON 响应体（按 RANKING_BODY_VERSION_NAMES 缓存）；`/api/home` 以相同缓存键复用 `/api/rankings` 的结果。"""
+    if not settings.ranking_cache_enabled:
+        return build()
+    try:
+        version = tuple(data_version_poller.current(name) for name in RANKING_BODY_VERSION_NAMES)
+    except Exception:
+        logger.exception("ranking cache version poll failed; serving uncached")
+        return build()
+    return ranking_read_cache.get_or_compute(version, key, build)
+
+
+def ranking_cache_stats() -> dict[str, object]:
+    stats = ranking_read_cache.stats()
+    stats["enabled"] = settings.ranking_cache_enabled
+    stats["version_poll_ms"] = settings.ranking_cache_version_poll_ms
+    stats["version_polls"] = data_version_poller.polls
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# HTTP 条件请求（ETag / Cache-Control）
+# ---------------------------------------------------------------------------
+
+# 响应结构变化（字段增删、序列化口径调整）时递增，使客户端持有的旧 ETag 全部失效
+ETAG_FORMAT_VERSION = 1
+PUBLIC_DYNAMIC_CACHE_CONTROL = (
+    f"public, max-age=0, s-maxage={settings.public_cache_s_maxage_seconds}, must-revalidate"
+)
+PUBLIC_STATIC_CACHE_CONTROL = f"public, max-age={settings.public_cache_static_max_age_seconds}"
+
+
+def public_etag(scope: str, version_names: tuple[str, ...], key: Hashable = ()) -> str | None:
+    """由数据版本号与请求键计算强 ETag，无需渲染响应体；版本读取失败时返回 None（不做条件响应）。"""
+    try:
+        versions = tuple(data_version_poller.current(name) for name in version_names)
+    except Exception:
+        logger.exception("etag version poll failed; serving without validators")
+        return None
+    material = repr((ETAG_FORMAT_VERSION, scope, versions, key)).encode("utf-8")
+    return f'"{hashlib.blake2b(material, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 采用弱比较：忽略 W/ 前缀，`*` 匹配任意实体。"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def public_read_cache(
+    scope: str,
+    *version_names: str,
+    cache_control: str = PUBLIC_DYNAMIC_CACHE_CONTROL,
+    key: Hashable | Callable[[], Hashable] = (),
+):
+    """
+    公共读接口的条件请求依赖：按「版本号 + 路径 + 查询参数」计算 ETag，
+    If-None-Match 命中时在进入路由（查询数据库 / 序列化）之前直接返回 304；
+    未命中时把 ETag 与 Cache-Control 写入响应并返回头部字典，供自行构造 Response 的路由使用。
+    key 为可调用对象时每次请求求值，用于响应体还随版本号以外的状态（如当天日期）变化的接口。
+    """
+
+    def dependency(request: Request, response: Response) -> dict[str, str]:
+        if not settings.public_cache_enabled:
+            return {}
+        request_key = (
+            request.url.path,
+            tuple(sorted(request.query_params.multi_items())),
+            key() if callable(key) else key,
+        )
+        etag = public_etag(scope, version_names, request_key)
+        if etag is None:
+            return {}
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return headers
+
+    return dependency
@@ -0,0 +1,154 @@
+"""首页聚合——`GET /api/home` 一次返回首页所需的全部数据，替代首屏的多次串行请求。
+
+- 组成：两张实时榜单（excellent / trend）、启用的榜单配置、申报统计、枚举、规则链接、首屏应用
+- 榜单以 `/api/rankings` 的缓存键读取进程内响应缓存，命中时不查库，结果字节直接拼入响应
+- 需要查库的部分在共享线程池（`HOME_BOOTSTRAP_WORKERS` 个线程）中并发执行，每部分使用独立会话；
+  线程池在进程内共享，首页并发再高占用的连接数也有上限
+- 单个部分失败只把该部分置为 null 并列入 `degraded`，其余部分照常返回
+- 调用方可只取其中几部分（`parts`）：未请求的部分不查库、返回 null，也不计入 `degraded`
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from .. import database as _database
+from ..config import settings
+from ..models import App, RankingConfig, Submission
+from ..schemas import AppDetail, RankingConfigOut, RuleLink, Stats
+from .app_catalog_service import APP_COMPACT_COLUMNS, APP_COMPACT_ITEMS_ADAPTER, compact_app_items
+from .cache_service import cached_ranking_body
+from .ranking_read_service import ranking_cache_key, render_live_ranking
+
+logger = logging.getLogger(__name__)
+
+HOME_RANKING_IDS = ("excellent", "trend")
+HOME_APPS_PAGE_SIZE = 24
+# 可按需选取的查库部分；enums / rules 不查库，始终返回
+HOME_PARTS = ("rankings", "ranking_configs", "stats", "apps")
+
+RANKING_CONFIGS_ADAPTER = TypeAdapter(list[RankingConfigOut])
+APP_DETAILS_ADAPTER = TypeAdapter(list[AppDetail])
+RULE_LINKS_ADAPTER = TypeAdapter(list[RuleLink])
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _home_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.home_bootstrap_workers, thread_name_prefix="home")
+        return _executor
+
+
+def public_stats(db: Session) -> Stats:
+    pending = db.query(Submission).filter(Submission.status == "pending").count()
+    approved_period = db.query(Submission).filter(Submission.status == "approved").count()
+    total_apps = db.query(App).count()
+    return Stats(pending=pending, approved_period=approved_period, total_apps=total_apps)
+
+
+def rule_links() -> list[RuleLink]:
+    base = settings.oa_rule_base_url.rstrip("/")
+    return [
+        RuleLink(title="如何申报应用", href=f"{base}/ai-app-square/rules/submission"),
+        RuleLink(title="上榜评选标准", href=f"{base}/ai-app-square/rules/ranking"),
+        RuleLink(title="API接入指南", href=f"{base}/ai-app-square/rules/api-integration"),
+    ]
+
+
+def _ranking_part(scope_id: str, view: str) -> Callable[[Session], bytes]:
+    return lambda db: cached_ranking_body(
+        ranking_cache_key(scope_id, view=view),
+        lambda: render_live_ranking(db, scope_id, view=view),
+    )
+
+
+def _ranking_configs_part(db: Session) -> bytes:
+    configs = db.query(RankingConfig).filter(RankingConfig.is_active.is_(True)).order_by(RankingConfig.id).all()
+    return RANKING_CONFIGS_ADAPTER.dump_json(RANKING_CONFIGS_ADAPTER.validate_python(configs, from_attributes=True))
+
+
+def _stats_part(db: Session) -> bytes:
+    return public_stats(db).model_dump_json().encode("utf-8")
+
+
+def _apps_part(view: str, limit: int) -> Callable[[Session], bytes]:
+    """首屏应用：与 `GET /api/apps` 默认列表相同的口径与顺序（隐藏下架、按 ID），取前 limit 条。"""
+
+    def build(db: Session) -> bytes:
+        if view == "compact":
+            query = db.query(*APP_COMPACT_COLUMNS)
+        else:
+            query = db.query(App)
+        rows = query.filter(App.status != "offline").order_by(App.id).limit(limit).all()
+        if view == "compact":
+            return APP_COMPACT_ITEMS_ADAPTER.dump_json(compact_app_items(rows))
+        return APP_DETAILS_ADAPTER.dump_json(APP_DETAILS_ADAPTER.validate_python(rows, from_attributes=True))
+
+    return build
+
+
+def _run_with_session(build: Callable[[Session], bytes], session_factory) -> bytes:
+    db = session_factory()
+    try:
+        return build(db)
+    finally:
+        db.close()
+
+
+def build_home_payload(
+    *,
+    enums: dict[str, list[str]],
+    view: str = "full",
+    apps_limit: int = HOME_APPS_PAGE_SIZE,
+    parts: Collection[str] = HOME_PARTS,
+    session_factory=None,
+) -> tuple[bytes, list[str]]:
+    """并发读取 parts 中的各部分并拼成首页 JSON，返回 (响应体, 失败而置空的部分名)。"""
+    factory = session_factory or _database.SessionLocal
+    builders: dict[str, Callable[[Session], bytes]] = {}
+    if "rankings" in parts:
+        builders.update({f"rankings.{scope_id}": _ranking_part(scope_id, view) for scope_id in HOME_RANKING_IDS})
+    if "ranking_configs" in parts:
+        builders["ranking_configs"] = _ranking_configs_part
+    if "stats" in parts:
+        builders["stats"] = _stats_part
+    if "apps" in parts:
+        builders["apps"] = _apps_part(view, apps_limit)
+
+    executor = _home_executor()
+    futures = {name: executor.submit(_run_with_session, build, factory) for name, build in builders.items()}
+    bodies: dict[str, bytes] = {}
+    degraded: list[str] = []
+    for name, future in futures.items():
+        try:
+            bodies[name] = future.result()
+        except Exception:
+            logger.exception("home bootstrap part failed part=%s", name)
+            bodies[name] = b"null"
+            degraded.append(name)
+
+    def field(name: str, body: bytes) -> bytes:
+        return json.dumps(name).encode("utf-8") + b":" + body
+
+    rankings = b"{" + b",".join(
+        field(scope_id, bodies.get(f"rankings.{scope_id}", b"null")) for scope_id in HOME_RANKING_IDS
+    ) + b"}"
+    body = b"{" + b",".join([
+        field("rankings", rankings),
+        field("ranking_configs", bodies.get("ranking_configs", b"null")),
+        field("stats", bodies.get("stats", b"null")),
+        field("enums", json.dumps(enums, ensure_ascii=False, separators=(",", ":")).encode("utf-8")),
+        field("rules", RULE_LINKS_ADAPTER.dump_json(rule_links())),
+        field("apps", bodies.get("apps", b"null")),
+        field("degraded", json.dumps(degraded).encode("utf-8")),
+    ]) + b"}"
+    return body, degraded
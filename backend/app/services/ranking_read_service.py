@@ -0,0 +1,389 @@
+"""公共榜单读路径——实时榜单条目的查询与序列化，供 `/api/rankings` 与静态快照导出共用。
+
+- 实时榜单读取生效指针指向的不可变快照；尚无指针的榜单回落到 Ranking 表
+- 只展示省内应用；公司口径为 company，为空时回落 org
+- 公司榜：发布时已在快照行上物化公司名与公司内名次，按 (榜单, 批次, 公司, 公司内名次) 索引范围读取；
+  回落 Ranking 表时仍按应用当前公司筛选
+- 快照行自带相对基准批次的变动（上一发布名次、名次变化、new / up / down / same），随条目返回；
+  Ranking 表回落时这些字段为空
+- 批次对比（`/api/rankings/diff`）：两个批次的快照各按 (榜单, 日期, 批次) 索引读取一次，按 app_id 归并
+- 序列化经 `RankingItem` 校验，保证接口响应与导出文件逐字节一致
+- 精简视图（view=compact）只 SELECT 卡片所需列，不构造 ORM 实体，按 `RankingItemCompact` 序列化
+"""
+
+from datetime import date, datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, null
+from sqlalchemy.orm import Session, load_only
+
+from ..models import App, HistoricalRanking, Ranking, RankingActiveRun, RankingRun
+from ..schemas import RankingDiff, RankingItem, RankingItemCompact
+
+RANKING_ITEM_APP_COLUMNS = (
+    App.id,
+    App.name,
+    App.org,
+    App.company,
+    App.department,
+    App.section,
+    App.category,
+    App.description,
+    App.status,
+    App.monthly_calls,
+    App.release_date,
+)
+
+RANKING_ITEMS_ADAPTER = TypeAdapter(list[RankingItem])
+RANKING_COMPACT_ITEMS_ADAPTER = TypeAdapter(list[RankingItemCompact])
+
+RANKING_VIEWS = ("full", "compact")
+# 名次变动标记；dropped 仅出现在批次对比结果中
+MOVEMENT_NEW = "new"
+MOVEMENT_UP = "up"
+MOVEMENT_DOWN = "down"
+MOVEMENT_SAME = "same"
+MOVEMENT_DROPPED = "dropped"
+
+# 仅快照行（HistoricalRanking）具备、随榜单条目返回的物化列
+SNAPSHOT_ITEM_COLUMNS = ("company_position", "previous_position", "position_delta", "movement")
+
+
+def ranking_cache_key(
+    scope_id: str,
+    *,
+    company: str | None = None,
+    period_date: date | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    view: str = "full",
+) -> tuple:
+    """`/api/rankings` 响应体的进程内缓存键；`/api/home` 用同一键复用整榜结果。"""
+    return ("rankings", scope_id, company, period_date, limit, offset, view)
+
+
+def compute_movement(position: int, previous) -> dict:
+    """相对基准的变动；previous 为基准批次中该应用的行（含 position / score），不存在时为新上榜。"""
+    if previous is None:
+        return {"previous_position": None, "previous_score": None, "position_delta": None, "movement": MOVEMENT_NEW}
+    delta = previous.position - position
+    return {
+        "previous_position": previous.position,
+        "previous_score": previous.score,
+        "position_delta": delta,
+        "movement": MOVEMENT_UP if delta > 0 else MOVEMENT_DOWN if delta < 0 else MOVEMENT_SAME,
+    }
+
+
+def ranking_company_expr():
+    """与展示口径一致的公司名：company 为空时回落到 org。"""
+    return func.coalesce(func.nullif(App.company, ""), App.org)
+
+
+def dump_ranking_items(items: list[dict]) -> bytes:
+    return RANKING_ITEMS_ADAPTER.dump_json(RANKING_ITEMS_ADAPTER.validate_python(items, from_attributes=True))
+
+
+def compact_ranking_columns(position_column) -> tuple:
+    """精简视图的列投影：榜单行的名次 / 标签 / 指标，加应用 ID、名称与展示口径公司名。"""
+    row_model = position_column.class_
+    return (
+        position_column,
+        *(getattr(row_model, name, null()).label(name) for name in SNAPSHOT_ITEM_COLUMNS),
+        row_model.tag,
+        row_model.score,
+        row_model.metric_type,
+        row_model.value_dimension,
+        row_model.usage_30d,
+        App.id.label("app_id"),
+        App.name.label("app_name"),
+        ranking_company_expr().label("app_company"),
+    )
+
+
+def dump_compact_ranking_rows(rows) -> bytes:
+    return RANKING_COMPACT_ITEMS_ADAPTER.dump_json(RANKING_COMPACT_ITEMS_ADAPTER.validate_python([
+        {
+            "position": row.position,
+            **{name: getattr(row, name) for name in SNAPSHOT_ITEM_COLUMNS},
+            "tag": row.tag,
+            "score": row.score,
+            "metric_type": row.metric_type,
+            "value_dimension": row.value_dimension,
+            "usage_30d": row.usage_30d,
+            "app": {"id": row.app_id, "name": row.app_name, "company": row.app_company or ""},
+        }
+        for row in rows
+    ]))
+
+
+def compact_ranking_items(items: list[dict]) -> list[dict]:
+    """把完整视图的 JSON 条目裁剪为精简视图（静态快照回落时使用）。"""
+    return [
+        {
+            "position": item["position"],
+            **{name: item.get(name) for name in SNAPSHOT_ITEM_COLUMNS},
+            "tag": item["tag"],
+            "score": item["score"],
+            "metric_type": item["metric_type"],
+            "value_dimension": item["value_dimension"],
+            "usage_30d": item["usage_30d"],
+            "app": {
+                "id": item["app"]["id"],
+                "name": item["app"]["name"],
+                "company": item["app"]["company"] or item["app"]["org"],
+            },
+        }
+        for item in items
+    ]
+
+
+def ranking_item_payload(
+    *,
+    app: App,
+    ranking_config_id_value: str | None,
+    position: int,
+    tag: str,
+    score: int,
+    metric_type: str,
+    value_dimension: str,
+    usage_30d: int,
+    declared_at: date,
+    updated_at: datetime | None = None,
+    snapshot: HistoricalRanking | None = None,
+) -> dict:
+    """snapshot 为快照行时一并带出公司内名次与变动字段。"""
+    return {
+        "ranking_config_id": ranking_config_id_value,
+        "position": position,
+        **{name: getattr(snapshot, name, None) for name in SNAPSHOT_ITEM_COLUMNS},
+        "tag": tag,
+        "score": score,
+        "likes": None,
+        "metric_type": metric_type,
+        "value_dimension": value_dimension,
+        "usage_30d": usage_30d,
+        "declared_at": declared_at,
+        "updated_at": updated_at,
+        "app": app,
+    }
+
+
+def apply_ranking_app_filters(
+    query,
+    position_column,
+    *,
+    company: str | None,
+    limit: int | None,
+    offset: int,
+    view: str = "full",
+    materialized_company: bool = False,
+):
+    """省内 / 公司筛选、列投影、排序与分页；materialized_company 时按快照行上物化的公司名与公司内名次读取。"""
+    query = query.filter(App.section == "province")
+    order_column = position_column
+    if company:
+        if materialized_company:
+            row_model = position_column.class_
+            query = query.filter(row_model.app_company == company)
+            order_column = row_model.company_position
+        else:
+            query = query.filter(ranking_company_expr() == company)
+    if view == "compact":
+        query = query.with_entities(*compact_ranking_columns(position_column))
+    else:
+        query = query.options(load_only(*RANKING_ITEM_APP_COLUMNS))
+    query = query.order_by(order_column, App.id)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def load_live_ranking_rows(
+    db: Session,
+    scope_id: str,
+    *,
+    company: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    view: str = "full",
+) -> tuple[list, bool]:
+    """实时榜单行：生效指针 → 不可变快照，读路径不触碰同步中的 Ranking 行。返回 (行, 是否快照行)。"""
+    active_query = (
+        db.query(HistoricalRanking, App)
+        .join(
+            RankingActiveRun,
+            and_(
+                RankingActiveRun.ranking_config_id == HistoricalRanking.ranking_config_id,
+                RankingActiveRun.period_date == HistoricalRanking.period_date,
+                RankingActiveRun.snapshot_run_id == HistoricalRanking.run_id,
+            ),
+        )
+        .join(App, App.id == HistoricalRanking.app_id)
+        .filter(HistoricalRanking.ranking_config_id == scope_id)
+    )
+    active_rows = apply_ranking_app_filters(
+        active_query,
+        HistoricalRanking.position,
+        company=company,
+        limit=limit,
+        offset=offset,
+        view=view,
+        materialized_company=True,
+    ).all()
+    if active_rows or db.get(RankingActiveRun, scope_id) is not None:
+        return active_rows, True
+    # 尚未发布过批次（升级前的旧数据）：回落到 Ranking 表
+    realtime_query = (
+        db.query(Ranking, App)
+        .join(App, App.id == Ranking.app_id)
+        .filter(Ranking.ranking_config_id == scope_id)
+    )
+    realtime_rows = apply_ranking_app_filters(
+        realtime_query, Ranking.position, company=company, limit=limit, offset=offset, view=view
+    ).all()
+    return realtime_rows, False
+
+
+def dump_live_ranking_rows(rows: list, *, snapshot: bool, view: str = "full") -> bytes:
+    if view == "compact":
+        return dump_compact_ranking_rows(rows)
+    if snapshot:
+        return dump_ranking_items([
+            ranking_item_payload(
+                app=app,
+                ranking_config_id_value=hr.ranking_config_id,
+                position=hr.position,
+                tag=hr.tag,
+                score=hr.score,
+                metric_type=hr.metric_type,
+                value_dimension=hr.value_dimension,
+                usage_30d=hr.usage_30d,
+                declared_at=hr.period_date,
+                updated_at=hr.created_at,
+                snapshot=hr,
+            )
+            for hr, app in rows
+        ])
+    return dump_ranking_items([
+        ranking_item_payload(
+            app=app,
+            ranking_config_id_value=row.ranking_config_id,
+            position=row.position,
+            tag=row.tag,
+            score=row.score,
+            metric_type=row.metric_type,
+            value_dimension=row.value_dimension,
+            usage_30d=row.usage_30d,
+            declared_at=row.declared_at,
+            updated_at=row.updated_at,
+        )
+        for row, app in rows
+    ])
+
+
+def render_live_ranking(
+    db: Session,
+    scope_id: str,
+    *,
+    company: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    view: str = "full",
+) -> bytes:
+    """实时榜单 JSON（完整视图或精简视图）。"""
+    rows, snapshot = load_live_ranking_rows(db, scope_id, company=company, limit=limit, offset=offset, view=view)
+    return dump_live_ranking_rows(rows, snapshot=snapshot, view=view)
+
+
+def partition_live_ranking_rows(rows: list, *, snapshot: bool) -> dict[str, list]:
+    """
+    把整榜（完整视图）行按公司拆成公司榜，筛选与排序口径同 `load_live_ranking_rows(company=...)`：
+    快照行按物化公司名、公司内名次排序；Ranking 表回落时按应用当前公司（company 为空回落 org）保持整榜顺序。
+    """
+    groups: dict[str, list] = {}
+    for row, app in rows:
+        company = row.app_company if snapshot else (app.company or app.org)
+        if company:
+            groups.setdefault(company, []).append((row, app))
+    if snapshot:
+        # 与 SQL ORDER BY company_position, App.id 一致：MySQL 升序时 NULL 在前
+        for group in groups.values():
+            group.sort(key=lambda pair: (pair[0].company_position is not None, pair[0].company_position or 0, pair[1].id))
+    return groups
+
+
+def resolve_run_snapshot(db: Session, scope_id: str, run_id: str) -> tuple[date, str] | None:
+    """批次 run_id → (日期, 实际承载快照行的批次)；目录中无此批次时返回 None。"""
+    row = (
+        db.query(RankingRun.period_date, func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id))
+        .filter(RankingRun.ranking_config_id == scope_id, RankingRun.run_id == run_id)
+        .order_by(RankingRun.period_date.desc())
+        .first()
+    )
+    return (row[0], row[1]) if row is not None else None
+
+
+def _snapshot_rows(db: Session, scope_id: str, snapshot: tuple[date, str]) -> list:
+    period_date, run_id = snapshot
+    return (
+        db.query(
+            HistoricalRanking.app_id,
+            HistoricalRanking.app_name,
+            HistoricalRanking.app_org,
+            HistoricalRanking.position,
+            HistoricalRanking.score,
+        )
+        .filter(
+            HistoricalRanking.ranking_config_id == scope_id,
+            HistoricalRanking.period_date == period_date,
+            HistoricalRanking.run_id == run_id,
+        )
+        .order_by(HistoricalRanking.position, HistoricalRanking.app_id)
+        .all()
+    )
+
+
+def render_ranking_diff(db: Session, scope_id: str, from_run: str, to_run: str) -> bytes | None:
+    """
+    两个批次的名次对比 JSON：先按 to_run 名次列出其全部应用（new / up / down / same），
+    再按 from_run 名次列出已跌出的应用（dropped）。任一批次不存在时返回 None。
+    """
+    from_snapshot = resolve_run_snapshot(db, scope_id, from_run)
+    to_snapshot = resolve_run_snapshot(db, scope_id, to_run)
+    if from_snapshot is None or to_snapshot is None:
+        return None
+    remaining = {row.app_id: row for row in _snapshot_rows(db, scope_id, from_snapshot)}
+    items = []
+    for row in _snapshot_rows(db, scope_id, to_snapshot):
+        previous = remaining.pop(row.app_id, None)
+        movement = compute_movement(row.position, previous)
+        items.append({
+            "app_id": row.app_id,
+            "app_name": row.app_name,
+            "app_org": row.app_org,
+            "from_position": movement["previous_position"],
+            "to_position": row.position,
+            "from_score": movement["previous_score"],
+            "to_score": row.score,
+            "position_delta": movement["position_delta"],
+            "score_delta": row.score - previous.score if previous is not None else None,
+            "movement": movement["movement"],
+        })
+    for row in remaining.values():
+        items.append({
+            "app_id": row.app_id,
+            "app_name": row.app_name,
+            "app_org": row.app_org,
+            "from_position": row.position,
+            "from_score": row.score,
+            "movement": MOVEMENT_DROPPED,
+        })
+    return RankingDiff(
+        ranking_config_id=scope_id,
+        from_run={"run_id": from_run, "period_date": from_snapshot[0]},
+        to_run={"run_id": to_run, "period_date": to_snapshot[0]},
+        items=items,
+    ).model_dump_json().encode("utf-8")
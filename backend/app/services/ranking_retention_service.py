@@ -0,0 +1,193 @@
+"""榜单快照保留策略——按批次目录挑选可清理批次，并分块删除历史快照行。
+
+保留规则（按 榜单 × 日期 分组）：
+- 经发布入口产出的批次全部保留
+- 中间批次（链路变更触发的同步）只保留最近 `RANKING_SNAPSHOT_KEEP_PER_DAY` 个
+- 被保留批次通过 snapshot_run_id 引用的快照行及其所属批次的目录行不删除
+- 实时榜单生效指针所指批次及其快照始终保留
+- 无 run_id 的旧版快照不参与清理
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import database as _database
+from ..config import settings
+from ..dependencies import write_ranking_audit_log
+from ..models import HistoricalRanking, RankingActiveRun, RankingRun
+from .cache_service import RANKINGS_DATA_VERSION, bump_data_version
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SnapshotPurgePlan:
+    run_row_ids: frozenset[int]  # 待删除的 ranking_runs 行
+    snapshot_keys: frozenset[tuple[str, date, str]]  # 待删除快照行的 (榜单, 日期, run_id)
+
+
+@dataclass(frozen=True)
+class SnapshotPurgeResult:
+    purged_runs: int
+    purged_rows: int
+    batches: int
+
+
+def plan_snapshot_purge(
+    runs: list,
+    keep_per_day: int,
+    pinned: frozenset[tuple[str, date, str]] = frozenset(),
+) -> SnapshotPurgePlan:
+    """
+    根据保留规则计算清理计划；runs 为同一批 (榜单, 日期) 分组下的全部目录行，
+    pinned 为必须保留的 (榜单, 日期, run_id)（生效指针所指批次）。
+    """
+    groups: dict[tuple[str, date], list] = {}
+    for run in runs:
+        if run.run_id is None:
+            continue
+        groups.setdefault((run.ranking_config_id, run.period_date), []).append(run)
+
+    dropped = []
+    referenced: set[tuple[str, date, str]] = set()
+    for (config_id, period_date), group in groups.items():
+        group.sort(key=lambda run: (run.created_at or datetime.min, run.id), reverse=True)
+        intermediate_kept = 0
+        for run in group:
+            is_pinned = (config_id, period_date, run.run_id) in pinned
+            keep = run.is_published or is_pinned or intermediate_kept < keep_per_day
+            if keep:
+                if not (run.is_published or is_pinned):
+                    intermediate_kept += 1
+                referenced.add((config_id, period_date, run.snapshot_run_id or run.run_id))
+            else:
+                dropped.append(run)
+
+    # 被保留批次引用的快照所属批次，其目录行也保留：快照行仍在，删掉目录行后再无批次能把它清理掉
+    run_row_ids = {
+        run.id
+        for run in dropped
+        if (run.ranking_config_id, run.period_date, run.run_id) not in referenced
+    }
+    # 按被清理批次实际指向的快照清理（复用快照的批次自身没有快照行）
+    snapshot_keys = {
+        (run.ranking_config_id, run.period_date, run.snapshot_run_id or run.run_id)
+        for run in dropped
+    } - referenced
+    return SnapshotPurgePlan(
+        run_row_ids=frozenset(run_row_ids),
+        snapshot_keys=frozenset(snapshot_keys),
+    )
+
+
+def load_purge_candidates(db: Session, keep_per_day: int) -> list[RankingRun]:
+    """只加载中间批次数超过保留上限的 (榜单, 日期) 分组，避免全表读取目录。"""
+    crowded = (
+        db.query(RankingRun.ranking_config_id, RankingRun.period_date)
+        .filter(RankingRun.run_id.is_not(None), RankingRun.is_published.is_(False))
+        .group_by(RankingRun.ranking_config_id, RankingRun.period_date)
+        .having(func.count(RankingRun.id) > keep_per_day)
+        .all()
+    )
+    runs: list[RankingRun] = []
+    for config_id, period_date in crowded:
+        runs.extend(
+            db.query(RankingRun)
+            .filter(RankingRun.ranking_config_id == config_id, RankingRun.period_date == period_date)
+            .all()
+        )
+    return runs
+
+
+def purge_snapshot_rows(db: Session, key: tuple[str, date, str], chunk_size: int) -> tuple[int, int]:
+    """按主键分块删除单个批次的快照行，每块独立提交以缩短 InnoDB 行锁持有时间。返回 (行数, 块数)。"""
+    config_id, period_date, run_id = key
+    removed = 0
+    batches = 0
+    while True:
+        ids = [
+            row[0]
+            for row in db.query(HistoricalRanking.id)
+            .filter(
+                HistoricalRanking.ranking_config_id == config_id,
+                HistoricalRanking.period_date == period_date,
+                HistoricalRanking.run_id == run_id,
+            )
+            .order_by(HistoricalRanking.id)
+            .limit(chunk_size)
+            .all()
+        ]
+        if not ids:
+            return removed, batches
+        db.query(HistoricalRanking).filter(HistoricalRanking.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        removed += len(ids)
+        batches += 1
+
+
+def purge_ranking_snapshots(
+    session_factory=None,
+    *,
+    keep_per_day: int | None = None,
+    chunk_size: int | None = None,
+    actor: str = "system",
+) -> SnapshotPurgeResult:
+    """
+    执行一轮快照清理：先分块删快照行，再删目录行。
+    中途失败时目录行仍在，下一轮会重新选中并继续清理。
+    """
+    keep = keep_per_day or settings.ranking_snapshot_keep_per_day
+    chunk = chunk_size or settings.ranking_snapshot_purge_chunk_size
+    factory = session_factory or _database.SessionLocal
+    db = factory()
+    try:
+        pinned = frozenset(
+            (pointer.ranking_config_id, pointer.period_date, pointer.run_id)
+            for pointer in db.query(RankingActiveRun).all()
+        )
+        plan = plan_snapshot_purge(load_purge_candidates(db, keep), keep, pinned)
+        db.rollback()
+        if not plan.run_row_ids and not plan.snapshot_keys:
+            return SnapshotPurgeResult(purged_runs=0, purged_rows=0, batches=0)
+
+        purged_rows = 0
+        batches = 0
+        for key in sorted(plan.snapshot_keys):
+            removed, used = purge_snapshot_rows(db, key, chunk)
+            purged_rows += removed
+            batches += used
+
+        run_row_ids = sorted(plan.run_row_ids)
+        for start in range(0, len(run_row_ids), chunk):
+            db.query(RankingRun).filter(
+                RankingRun.id.in_(run_row_ids[start:start + chunk])
+            ).delete(synchronize_session=False)
+            db.commit()
+            batches += 1
+
+        write_ranking_audit_log(
+            db,
+            action="ranking_snapshots_purged",
+            period_date=datetime.utcnow().date(),
+            actor=actor,
+            payload_summary=(
+                f"keep_per_day={keep},chunk_size={chunk},"
+                f"purged_runs={len(run_row_ids)},purged_rows={purged_rows},batches={batches}"
+            ),
+        )
+        bump_data_version(db, RANKINGS_DATA_VERSION)
+        db.commit()
+        logger.info(
+            "ranking snapshot purge finished runs=%d rows=%d batches=%d",
+            len(run_row_ids), purged_rows, batches,
+        )
+        return SnapshotPurgeResult(purged_runs=len(run_row_ids), purged_rows=purged_rows, batches=batches)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
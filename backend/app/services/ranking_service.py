@@ -3,13 +3,21 @@
 从 main.py 提取，可脱离 HTTP 层独立测试。
 """
 
+import hashlib
 import json as _json
 import logging
 import uuid as _uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import date, datetime
+from time import perf_counter
 
+import numpy as np
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ..dependencies import structured_error_detail, write_ranking_audit_log
 from ..models import (
@@ -19,8 +27,14 @@ from ..models import (
     HistoricalRanking,
     Ranking,
     RankingConfig,
+    RankingActiveRun,
+    RankingConfigDimension,
     RankingDimension,
+    RankingRun,
 )
+from .cache_service import RANKINGS_DATA_VERSION, bump_data_version
+from .ranking_read_service import compute_movement
+from .scoring_engine import AppColumns, rule_for_dimension, score_dimension_matrix, weighted_final_scores
 
 logger = logging.getLogger(__name__)
 DEFAULT_RANKING_TAG = "推荐"
@@ -87,37 +101,7 @@ def calculate_app_score(app: App, dimensions: list[RankingDimension]) -> int:
 
     base_score = 0.0
     for dimension in dimensions:
-        dimension_score = 0
-        if dimension.name == "用户满意度":
-            dimension_score = min(int(app.monthly_calls * 10), 100)
-        elif dimension.name == "业务价值":
-            if app.effectiveness_type == "revenue_growth":
-                dimension_score = 100
-            elif app.effectiveness_type == "efficiency_gain":
-                dimension_score = 80
-            elif app.effectiveness_type == "cost_reduction":
-                dimension_score = 70
-            else:
-                dimension_score = 60
-        elif dimension.name == "技术创新性":
-            if app.difficulty == "High":
-                dimension_score = 100
-            elif app.difficulty == "Medium":
-                dimension_score = 70
-            else:
-                dimension_score = 40
-        elif dimension.name == "使用活跃度":
-            dimension_score = min(int(app.monthly_calls * 5), 100)
-        elif dimension.name == "稳定性和安全性":
-            if app.status == "available":
-                dimension_score = 100
-            elif app.status == "beta":
-                dimension_score = 80
-            else:
-                dimension_score = 60
-        else:
-            dimension_score = 50
-
+        dimension_score, _ = calculate_dimension_score(app, dimension)
         base_score += dimension_score * dimension.weight
 
     final_score = int(base_score * app.ranking_weight)
@@ -126,55 +110,12 @@ def calculate_app_score(app: App, dimensions: list[RankingDimension]) -> int:
 
 def calculate_dimension_score(app: App, dimension: RankingDimension) -> tuple[int, str]:
     """
-    计算应用在某个维度的得分和计算详情
+    计算应用在某个维度的得分和计算详情（单应用入口；批量同步走 scoring_engine 列式计算）
     返回：(得分, 计算详情说明)
     """
-    dimension_score = 0
-    calculation_detail = ""
-
-    if dimension.name == "用户满意度":
-        dimension_score = min(int(app.monthly_calls * 10), 100)
-        calculation_detail = f"基于月调用量计算：{app.monthly_calls} * 10 = {dimension_score}分"
-    elif dimension.name == "业务价值":
-        if app.effectiveness_type == "revenue_growth":
-            dimension_score = 100
-            calculation_detail = "成效类型为拉动收入，获得满分100分"
-        elif app.effectiveness_type == "efficiency_gain":
-            dimension_score = 80
-            calculation_detail = "成效类型为增效，获得80分"
-        elif app.effectiveness_type == "cost_reduction":
-            dimension_score = 70
-            calculation_detail = "成效类型为降本，获得70分"
-        else:
-            dimension_score = 60
-            calculation_detail = "成效类型为感知提升，获得60分"
-    elif dimension.name == "技术创新性":
-        if app.difficulty == "High":
-            dimension_score = 100
-            calculation_detail = "难度等级为高，获得满分100分"
-        elif app.difficulty == "Medium":
-            dimension_score = 70
-            calculation_detail = "难度等级为中，获得70分"
-        else:
-            dimension_score = 40
-            calculation_detail = "难度等级为低，获得40分"
-    elif dimension.name == "使用活跃度":
-        dimension_score = min(int(app.monthly_calls * 5), 100)
-        calculation_detail = f"基于月调用量计算：{app.monthly_calls} * 5 = {dimension_score}分"
-    elif dimension.name == "稳定性和安全性":
-        if app.status == "available":
-            dimension_score = 100
-            calculation_detail = "应用状态为可用，获得满分100分"
-        elif app.status == "beta":
-            dimension_score = 80
-            calculation_detail = "应用状态为试运行，获得80分"
-        else:
-            dimension_score = 60
-            calculation_detail = f"应用状态为{app.status}，获得60分"
-    else:
-        dimension_score = 50
-        calculation_detail = "默认评分50分"
-
+    rule = rule_for_dimension(dimension)
+    dimension_score = rule.score_one(app)
+    calculation_detail = rule.detail(app, dimension_score)
     return dimension_score, calculation_detail
 
 
@@ -200,239 +141,1211 @@ def calculate_three_layer_score(
 
 
 # ---------------------------------------------------------------------------
-# 榜单同步核心服务
+# 批量同步基础设施（预取 / 批量写回 / 阶段计时）
 # ---------------------------------------------------------------------------
 
-def sync_rankings_service(db: Session, run_id: str | None = None, actor: str = "system") -> tuple[int, str]:
+BULK_WRITE_CHUNK_SIZE = 500
+MANUAL_SCORE_PREFIX = "手动调整评分"
+
+
+class SyncPhaseTimer:
+    """按阶段累计同步耗时（毫秒），写入审计摘要与日志。"""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (perf_counter() - started) * 1000
+
+    def merge(self, other: "SyncPhaseTimer") -> None:
+        for name, elapsed in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def summary(self) -> str:
+        return ",".join(f"{name}_ms={elapsed:.1f}" for name, elapsed in self.phases.items())
+
+
+@dataclass(frozen=True)
+class RankingSyncResult:
+    updated_count: int
+    run_id: str
+    timings_ms: dict[str, float]
+
+
+@dataclass(frozen=True)
+class RankingSyncScope:
     """
-    同步排行榜数据（支持三层架构）
-    - 遍历每个榜单配置
-    - 获取参与该榜单的应用
-    - 根据榜单配置的维度权重计算得分
-    - 生成排名并保存历史数据
+    链路变更声明的影响范围（增量重算）。
+    - app_ids：仅重算这些应用，并对名次做有序修复
+    - config_ids / dimension_ids：限定受影响的榜单（维度展开为引用它的榜单）
+    - 仅给出 app_ids 时，受影响榜单为应用当前参与或已上榜的榜单
     """
-    # 获取所有活跃的榜单配置
-    ranking_configs = (
-        db.query(RankingConfig)
-        .filter(RankingConfig.is_active.is_(True))
+    app_ids: frozenset[int] = frozenset()
+    config_ids: frozenset[str] = frozenset()
+    dimension_ids: frozenset[int] = frozenset()
+
+    @classmethod
+    def for_app(cls, app_id: int, *config_ids: str | None) -> "RankingSyncScope":
+        return cls(app_ids=frozenset({app_id}), config_ids=frozenset(cid for cid in config_ids if cid))
+
+    @classmethod
+    def for_configs(cls, *config_ids: str | None) -> "RankingSyncScope":
+        return cls(config_ids=frozenset(cid for cid in config_ids if cid))
+
+    @classmethod
+    def for_dimension(cls, dimension_id: int) -> "RankingSyncScope":
+        return cls(dimension_ids=frozenset({dimension_id}))
+
+    def describe(self) -> str:
+        return (
+            f"apps={','.join(str(i) for i in sorted(self.app_ids))};"
+            f"configs={','.join(sorted(self.config_ids))};"
+            f"dimensions={','.join(str(i) for i in sorted(self.dimension_ids))}"
+        )
+
+
+def ranking_sort_key(score: int, app_id: int) -> tuple[int, int]:
+    """全量与增量同步共用的名次排序键：分数降序；同分按 app_id 升序，避免重算后顺序抖动。"""
+    return -score, app_id
+
+
+def is_manual_dimension_score(calculation_detail: str | None) -> bool:
+    return (calculation_detail or "").startswith(MANUAL_SCORE_PREFIX)
+
+
+def bulk_upsert_rows(db: Session, table, rows: list[dict], update_columns: tuple[str, ...]) -> None:
+    """INSERT ... ON DUPLICATE KEY UPDATE 分块 executemany 写回。"""
+    if not rows:
+        return
+    stmt = mysql_insert(table)
+    stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+    for start in range(0, len(rows), BULK_WRITE_CHUNK_SIZE):
+        db.execute(stmt, rows[start:start + BULK_WRITE_CHUNK_SIZE])
+
+
+def prefetch_dimension_scores(
+    db: Session,
+    *,
+    ranking_config_id: str,
+    period_date: date,
+    app_ids: set[int] | None = None,
+) -> dict[tuple[int, int], tuple]:
+    """一次性读取榜单当日全部维度分值，返回 {(app_id, dimension_id): 行}，并清理重复脏数据。"""
+    query = (
+        db.query(
+            AppDimensionScore.id,
+            AppDimensionScore.app_id,
+            AppDimensionScore.dimension_id,
+            AppDimensionScore.dimension_name,
+            AppDimensionScore.score,
+            AppDimensionScore.weight,
+            AppDimensionScore.calculation_detail,
+        )
+        .filter(
+            AppDimensionScore.ranking_config_id == ranking_config_id,
+            AppDimensionScore.period_date == period_date,
+        )
+    )
+    if app_ids is not None:
+        if not app_ids:
+            return {}
+        query = query.filter(AppDimensionScore.app_id.in_(app_ids))
+    rows = query.order_by(AppDimensionScore.updated_at.desc(), AppDimensionScore.id.desc()).all()
+
+    scores: dict[tuple[int, int], tuple] = {}
+    stale_ids: list[int] = []
+    for row in rows:
+        key = (row.app_id, row.dimension_id)
+        if key in scores:
+            stale_ids.append(row.id)
+        else:
+            scores[key] = row
+    if stale_ids:
+        db.query(AppDimensionScore).filter(AppDimensionScore.id.in_(stale_ids)).delete(synchronize_session=False)
+    return scores
+
+
+def prefetch_realtime_rankings(db: Session, ranking_config_id: str) -> dict[int, tuple]:
+    rows = (
+        db.query(Ranking.app_id, Ranking.position, Ranking.score, Ranking.tag, Ranking.usage_30d)
+        .filter(Ranking.ranking_config_id == ranking_config_id)
         .all()
     )
-    active_config_ids = {config.id for config in ranking_configs}
-
-    # 全局清理：非活跃（或已删除）配置的实时榜单记录，避免首页残留脏数据
-    stale_realtime_query = db.query(Ranking)
-    if active_config_ids:
-        stale_realtime_query = stale_realtime_query.filter(~Ranking.ranking_config_id.in_(active_config_ids))
-    removed_global_realtime_rows = stale_realtime_query.delete(synchronize_session=False)
-
-    # 获取所有维度
-    dimensions = (
-        db.query(RankingDimension)
-        .filter(RankingDimension.is_active.is_(True))
-        .order_by(RankingDimension.id)
+    return {row.app_id: row for row in rows}
+
+
+def prefetch_historical_run_rows(
+    db: Session,
+    *,
+    ranking_config_id: str,
+    period_date: date,
+    run_id: str,
+) -> dict[int, tuple]:
+    rows = (
+        db.query(
+            HistoricalRanking.app_id,
+            HistoricalRanking.position,
+            HistoricalRanking.score,
+            HistoricalRanking.tag,
+            HistoricalRanking.app_company,
+            HistoricalRanking.company_position,
+            HistoricalRanking.previous_position,
+            HistoricalRanking.previous_score,
+            HistoricalRanking.movement,
+        )
+        .filter(
+            HistoricalRanking.ranking_config_id == ranking_config_id,
+            HistoricalRanking.period_date == period_date,
+            HistoricalRanking.run_id == run_id,
+        )
         .all()
     )
+    return {row.app_id: row for row in rows}
 
-    # 创建维度ID到维度对象的映射
-    dimension_map = {d.id: d for d in dimensions}
 
-    updated_count = 0
-    today = datetime.now().date()
-    current_run_id = (run_id or str(_uuid.uuid4())).strip()
-    if not current_run_id:
-        current_run_id = str(_uuid.uuid4())
+def load_ranking_participants(
+    db: Session,
+    ranking_config_id: str,
+    app_ids: set[int] | None = None,
+) -> list[AppRankingSetting]:
+    """读取参与榜单的启用设置（含 App），仅保留省内未下架应用；可限定应用范围。"""
+    query = (
+        db.query(AppRankingSetting)
+        .filter(
+            AppRankingSetting.ranking_config_id == ranking_config_id,
+            AppRankingSetting.is_enabled.is_(True)
+        )
+    )
+    if app_ids is not None:
+        if not app_ids:
+            return []
+        query = query.filter(AppRankingSetting.app_id.in_(app_ids))
+    app_settings = query.options(joinedload(AppRankingSetting.app)).all()
+    return [
+        setting
+        for setting in app_settings
+        if setting.app and setting.app.section == "province" and setting.app.status != "offline"
+    ]
+
+
+def compute_config_scores(
+    config_id: str,
+    participants: list[AppRankingSetting],
+    config_dimensions: list[dict],
+    dimension_map: dict[int, RankingDimension],
+    existing_scores: dict[tuple[int, int], tuple],
+    period_date: date,
+    now: datetime,
+) -> tuple[list[dict], list[dict], int]:
+    """
+    在内存中计算维度分与最终得分。
+    返回：(按名次排序的得分列表, 需写回的维度分行, 处理的维度分数量)
+    """
+    dimensions: list[RankingDimension] = []
+    weights: list[float] = []
+    for dim_config in config_dimensions:
+        dimension = dimension_map.get(dim_config.get("dim_id"))
+        if dimension:
+            dimensions.append(dimension)
+            weights.append(dim_config.get("weight", 1.0))
+
+    # 全部参与应用 × 维度一次性按规则计算，再逐格套用手动评分覆盖
+    matrix = score_dimension_matrix(AppColumns([setting.app for setting in participants]), dimensions)
+    dim_scores = matrix.scores.copy()
+    score_rows: list[dict] = []
+    processed = 0
+    for row, setting in enumerate(participants):
+        app = setting.app
+        # 维度分值来源收敛规则：
+        # 1) 手动评分（calculation_detail 以"手动调整评分"开头）优先
+        # 2) 否则按规则自动计算并落库
+        for col, dimension in enumerate(dimensions):
+            weight = weights[col]
+            existing = existing_scores.get((app.id, dimension.id))
+            if existing is not None and is_manual_dimension_score(existing.calculation_detail):
+                dim_score, calc_detail = existing.score, existing.calculation_detail
+                dim_scores[row, col] = dim_score
+            else:
+                dim_score, calc_detail = int(dim_scores[row, col]), matrix.detail(row, col)
 
-    for config in ranking_configs:
-        config_dimension_updates = 0
-        config_ranking_updates = 0
-        config_historical_updates = 0
-
-        # 从关联表读取榜单配置的维度权重
-        config_dimensions = [
-            {"dim_id": d.dimension_id, "weight": d.weight}
-            for d in config.dimensions
-        ] if config.dimensions else []
-
-        # 获取参与该榜单的应用设置
-        app_settings = (
-            db.query(AppRankingSetting)
-            .filter(
-                AppRankingSetting.ranking_config_id == config.id,
-                AppRankingSetting.is_enabled.is_(True)
+            unchanged = existing is not None and (
+                existing.dimension_name == dimension.name
+                and existing.score == dim_score
+                and existing.weight == weight
+                and existing.calculation_detail == calc_detail
             )
-            .options(joinedload(AppRankingSetting.app))
+            if not unchanged:
+                score_rows.append({
+                    "app_id": app.id,
+                    "ranking_config_id": config_id,
+                    "dimension_id": dimension.id,
+                    "dimension_name": dimension.name,
+                    "score": dim_score,
+                    "weight": weight,
+                    "calculation_detail": calc_detail,
+                    "period_date": period_date,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            processed += 1
+
+    # 应用权重因子（使用已收敛的维度分值）
+    weight_factors = np.fromiter(
+        (setting.weight_factor for setting in participants), dtype=np.float64, count=len(participants)
+    )
+    final_scores = weighted_final_scores(dim_scores, weights, weight_factors)
+    app_scores = [
+        {"app": setting.app, "setting": setting, "score": int(final_score)}
+        for setting, final_score in zip(participants, final_scores)
+    ]
+
+    app_scores.sort(key=lambda x: ranking_sort_key(x["score"], x["app"].id))
+    return app_scores, score_rows, processed
+
+
+def resolve_ranking_entry(setting: AppRankingSetting, app: App) -> tuple[str, int]:
+    """返回榜单条目的 (标签, 近30日调用量)。"""
+    tag = setting.custom_tags.strip() if setting.custom_tags else DEFAULT_RANKING_TAG
+    usage_30d = int(app.monthly_calls * 1000) if app.monthly_calls else 0
+    return tag, usage_30d
+
+
+def repair_ranking_order(
+    current: list[tuple[int, int]],
+    removed_app_ids: set[int],
+    inserted: list[tuple[int, int]],
+) -> tuple[list[int], int]:
+    """
+    对已按名次排列的 [(score, app_id)] 做有序删除 / 插入，避免整榜重排。
+    排序键与全量同步相同（ranking_sort_key）；现有顺序不符合该排序键时（旧数据或手工改过名次）整榜重排，
+    保证结果与全量同步一致。
+    返回：(新顺序的 app_id 列表, 首个可能变动的下标)
+    """
+    keys = [ranking_sort_key(score, app_id) for score, app_id in current]
+    if any(keys[index] > keys[index + 1] for index in range(len(keys) - 1)):
+        keys = sorted(
+            [key for key in keys if key[1] not in removed_app_ids]
+            + [ranking_sort_key(score, app_id) for score, app_id in inserted]
+        )
+        return [app_id for _, app_id in keys], 0
+    old_scores = {app_id: score for score, app_id in current}
+    first_touched = len(keys)
+    for app_id in removed_app_ids:
+        if app_id not in old_scores:
+            continue
+        index = bisect_left(keys, ranking_sort_key(old_scores[app_id], app_id))
+        keys.pop(index)
+        first_touched = min(first_touched, index)
+    for score, app_id in inserted:
+        key = ranking_sort_key(score, app_id)
+        index = bisect_left(keys, key)
+        keys.insert(index, key)
+        first_touched = min(first_touched, index)
+    return [app_id for _, app_id in keys], first_touched
+
+
+def bulk_move_positions(db: Session, ranking_config_id: str, moves: list[dict], now: datetime) -> None:
+    """仅改名次的行按 (榜单, 应用) 分块 executemany 更新。"""
+    if not moves:
+        return
+    table = Ranking.__table__
+    stmt = (
+        update(table)
+        .where(table.c.ranking_config_id == ranking_config_id, table.c.app_id == bindparam("b_app_id"))
+        .values(position=bindparam("b_position"), updated_at=now)
+    )
+    for start in range(0, len(moves), BULK_WRITE_CHUNK_SIZE):
+        db.execute(stmt, moves[start:start + BULK_WRITE_CHUNK_SIZE])
+
+
+def assign_company_positions(rows: list) -> list[dict]:
+    """按名次顺序为每行计算公司内名次；rows 为 (行ID, 展示口径公司名)，返回 executemany 参数。"""
+    counts: dict[str, int] = {}
+    updates = []
+    for row_id, company in rows:
+        counts[company] = counts.get(company, 0) + 1
+        updates.append({"b_id": row_id, "b_company_position": counts[company]})
+    return updates
+
+
+def find_baseline_snapshot(db: Session, *, ranking_config_id: str, period_date: date) -> tuple[date, str] | None:
+    """
+    变动基准：更早日期中最近一次发布的批次（榜单从未发布过时取更早日期最近的批次），返回其 (日期, 快照批次)。
+    同一日期的各批次共用同一基准，复用快照的批次因此与被复用批次的变动一致。
+    """
+    for published_only in (True, False):
+        query = db.query(
+            RankingRun.period_date,
+            func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id),
+        ).filter(
+            RankingRun.ranking_config_id == ranking_config_id,
+            RankingRun.period_date < period_date,
+            RankingRun.run_id.is_not(None),
+        )
+        if published_only:
+            query = query.filter(RankingRun.is_published.is_(True))
+        row = query.order_by(RankingRun.period_date.desc(), RankingRun.created_at.desc(), RankingRun.id.desc()).first()
+        if row is not None:
+            return row[0], row[1]
+    return None
+
+
+def load_baseline_rows(
+    db: Session,
+    ranking_config_id: str,
+    baseline: tuple[date, str] | None,
+    app_ids: set[int] | None = None,
+) -> dict[int, tuple]:
+    if baseline is None or app_ids is not None and not app_ids:
+        return {}
+    period_date, run_id = baseline
+    query = db.query(
+        HistoricalRanking.app_id,
+        HistoricalRanking.position,
+        HistoricalRanking.score,
+    ).filter(
+        HistoricalRanking.ranking_config_id == ranking_config_id,
+        HistoricalRanking.period_date == period_date,
+        HistoricalRanking.run_id == run_id,
+    )
+    if app_ids is not None:
+        query = query.filter(HistoricalRanking.app_id.in_(app_ids))
+    return {row.app_id: row for row in query.all()}
+
+
+def find_working_snapshot(db: Session, *, ranking_config_id: str, period_date: date, run_id: str) -> str | None:
+    """
+    增量同步可原地修补的快照：本日期最近一个批次指向的快照，且没有已发布批次指向它。
+    本日期尚无批次（跨日后首次同步）或最近快照已发布（发布批次的快照不可变）时返回 None。
+    """
+    previous = (
+        db.query(RankingRun.run_id, RankingRun.snapshot_run_id)
+        .filter(
+            RankingRun.ranking_config_id == ranking_config_id,
+            RankingRun.period_date == period_date,
+            RankingRun.run_id.is_not(None),
+            RankingRun.run_id != run_id,
+        )
+        .order_by(RankingRun.created_at.desc(), RankingRun.id.desc())
+        .first()
+    )
+    if previous is None:
+        return None
+    snapshot_run_id = previous.snapshot_run_id or previous.run_id
+    published = (
+        db.query(RankingRun.id)
+        .filter(
+            RankingRun.ranking_config_id == ranking_config_id,
+            RankingRun.period_date == period_date,
+            RankingRun.is_published.is_(True),
+            func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id) == snapshot_run_id,
+        )
+        .first()
+    )
+    return None if published else snapshot_run_id
+
+
+def patch_working_snapshot(
+    db: Session,
+    config: RankingConfig,
+    *,
+    period_date: date,
+    snapshot_run_id: str,
+    ordered_app_ids: list[int],
+    first_touched: int,
+    refreshed: dict[int, dict],
+    current_positions: dict[int, int],
+    removed_app_ids: list[int],
+    now: datetime,
+) -> int:
+    """
+    把增量重算的结果原地写入共享快照：删除移出的应用、整行改写重算的应用、只改名次与变动的被挤动行，
+    再只为涉及的公司重排公司内名次。写入量与受影响行数成正比，不复制整榜。返回写入行数。
+    """
+    metric_type = config.calculation_method or "composite"
+    table = HistoricalRanking.__table__
+    snapshot_filter = (
+        HistoricalRanking.ranking_config_id == config.id,
+        HistoricalRanking.period_date == period_date,
+        HistoricalRanking.run_id == snapshot_run_id,
+    )
+    touched_app_ids = set(refreshed) | set(removed_app_ids)
+    companies = {
+        row.app_company
+        for row in db.query(HistoricalRanking.app_company)
+        .filter(*snapshot_filter, HistoricalRanking.app_id.in_(touched_app_ids))
+        .all()
+    } if touched_app_ids else set()
+
+    changed = [
+        (index + 1, app_id)
+        for index, app_id in enumerate(ordered_app_ids[first_touched:], start=first_touched)
+        if app_id in refreshed or current_positions.get(app_id) != index + 1
+    ]
+    baseline_rows = load_baseline_rows(
+        db,
+        config.id,
+        find_baseline_snapshot(db, ranking_config_id=config.id, period_date=period_date),
+        app_ids={app_id for _, app_id in changed},
+    )
+
+    if removed_app_ids:
+        db.query(HistoricalRanking).filter(
+            *snapshot_filter, HistoricalRanking.app_id.in_(removed_app_ids)
+        ).delete(synchronize_session=False)
+
+    patched_rows: list[dict] = []
+    moved_rows: list[dict] = []
+    for position, app_id in changed:
+        movement = compute_movement(position, baseline_rows.get(app_id))
+        item = refreshed.get(app_id)
+        if item is None:
+            moved_rows.append({"b_app_id": app_id, "b_position": position, **{f"b_{k}": v for k, v in movement.items()}})
+            continue
+        app = item["app"]
+        tag, usage_30d = resolve_ranking_entry(item["setting"], app)
+        company = app.company or app.org
+        companies.add(company)
+        patched_rows.append({
+            "ranking_config_id": config.id,
+            "period_date": period_date,
+            "run_id": snapshot_run_id,
+            "position": position,
+            "app_id": app_id,
+            "app_name": app.name,
+            "app_org": app.org,
+            "tag": tag,
+            "score": item["score"],
+            "metric_type": metric_type,
+            "value_dimension": app.effectiveness_type,
+            "usage_30d": usage_30d,
+            "app_company": company,
+            "company_position": None,
+            **movement,
+            "created_at": now,
+        })
+    bulk_upsert_rows(db, table, patched_rows, SNAPSHOT_PATCH_COLUMNS)
+    move_stmt = (
+        update(table)
+        .where(
+            table.c.ranking_config_id == config.id,
+            table.c.period_date == period_date,
+            table.c.run_id == snapshot_run_id,
+            table.c.app_id == bindparam("b_app_id"),
+        )
+        .values(
+            position=bindparam("b_position"),
+            **{column: bindparam(f"b_{column}") for column in SNAPSHOT_MOVEMENT_COLUMNS},
+        )
+    )
+    for start in range(0, len(moved_rows), BULK_WRITE_CHUNK_SIZE):
+        db.execute(move_stmt, moved_rows[start:start + BULK_WRITE_CHUNK_SIZE])
+
+    # 插入 / 移出只改变同公司应用之间的相对顺序，其他公司的公司内名次不变
+    company_updates: list[dict] = []
+    if companies:
+        company_rows = (
+            db.query(HistoricalRanking.id, HistoricalRanking.app_company)
+            .filter(*snapshot_filter, HistoricalRanking.app_company.in_(companies))
+            .order_by(HistoricalRanking.position, HistoricalRanking.app_id)
             .all()
         )
+        company_updates = assign_company_positions([(row.id, row.app_company) for row in company_rows])
+        company_stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(company_position=bindparam("b_company_position"))
+        )
+        for start in range(0, len(company_updates), BULK_WRITE_CHUNK_SIZE):
+            db.execute(company_stmt, company_updates[start:start + BULK_WRITE_CHUNK_SIZE])
+
+    # 共享快照内容已变：指向它的各批次内容哈希失效，避免之后按旧哈希误判复用
+    db.query(RankingRun).filter(
+        RankingRun.ranking_config_id == config.id,
+        RankingRun.period_date == period_date,
+        func.coalesce(RankingRun.snapshot_run_id, RankingRun.run_id) == snapshot_run_id,
+    ).update({"content_hash": None}, synchronize_session=False)
+    return len(removed_app_ids) + len(patched_rows) + len(moved_rows)
+
+
+DIMENSION_SCORE_UPSERT_COLUMNS = ("dimension_name", "score", "weight", "calculation_detail", "updated_at")
+RANKING_UPSERT_COLUMNS = ("position", "score", "tag", "usage_30d", "updated_at")
+SNAPSHOT_MOVEMENT_COLUMNS = ("previous_position", "previous_score", "position_delta", "movement")
+SNAPSHOT_DERIVED_COLUMNS = ("company_position", *SNAPSHOT_MOVEMENT_COLUMNS)
+HISTORICAL_UPSERT_COLUMNS = ("position", "score", "tag", "app_company", *SNAPSHOT_DERIVED_COLUMNS)
+SNAPSHOT_PATCH_COLUMNS = ("app_name", "app_org", "metric_type", "value_dimension", "usage_30d", *HISTORICAL_UPSERT_COLUMNS)
+RANKING_RUN_UPSERT_COLUMNS = ("row_count", "content_hash", "snapshot_run_id", "duration_ms", "updated_at")
+
+
+def snapshot_content_entry(
+    position: int,
+    app: App,
+    *,
+    tag: str,
+    score: int,
+    metric_type: str,
+    usage_30d: int,
+) -> tuple:
+    """
+    参与内容哈希的快照行：各列都取自本次计算的来源（榜单配置、应用当前字段），
+    不读实时榜单表里可能过期的 metric_type / value_dimension，相同榜单内容总得到相同哈希。
+    """
+    return (
+        position, app.id, app.name, app.org, tag, score, metric_type, app.effectiveness_type, usage_30d,
+        app.company or app.org,
+    )
+
+
+def compute_snapshot_hash(entries: list[tuple]) -> str:
+    """按名次顺序对快照内容做 SHA-256，用于识别与上一批次完全相同的快照。"""
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(_json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def find_previous_ranking_run(
+    db: Session,
+    *,
+    ranking_config_id: str,
+    period_date: date,
+    run_id: str,
+) -> RankingRun | None:
+    """同一榜单同一日期、本批次之前最近一次带内容哈希的目录行。"""
+    return (
+        db.query(RankingRun)
+        .filter(
+            RankingRun.ranking_config_id == ranking_config_id,
+            RankingRun.period_date == period_date,
+            RankingRun.run_id != run_id,
+            RankingRun.content_hash.is_not(None),
+        )
+        .order_by(RankingRun.created_at.desc(), RankingRun.id.desc())
+        .first()
+    )
+
+
+def resolve_snapshot_dedup(
+    db: Session,
+    *,
+    ranking_config_id: str,
+    period_date: date,
+    run_id: str,
+    content_hash: str,
+) -> str | None:
+    """快照内容与上一批次一致时返回应复用的快照 run_id，否则返回 None（需写入本批次快照）。"""
+    previous = find_previous_ranking_run(
+        db, ranking_config_id=ranking_config_id, period_date=period_date, run_id=run_id,
+    )
+    if previous is None or previous.content_hash != content_hash:
+        return None
+    return previous.snapshot_run_id or previous.run_id
 
-        # 计算每个应用的得分
-        app_scores = []
-        for setting in app_settings:
-            app = setting.app
-            if not app or app.section != "province" or app.status == "offline":
+
+def record_ranking_run(
+    db: Session,
+    *,
+    ranking_config_id: str,
+    period_date: date,
+    run_id: str,
+    row_count: int,
+    duration_ms: float,
+    now: datetime,
+    content_hash: str | None = None,
+    snapshot_run_id: str | None = None,
+) -> None:
+    """登记（或刷新）本批次的榜单目录行，与历史快照写入同一事务提交。"""
+    bulk_upsert_rows(
+        db,
+        RankingRun.__table__,
+        [{
+            "ranking_config_id": ranking_config_id,
+            "period_date": period_date,
+            "run_id": run_id,
+            "row_count": row_count,
+            "content_hash": content_hash,
+            "snapshot_run_id": snapshot_run_id or run_id,
+            "is_published": False,
+            "duration_ms": int(duration_ms),
+            "created_at": now,
+            "updated_at": now,
+        }],
+        RANKING_RUN_UPSERT_COLUMNS,
+    )
+
+
+def activate_ranking_runs(
+    db: Session,
+    run_id: str,
+    config_ids: set[str],
+    *,
+    retired_config_ids: set[str] | None = None,
+    retire_unlisted: bool = False,
+) -> int:
+    """
+    在独立的小事务内把各榜单的生效指针切到本批次（调用前本批次快照须已提交）。
+    - 指针上已是更新批次时不回退（并发同步按批次创建时间取新）
+    - retired_config_ids / retire_unlisted：撤下已停用或删除榜单的指针
+    返回切换的榜单数。
+    """
+    now = datetime.utcnow()
+    activated = 0
+    if config_ids:
+        runs = (
+            db.query(RankingRun)
+            .filter(RankingRun.run_id == run_id, RankingRun.ranking_config_id.in_(config_ids))
+            .all()
+        )
+        pointers = {
+            pointer.ranking_config_id: pointer
+            for pointer in db.query(RankingActiveRun)
+            .filter(RankingActiveRun.ranking_config_id.in_(config_ids))
+            .with_for_update()
+            .all()
+        }
+        for run in runs:
+            pointer = pointers.get(run.ranking_config_id)
+            if pointer is None:
+                pointer = RankingActiveRun(ranking_config_id=run.ranking_config_id)
+                db.add(pointer)
+            elif pointer.run_created_at and run.created_at and run.created_at < pointer.run_created_at:
                 continue
+            pointer.run_id = run.run_id
+            pointer.snapshot_run_id = run.snapshot_run_id or run.run_id
+            pointer.period_date = run.period_date
+            pointer.run_created_at = run.created_at
+            pointer.activated_at = now
+            activated += 1
+
+    retire_query = None
+    if retire_unlisted:
+        retire_query = db.query(RankingActiveRun).filter(~RankingActiveRun.ranking_config_id.in_(config_ids or {""}))
+    elif retired_config_ids:
+        retire_query = db.query(RankingActiveRun).filter(RankingActiveRun.ranking_config_id.in_(retired_config_ids))
+    if retire_query is not None:
+        retire_query.delete(synchronize_session=False)
+
+    bump_data_version(db, RANKINGS_DATA_VERSION)
+    db.commit()
+    return activated
 
-            # 维度分值来源收敛规则：
-            # 1) 手动评分（calculation_detail 以"手动调整评分"开头）优先
-            # 2) 否则按规则自动计算并落库
-            weighted_dimension_score = 0.0
-            for dim_config in config_dimensions:
-                dim_id = dim_config.get("dim_id")
-                weight = dim_config.get("weight", 1.0)
-
-                dimension = dimension_map.get(dim_id)
-                if not dimension:
-                    continue
-
-                # 保存维度评分
-                existing_score = load_single_dimension_score(
-                    db,
-                    app_id=app.id,
-                    ranking_config_id=config.id,
-                    dimension_id=dimension.id,
-                    period_date=today,
-                )
-
-                is_manual_score = bool(existing_score and (existing_score.calculation_detail or "").startswith("手动调整评分"))
-                if is_manual_score:
-                    dim_score = existing_score.score
-                    existing_score.dimension_name = dimension.name
-                    existing_score.weight = weight
-                    existing_score.updated_at = datetime.utcnow()
-                else:
-                    dim_score, calc_detail = calculate_dimension_score(app, dimension)
-                    if existing_score:
-                        existing_score.dimension_name = dimension.name
-                        existing_score.score = dim_score
-                        existing_score.weight = weight
-                        existing_score.calculation_detail = calc_detail
-                        existing_score.updated_at = datetime.utcnow()
-                    else:
-                        db.add(
-                            AppDimensionScore(
-                                app_id=app.id,
-                                ranking_config_id=config.id,
-                                dimension_id=dimension.id,
-                                dimension_name=dimension.name,
-                                score=dim_score,
-                                weight=weight,
-                                calculation_detail=calc_detail,
-                                period_date=today
-                            )
-                        )
-                weighted_dimension_score += dim_score * weight
-                config_dimension_updates += 1
-
-            # 应用权重因子（使用已收敛的维度分值）
-            final_score = max(0, min(int(weighted_dimension_score * setting.weight_factor), 1000))
-
-            app_scores.append({
-                "app": app,
-                "setting": setting,
-                "score": final_score
-            })
-
-        # 按得分排序
-        # 明确同分规则：分数降序；同分按 app_id 升序，避免重算后顺序抖动
-        app_scores.sort(key=lambda x: (-x["score"], x["app"].id))
 
-        # 清理不再参与该榜单的实时排名（解决"换榜后旧榜仍残留"问题）
-        participating_app_ids = {item["app"].id for item in app_scores}
-        stale_rankings_query = db.query(Ranking).filter(Ranking.ranking_config_id == config.id)
-        if participating_app_ids:
-            stale_rankings_query = stale_rankings_query.filter(~Ranking.app_id.in_(participating_app_ids))
-        removed_realtime_rows = stale_rankings_query.delete(synchronize_session=False)
+def mark_ranking_runs_published(db: Session, run_id: str) -> int:
+    """发布入口完成同步后，把本批次各榜单的目录行标记为已发布。"""
+    return (
+        db.query(RankingRun)
+        .filter(RankingRun.run_id == run_id)
+        .update({"is_published": True, "updated_at": datetime.utcnow()}, synchronize_session=False)
+    )
+
+
+# ---------------------------------------------------------------------------
+# 榜单同步核心服务
+# ---------------------------------------------------------------------------
+
+def sync_config_rankings(
+    db: Session,
+    config: RankingConfig,
+    *,
+    dimension_map: dict[int, RankingDimension],
+    run_id: str,
+    period_date: date,
+    actor: str,
+    timer: SyncPhaseTimer,
+) -> int:
+    """以集合方式同步单个榜单：预取 → 内存计算 → 批量写回 → 清理 → 审计。"""
+    config_timer = SyncPhaseTimer()
+    now = datetime.utcnow()
+    metric_type = config.calculation_method or "composite"
+
+    # 从关联表读取榜单配置的维度权重
+    config_dimensions = [
+        {"dim_id": d.dimension_id, "weight": d.weight}
+        for d in config.dimensions
+    ] if config.dimensions else []
+
+    with config_timer.phase("prefetch"):
+        participants = load_ranking_participants(db, config.id)
+        existing_scores = prefetch_dimension_scores(db, ranking_config_id=config.id, period_date=period_date)
+        existing_realtime = prefetch_realtime_rankings(db, config.id)
+        existing_historical = prefetch_historical_run_rows(
+            db, ranking_config_id=config.id, period_date=period_date, run_id=run_id,
+        )
+        baseline_rows = load_baseline_rows(
+            db, config.id, find_baseline_snapshot(db, ranking_config_id=config.id, period_date=period_date),
+        )
 
-        # 更新或创建排名记录
+    with config_timer.phase("compute"):
+        app_scores, score_rows, dimension_updates = compute_config_scores(
+            config.id, participants, config_dimensions, dimension_map, existing_scores, period_date, now,
+        )
+        ranking_rows: list[dict] = []
+        historical_rows: list[dict] = []
+        snapshot_entries: list[tuple] = []
+        company_counts: dict[str, int] = {}
         for index, item in enumerate(app_scores, start=1):
             app = item["app"]
-            setting = item["setting"]
-
             score = item["score"]
+            tag, usage_30d = resolve_ranking_entry(item["setting"], app)
+            company = app.company or app.org
+            company_counts[company] = company_position = company_counts.get(company, 0) + 1
+            movement = compute_movement(index, baseline_rows.get(app.id))
+            snapshot_entries.append(snapshot_content_entry(
+                index, app, tag=tag, score=score, metric_type=metric_type, usage_30d=usage_30d,
+            ))
+
+            current = existing_realtime.get(app.id)
+            if current is None or (current.position, current.score, current.tag, current.usage_30d) != (index, score, tag, usage_30d):
+                ranking_rows.append({
+                    "ranking_config_id": config.id,
+                    "position": index,
+                    "app_id": app.id,
+                    "tag": tag,
+                    "score": score,
+                    "metric_type": metric_type,
+                    "value_dimension": app.effectiveness_type,
+                    "usage_30d": usage_30d,
+                    "declared_at": period_date,
+                    "updated_at": now,
+                })
+
+            snapshot = existing_historical.get(app.id)
+            if snapshot is None or (
+                snapshot.position, snapshot.score, snapshot.tag, snapshot.app_company, snapshot.company_position,
+                snapshot.previous_position, snapshot.previous_score, snapshot.movement,
+            ) != (
+                index, score, tag, company, company_position,
+                movement["previous_position"], movement["previous_score"], movement["movement"],
+            ):
+                historical_rows.append({
+                    "ranking_config_id": config.id,
+                    "period_date": period_date,
+                    "run_id": run_id,
+                    "position": index,
+                    "app_id": app.id,
+                    "app_name": app.name,
+                    "app_org": app.org,
+                    "tag": tag,
+                    "score": score,
+                    "metric_type": metric_type,
+                    "value_dimension": app.effectiveness_type,
+                    "usage_30d": usage_30d,
+                    "app_company": company,
+                    "company_position": company_position,
+                    **movement,
+                    "created_at": now,
+                })
+
+    with config_timer.phase("write_scores"):
+        bulk_upsert_rows(db, AppDimensionScore.__table__, score_rows, DIMENSION_SCORE_UPSERT_COLUMNS)
+
+    with config_timer.phase("cleanup"):
+        # 清理不再参与该榜单的实时排名（解决"换榜后旧榜仍残留"问题）
+        participating_app_ids = {item["app"].id for item in app_scores}
+        stale_app_ids = set(existing_realtime) - participating_app_ids
+        removed_realtime_rows = 0
+        if stale_app_ids:
+            removed_realtime_rows = (
+                db.query(Ranking)
+                .filter(Ranking.ranking_config_id == config.id, Ranking.app_id.in_(stale_app_ids))
+                .delete(synchronize_session=False)
+            )
+
+    with config_timer.phase("write_rankings"):
+        bulk_upsert_rows(db, Ranking.__table__, ranking_rows, RANKING_UPSERT_COLUMNS)
+
+    with config_timer.phase("write_historical"):
+        content_hash = compute_snapshot_hash(snapshot_entries)
+        reused_snapshot_run_id = None
+        if not existing_historical:
+            # 本批次尚无快照行时才可复用上一批次；已落过行的批次（同 run_id 重算）继续原地更新
+            reused_snapshot_run_id = resolve_snapshot_dedup(
+                db, ranking_config_id=config.id, period_date=period_date, run_id=run_id, content_hash=content_hash,
+            )
+        if reused_snapshot_run_id is not None:
+            historical_rows = []
+        bulk_upsert_rows(db, HistoricalRanking.__table__, historical_rows, HISTORICAL_UPSERT_COLUMNS)
+        record_ranking_run(
+            db,
+            ranking_config_id=config.id,
+            period_date=period_date,
+            run_id=run_id,
+            row_count=len(app_scores),
+            duration_ms=sum(config_timer.phases.values()),
+            now=now,
+            content_hash=content_hash,
+            snapshot_run_id=reused_snapshot_run_id,
+        )
 
-            tag = setting.custom_tags.strip() if setting.custom_tags else DEFAULT_RANKING_TAG
-            usage_30d = int(app.monthly_calls * 1000) if app.monthly_calls else 0
+    write_ranking_audit_log(
+        db,
+        action="rankings_sync_config_published",
+        ranking_config_id=config.id,
+        period_date=period_date,
+        run_id=run_id,
+        actor=actor,
+        payload_summary=(
+            f"dimension_score_updates={dimension_updates},"
+            f"ranking_updates={len(app_scores)},"
+            f"historical_ranking_updates={len(app_scores)},"
+            f"realtime_removed={removed_realtime_rows},"
+            f"dimension_score_writes={len(score_rows)},"
+            f"ranking_writes={len(ranking_rows)},"
+            f"historical_writes={len(historical_rows)},"
+            f"snapshot_reused={reused_snapshot_run_id or ''},"
+            f"{config_timer.summary()}"
+        ),
+    )
+    timer.merge(config_timer)
+    return len(app_scores)
 
-            existing = (
+
+def resync_config_apps(
+    db: Session,
+    config: RankingConfig,
+    app_ids: set[int],
+    *,
+    dimension_map: dict[int, RankingDimension],
+    run_id: str,
+    period_date: date,
+    actor: str,
+    timer: SyncPhaseTimer,
+) -> int:
+    """
+    增量同步单个榜单：只重算指定应用，按有序插入 / 移动修复名次，其余行只在名次变化时更新。
+    本日期的中间批次共用一份快照，原地只修补受影响的行；跨日后首次同步或最近快照已发布时
+    退化为单榜全量同步（写全量维度分与新快照）。
+    """
+    config_timer = SyncPhaseTimer()
+    now = datetime.utcnow()
+    metric_type = config.calculation_method or "composite"
+
+    with config_timer.phase("prefetch"):
+        current_rows = (
+            db.query(Ranking.app_id, Ranking.position, Ranking.score, Ranking.tag, Ranking.usage_30d)
+            .filter(Ranking.ranking_config_id == config.id)
+            .order_by(Ranking.position, Ranking.app_id)
+            .all()
+        )
+        working_snapshot_run_id = find_working_snapshot(
+            db, ranking_config_id=config.id, period_date=period_date, run_id=run_id,
+        ) if current_rows else None
+    if working_snapshot_run_id is None:
+        # 榜单尚无实时数据、本日期尚无快照或最近快照已发布：无从原地修补，退化为单榜全量同步
+        timer.merge(config_timer)
+        return sync_config_rankings(
+            db,
+            config,
+            dimension_map=dimension_map,
+            run_id=run_id,
+            period_date=period_date,
+            actor=actor,
+            timer=timer,
+        )
+
+    config_dimensions = [
+        {"dim_id": d.dimension_id, "weight": d.weight}
+        for d in config.dimensions
+    ] if config.dimensions else []
+
+    with config_timer.phase("prefetch"):
+        participants = load_ranking_participants(db, config.id, app_ids=app_ids)
+        existing_scores = prefetch_dimension_scores(
+            db, ranking_config_id=config.id, period_date=period_date, app_ids=app_ids,
+        )
+
+    with config_timer.phase("compute"):
+        app_scores, score_rows, dimension_updates = compute_config_scores(
+            config.id, participants, config_dimensions, dimension_map, existing_scores, period_date, now,
+        )
+        current_by_app = {row.app_id: row for row in current_rows}
+        refreshed = {item["app"].id: item for item in app_scores}
+        ordered_app_ids, first_touched = repair_ranking_order(
+            [(row.score, row.app_id) for row in current_rows],
+            set(app_ids),
+            [(item["score"], app_id) for app_id, item in refreshed.items()],
+        )
+        removed_app_ids = [app_id for app_id in app_ids if app_id in current_by_app and app_id not in refreshed]
+
+        ranking_rows: list[dict] = []
+        position_moves: list[dict] = []
+        for index in range(first_touched, len(ordered_app_ids)):
+            position = index + 1
+            app_id = ordered_app_ids[index]
+            current = current_by_app.get(app_id)
+            item = refreshed.get(app_id)
+            if item is None:
+                if current.position != position:
+                    position_moves.append({"b_app_id": app_id, "b_position": position})
+                continue
+            app = item["app"]
+            tag, usage_30d = resolve_ranking_entry(item["setting"], app)
+            if current is None or (current.position, current.score, current.tag, current.usage_30d) != (position, item["score"], tag, usage_30d):
+                ranking_rows.append({
+                    "ranking_config_id": config.id,
+                    "position": position,
+                    "app_id": app_id,
+                    "tag": tag,
+                    "score": item["score"],
+                    "metric_type": metric_type,
+                    "value_dimension": app.effectiveness_type,
+                    "usage_30d": usage_30d,
+                    "declared_at": period_date,
+                    "updated_at": now,
+                })
+
+    with config_timer.phase("write_scores"):
+        bulk_upsert_rows(db, AppDimensionScore.__table__, score_rows, DIMENSION_SCORE_UPSERT_COLUMNS)
+
+    with config_timer.phase("cleanup"):
+        removed_realtime_rows = 0
+        if removed_app_ids:
+            removed_realtime_rows = (
                 db.query(Ranking)
-                .filter(
-                    Ranking.ranking_config_id == config.id,
-                    Ranking.app_id == app.id
-                )
-                .first()
+                .filter(Ranking.ranking_config_id == config.id, Ranking.app_id.in_(removed_app_ids))
+                .delete(synchronize_session=False)
             )
 
-            if existing:
-                existing.position = index
-                existing.score = score
-                existing.tag = tag
-                existing.usage_30d = usage_30d
-                existing.updated_at = datetime.utcnow()
-            else:
-                db.add(
-                    Ranking(
-                        ranking_config_id=config.id,
-                        position=index,
-                        app_id=app.id,
-                        tag=tag,
-                        score=score,
-                        metric_type=config.calculation_method or "composite",
-                        value_dimension=app.effectiveness_type,
-                        usage_30d=usage_30d,
-                        declared_at=today,
-                    )
-                )
-            config_ranking_updates += 1
-
-            # 保存历史榜单数据
-            historical = (
-                db.query(HistoricalRanking)
-                .filter(
-                    HistoricalRanking.ranking_config_id == config.id,
-                    HistoricalRanking.app_id == app.id,
-                    HistoricalRanking.period_date == today,
-                    HistoricalRanking.run_id == current_run_id
-                )
-                .first()
+    with config_timer.phase("write_rankings"):
+        bulk_upsert_rows(db, Ranking.__table__, ranking_rows, RANKING_UPSERT_COLUMNS)
+        bulk_move_positions(db, config.id, position_moves, now)
+
+    with config_timer.phase("write_historical"):
+        historical_rows = patch_working_snapshot(
+            db,
+            config,
+            period_date=period_date,
+            snapshot_run_id=working_snapshot_run_id,
+            ordered_app_ids=ordered_app_ids,
+            first_touched=first_touched,
+            refreshed=refreshed,
+            current_positions={row.app_id: row.position for row in current_rows},
+            removed_app_ids=removed_app_ids,
+            now=now,
+        )
+        # 共享快照随修补变化，本批次不记内容哈希（不参与之后的快照复用判断）
+        record_ranking_run(
+            db,
+            ranking_config_id=config.id,
+            period_date=period_date,
+            run_id=run_id,
+            row_count=len(ordered_app_ids),
+            duration_ms=sum(config_timer.phases.values()),
+            now=now,
+            snapshot_run_id=working_snapshot_run_id,
+        )
+
+    write_ranking_audit_log(
+        db,
+        action="rankings_sync_config_repaired",
+        ranking_config_id=config.id,
+        period_date=period_date,
+        run_id=run_id,
+        actor=actor,
+        payload_summary=(
+            f"app_ids={','.join(str(i) for i in sorted(app_ids))},"
+            f"dimension_score_updates={dimension_updates},"
+            f"repaired_from_position={first_touched + 1},"
+            f"realtime_removed={removed_realtime_rows},"
+            f"dimension_score_writes={len(score_rows)},"
+            f"ranking_writes={len(ranking_rows)},"
+            f"position_moves={len(position_moves)},"
+            f"historical_writes={historical_rows},"
+            f"snapshot_patched={working_snapshot_run_id},"
+            f"{config_timer.summary()}"
+        ),
+    )
+    timer.merge(config_timer)
+    return len(app_scores)
+
+
+def resolve_scope_config_ids(db: Session, scope: RankingSyncScope) -> set[str]:
+    """把变更范围展开为受影响的榜单ID集合。"""
+    config_ids = set(scope.config_ids)
+    if scope.dimension_ids:
+        config_ids.update(
+            row[0]
+            for row in db.query(RankingConfigDimension.ranking_config_id)
+            .filter(RankingConfigDimension.dimension_id.in_(scope.dimension_ids))
+            .distinct()
+            .all()
+        )
+    if not scope.config_ids and not scope.dimension_ids and scope.app_ids:
+        config_ids.update(
+            row[0]
+            for row in db.query(AppRankingSetting.ranking_config_id)
+            .filter(
+                AppRankingSetting.app_id.in_(scope.app_ids),
+                AppRankingSetting.ranking_config_id.is_not(None),
             )
+            .distinct()
+            .all()
+        )
+        # 已上榜但设置被删除 / 迁移的旧榜单同样需要修复
+        config_ids.update(
+            row[0]
+            for row in db.query(Ranking.ranking_config_id)
+            .filter(Ranking.app_id.in_(scope.app_ids))
+            .distinct()
+            .all()
+        )
+    return config_ids
 
-            if historical:
-                historical.position = index
-                historical.score = score
-                historical.tag = tag
-            else:
-                db.add(
-                    HistoricalRanking(
-                        ranking_config_id=config.id,
-                        period_date=today,
-                        run_id=current_run_id,
-                        position=index,
-                        app_id=app.id,
-                        app_name=app.name,
-                        app_org=app.org,
-                        tag=tag,
-                        score=score,
-                        metric_type=config.calculation_method or "composite",
-                        value_dimension=app.effectiveness_type,
-                        usage_30d=usage_30d
-                    )
-                )
-            config_historical_updates += 1
-
-            updated_count += 1
 
+def run_scoped_ranking_sync(
+    db: Session,
+    scope: RankingSyncScope,
+    run_id: str | None = None,
+    actor: str = "system",
+) -> RankingSyncResult:
+    """
+    按变更范围增量同步榜单
+    - 仅处理受影响的榜单；未受影响榜单沿用各自最新批次
+    - 声明了 app_ids 时只重算这些应用并有序修复名次，否则对受影响榜单全量重算
+    - 受影响榜单中已停用或删除的，清理其实时榜单
+    - 快照提交后再以小事务切换生效指针，读路径在切换前始终看到上一批次
+    """
+    timer = SyncPhaseTimer()
+    started = perf_counter()
+    current_run_id = (run_id or str(_uuid.uuid4())).strip() or str(_uuid.uuid4())
+    today = datetime.now().date()
+
+    with timer.phase("load"):
+        target_config_ids = resolve_scope_config_ids(db, scope)
+        ranking_configs = (
+            db.query(RankingConfig)
+            .filter(RankingConfig.id.in_(target_config_ids), RankingConfig.is_active.is_(True))
+            .options(selectinload(RankingConfig.dimensions))
+            .all()
+        ) if target_config_ids else []
+        needed_dimension_ids = {d.dimension_id for config in ranking_configs for d in config.dimensions}
+        dimension_map = {
+            d.id: d
+            for d in db.query(RankingDimension)
+            .filter(RankingDimension.id.in_(needed_dimension_ids), RankingDimension.is_active.is_(True))
+            .all()
+        } if needed_dimension_ids else {}
+
+    with timer.phase("cleanup"):
+        inactive_config_ids = target_config_ids - {config.id for config in ranking_configs}
+        removed_realtime_rows = 0
+        if inactive_config_ids:
+            removed_realtime_rows = (
+                db.query(Ranking)
+                .filter(Ranking.ranking_config_id.in_(inactive_config_ids))
+                .delete(synchronize_session=False)
+            )
+
+    updated_count = 0
+    for config in ranking_configs:
+        if scope.app_ids:
+            updated_count += resync_config_apps(
+                db,
+                config,
+                set(scope.app_ids),
+                dimension_map=dimension_map,
+                run_id=current_run_id,
+                period_date=today,
+                actor=actor,
+                timer=timer,
+            )
+        else:
+            updated_count += sync_config_rankings(
+                db,
+                config,
+                dimension_map=dimension_map,
+                run_id=current_run_id,
+                period_date=today,
+                actor=actor,
+                timer=timer,
+            )
+
+    if removed_realtime_rows:
         write_ranking_audit_log(
             db,
-            action="rankings_sync_config_published",
-            ranking_config_id=config.id,
+            action="rankings_sync_scoped_realtime_cleanup",
             period_date=today,
             run_id=current_run_id,
             actor=actor,
-            payload_summary=(
-                f"dimension_score_updates={config_dimension_updates},"
-                f"ranking_updates={config_ranking_updates},"
-                f"historical_ranking_updates={config_historical_updates},"
-                f"realtime_removed={removed_realtime_rows}"
-            ),
+            payload_summary=f"configs={','.join(sorted(inactive_config_ids))},removed_realtime={removed_realtime_rows}",
+        )
+
+    with timer.phase("commit"):
+        db.commit()
+    with timer.phase("activate"):
+        activate_ranking_runs(
+            db,
+            current_run_id,
+            {config.id for config in ranking_configs},
+            retired_config_ids=inactive_config_ids,
+        )
+    timer.phases["total"] = (perf_counter() - started) * 1000
+    logger.info(
+        "rankings scoped sync finished run_id=%s scope=%s configs=%d updated=%d %s",
+        current_run_id, scope.describe(), len(ranking_configs), updated_count, timer.summary(),
+    )
+    return RankingSyncResult(updated_count=updated_count, run_id=current_run_id, timings_ms=dict(timer.phases))
+
+
+def run_ranking_sync(db: Session, run_id: str | None = None, actor: str = "system") -> RankingSyncResult:
+    """
+    同步排行榜数据（支持三层架构，集合式批量引擎）
+    - 遍历每个榜单配置
+    - 一次性预取参与应用、维度分值、实时榜单与本批次历史快照
+    - 在内存中按榜单配置的维度权重计算得分并排序
+    - 通过 INSERT ... ON DUPLICATE KEY UPDATE 批量写回，并保存历史数据
+    - 全部写入提交后，以独立小事务把各榜单生效指针切到本批次（影子发布）
+    """
+    timer = SyncPhaseTimer()
+    started = perf_counter()
+
+    with timer.phase("load"):
+        # 获取所有活跃的榜单配置
+        ranking_configs = (
+            db.query(RankingConfig)
+            .filter(RankingConfig.is_active.is_(True))
+            .options(selectinload(RankingConfig.dimensions))
+            .all()
+        )
+        active_config_ids = {config.id for config in ranking_configs}
+
+        # 获取所有维度，创建维度ID到维度对象的映射
+        dimensions = (
+            db.query(RankingDimension)
+            .filter(RankingDimension.is_active.is_(True))
+            .order_by(RankingDimension.id)
+            .all()
+        )
+        dimension_map = {d.id: d for d in dimensions}
+
+    with timer.phase("cleanup"):
+        # 全局清理：非活跃（或已删除）配置的实时榜单记录，避免首页残留脏数据
+        stale_realtime_query = db.query(Ranking)
+        if active_config_ids:
+            stale_realtime_query = stale_realtime_query.filter(~Ranking.ranking_config_id.in_(active_config_ids))
+        removed_global_realtime_rows = stale_realtime_query.delete(synchronize_session=False)
+
+    updated_count = 0
+    today = datetime.now().date()
+    current_run_id = (run_id or str(_uuid.uuid4())).strip()
+    if not current_run_id:
+        current_run_id = str(_uuid.uuid4())
+
+    for config in ranking_configs:
+        updated_count += sync_config_rankings(
+            db,
+            config,
+            dimension_map=dimension_map,
+            run_id=current_run_id,
+            period_date=today,
+            actor=actor,
+            timer=timer,
         )
 
     if removed_global_realtime_rows:
@@ -445,33 +1358,22 @@ def sync_rankings_service(db: Session, run_id: str | None = None, actor: str = "
             payload_summary=f"removed_realtime={removed_global_realtime_rows}",
         )
 
-    db.commit()
-    return updated_count, current_run_id
-
+    with timer.phase("commit"):
+        db.commit()
+    with timer.phase("activate"):
+        activate_ranking_runs(db, current_run_id, active_config_ids, retire_unlisted=True)
+    timer.phases["total"] = (perf_counter() - started) * 1000
+    logger.info(
+        "rankings sync finished run_id=%s configs=%d updated=%d %s",
+        current_run_id, len(ranking_configs), updated_count, timer.summary(),
+    )
+    return RankingSyncResult(updated_count=updated_count, run_id=current_run_id, timings_ms=dict(timer.phases))
 
-# ---------------------------------------------------------------------------
-# 链式变更触发
-# ---------------------------------------------------------------------------
 
-def sync_after_chain_mutation(db: Session, trigger: str, actor: str = "system") -> tuple[int, str]:
-    """链路节点发生增删改后，统一触发榜单重算并返回运行信息。"""
-    try:
-        # SessionLocal 关闭了 autoflush，先显式 flush，避免同步阶段读不到本次变更。
-        db.flush()
-        updated_count, run_id = sync_rankings_service(db, actor=actor)
-        write_ranking_audit_log(
-            db,
-            action=f"{trigger}_triggered_sync",
-            period_date=datetime.utcnow().date(),
-            run_id=run_id,
-            actor=actor,
-            payload_summary=f"updated_count={updated_count}",
-        )
-        db.commit()
-        return updated_count, run_id
-    except Exception as exc:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"链路同步失败: {str(exc)}") from exc
+def sync_rankings_service(db: Session, run_id: str | None = None, actor: str = "system") -> tuple[int, str]:
+    """同步排行榜数据，返回 (更新条数, run_id)；阶段耗时见 run_ranking_sync。"""
+    result = run_ranking_sync(db, run_id=run_id, actor=actor)
+    return result.updated_count, result.run_id
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,364 @@
+"""榜单权重试算（what-if）——在缓存的应用 × 维度评分矩阵上重算名次，不写任何榜单表。
+
+评分矩阵按榜单缓存在进程内，随 `rankings` 数据版本号变化或超过
+`RANKING_SIMULATION_CACHE_TTL_SECONDS` 后重建。矩阵已套用当日手动评分覆盖，
+试算只重做「加权求和 → 乘权重因子 → 排序」，计分顺序与同步链路一致，
+因此按试算参数保存并同步后得到的榜单与试算结果相同。
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from time import monotonic, perf_counter
+from typing import Iterable
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from ..config import settings
+from ..dependencies import structured_error_detail
+from ..models import AppDimensionScore, AppRankingSetting, RankingConfig, RankingDimension
+from .cache_service import RANKINGS_DATA_VERSION, data_version_poller
+from .ranking_service import is_manual_dimension_score
+from .scoring_engine import AppColumns, score_dimension_matrix, weighted_final_scores
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# 试算基线（评分矩阵 + 当前配置下的名次）
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SimulationBase:
+    ranking_config_id: str
+    period_date: date
+    app_ids: np.ndarray  # 候选应用（已参与或可被启用），按 app_id 升序
+    app_names: list[str]
+    app_orgs: list[str]
+    dimension_ids: list[int]  # 矩阵列：榜单已配置维度在前，其余启用维度在后
+    scores: np.ndarray  # 已套用手动评分覆盖的维度分
+    config_columns: list[int]  # 当前维度配置对应的列号（保持配置顺序）
+    config_weights: list[float]
+    weight_factors: np.ndarray
+    enabled: np.ndarray
+    baseline_scores: np.ndarray
+    baseline_positions: np.ndarray  # 0 表示当前未上榜
+    build_ms: float
+    row_of: dict[int, int] = field(default_factory=dict)
+    column_of: dict[int, int] = field(default_factory=dict)
+
+
+def rank_rows(final_scores: np.ndarray, enabled: np.ndarray, app_ids: np.ndarray) -> np.ndarray:
+    """返回按名次排列的上榜行号：分数降序，同分按 app_id 升序（与同步链路一致）。"""
+    rows = np.flatnonzero(enabled)
+    return rows[np.lexsort((app_ids[rows], -final_scores[rows]))]
+
+
+def positions_for(order: np.ndarray, size: int) -> np.ndarray:
+    positions = np.zeros(size, dtype=np.int64)
+    positions[order] = np.arange(1, len(order) + 1)
+    return positions
+
+
+def build_simulation_base(
+    ranking_config_id: str,
+    *,
+    period_date: date,
+    config_dimensions: list[dict],
+    dimension_map: dict[int, RankingDimension],
+    candidates: list[AppRankingSetting],
+    manual_scores: dict[tuple[int, int], int],
+) -> SimulationBase:
+    """由候选应用与维度构建评分矩阵，并按当前配置算出基线名次（纯计算）。"""
+    started = perf_counter()
+    candidates = sorted(candidates, key=lambda setting: setting.app.id)
+
+    dimensions: list[RankingDimension] = []
+    column_of: dict[int, int] = {}
+    config_columns: list[int] = []
+    config_weights: list[float] = []
+    for dim_config in config_dimensions:
+        dimension = dimension_map.get(dim_config.get("dim_id"))
+        if not dimension:
+            continue
+        if dimension.id not in column_of:
+            column_of[dimension.id] = len(dimensions)
+            dimensions.append(dimension)
+        config_columns.append(column_of[dimension.id])
+        config_weights.append(dim_config.get("weight", 1.0))
+    # 未配置的启用维度也进入矩阵，试算时可直接加入
+    for dim_id in sorted(dimension_map):
+        if dim_id not in column_of:
+            column_of[dim_id] = len(dimensions)
+            dimensions.append(dimension_map[dim_id])
+
+    apps = [setting.app for setting in candidates]
+    scores = score_dimension_matrix(AppColumns(apps), dimensions).scores.copy()
+    row_of = {app.id: row for row, app in enumerate(apps)}
+    for (app_id, dimension_id), score in manual_scores.items():
+        row = row_of.get(app_id)
+        col = column_of.get(dimension_id)
+        if row is not None and col is not None:
+            scores[row, col] = score
+
+    app_ids = np.fromiter((app.id for app in apps), dtype=np.int64, count=len(apps))
+    weight_factors = np.fromiter(
+        (setting.weight_factor for setting in candidates), dtype=np.float64, count=len(candidates)
+    )
+    enabled = np.fromiter((bool(setting.is_enabled) for setting in candidates), dtype=bool, count=len(candidates))
+    baseline_scores = weighted_final_scores(scores[:, config_columns], config_weights, weight_factors)
+    baseline_positions = positions_for(rank_rows(baseline_scores, enabled, app_ids), len(apps))
+
+    return SimulationBase(
+        ranking_config_id=ranking_config_id,
+        period_date=period_date,
+        app_ids=app_ids,
+        app_names=[app.name for app in apps],
+        app_orgs=[app.org for app in apps],
+        dimension_ids=[dimension.id for dimension in dimensions],
+        scores=scores,
+        config_columns=config_columns,
+        config_weights=config_weights,
+        weight_factors=weight_factors,
+        enabled=enabled,
+        baseline_scores=baseline_scores,
+        baseline_positions=baseline_positions,
+        build_ms=round((perf_counter() - started) * 1000, 2),
+        row_of=row_of,
+        column_of=column_of,
+    )
+
+
+def load_simulation_base(db: Session, ranking_config_id: str) -> SimulationBase:
+    """只读加载试算所需数据：榜单维度配置、启用维度、候选应用与当日手动评分。"""
+    config = (
+        db.query(RankingConfig)
+        .options(selectinload(RankingConfig.dimensions))
+        .filter(RankingConfig.id == ranking_config_id)
+        .first()
+    )
+    if not config:
+        raise HTTPException(
+            status_code=404,
+            detail=structured_error_detail(code="ranking_config_not_found", message="榜单配置不存在"),
+        )
+    dimension_map = {
+        dimension.id: dimension
+        for dimension in db.query(RankingDimension)
+        .filter(RankingDimension.is_active.is_(True))
+        .order_by(RankingDimension.id)
+        .all()
+    }
+
+    # 候选应用口径与 load_ranking_participants 一致，但保留未启用的设置以便试算启用
+    candidates: dict[int, AppRankingSetting] = {}
+    for setting in (
+        db.query(AppRankingSetting)
+        .filter(AppRankingSetting.ranking_config_id == ranking_config_id)
+        .options(joinedload(AppRankingSetting.app))
+        .order_by(AppRankingSetting.is_enabled.desc(), AppRankingSetting.id)
+        .all()
+    ):
+        app = setting.app
+        if app and app.section == "province" and app.status != "offline":
+            candidates.setdefault(app.id, setting)
+
+    period_date = datetime.now().date()
+    manual_scores: dict[tuple[int, int], int] = {}
+    seen: set[tuple[int, int]] = set()
+    for row in (
+        db.query(
+            AppDimensionScore.app_id,
+            AppDimensionScore.dimension_id,
+            AppDimensionScore.score,
+            AppDimensionScore.calculation_detail,
+        )
+        .filter(
+            AppDimensionScore.ranking_config_id == ranking_config_id,
+            AppDimensionScore.period_date == period_date,
+        )
+        .order_by(AppDimensionScore.updated_at.desc(), AppDimensionScore.id.desc())
+        .all()
+    ):
+        key = (row.app_id, row.dimension_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        if is_manual_dimension_score(row.calculation_detail):
+            manual_scores[key] = row.score
+
+    return build_simulation_base(
+        ranking_config_id,
+        period_date=period_date,
+        config_dimensions=[{"dim_id": d.dimension_id, "weight": d.weight} for d in config.dimensions],
+        dimension_map=dimension_map,
+        candidates=list(candidates.values()),
+        manual_scores=manual_scores,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 基线缓存
+# ---------------------------------------------------------------------------
+
+class SimulationBaseCache:
+    """每个榜单缓存一份试算基线，数据版本变化或超过 TTL 即视为失效；按 LRU 控制条目数。"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[int, float, SimulationBase]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ranking_config_id: str, version: int) -> SimulationBase | None:
+        with self._lock:
+            entry = self._entries.get(ranking_config_id)
+            if entry is not None and entry[0] == version and monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(ranking_config_id)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, ranking_config_id: str, version: int, base: SimulationBase) -> None:
+        with self._lock:
+            self._entries.pop(ranking_config_id, None)
+            self._entries[ranking_config_id] = (version, monotonic(), base)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+simulation_base_cache = SimulationBaseCache(
+    settings.ranking_simulation_cache_max_entries,
+    settings.ranking_simulation_cache_ttl_seconds,
+)
+
+
+def get_simulation_base(db: Session, ranking_config_id: str) -> tuple[SimulationBase, bool]:
+    """返回 (试算基线, 是否命中缓存)；版本号读取失败时直接重建且不入缓存。"""
+    try:
+        # 先读版本再加载：加载期间若有新提交，只会让本条目提前失效
+        version = data_version_poller.current(RANKINGS_DATA_VERSION)
+    except Exception:
+        logger.exception("ranking simulation version poll failed; rebuilding matrix")
+        return load_simulation_base(db, ranking_config_id), False
+    cached = simulation_base_cache.get(ranking_config_id, version)
+    if cached is not None:
+        return cached, True
+    base = load_simulation_base(db, ranking_config_id)
+    simulation_base_cache.put(ranking_config_id, version, base)
+    return base, False
+
+
+# ---------------------------------------------------------------------------
+# 试算
+# ---------------------------------------------------------------------------
+
+def _invalid_simulation_input(field_errors: list[dict[str, str]]) -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail=structured_error_detail(
+            code="ranking_simulation_invalid",
+            message="试算参数无效",
+            field_errors=field_errors,
+        ),
+    )
+
+
+def simulate_rankings(
+    base: SimulationBase,
+    *,
+    dimensions: list[tuple[int, float]] | None = None,
+    app_settings: Iterable = (),
+    limit: int = 100,
+) -> dict:
+    """
+    在基线矩阵上按候选参数重算榜单。
+    dimensions 为 [(dim_id, weight)]，整体替换榜单维度配置（None 沿用当前配置）；
+    app_settings 逐项覆盖应用的 is_enabled / weight_factor（为 None 的字段沿用当前值）。
+    position_delta = 基线名次 - 试算名次，正数表示上升。
+    """
+    field_errors: list[dict[str, str]] = []
+    if dimensions is None:
+        columns, weights = base.config_columns, base.config_weights
+    else:
+        columns, weights = [], []
+        for index, (dim_id, weight) in enumerate(dimensions):
+            col = base.column_of.get(dim_id)
+            if col is None:
+                field_errors.append({"field": f"dimensions[{index}].dim_id", "message": "维度不存在或未启用"})
+                continue
+            columns.append(col)
+            weights.append(weight)
+
+    weight_factors = base.weight_factors
+    enabled = base.enabled
+    overrides = list(app_settings)
+    if overrides:
+        weight_factors = weight_factors.copy()
+        enabled = enabled.copy()
+        for index, override in enumerate(overrides):
+            row = base.row_of.get(override.app_id)
+            if row is None:
+                field_errors.append({"field": f"app_settings[{index}].app_id", "message": "应用未关联该榜单或不满足参评条件"})
+                continue
+            if override.is_enabled is not None:
+                enabled[row] = override.is_enabled
+            if override.weight_factor is not None:
+                weight_factors[row] = override.weight_factor
+    if field_errors:
+        raise _invalid_simulation_input(field_errors)
+
+    final_scores = weighted_final_scores(base.scores[:, columns], weights, weight_factors)
+    order = rank_rows(final_scores, enabled, base.app_ids)
+    positions = positions_for(order, len(base.app_ids))
+    baseline_positions = base.baseline_positions
+    in_baseline = baseline_positions > 0
+
+    items = []
+    for position, row in enumerate(order[:limit].tolist(), start=1):
+        baseline_position = int(baseline_positions[row])
+        items.append({
+            "position": position,
+            "app_id": int(base.app_ids[row]),
+            "app_name": base.app_names[row],
+            "app_org": base.app_orgs[row],
+            "score": int(final_scores[row]),
+            "baseline_position": baseline_position or None,
+            "baseline_score": int(base.baseline_scores[row]) if baseline_position else None,
+            "position_delta": baseline_position - position if baseline_position else None,
+        })
+
+    dropped_rows = np.flatnonzero(in_baseline & ~enabled)
+    dropped = [
+        {
+            "app_id": int(base.app_ids[row]),
+            "app_name": base.app_names[row],
+            "app_org": base.app_orgs[row],
+            "baseline_position": int(baseline_positions[row]),
+            "baseline_score": int(base.baseline_scores[row]),
+        }
+        for row in dropped_rows[np.argsort(baseline_positions[dropped_rows])].tolist()
+    ]
+
+    return {
+        "ranking_config_id": base.ranking_config_id,
+        "period_date": base.period_date,
+        "participant_count": len(order),
+        "baseline_participant_count": int(in_baseline.sum()),
+        "moved_count": int((in_baseline & enabled & (positions != baseline_positions)).sum()),
+        "entered_count": int((enabled & ~in_baseline).sum()),
+        "items": items,
+        "dropped": dropped,
+        "matrix_build_ms": base.build_ms,
+    }
@@ -0,0 +1,148 @@
+"""榜单静态快照——发布时把各启用榜单的实时榜单预渲染为 JSON 文件，供前端 / 反向代理零查库读取。
+
+- 目录：`STATIC_DIR/rankings/<版本>/`，版本取发布批次 run_id；每个榜单一份整榜文件，
+  外加每个公司一份公司榜文件，内容与 `GET /api/rankings?ranking_config_id=&company=` 逐字节一致；
+  每个榜单只查一次整榜行，公司榜由整榜行在内存中拆分，发布持锁期间查询数与公司数无关
+- 每个文件同时写出 `.json` 与预压缩的 `.json.gz`（可直接配合 nginx `gzip_static`）
+- `STATIC_DIR/rankings/manifest.json` 指向最新版本及各文件路径；先写完版本目录再原子替换清单，
+  读方不会看到半套文件。旧版本目录只保留 `RANKING_STATIC_KEEP_VERSIONS` 个
+- `/api/rankings` 查库失败时按清单回落到最新静态文件（仅实时榜单）
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from ..config import resolve_runtime_path, settings
+from ..models import RankingConfig
+from .ranking_read_service import dump_live_ranking_rows, load_live_ranking_rows, partition_live_ranking_rows
+
+logger = logging.getLogger(__name__)
+
+RANKING_STATIC_SUBDIR = "rankings"
+RANKING_STATIC_MANIFEST = "manifest.json"
+RANKING_STATIC_FORMAT_VERSION = 1
+_SAFE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+
+def ranking_static_root() -> Path:
+    return resolve_runtime_path(settings.static_dir) / RANKING_STATIC_SUBDIR
+
+
+def _file_stem(value: str) -> str:
+    """榜单 ID / run_id 可直接作文件名时原样使用，否则（含中文、路径分隔符等）取摘要。"""
+    if _SAFE_NAME.fullmatch(value) and ".." not in value:
+        return value
+    return "h" + hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_json_pair(directory: Path, version_name: str, name: str, body: bytes) -> dict[str, object]:
+    """写出 .json 与 .json.gz，返回清单条目（路径相对 STATIC_DIR）。"""
+    (directory / f"{name}.json").write_bytes(body)
+    (directory / f"{name}.json.gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+    return {"path": f"{RANKING_STATIC_SUBDIR}/{version_name}/{name}.json", "bytes": len(body)}
+
+
+def export_ranking_static_files(db: Session, version: str, root: Path | None = None) -> dict:
+    """渲染所有启用榜单（整榜 + 各公司榜）到新版本目录并切换清单，返回清单内容。"""
+    root = root or ranking_static_root()
+    root.mkdir(parents=True, exist_ok=True)
+    version_name = _file_stem(version)
+    staging = root / f".{version_name}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    target = root / version_name
+    rankings: dict[str, dict] = {}
+    try:
+        configs = db.query(RankingConfig).filter(RankingConfig.is_active.is_(True)).order_by(RankingConfig.id).all()
+        for config in configs:
+            stem = _file_stem(config.id)
+            rows, snapshot = load_live_ranking_rows(db, config.id)
+            overall = _write_json_pair(staging, version_name, stem, dump_live_ranking_rows(rows, snapshot=snapshot))
+            companies = {}
+            for company, company_rows in sorted(partition_live_ranking_rows(rows, snapshot=snapshot).items()):
+                companies[company] = _write_json_pair(
+                    staging,
+                    version_name,
+                    f"{stem}.company-{_file_stem(company)}",
+                    dump_live_ranking_rows(company_rows, snapshot=snapshot),
+                )
+            rankings[config.id] = {
+                "name": config.name,
+                "items": len(rows),
+                "overall": overall,
+                "companies": companies,
+            }
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    manifest = {
+        "format": RANKING_STATIC_FORMAT_VERSION,
+        "version": version_name,
+        "run_id": version,
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "rankings": rankings,
+    }
+    manifest_tmp = root / f".{RANKING_STATIC_MANIFEST}.tmp-{os.getpid()}"
+    manifest_tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(manifest_tmp, root / RANKING_STATIC_MANIFEST)
+    prune_ranking_static_versions(root, keep=settings.ranking_static_keep_versions, current=version_name)
+    return manifest
+
+
+def prune_ranking_static_versions(root: Path, *, keep: int, current: str) -> list[str]:
+    """按修改时间保留最近 keep 个版本目录（当前清单指向的版本始终保留）。"""
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.name.startswith(".")),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    stale = [path for path in versions if path.name != current][max(keep - 1, 0):]
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+    return [path.name for path in stale]
+
+
+def publish_ranking_static_files(db: Session, run_id: str) -> dict | None:
+    """发布后导出静态快照；失败只记日志，不影响已提交的发布结果。"""
+    if not settings.ranking_static_export_enabled:
+        return None
+    try:
+        manifest = export_ranking_static_files(db, run_id)
+    except Exception:
+        logger.exception("ranking static export failed run_id=%s", run_id)
+        return {"exported": False, "version": None, "files": 0}
+    files = sum(1 + len(entry["companies"]) for entry in manifest["rankings"].values())
+    logger.info("ranking static export done version=%s files=%d", manifest["version"], files)
+    return {"exported": True, "version": manifest["version"], "files": files}
+
+
+def read_static_ranking(ranking_config_id: str, company: str | None = None, root: Path | None = None) -> bytes | None:
+    """按清单读取最新静态榜单文件；清单或文件缺失时返回 None。"""
+    root = root or ranking_static_root()
+    try:
+        manifest = json.loads((root / RANKING_STATIC_MANIFEST).read_text(encoding="utf-8"))
+        entry = manifest["rankings"].get(ranking_config_id)
+        if entry is None:
+            return None
+        if company:
+            file_entry = entry["companies"].get(company)
+            if file_entry is None:
+                return b"[]"
+        else:
+            file_entry = entry["overall"]
+        return (root / manifest["version"] / Path(file_entry["path"]).name).read_bytes()
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,685 @@
+"""榜单同步任务服务——链路变更去抖合并、任务状态跟踪与后台执行线程。
+
+管理端每次增删改只登记一个同步任务并立即返回；窗口期内到达的变更合并进同一个
+排队任务（同一 run_id），由后台线程统一重算。`RANKING_SYNC_MODE=inline` 时
+登记后在请求内直接执行，等锁超时的任务留给后台线程补跑。
+"""
+
+import json as _json
+import logging
+import threading
+import uuid as _uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic, perf_counter
+
+from fastapi import HTTPException, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import database as _database
+from ..config import settings
+from ..dependencies import structured_error_detail, write_ranking_audit_log
+from ..models import DataVersion, RankingSyncJob
+from .cache_service import RANKINGS_DATA_VERSION, bump_data_version
+from .ranking_retention_service import purge_ranking_snapshots
+from .ranking_service import (
+    RankingSyncResult,
+    RankingSyncScope,
+    resolve_scope_config_ids,
+    run_ranking_sync,
+    run_scoped_ranking_sync,
+)
+
+logger = logging.getLogger(__name__)
+
+SYNC_JOB_QUEUED = "queued"
+SYNC_JOB_RUNNING = "running"
+SYNC_JOB_DONE = "done"
+SYNC_JOB_FAILED = "failed"
+SYNC_WORKER_POLL_SECONDS = 0.5
+SNAPSHOT_PURGE_LOCK_OWNER = "snapshot_purge"
+# data_versions 中记录集群内上次周期清理时间的行（updated_at）
+SNAPSHOT_PURGE_MARKER = "snapshot_purge"
+SNAPSHOT_PURGE_RETRY_SECONDS = 60
+MANUAL_SYNC_TRIGGER = "manual_sync"
+PUBLISH_SYNC_TRIGGER = "ranking_publish"
+
+
+@dataclass(frozen=True)
+class RankingSyncTicket:
+    """链路变更触发同步后返回给调用方的任务凭据。"""
+    job_id: int
+    status: str
+    updated_count: int
+    run_id: str
+
+
+# ---------------------------------------------------------------------------
+# 集群互斥锁（MySQL GET_LOCK）
+# ---------------------------------------------------------------------------
+
+class RankingSyncLockBusy(Exception):
+    """等待集群同步锁超时。"""
+
+    def __init__(self, wait_ms: float) -> None:
+        super().__init__(f"ranking sync lock busy after {wait_ms:.1f}ms")
+        self.wait_ms = wait_ms
+
+
+class RankingSyncLockHandle:
+    """持锁期间的计时信息；run_id 由持锁方回填，写入释放审计。"""
+
+    def __init__(self, owner: str, wait_ms: float, contended: bool) -> None:
+        self.owner = owner
+        self.wait_ms = wait_ms
+        self.contended = contended
+        self.run_id: str | None = None
+        self.acquired_at = perf_counter()
+
+
+def ranking_sync_lock_name() -> str:
+    # GET_LOCK 在整个 MySQL 实例内生效，带上库名避免同实例多套环境互相阻塞
+    return f"ranking_sync:{_database.engine.url.database or ''}"[:64]
+
+
+def _get_named_lock(connection, name: str, timeout_seconds: int) -> bool:
+    return connection.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout_seconds}
+    ).scalar() == 1
+
+
+def _release_named_lock(connection, name: str) -> None:
+    connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+
+
+def write_sync_lock_audit(action: str, owner: str, *, run_id: str | None = None, payload: str = "") -> None:
+    """锁审计用独立短事务写入，不受持锁方业务事务提交 / 回滚影响。"""
+    db = _database.SessionLocal()
+    try:
+        write_ranking_audit_log(
+            db,
+            action=action,
+            period_date=datetime.utcnow().date(),
+            run_id=run_id,
+            actor=owner,
+            payload_summary=payload,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("failed to write ranking sync lock audit action=%s", action)
+    finally:
+        db.close()
+
+
+@contextmanager
+def acquire_ranking_sync_lock(owner: str, wait_seconds: int | None = None):
+    """
+    在独立连接上持有集群级同步锁，退出时释放并记录等待 / 持有耗时。
+    先以 0 超时试探，仅在锁被占用时才按 wait_seconds 等待；等待超时抛 RankingSyncLockBusy。
+    持锁连接异常断开时 MySQL 会自动释放锁，进程崩溃不会造成死锁。
+    """
+    timeout = settings.ranking_sync_lock_wait_seconds if wait_seconds is None else wait_seconds
+    name = ranking_sync_lock_name()
+    connection = _database.engine.connect()
+    try:
+        started = perf_counter()
+        contended = not _get_named_lock(connection, name, 0)
+        if contended and not (timeout > 0 and _get_named_lock(connection, name, timeout)):
+            raise RankingSyncLockBusy((perf_counter() - started) * 1000)
+        handle = RankingSyncLockHandle(owner, (perf_counter() - started) * 1000, contended)
+        try:
+            yield handle
+        finally:
+            hold_ms = (perf_counter() - handle.acquired_at) * 1000
+            try:
+                _release_named_lock(connection, name)
+            finally:
+                write_sync_lock_audit(
+                    "ranking_sync_lock_released",
+                    owner,
+                    run_id=handle.run_id,
+                    payload=f"lock_wait_ms={handle.wait_ms:.1f},lock_hold_ms={hold_ms:.1f},contended={int(contended)}",
+                )
+    finally:
+        connection.close()
+
+
+def find_running_sync_job_id(db: Session) -> int | None:
+    row = (
+        db.query(RankingSyncJob.id)
+        .filter(RankingSyncJob.status == SYNC_JOB_RUNNING)
+        .order_by(RankingSyncJob.started_at.desc(), RankingSyncJob.id.desc())
+        .first()
+    )
+    return row[0] if row else None
+
+
+@contextmanager
+def ranking_sync_guard(db: Session, owner: str, wait_seconds: int | None = None):
+    """请求路径上的同步互斥：等锁超时返回 409，并带上正在执行的同步任务ID。"""
+    try:
+        with acquire_ranking_sync_lock(owner, wait_seconds) as handle:
+            yield handle
+    except RankingSyncLockBusy as busy:
+        running_job_id = find_running_sync_job_id(db)
+        write_sync_lock_audit(
+            "ranking_sync_lock_timeout",
+            owner,
+            payload=f"lock_wait_ms={busy.wait_ms:.1f},running_job_id={running_job_id or ''}",
+        )
+        headers = {"X-Ranking-Sync-Job-Id": str(running_job_id)} if running_job_id else None
+        raise HTTPException(
+            status_code=409,
+            detail=structured_error_detail(
+                code="ranking_sync_in_progress",
+                message="榜单正在同步中，请稍后重试或轮询当前同步任务",
+                field_errors=[{"field": "sync_job_id", "message": str(running_job_id or "")}],
+            ),
+            headers=headers,
+        ) from busy
+
+
+# ---------------------------------------------------------------------------
+# 影响范围序列化 / 合并
+# ---------------------------------------------------------------------------
+
+def serialize_sync_scope(scope: RankingSyncScope | None) -> str:
+    """空串表示全量重算。"""
+    if scope is None:
+        return ""
+    return _json.dumps(
+        {"app_ids": sorted(scope.app_ids), "config_ids": sorted(scope.config_ids)},
+        ensure_ascii=False,
+    )
+
+
+def deserialize_sync_scope(raw: str | None) -> RankingSyncScope | None:
+    if not raw:
+        return None
+    data = _json.loads(raw)
+    return RankingSyncScope(
+        app_ids=frozenset(int(i) for i in data.get("app_ids", [])),
+        config_ids=frozenset(str(i) for i in data.get("config_ids", [])),
+    )
+
+
+def normalize_sync_scope(db: Session, scope: RankingSyncScope | None) -> RankingSyncScope | None:
+    """在登记时把维度 / 应用参与关系展开成具体榜单，之后的合并只需做集合运算。"""
+    if scope is None:
+        return None
+    return RankingSyncScope(app_ids=scope.app_ids, config_ids=frozenset(resolve_scope_config_ids(db, scope)))
+
+
+def merge_sync_scopes(
+    current: RankingSyncScope | None,
+    incoming: RankingSyncScope | None,
+) -> RankingSyncScope | None:
+    """
+    合并两个已展开的影响范围：
+    - 任一为全量 → 全量
+    - 均为应用级 → 应用与榜单分别取并集（重算未变化的应用是幂等的）
+    - 否则升级为受影响榜单的单榜全量重算
+    """
+    if current is None or incoming is None:
+        return None
+    if current.app_ids and incoming.app_ids:
+        return RankingSyncScope(
+            app_ids=current.app_ids | incoming.app_ids,
+            config_ids=current.config_ids | incoming.config_ids,
+        )
+    return RankingSyncScope(config_ids=current.config_ids | incoming.config_ids)
+
+
+def _append_trigger(triggers: str, trigger: str) -> str:
+    existing = [item for item in triggers.split(",") if item]
+    if trigger not in existing:
+        existing.append(trigger)
+    return ",".join(existing)
+
+
+# ---------------------------------------------------------------------------
+# 任务登记 / 执行
+# ---------------------------------------------------------------------------
+
+def enqueue_ranking_sync(
+    db: Session,
+    trigger: str,
+    actor: str = "system",
+    scope: RankingSyncScope | None = None,
+    now: datetime | None = None,
+) -> RankingSyncJob:
+    """
+    登记同步任务：存在排队中的任务时合并进去并顺延去抖窗口
+    （不超过首次登记后的 RANKING_SYNC_MAX_DELAY_MS），否则新建任务。
+    调用方负责提交事务。
+    """
+    now = now or datetime.utcnow()
+    normalized = normalize_sync_scope(db, scope)
+    debounce = timedelta(milliseconds=settings.ranking_sync_debounce_ms)
+    max_delay = timedelta(milliseconds=settings.ranking_sync_max_delay_ms)
+
+    job = (
+        db.query(RankingSyncJob)
+        .filter(RankingSyncJob.status == SYNC_JOB_QUEUED)
+        .order_by(RankingSyncJob.id.desc())
+        .with_for_update()
+        .first()
+    )
+    if job is None:
+        job = RankingSyncJob(
+            status=SYNC_JOB_QUEUED,
+            triggers=trigger,
+            scope_json=serialize_sync_scope(normalized),
+            coalesced_count=1,
+            actor=actor,
+            run_id=str(_uuid.uuid4()),
+            timings_summary="",
+            error_message="",
+            not_before=now + debounce,
+            created_at=now,
+        )
+        db.add(job)
+        db.flush()
+        return job
+
+    job.scope_json = serialize_sync_scope(merge_sync_scopes(deserialize_sync_scope(job.scope_json), normalized))
+    job.triggers = _append_trigger(job.triggers or "", trigger)
+    job.coalesced_count = (job.coalesced_count or 1) + 1
+    job.not_before = min(now + debounce, (job.created_at or now) + max_delay)
+    db.flush()
+    return job
+
+
+def _new_running_job(
+    db: Session,
+    trigger: str,
+    actor: str,
+    scope_json: str,
+    run_id: str | None = None,
+) -> RankingSyncJob:
+    """请求内直接执行的同步同样登记为 running 任务，便于并发请求透出 / 复用。调用方负责提交。"""
+    now = datetime.utcnow()
+    job = RankingSyncJob(
+        status=SYNC_JOB_RUNNING,
+        triggers=trigger,
+        scope_json=scope_json,
+        coalesced_count=1,
+        actor=actor,
+        run_id=run_id or str(_uuid.uuid4()),
+        timings_summary="",
+        error_message="",
+        not_before=now,
+        created_at=now,
+        started_at=now,
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _run_sync_for_scope(db: Session, scope: RankingSyncScope | None, run_id: str, actor: str) -> RankingSyncResult:
+    if scope is None:
+        return run_ranking_sync(db, run_id=run_id, actor=actor)
+    return run_scoped_ranking_sync(db, scope, run_id=run_id, actor=actor)
+
+
+def _record_job_success(db: Session, job: RankingSyncJob, result: RankingSyncResult) -> None:
+    now = datetime.utcnow()
+    for trigger in [item for item in (job.triggers or "").split(",") if item]:
+        write_ranking_audit_log(
+            db,
+            action=f"{trigger}_triggered_sync",
+            period_date=now.date(),
+            run_id=result.run_id,
+            actor=job.actor,
+            payload_summary=(
+                f"updated_count={result.updated_count},sync_job_id={job.id},"
+                f"coalesced={job.coalesced_count},scope={job.scope_json or 'full'}"
+            ),
+        )
+    job.status = SYNC_JOB_DONE
+    job.updated_count = result.updated_count
+    job.timings_summary = ",".join(f"{name}_ms={elapsed:.1f}" for name, elapsed in result.timings_ms.items())
+    job.finished_at = now
+    db.commit()
+
+
+def execute_sync_job(db: Session, job_id: int) -> RankingSyncJob | None:
+    """执行已认领（running）的任务；失败时记录错误信息而不抛出。"""
+    job = db.get(RankingSyncJob, job_id)
+    if job is None:
+        return None
+    try:
+        result = _run_sync_for_scope(db, deserialize_sync_scope(job.scope_json), job.run_id, job.actor)
+        _record_job_success(db, job, result)
+    except Exception as exc:
+        db.rollback()
+        logger.exception("ranking sync job %s failed", job_id)
+        job = db.get(RankingSyncJob, job_id)
+        job.status = SYNC_JOB_FAILED
+        job.error_message = str(exc)[:2000]
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    return job
+
+
+def claim_sync_job(db: Session, job_id: int) -> bool:
+    """把指定排队任务原子改为 running；已被其他进程 / 请求认领时返回 False。"""
+    claimed = (
+        db.query(RankingSyncJob)
+        .filter(RankingSyncJob.id == job_id, RankingSyncJob.status == SYNC_JOB_QUEUED)
+        .update(
+            {RankingSyncJob.status: SYNC_JOB_RUNNING, RankingSyncJob.started_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return bool(claimed)
+
+
+def claim_next_sync_job(db: Session, now: datetime | None = None) -> int | None:
+    """原子认领一个已过去抖窗口的排队任务（多进程下只有一个能认领成功）。"""
+    now = now or datetime.utcnow()
+    candidate_ids = [
+        row[0]
+        for row in db.query(RankingSyncJob.id)
+        .filter(RankingSyncJob.status == SYNC_JOB_QUEUED, RankingSyncJob.not_before <= now)
+        .order_by(RankingSyncJob.id)
+        .limit(5)
+        .all()
+    ]
+    for job_id in candidate_ids:
+        if claim_sync_job(db, job_id):
+            return job_id
+    return None
+
+
+def fail_stale_sync_jobs(db: Session, now: datetime | None = None) -> int:
+    """进程崩溃遗留的 running 任务超时后标记失败，避免前端一直轮询。"""
+    now = now or datetime.utcnow()
+    deadline = now - timedelta(seconds=settings.ranking_sync_job_timeout_seconds)
+    failed = (
+        db.query(RankingSyncJob)
+        .filter(RankingSyncJob.status == SYNC_JOB_RUNNING, RankingSyncJob.started_at < deadline)
+        .update(
+            {
+                RankingSyncJob.status: SYNC_JOB_FAILED,
+                RankingSyncJob.error_message: "任务执行超时，已自动终止",
+                RankingSyncJob.finished_at: now,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return failed
+
+
+def has_due_sync_jobs(db: Session, now: datetime | None = None) -> bool:
+    now = now or datetime.utcnow()
+    return db.query(RankingSyncJob.id).filter(
+        RankingSyncJob.status == SYNC_JOB_QUEUED, RankingSyncJob.not_before <= now
+    ).first() is not None
+
+
+def process_due_sync_jobs(session_factory=None, now: datetime | None = None) -> int:
+    """
+    处理所有到期任务，返回执行的任务数。
+    有到期任务时才尝试集群锁（不等待）：锁被其他进程 / 请求持有时本轮跳过，任务留在队列里下一轮再认领。
+    """
+    factory = session_factory or _database.SessionLocal
+    db = factory()
+    processed = 0
+    try:
+        fail_stale_sync_jobs(db, now=now)
+        if not has_due_sync_jobs(db, now=now):
+            return processed
+        db.rollback()
+        try:
+            with acquire_ranking_sync_lock("sync_worker", wait_seconds=0) as lock:
+                while True:
+                    job_id = claim_next_sync_job(db, now=now)
+                    if job_id is None:
+                        return processed
+                    job = execute_sync_job(db, job_id)
+                    lock.run_id = job.run_id if job is not None else lock.run_id
+                    processed += 1
+        except RankingSyncLockBusy:
+            return processed
+    finally:
+        db.close()
+
+
+def find_joinable_sync_job(db: Session, triggers: tuple[str, ...], since: datetime) -> RankingSyncJob | None:
+    """等锁期间由其他请求发起并完成的全量同步：开始时间不早于 since，说明已包含本请求之前提交的全部变更。"""
+    return (
+        db.query(RankingSyncJob)
+        .filter(
+            RankingSyncJob.status == SYNC_JOB_DONE,
+            RankingSyncJob.scope_json == "",
+            RankingSyncJob.triggers.in_(triggers),
+            RankingSyncJob.started_at >= since,
+        )
+        .order_by(RankingSyncJob.started_at.desc(), RankingSyncJob.id.desc())
+        .first()
+    )
+
+
+def run_locked_full_sync(
+    db: Session,
+    lock: RankingSyncLockHandle,
+    trigger: str,
+    actor: str,
+    *,
+    requested_at: datetime,
+    run_id: str | None = None,
+    joinable_triggers: tuple[str, ...] = (),
+) -> tuple[RankingSyncJob, bool]:
+    """
+    在已持有集群锁的前提下执行请求路径上的全量同步（手动同步 / 发布），返回 (任务, 是否复用)。
+    曾因锁等待排队、且未指定 run_id 时，优先复用等待期间已完成的同类全量同步，避免重复重算。
+    同步失败时任务标记为 failed 并抛出 500。
+    """
+    if lock.contended and run_id is None and joinable_triggers:
+        joined = find_joinable_sync_job(db, joinable_triggers, requested_at)
+        if joined is not None:
+            lock.run_id = joined.run_id
+            return joined, True
+    job = _new_running_job(db, trigger, actor, "", run_id=run_id)
+    db.commit()
+    lock.run_id = job.run_id
+    job = execute_sync_job(db, job.id)
+    if job.status != SYNC_JOB_DONE:
+        raise HTTPException(status_code=500, detail=f"同步失败: {job.error_message}")
+    return job, False
+
+
+# ---------------------------------------------------------------------------
+# 链式变更触发
+# ---------------------------------------------------------------------------
+
+def sync_after_chain_mutation(
+    db: Session,
+    trigger: str,
+    actor: str = "system",
+    scope: RankingSyncScope | None = None,
+) -> RankingSyncTicket:
+    """
+    链路节点发生增删改后，统一触发榜单重算并返回任务凭据。
+    本次变更与登记（或合并进）的排队任务总是先一起提交，之后才去拿集群锁：
+    变更事务持有的行锁不会跨越锁等待，等锁超时也不会回滚已保存的变更。
+    - background：登记后立即返回，由后台线程去抖合并后执行
+    - inline：立即在请求内持锁执行该任务；等锁超时时任务留在队列，由后台线程补跑，返回 queued 凭据
+    scope 声明变更影响范围时走增量同步；未声明时全量重算全部启用榜单。
+    """
+    inline = settings.ranking_sync_mode != "background"
+    try:
+        # SessionLocal 关闭了 autoflush，先显式 flush，避免登记 / 同步阶段读不到本次变更。
+        db.flush()
+        job = enqueue_ranking_sync(db, trigger, actor=actor, scope=scope)
+        if inline:
+            job.not_before = datetime.utcnow()
+        # 变更本身（如删除榜单配置连带清理榜单行）随本次提交对外可见
+        bump_data_version(db, RANKINGS_DATA_VERSION)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"链路同步失败: {str(exc)}") from exc
+
+    job_id, run_id = job.id, job.run_id
+    queued = RankingSyncTicket(job_id=job_id, status=SYNC_JOB_QUEUED, updated_count=0, run_id=run_id)
+    if not inline:
+        return queued
+    try:
+        with acquire_ranking_sync_lock(actor) as lock:
+            lock.run_id = run_id
+            if not claim_sync_job(db, job_id):
+                # 等锁期间已被后台线程认领执行
+                job = db.get(RankingSyncJob, job_id)
+                db.refresh(job)
+            else:
+                job = execute_sync_job(db, job_id)
+    except RankingSyncLockBusy as busy:
+        write_sync_lock_audit(
+            "ranking_sync_lock_timeout",
+            actor,
+            run_id=run_id,
+            payload=f"lock_wait_ms={busy.wait_ms:.1f},queued_job_id={job_id}",
+        )
+        return queued
+    return RankingSyncTicket(
+        job_id=job_id,
+        status=job.status,
+        updated_count=job.updated_count or 0,
+        run_id=run_id,
+    )
+
+
+def apply_sync_ticket_headers(response: Response, ticket: RankingSyncTicket) -> None:
+    """返回 ORM 对象的接口通过响应头透出同步任务，便于前端轮询。"""
+    response.headers["X-Ranking-Sync-Job-Id"] = str(ticket.job_id)
+    response.headers["X-Ranking-Sync-Status"] = ticket.status
+
+
+def serialize_sync_job(job: RankingSyncJob) -> dict[str, object]:
+    queue_wait_ms = None
+    duration_ms = None
+    if job.started_at and job.created_at:
+        queue_wait_ms = int((job.started_at - job.created_at).total_seconds() * 1000)
+    if job.finished_at and job.started_at:
+        duration_ms = int((job.finished_at - job.started_at).total_seconds() * 1000)
+    return {
+        "id": job.id,
+        "status": job.status,
+        "triggers": [item for item in (job.triggers or "").split(",") if item],
+        "scope": job.scope_json or "full",
+        "coalesced_count": job.coalesced_count,
+        "actor": job.actor,
+        "run_id": job.run_id,
+        "updated_count": job.updated_count,
+        "timings_summary": job.timings_summary or "",
+        "error_message": job.error_message or "",
+        "not_before": job.not_before,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "queue_wait_ms": queue_wait_ms,
+        "duration_ms": duration_ms,
+    }
+
+
+def run_scheduled_snapshot_purge(
+    interval_seconds: int,
+    session_factory=None,
+    now: datetime | None = None,
+) -> bool:
+    """
+    周期快照清理：集群内每个周期只执行一次，返回本次是否执行。
+    持集群锁（不等待，占用时抛 RankingSyncLockBusy）后读取 data_versions 中 snapshot_purge 行的
+    updated_at 作为上次清理时间，未满一个周期直接跳过；清理完成后自增该行。
+    """
+    factory = session_factory or _database.SessionLocal
+    with acquire_ranking_sync_lock(SNAPSHOT_PURGE_LOCK_OWNER, wait_seconds=0):
+        db = factory()
+        try:
+            now = now or datetime.utcnow()
+            last_purged_at = (
+                db.query(DataVersion.updated_at).filter(DataVersion.name == SNAPSHOT_PURGE_MARKER).scalar()
+            )
+            if last_purged_at is not None and last_purged_at > now - timedelta(seconds=interval_seconds):
+                return False
+            purge_ranking_snapshots(factory)
+            bump_data_version(db, SNAPSHOT_PURGE_MARKER)
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------------
+# 后台执行线程
+# ---------------------------------------------------------------------------
+
+class RankingSyncWorker:
+    """
+    进程内后台线程：轮询到期任务并执行；多进程部署时由原子认领保证不重复执行。
+    同时按 RANKING_SNAPSHOT_PURGE_INTERVAL_SECONDS 周期清理过期的中间快照（集群内每周期一次）。
+    """
+
+    def __init__(self, poll_seconds: float = SYNC_WORKER_POLL_SECONDS) -> None:
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ranking-sync-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        purge_interval = settings.ranking_snapshot_purge_interval_seconds
+        next_purge_at = monotonic() + purge_interval
+        while not self._stop.is_set():
+            try:
+                process_due_sync_jobs()
+            except Exception:
+                logger.exception("ranking sync worker iteration failed")
+            if purge_interval and monotonic() >= next_purge_at:
+                next_purge_at = monotonic() + purge_interval
+                try:
+                    # 清理与同步 / 发布互斥，避免删掉正在被发布标记的批次；其他 worker 本周期已清理过时跳过
+                    run_scheduled_snapshot_purge(purge_interval)
+                except RankingSyncLockBusy:
+                    # 锁被同步 / 发布或其他 worker 的清理占用：本轮跳过，稍后再试
+                    next_purge_at = monotonic() + min(purge_interval, SNAPSHOT_PURGE_RETRY_SECONDS)
+                except Exception:
+                    logger.exception("ranking snapshot purge failed")
+            self._stop.wait(self.poll_seconds)
+
+
+_worker: RankingSyncWorker | None = None
+
+
+def start_ranking_sync_worker() -> None:
+    # inline 模式下也启动：补跑等锁超时留在队列里的任务，并负责周期清理快照
+    global _worker
+    if _worker is None:
+        _worker = RankingSyncWorker()
+    _worker.start()
+
+
+def stop_ranking_sync_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
@@ -0,0 +1,400 @@
+"""列式评分引擎——把参与应用的评分字段装入 NumPy 数组，按维度规则一次性算出全部应用的维度分。
+
+- 维度评分规则是声明式的：`ranking_dimensions.scoring_rule` 保存规则 JSON（查表 / 线性钳制 /
+  环比增长率 / 常数），未配置时按维度名称取 `BUILTIN_RULE_SPECS` 中的系统预置规则，再兜底默认 50 分
+- 规则 JSON 的校验在依赖无关的 `app/scoring_rules.py`，schemas 直接复用；本模块只负责编译与计算
+- 规则按 (维度ID, updated_at, 名称, 规则文本) 编译一次后缓存；逐应用的 `calculate_dimension_score`
+  与批量的 `score_dimension_matrix` 共用同一编译结果，两条路径逐位一致
+- 只装载规则实际用到的 App 字段；分类字段按取值编码一次，各规则查表得分
+- 计算详情文案按需生成：只有写回维度分或比对已有行时才格式化字符串
+"""
+
+import json
+import string
+import threading
+from typing import Any, Sequence
+
+import numpy as np
+
+from ..scoring_rules import (
+    CATEGORICAL_APP_FIELDS,
+    DEFAULT_DIMENSION_DETAIL,
+    DEFAULT_DIMENSION_SCORE,
+    NUMERIC_APP_FIELDS,
+    SCORE_LIMIT,
+    SCORING_RULE_TYPES,
+    dump_scoring_rule,
+    parse_scoring_rule,
+    validate_scoring_rule,
+)
+
+# ---------------------------------------------------------------------------
+# 列式数据
+# ---------------------------------------------------------------------------
+
+class AppColumns:
+    """一组应用的评分字段列存；字段在首次被规则使用时才从 App 对象读取。"""
+
+    def __init__(self, apps: Sequence[Any]) -> None:
+        self.apps = list(apps)
+        self._numeric: dict[str, np.ndarray] = {}
+        self._categorical: dict[str, tuple[list, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.apps)
+
+    def numeric(self, attribute: str) -> np.ndarray:
+        """数值列；空值按 0 处理（增长类字段允许为空）。"""
+        column = self._numeric.get(attribute)
+        if column is None:
+            column = np.fromiter(
+                (getattr(app, attribute) or 0 for app in self.apps), dtype=np.float64, count=len(self.apps)
+            )
+            self._numeric[attribute] = column
+        return column
+
+    def categorical(self, attribute: str) -> tuple[list, np.ndarray]:
+        """返回 (去重取值列表, 每个应用对应的取值下标)。"""
+        encoded = self._categorical.get(attribute)
+        if encoded is None:
+            index: dict[Any, int] = {}
+            codes = np.fromiter(
+                (index.setdefault(getattr(app, attribute), len(index)) for app in self.apps),
+                dtype=np.intp,
+                count=len(self.apps),
+            )
+            encoded = (list(index), codes)
+            self._categorical[attribute] = encoded
+        return encoded
+
+
+def _clamp_one(raw: float, lower: int | None, upper: int | None) -> int:
+    # 未配置上下限的规则同样不超出 ±SCORE_LIMIT（score 列为 INT），NaN 按 0 分
+    score = 0 if raw != raw else int(min(max(raw, -SCORE_LIMIT), SCORE_LIMIT))
+    if upper is not None:
+        score = min(score, upper)
+    if lower is not None:
+        score = max(score, lower)
+    return score
+
+
+def _clamp_many(raw: np.ndarray, lower: int | None, upper: int | None) -> np.ndarray:
+    scores = np.trunc(np.clip(np.nan_to_num(raw, nan=0.0), -SCORE_LIMIT, SCORE_LIMIT))
+    if upper is not None:
+        scores = np.minimum(scores, upper)
+    if lower is not None:
+        scores = np.maximum(scores, lower)
+    return scores.astype(np.int64)
+
+
+def _positional_template(template: str, names: Sequence[str]) -> str:
+    """把具名占位符改写为位置占位符：批量生成详情时按位置传参，省去逐行构造 kwargs。"""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is not None:
+            parts.append("{" + str(names.index(field)) + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# 编译后的规则
+# ---------------------------------------------------------------------------
+
+class LinearRule:
+    """Σ(字段 × 系数) / divisor，向零截断后钳制到 [min, max]。"""
+
+    def __init__(self, terms: dict[str, float], divisor: float, lower: int | None, upper: int | None, detail: str) -> None:
+        self.terms = list(terms.items())
+        self.divisor = divisor
+        self.lower = lower
+        self.upper = upper
+        self.template = detail
+        self._fields = [field for field, _ in self.terms]
+        self._positional = _positional_template(detail, ["score", *self._fields])
+
+    def score_one(self, app: Any) -> int:
+        total = 0.0
+        for field, coefficient in self.terms:
+            total += float(getattr(app, field) or 0) * coefficient
+        return _clamp_one(total / self.divisor, self.lower, self.upper)
+
+    def score_many(self, columns: AppColumns) -> np.ndarray:
+        total = np.zeros(len(columns), dtype=np.float64)
+        for field, coefficient in self.terms:
+            total = total + columns.numeric(field) * coefficient
+        return _clamp_many(total / self.divisor, self.lower, self.upper)
+
+    def detail(self, app: Any, score: int) -> str:
+        return self.template.format(score=score, **{field: getattr(app, field) for field, _ in self.terms})
+
+    def details_many(self, columns: AppColumns, scores: np.ndarray) -> list[str]:
+        render = self._positional.format
+        values = [[getattr(app, field) for app in columns.apps] for field in self._fields]
+        return [render(*row) for row in zip(scores.tolist(), *values)]
+
+
+class LookupRule:
+    """按 App 分类字段查表得分；未列出的取值走兜底分。"""
+
+    def __init__(
+        self,
+        field: str,
+        table: dict[str, int],
+        default: int,
+        details: dict[str, str],
+        default_detail: str,
+    ) -> None:
+        self.field = field
+        self.table = table
+        self.default = default
+        self.details = details
+        self.default_detail = default_detail
+
+    def score_one(self, app: Any) -> int:
+        return self.table.get(getattr(app, self.field), self.default)
+
+    def score_many(self, columns: AppColumns) -> np.ndarray:
+        values, codes = columns.categorical(self.field)
+        if not values:
+            return np.zeros(0, dtype=np.int64)
+        lookup = np.array([self.table.get(value, self.default) for value in values], dtype=np.int64)
+        return lookup[codes]
+
+    def _detail_for_value(self, value: Any) -> str:
+        if value not in self.table:
+            return self.default_detail.format(value=value, score=self.default)
+        template = self.details.get(value) or f"{CATEGORICAL_APP_FIELDS[self.field]}为{{value}}，获得{{score}}分"
+        return template.format(value=value, score=self.table[value])
+
+    def detail(self, app: Any, score: int) -> str:
+        return self._detail_for_value(getattr(app, self.field))
+
+    def details_many(self, columns: AppColumns, scores: np.ndarray) -> list[str]:
+        values, codes = columns.categorical(self.field)
+        texts = [self._detail_for_value(value) for value in values]
+        return [texts[code] for code in codes.tolist()]
+
+
+class GrowthRatioRule:
+    """(field - baseline) / baseline × scale，向零截断后钳制；基线不大于 0 时给固定分。"""
+
+    def __init__(
+        self,
+        field: str,
+        baseline: str,
+        scale: float,
+        lower: int | None,
+        upper: int | None,
+        no_baseline_score: int,
+        detail: str,
+        no_baseline_detail: str,
+    ) -> None:
+        self.field = field
+        self.baseline = baseline
+        self.scale = scale
+        self.lower = lower
+        self.upper = upper
+        self.no_baseline_score = no_baseline_score
+        self.template = detail
+        self.no_baseline_template = no_baseline_detail
+
+    def _rate_one(self, app: Any) -> float | None:
+        previous = float(getattr(app, self.baseline) or 0)
+        if previous > 0:
+            return (float(getattr(app, self.field) or 0) - previous) / previous
+        return None
+
+    def score_one(self, app: Any) -> int:
+        rate = self._rate_one(app)
+        if rate is None:
+            return self.no_baseline_score
+        return _clamp_one(rate * self.scale, self.lower, self.upper)
+
+    def score_many(self, columns: AppColumns) -> np.ndarray:
+        current = columns.numeric(self.field)
+        previous = columns.numeric(self.baseline)
+        has_baseline = previous > 0
+        rate = np.divide(current - previous, previous, out=np.zeros_like(current), where=has_baseline)
+        scores = _clamp_many(rate * self.scale, self.lower, self.upper)
+        return np.where(has_baseline, scores, self.no_baseline_score).astype(np.int64)
+
+    def detail(self, app: Any, score: int) -> str:
+        values = {self.field: getattr(app, self.field), self.baseline: getattr(app, self.baseline)}
+        rate = self._rate_one(app)
+        if rate is None:
+            return self.no_baseline_template.format(score=score, **values)
+        return self.template.format(score=score, rate=rate, **values)
+
+    def details_many(self, columns: AppColumns, scores: np.ndarray) -> list[str]:
+        return [self.detail(app, score) for app, score in zip(columns.apps, scores.tolist())]
+
+
+class ConstantRule:
+    """固定分值；未配置规则的维度兜底使用。"""
+
+    def __init__(self, score: int, detail: str) -> None:
+        self.score = score
+        self.template = detail
+
+    def score_one(self, app: Any) -> int:
+        return self.score
+
+    def score_many(self, columns: AppColumns) -> np.ndarray:
+        return np.full(len(columns), self.score, dtype=np.int64)
+
+    def detail(self, app: Any, score: int) -> str:
+        return self.template.format(score=score)
+
+    def details_many(self, columns: AppColumns, scores: np.ndarray) -> list[str]:
+        return [self.template.format(score=self.score)] * len(columns)
+
+
+DEFAULT_DIMENSION_RULE = ConstantRule(DEFAULT_DIMENSION_SCORE, DEFAULT_DIMENSION_DETAIL)
+RULE_CLASSES = {"constant": ConstantRule, "lookup": LookupRule, "linear": LinearRule, "growth_ratio": GrowthRatioRule}
+
+
+# ---------------------------------------------------------------------------
+# 声明式规则：编译（校验见 app/scoring_rules.py）
+# ---------------------------------------------------------------------------
+
+def compile_scoring_rule(spec: dict[str, Any]):
+    """把规则 JSON 编译为可逐条 / 批量计算的规则对象；非法规则抛 ValueError。"""
+    rule_type, params = validate_scoring_rule(spec)
+    return RULE_CLASSES[rule_type](**params)
+
+
+# 系统预置维度的规则（按维度名称兜底；数据库中显式配置 scoring_rule 时以配置为准）
+BUILTIN_RULE_SPECS: dict[str, dict[str, Any]] = {
+    "用户满意度": {
+        "type": "linear",
+        "terms": {"monthly_calls": 10},
+        "max": 100,
+        "detail": "基于月调用量计算：{monthly_calls} * 10 = {score}分",
+    },
+    "业务价值": {
+        "type": "lookup",
+        "field": "effectiveness_type",
+        "scores": {"revenue_growth": 100, "efficiency_gain": 80, "cost_reduction": 70},
+        "default": 60,
+        "details": {
+            "revenue_growth": "成效类型为拉动收入，获得满分100分",
+            "efficiency_gain": "成效类型为增效，获得80分",
+            "cost_reduction": "成效类型为降本，获得70分",
+        },
+        "default_detail": "成效类型为感知提升，获得60分",
+    },
+    "技术创新性": {
+        "type": "lookup",
+        "field": "difficulty",
+        "scores": {"High": 100, "Medium": 70},
+        "default": 40,
+        "details": {"High": "难度等级为高，获得满分100分", "Medium": "难度等级为中，获得70分"},
+        "default_detail": "难度等级为低，获得40分",
+    },
+    "使用活跃度": {
+        "type": "linear",
+        "terms": {"monthly_calls": 5},
+        "max": 100,
+        "detail": "基于月调用量计算：{monthly_calls} * 5 = {score}分",
+    },
+    "稳定性和安全性": {
+        "type": "lookup",
+        "field": "status",
+        "scores": {"available": 100, "beta": 80},
+        "default": 60,
+        "details": {"available": "应用状态为可用，获得满分100分", "beta": "应用状态为试运行，获得80分"},
+        "default_detail": "应用状态为{value}，获得60分",
+    },
+    "增长趋势": {
+        "type": "growth_ratio",
+        "field": "monthly_calls",
+        "baseline": "last_month_calls",
+        "scale": 100,
+        "min": 0,
+        "max": 100,
+        "no_baseline_score": 50,
+        "detail": "月调用量 {monthly_calls} 较上月 {last_month_calls} 增长{rate:.1%}，获得{score}分",
+        "no_baseline_detail": "上月无调用量基线，获得{score}分",
+    },
+    "用户增长": {
+        "type": "linear",
+        "terms": {"new_users_count": 1},
+        "divisor": 10,
+        "max": 100,
+        "detail": "基于新增用户数计算：{new_users_count} / 10 = {score}分",
+    },
+    "市场热度": {
+        "type": "linear",
+        "terms": {"search_count": 1, "share_count": 2, "favorite_count": 3},
+        "divisor": 10,
+        "max": 100,
+        "detail": "基于搜索 / 分享 / 收藏计算：({search_count} + {share_count}*2 + {favorite_count}*3) / 10 = {score}分",
+    },
+}
+
+BUILTIN_DIMENSION_RULES = {name: compile_scoring_rule(spec) for name, spec in BUILTIN_RULE_SPECS.items()}
+
+_COMPILED_RULE_CACHE_LIMIT = 1024
+_compiled_rules: dict[tuple, Any] = {}
+_compiled_rules_lock = threading.Lock()
+
+
+def rule_for_dimension(dimension: Any):
+    """
+    返回维度的编译后规则：显式 scoring_rule → 系统预置（按名称）→ 默认 50 分。
+    编译结果按 (ID, updated_at, 名称, 规则文本) 缓存，维度被修改后自动失效。
+    """
+    raw = getattr(dimension, "scoring_rule", None)
+    if not raw:
+        return BUILTIN_DIMENSION_RULES.get(dimension.name, DEFAULT_DIMENSION_RULE)
+    key = (getattr(dimension, "id", None), getattr(dimension, "updated_at", None), dimension.name, raw)
+    rule = _compiled_rules.get(key)
+    if rule is None:
+        rule = compile_scoring_rule(json.loads(raw))
+        with _compiled_rules_lock:
+            if len(_compiled_rules) >= _COMPILED_RULE_CACHE_LIMIT:
+                _compiled_rules.clear()
+            _compiled_rules[key] = rule
+    return rule
+
+
+# ---------------------------------------------------------------------------
+# 批量评分
+# ---------------------------------------------------------------------------
+
+class DimensionScoreMatrix:
+    """应用 × 维度得分矩阵；某一维度的计算详情在首次 detail(i, j) 访问时整列生成。"""
+
+    def __init__(self, columns: AppColumns, rules: list, scores: np.ndarray) -> None:
+        self.columns = columns
+        self.rules = rules
+        self.scores = scores
+        self._details: dict[int, list[str]] = {}
+
+    def detail(self, row: int, col: int) -> str:
+        details = self._details.get(col)
+        if details is None:
+            details = self.rules[col].details_many(self.columns, self.scores[:, col])
+            self._details[col] = details
+        return details[row]
+
+
+def score_dimension_matrix(columns: AppColumns, dimensions: Sequence[Any]) -> DimensionScoreMatrix:
+    """按维度逐列向量化计算，返回 len(columns) × len(dimensions) 的整数得分矩阵。"""
+    rules = [rule_for_dimension(dimension) for dimension in dimensions]
+    scores = np.empty((len(columns), len(rules)), dtype=np.int64)
+    for col, rule in enumerate(rules):
+        scores[:, col] = rule.score_many(columns)
+    return DimensionScoreMatrix(columns, rules, scores)
+
+
+def weighted_final_scores(scores: np.ndarray, weights: Sequence[float], weight_factors: np.ndarray) -> np.ndarray:
+    """
+    按维度顺序逐列累加加权分，乘应用权重因子后向零截断并钳制到 [0, 1000]。
+    累加顺序与逐应用循环一致，保证浮点结果逐位相同。
+    """
+    total = np.zeros(scores.shape[0], dtype=np.float64)
+    for col, weight in enumerate(weights):
+        total = total + scores[:, col] * float(weight)
+    return np.clip(np.trunc(total * weight_factors), 0, 1000).astype(np.int64)
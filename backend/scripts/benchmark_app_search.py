@@ -0,0 +1,108 @@
+"""应用关键词检索基准：旧 LIKE '%q%' 多字段 OR 与 ngram 全文索引检索的耗时及结果一致性对比。
+
+需要已执行 `alembic upgrade head` 的 MySQL 库（建议专用测试库）。脚本写入一批
+section="benchmark" 的合成应用，跑完后删除。
+
+用法：
+    cd backend
+    python scripts/benchmark_app_search.py --apps 50000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+from datetime import date
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.models import App  # noqa: E402
+from app.services.app_search_service import APP_SEARCH_FIELDS, apply_app_search  # noqa: E402
+
+BENCHMARK_SECTION = "benchmark"
+WORDS = [
+    "智能", "客服", "工单", "质检", "营销", "外呼", "知识库", "问答", "坐席", "报表", "稽核", "巡检",
+    "网络", "运维", "告警", "预测", "推荐", "审批", "合同", "财务", "人力", "培训", "AI", "RPA",
+]
+ORGS = ["省公司", "市场部", "客服中心", "网络部", "信息中心", "财务部"]
+QUERIES = ["智能客服", "工单", "知识库问答", "运维告警", "AI", "营销外呼", "合同审批", "不存在的关键词"]
+
+
+def build_rows(count: int, seed: int) -> list[dict]:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = "".join(rnd.sample(WORDS, 3)) + f"-{i}"
+        rows.append({
+            "name": name,
+            "org": rnd.choice(ORGS),
+            "company": rnd.choice(["", "分公司A", "分公司B"]),
+            "department": rnd.choice(["", "一部", "二部"]),
+            "section": BENCHMARK_SECTION,
+            "category": rnd.choice(["前端市场类", "客户服务类", "云网运营类", "管理支撑类"]),
+            "description": "，".join(rnd.choice(WORDS) + rnd.choice(WORDS) for _ in range(12)),
+            "status": "available",
+            "monthly_calls": 0.0,
+            "release_date": date(2026, 10, 17),
+        })
+    return rows
+
+
+def legacy_like_query(db, q: str):
+    return db.query(App.id).filter(
+        App.section == BENCHMARK_SECTION,
+        or_(*(getattr(App, field).contains(q) for field in APP_SEARCH_FIELDS)),
+    ).order_by(App.id)
+
+
+def timed(run, repeat: int) -> tuple[float, list]:
+    samples = []
+    result = []
+    for _ in range(repeat):
+        started = perf_counter()
+        result = run()
+        samples.append((perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=20261017)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = build_rows(args.apps, args.seed)
+        for start in range(0, len(rows), 2000):
+            db.execute(insert(App.__table__), rows[start:start + 2000])
+        db.commit()
+
+        print(f"apps={args.apps} repeat={args.repeat}")
+        print(f"{'query':<16}{'hits':>8}{'LIKE ms':>12}{'FULLTEXT ms':>14}{'speedup':>10}  same_ids")
+        for q in QUERIES:
+            like_ms, like_rows = timed(lambda: legacy_like_query(db, q).all(), args.repeat)
+            fulltext_ms, fulltext_rows = timed(
+                lambda: apply_app_search(db.query(App.id).filter(App.section == BENCHMARK_SECTION), q).all(),
+                args.repeat,
+            )
+            same = {row[0] for row in like_rows} == {row[0] for row in fulltext_rows}
+            print(
+                f"{q:<16}{len(fulltext_rows):>8}{like_ms:>12.1f}{fulltext_ms:>14.1f}"
+                f"{like_ms / fulltext_ms if fulltext_ms else float('inf'):>10.1f}  {same}"
+            )
+    finally:
+        db.rollback()
+        db.query(App).filter(App.section == BENCHMARK_SECTION).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""大列表接口序列化基准：默认路径（ORM + response_model）与快速路径（stream=true）的吞吐与峰值内存对比。
+
+需要已执行 `alembic upgrade head` 的 MySQL 库（建议专用测试库）。脚本写入一批 section="benchmark"
+的合成应用与 status="benchmark" 的合成申报，经进程内 TestClient 请求
+`/api/apps?section=benchmark` 与 `/api/submissions?status=benchmark`，跑完后删除。
+峰值内存为 tracemalloc 统计的单次请求 Python 分配峰值。
+
+用法：
+    cd backend
+    python scripts/benchmark_list_serialization.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tracemalloc
+from datetime import date, datetime, timedelta
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.dependencies import require_admin_token  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import App, Submission  # noqa: E402
+
+BENCHMARK_MARKER = "benchmark"
+WORDS = ["智能", "客服", "工单", "质检", "营销", "外呼", "知识库", "问答", "坐席", "报表", "稽核", "巡检"]
+ENDPOINTS = [
+    ("apps", "/api/apps", {"section": BENCHMARK_MARKER}),
+    ("submissions", "/api/submissions", {"status": BENCHMARK_MARKER}),
+]
+
+
+def build_app_rows(count: int, rnd: random.Random) -> list[dict]:
+    return [
+        {
+            "name": "".join(rnd.sample(WORDS, 3)) + f"-{i}",
+            "org": "省公司",
+            "company": rnd.choice(["", "分公司A", "分公司B"]),
+            "department": "一部",
+            "section": BENCHMARK_MARKER,
+            "category": "客户服务类",
+            "description": "，".join(rnd.choice(WORDS) for _ in range(40)),
+            "status": "available",
+            "monthly_calls": rnd.random() * 1000,
+            "release_date": date(2026, 10, 17),
+            "problem_statement": "，".join(rnd.choice(WORDS) for _ in range(20)),
+        }
+        for i in range(count)
+    ]
+
+
+def build_submission_rows(count: int, rnd: random.Random) -> list[dict]:
+    return [
+        {
+            "app_name": "".join(rnd.sample(WORDS, 3)) + f"-{i}",
+            "unit_name": "省公司",
+            "company": "分公司A",
+            "department": "一部",
+            "contact": "张三",
+            "category": "客户服务类",
+            "scenario": "，".join(rnd.choice(WORDS) for _ in range(40)),
+            "embedded_system": "CRM",
+            "problem_statement": "，".join(rnd.choice(WORDS) for _ in range(20)),
+            "effectiveness_type": "cost_reduction",
+            "effectiveness_metric": "工时",
+            "data_level": "L2",
+            "expected_benefit": "，".join(rnd.choice(WORDS) for _ in range(20)),
+            "status": BENCHMARK_MARKER,
+            "manage_token": f"{BENCHMARK_MARKER}-{i}-{rnd.getrandbits(32):08x}",
+            "created_at": datetime(2026, 10, 17, 8, 0, 0) + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def measure(client: TestClient, path: str, params: dict, repeat: int) -> tuple[float, float, int, int]:
+    """返回 (中位耗时 ms, 峰值内存 MiB, 响应字节数, 行数)。"""
+    samples = []
+    for _ in range(repeat):
+        started = perf_counter()
+        resp = client.get(path, params=params)
+        samples.append((perf_counter() - started) * 1000)
+        resp.raise_for_status()
+    tracemalloc.start()
+    resp = client.get(path, params=params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1024 / 1024, len(resp.content), len(resp.json())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=20261017)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    app.dependency_overrides[require_admin_token] = lambda: None
+    db = SessionLocal()
+    try:
+        for table, rows in (
+            (App.__table__, build_app_rows(args.rows, rnd)),
+            (Submission.__table__, build_submission_rows(args.rows, rnd)),
+        ):
+            for start in range(0, len(rows), 2000):
+                db.execute(insert(table), rows[start:start + 2000])
+        db.commit()
+
+        client = TestClient(app)
+        print(f"rows={args.rows} repeat={args.repeat}")
+        print(f"{'endpoint':<13}{'path':<9}{'rows':>7}{'ms':>10}{'rows/s':>11}{'peak MiB':>10}{'bytes':>12}  same")
+        for label, path, params in ENDPOINTS:
+            default = measure(client, path, params, args.repeat)
+            fast = measure(client, path, {**params, "stream": "true"}, args.repeat)
+            same = client.get(path, params=params).json() == client.get(path, params={**params, "stream": "true"}).json()
+            for name, (ms, peak, size, count) in (("default", default), ("stream", fast)):
+                print(f"{label:<13}{name:<9}{count:>7}{ms:>10.1f}{count / ms * 1000 if ms else 0:>11.0f}{peak:>10.1f}{size:>12}  {same}")
+    finally:
+        app.dependency_overrides.pop(require_admin_token, None)
+        db.rollback()
+        db.query(App).filter(App.section == BENCHMARK_MARKER).delete(synchronize_session=False)
+        db.query(Submission).filter(Submission.status == BENCHMARK_MARKER).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
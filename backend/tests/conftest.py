@@ -107,6 +107,10 @@ def _alembic_config(database_url: str) -> Config:
 
 os.environ.setdefault("TEST_DATABASE_URL", DEFAULT_TEST_DATABASE_URL)
 os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+# API 用例断言的是变更后的即时榜单状态，测试进程内同步执行；后台队列另有专门用例。
+os.environ.setdefault("RANKING_SYNC_MODE", "inline")
+# 多数用例直接改库后立即读榜单；读缓存默认关闭，缓存行为由专门用例开启验证。
+os.environ.setdefault("RANKING_CACHE_ENABLED", "false")
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -337,6 +337,45 @@ def test_admin_api_rejects_non_admin_session_token():
     client.post("/api/auth/logout")
 
 
+def test_admin_session_cache_drops_sessions_on_role_change_and_disable():
+    username = f"cached_admin_{uuid.uuid4().hex[:8]}"
+    password = "Cached_123!"
+    db = SessionLocal()
+    try:
+        user = User(
+            username=username,
+            chinese_name="缓存管理员",
+            role="admin",
+            phone="",
+            email="",
+            company="河北省公司",
+            department="测试部门",
+            is_active=True,
+            can_submit=True,
+            password_hash=hash_password(password),
+            must_change_password=False,
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {login_and_get_token(username, password)}"}
+    for _ in range(3):
+        assert client.get("/api/admin/users", headers=headers).status_code == 200
+
+    lisi_headers = auth_headers_for_user("lisi")
+    demote_resp = client.put(f"/api/admin/users/{user_id}/role", headers=lisi_headers, json={"role": "user"})
+    assert demote_resp.status_code == 200
+    assert client.get("/api/admin/users", headers=headers).status_code == 403
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    disable_resp = client.put(f"/api/admin/users/{user_id}/status", headers=lisi_headers, json={"is_active": False})
+    assert disable_resp.status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
 def test_upload_endpoints_require_authenticated_session():
     client.cookies.clear()
     image_resp = client.post(
@@ -706,6 +745,29 @@ def test_admin_users_pagination_returns_metadata():
     assert len(payload["items"]) == 1
 
 
+def test_admin_users_cursor_pagination_walks_all_rows_in_id_order():
+    headers = auth_headers_for_user("lisi")
+    expected = client.get("/api/admin/users?page=1&page_size=1", headers=headers).json()
+    seen, cursor = [], ""
+    while cursor is not None:
+        resp = client.get("/api/admin/users", params={"cursor": cursor, "page_size": 1}, headers=headers)
+        assert resp.status_code == 200
+        payload = resp.json()
+        assert payload["total_is_exact"] is False
+        assert "page" not in payload
+        seen.extend(item["id"] for item in payload["items"])
+        cursor = payload["next_cursor"]
+    assert seen == sorted(set(seen))
+    assert len(seen) == expected["total"]
+
+    exact = client.get("/api/admin/users", params={"cursor": "", "include_total": "true"}, headers=headers).json()
+    assert exact["total"] == expected["total"]
+    assert exact["total_is_exact"] is True
+    invalid = client.get("/api/admin/users", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"]["code"] == "invalid_page_cursor"
+
+
 def test_user_without_submit_permission_can_still_create_submission():
     db = SessionLocal()
     try:
@@ -1267,6 +1329,71 @@ def test_rankings_support_company_filter_and_return_company_fields():
     assert 'department' in filtered_rows[0]['app']
 
 
+def test_company_leaderboard_is_read_from_materialised_company_positions():
+    client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    rows = client.get('/api/rankings', params={"ranking_config_id": "excellent"}).json()
+    if not rows:
+        return
+    company = rows[0]['app']['company'] or rows[0]['app']['org']
+    expected = [row for row in rows if (row['app']['company'] or row['app']['org']) == company]
+
+    company_rows = client.get('/api/rankings', params={"ranking_config_id": "excellent", "company": company}).json()
+    assert [row['app']['id'] for row in company_rows] == [row['app']['id'] for row in expected]
+    assert [row['position'] for row in company_rows] == [row['position'] for row in expected]
+    assert [row['company_position'] for row in company_rows] == list(range(1, len(company_rows) + 1))
+
+    page = client.get(
+        '/api/rankings',
+        params={"ranking_config_id": "excellent", "company": company, "view": "compact", "offset": 1, "limit": 2},
+    ).json()
+    assert [row['company_position'] for row in page] == list(range(2, 2 + len(page)))
+
+
+def _count_statements(callable_):
+    from sqlalchemy import event
+    from app.database import engine
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        result = callable_()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return result, statements
+
+
+def test_rankings_query_count_is_constant_regardless_of_length():
+    # 先发布一个批次，实时榜单走生效指针 + 快照的单条 JOIN
+    assert client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi")).status_code == 200
+    full_resp, full_statements = _count_statements(lambda: client.get('/api/rankings?ranking_type=excellent'))
+    assert full_resp.status_code == 200
+    assert len(full_resp.json()) >= 2
+    single_resp, single_statements = _count_statements(lambda: client.get('/api/rankings?ranking_type=excellent&limit=1'))
+    assert single_resp.status_code == 200
+    assert len(single_resp.json()) == 1
+    assert len(full_statements) == len(single_statements) == 1
+
+    period_date = datetime.now().date().isoformat()
+    hist_resp, hist_statements = _count_statements(
+        lambda: client.get(f'/api/rankings?ranking_type=excellent&period_date={period_date}')
+    )
+    assert hist_resp.status_code == 200
+    assert len(hist_statements) == 2
+
+
+def test_rankings_support_limit_and_offset():
+    full = client.get('/api/rankings?ranking_type=excellent').json()
+    if len(full) < 3:
+        return
+    page = client.get('/api/rankings?ranking_type=excellent&limit=2&offset=1').json()
+    assert [row['position'] for row in page] == [row['position'] for row in full[1:3]]
+    assert client.get('/api/rankings?ranking_type=excellent&limit=0').status_code == 422
+
+
 def test_historical_rankings_return_company_department_and_support_company_filter():
     db = SessionLocal()
     try:
@@ -1784,6 +1911,611 @@ def test_update_app_dimension_score_accepts_json_body():
     assert update_resp.json()['run_id']
 
 
+def test_sync_rankings_records_phase_timings_and_keeps_manual_scores():
+    db = SessionLocal()
+    try:
+        manual = (
+            db.query(AppDimensionScore)
+            .filter(AppDimensionScore.calculation_detail.like("手动调整评分%"))
+            .order_by(AppDimensionScore.id.desc())
+            .first()
+        )
+        manual_snapshot = (manual.id, manual.score) if manual else None
+    finally:
+        db.close()
+
+    resp = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    assert resp.status_code == 200
+    run_id = resp.json()["run_id"]
+
+    db = SessionLocal()
+    try:
+        from app.models import RankingAuditLog
+        audit_rows = (
+            db.query(RankingAuditLog)
+            .filter(
+                RankingAuditLog.run_id == run_id,
+                RankingAuditLog.action == "rankings_sync_config_published",
+            )
+            .all()
+        )
+        assert audit_rows
+        assert all("prefetch_ms=" in row.payload_summary for row in audit_rows)
+        assert all("write_historical_ms=" in row.payload_summary for row in audit_rows)
+        if manual_snapshot:
+            refreshed = db.query(AppDimensionScore).filter(AppDimensionScore.id == manual_snapshot[0]).first()
+            assert refreshed.score == manual_snapshot[1]
+        positions = [
+            (row.score, row.app_id)
+            for row in db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").order_by(Ranking.position).all()
+        ]
+        assert positions == sorted(positions, key=lambda item: (-item[0], item[1]))
+    finally:
+        db.close()
+
+
+def test_setting_toggle_repairs_positions_incrementally():
+    assert client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi")).status_code == 200
+    db = SessionLocal()
+    try:
+        target = (
+            db.query(Ranking)
+            .filter(Ranking.ranking_config_id == "excellent")
+            .order_by(Ranking.position.asc())
+            .first()
+        )
+        assert target is not None
+        app_id = target.app_id
+        setting = (
+            db.query(AppRankingSetting)
+            .filter(AppRankingSetting.app_id == app_id, AppRankingSetting.ranking_config_id == "excellent")
+            .first()
+        )
+        setting_id = setting.id
+        before_order = [
+            row.app_id
+            for row in db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").order_by(Ranking.position).all()
+        ]
+    finally:
+        db.close()
+
+    disable_resp = client.put(
+        f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+        headers=auth_headers_for_user("lisi"),
+        json={"is_enabled": False},
+    )
+    assert disable_resp.status_code == 200
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").order_by(Ranking.position).all()
+        assert app_id not in [row.app_id for row in rows]
+        assert [row.position for row in rows] == list(range(1, len(rows) + 1))
+        from app.models import RankingAuditLog
+        repaired = (
+            db.query(RankingAuditLog)
+            .filter(
+                RankingAuditLog.action == "rankings_sync_config_repaired",
+                RankingAuditLog.ranking_config_id == "excellent",
+            )
+            .order_by(RankingAuditLog.id.desc())
+            .first()
+        )
+        assert repaired is not None
+        assert f"app_ids={app_id}" in repaired.payload_summary
+    finally:
+        db.close()
+
+    enable_resp = client.put(
+        f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+        headers=auth_headers_for_user("lisi"),
+        json={"is_enabled": True},
+    )
+    assert enable_resp.status_code == 200
+
+    db = SessionLocal()
+    try:
+        after_order = [
+            row.app_id
+            for row in db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").order_by(Ranking.position).all()
+        ]
+        assert after_order == before_order
+    finally:
+        db.close()
+
+
+def test_scoped_resync_matches_full_resync_including_ties():
+    from app.models import RankingActiveRun
+
+    admin_headers = auth_headers_for_user("lisi")
+    assert client.post('/api/rankings/sync', headers=admin_headers).status_code == 200
+    snapshot_columns = (
+        "position", "app_id", "score", "tag", "app_company", "company_position",
+        "previous_position", "position_delta", "movement", "value_dimension", "usage_30d",
+    )
+
+    def boards():
+        db = SessionLocal()
+        try:
+            realtime = [
+                (row.position, row.app_id, row.score)
+                for row in db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").order_by(Ranking.position)
+            ]
+            pointer = db.get(RankingActiveRun, "excellent")
+            snapshot = [
+                tuple(getattr(row, column) for column in snapshot_columns)
+                for row in db.query(HistoricalRanking)
+                .filter(
+                    HistoricalRanking.ranking_config_id == "excellent",
+                    HistoricalRanking.period_date == pointer.period_date,
+                    HistoricalRanking.run_id == pointer.snapshot_run_id,
+                )
+                .order_by(HistoricalRanking.position)
+            ]
+            return realtime, snapshot
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        manual_app_ids = {
+            row.app_id
+            for row in db.query(AppDimensionScore.app_id).filter(AppDimensionScore.calculation_detail.like("手动调整评分%"))
+        }
+        settings_rows = [
+            row
+            for row in db.query(AppRankingSetting)
+            .filter(AppRankingSetting.ranking_config_id == "excellent", AppRankingSetting.is_enabled.is_(True))
+            .order_by(AppRankingSetting.app_id)
+            .all()
+            if row.app_id not in manual_app_ids
+        ]
+        if len(settings_rows) < 2:
+            return
+        source_setting, target_setting = settings_rows[0], settings_rows[-1]
+        source, target = db.get(App, source_setting.app_id), db.get(App, target_setting.app_id)
+        # 把 source 的计分字段复制给 target，使两者同分，由 app_id 决定先后
+        for column in App.__table__.columns:
+            if column.key not in ("id", "name", "created_at", "updated_at"):
+                setattr(target, column.key, getattr(source, column.key))
+        source_id, target_id, setting_id = source.id, target.id, target_setting.id
+        setting_payload = {"weight_factor": source_setting.weight_factor, "custom_tags": source_setting.custom_tags or ""}
+        db.commit()
+    finally:
+        db.close()
+
+    update_resp = client.put(
+        f"/api/apps/{target_id}/ranking-settings/{setting_id}",
+        headers=admin_headers,
+        json=setting_payload,
+    )
+    assert update_resp.status_code == 200
+    scoped = boards()
+    scores = {app_id: score for _, app_id, score in scoped[0]}
+    assert scores[target_id] == scores[source_id]
+
+    assert client.post('/api/rankings/sync', headers=admin_headers).status_code == 200
+    assert boards() == scoped
+
+
+def test_background_sync_coalesces_mutations_into_one_job(monkeypatch):
+    from datetime import timedelta
+    from app.services.ranking_sync_service import process_due_sync_jobs
+
+    monkeypatch.setattr(settings, "ranking_sync_mode", "background")
+    db = SessionLocal()
+    try:
+        settings_rows = (
+            db.query(AppRankingSetting)
+            .filter(AppRankingSetting.ranking_config_id == "excellent", AppRankingSetting.is_enabled.is_(True))
+            .order_by(AppRankingSetting.id.asc())
+            .limit(2)
+            .all()
+        )
+        assert len(settings_rows) == 2
+        targets = [(row.app_id, row.id, row.weight_factor) for row in settings_rows]
+    finally:
+        db.close()
+
+    job_ids = set()
+    run_ids = set()
+    for app_id, setting_id, weight_factor in targets:
+        resp = client.put(
+            f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+            headers=auth_headers_for_user("lisi"),
+            json={"weight_factor": weight_factor + 0.5},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["X-Ranking-Sync-Status"] == "queued"
+        job_ids.add(int(resp.headers["X-Ranking-Sync-Job-Id"]))
+
+    assert len(job_ids) == 1
+    job_id = job_ids.pop()
+    queued_resp = client.get(f"/api/rankings/sync-jobs/{job_id}", headers=auth_headers_for_user("lisi"))
+    assert queued_resp.status_code == 200
+    assert queued_resp.json()["status"] == "queued"
+    assert queued_resp.json()["coalesced_count"] == 2
+    run_ids.add(queued_resp.json()["run_id"])
+
+    assert process_due_sync_jobs(now=datetime.utcnow() + timedelta(minutes=1)) == 1
+
+    done_resp = client.get(f"/api/rankings/sync-jobs/{job_id}", headers=auth_headers_for_user("lisi"))
+    assert done_resp.status_code == 200
+    payload = done_resp.json()
+    assert payload["status"] == "done"
+    assert payload["run_id"] in run_ids
+    assert payload["triggers"] == ["app_ranking_setting_updated"]
+    assert "total_ms=" in payload["timings_summary"]
+
+    for app_id, setting_id, weight_factor in targets:
+        restore_resp = client.put(
+            f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+            headers=auth_headers_for_user("lisi"),
+            json={"weight_factor": weight_factor},
+        )
+        assert restore_resp.status_code == 200
+    assert process_due_sync_jobs(now=datetime.utcnow() + timedelta(minutes=1)) == 1
+
+
+def test_get_ranking_sync_job_returns_404_for_unknown_job():
+    resp = client.get("/api/rankings/sync-jobs/999999", headers=auth_headers_for_user("lisi"))
+    assert resp.status_code == 404
+
+
+def test_ranking_read_cache_serves_hits_until_sync_bumps_version(monkeypatch):
+    from app.services.cache_service import ranking_read_cache
+
+    monkeypatch.setattr(settings, "ranking_cache_enabled", True)
+    ranking_read_cache.clear()
+    url = "/api/rankings?ranking_type=excellent"
+    before = client.get(url)
+    assert before.status_code == 200
+    if not before.json():
+        return
+    top_app_id = before.json()[0]["app"]["id"]
+
+    db = SessionLocal()
+    try:
+        row = db.query(Ranking).filter(Ranking.ranking_config_id == "excellent", Ranking.app_id == top_app_id).first()
+        original_tag = row.tag
+        # 绕过写路径直接改库：不自增版本号，读接口应继续命中缓存
+        row.tag = "缓存探针"
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        cached = client.get(url)
+        assert cached.json() == before.json()
+        stats = client.get("/api/rankings/cache-stats", headers=auth_headers_for_user("lisi")).json()
+        assert stats["enabled"] is True
+        assert stats["hits"] >= 1
+
+        sync_resp = client.post("/api/rankings/sync", headers=auth_headers_for_user("lisi"))
+        assert sync_resp.status_code == 200
+        fresh = client.get(url)
+        assert fresh.status_code == 200
+        # 同步按真实数据重算并提交新版本号后，读接口不再返回旧缓存
+        assert all(item["tag"] != "缓存探针" for item in fresh.json())
+    finally:
+        db = SessionLocal()
+        try:
+            row = db.query(Ranking).filter(Ranking.ranking_config_id == "excellent", Ranking.app_id == top_app_id).first()
+            if row is not None and row.tag == "缓存探针":
+                row.tag = original_tag
+                db.commit()
+        finally:
+            db.close()
+
+
+def test_public_reads_answer_if_none_match_until_data_version_changes():
+    create_resp = client.post(
+        "/api/admin/group-apps",
+        headers=auth_headers_for_user("lisi"),
+        json={
+            "name": f"ETag验证-{uuid.uuid4().hex[:6]}",
+            "org": "测试单位",
+            "category": "前端市场类",
+            "description": "验证条件请求",
+            "status": "available",
+            "monthly_calls": 0,
+            "effectiveness_type": "efficiency_gain",
+        },
+    )
+    assert create_resp.status_code == 200
+    app_id = create_resp.json()["id"]
+    url = f"/api/apps/{app_id}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "must-revalidate" in first.headers["cache-control"]
+    revalidated = client.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    offline_resp = client.put(
+        f"/api/admin/apps/{app_id}/status",
+        headers=auth_headers_for_user("lisi"),
+        json={"status": "offline"},
+    )
+    assert offline_resp.status_code == 200
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "offline"
+    assert changed.headers["etag"] != etag
+
+    for path in ("/api/rankings", "/api/ranking-configs", "/api/stats", "/api/meta/enums"):
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert client.get(path, headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+def test_ranking_read_failure_without_static_file_is_not_cacheable(monkeypatch):
+    from app.routers import rankings as rankings_router
+
+    def _fail(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(rankings_router, "render_live_ranking", _fail)
+    monkeypatch.setattr(rankings_router, "read_static_ranking", lambda *args, **kwargs: None)
+    resp = client.get("/api/rankings", params={"ranking_config_id": "excellent"})
+    assert resp.status_code == 200
+    assert resp.json() == []
+    # 空榜单不得带校验器：否则恢复后 If-None-Match 仍会命中这份空结果
+    assert "etag" not in resp.headers
+    assert resp.headers["cache-control"] == "no-store"
+
+
+def test_ranking_cache_stats_requires_admin():
+    assert client.get("/api/rankings/cache-stats").status_code in {401, 403}
+
+
+def test_publish_registers_runs_in_catalog_and_serves_latest_from_it():
+    from app.models import RankingRun
+
+    publish_resp = client.post('/api/rankings/publish', headers=auth_headers_for_user("lisi"))
+    if publish_resp.status_code == 409:
+        return
+    assert publish_resp.status_code == 200
+    run_id = publish_resp.json()["run_id"]
+    published_date = publish_resp.json()["published_date"]
+
+    db = SessionLocal()
+    try:
+        runs = db.query(RankingRun).filter(RankingRun.run_id == run_id).all()
+        assert runs
+        assert all(run.is_published for run in runs)
+        excellent_run = next(run for run in runs if run.ranking_config_id == "excellent")
+        assert excellent_run.row_count == (
+            db.query(HistoricalRanking)
+            .filter(
+                HistoricalRanking.ranking_config_id == "excellent",
+                HistoricalRanking.run_id == excellent_run.snapshot_run_id,
+            )
+            .count()
+        )
+    finally:
+        db.close()
+
+    dates = client.get('/api/rankings/available-dates?ranking_type=excellent').json()["dates"]
+    assert published_date in dates
+    historical = client.get(f'/api/rankings/historical?ranking_type=excellent&period_date={published_date}').json()
+    assert {row["run_id"] for row in historical} <= {run_id}
+
+
+def test_publish_exports_static_leaderboards_matching_the_api():
+    publish_resp = client.post('/api/rankings/publish', headers=auth_headers_for_user("lisi"))
+    if publish_resp.status_code == 409:
+        return
+    assert publish_resp.status_code == 200
+    static_export = publish_resp.json()["static_export"]
+    assert static_export["exported"] is True
+
+    manifest = client.get("/static/rankings/manifest.json").json()
+    assert manifest["version"] == static_export["version"]
+    entry = manifest["rankings"]["excellent"]
+    assert client.get(f"/static/{entry['overall']['path']}").content == client.get(
+        "/api/rankings?ranking_config_id=excellent"
+    ).content
+    for company, company_entry in list(entry["companies"].items())[:2]:
+        assert client.get(f"/static/{company_entry['path']}").content == client.get(
+            "/api/rankings", params={"ranking_config_id": "excellent", "company": company}
+        ).content
+
+
+def test_compact_view_projects_ranking_and_app_card_fields():
+    full = client.get("/api/rankings", params={"ranking_config_id": "excellent"})
+    compact = client.get("/api/rankings", params={"ranking_config_id": "excellent", "view": "compact"})
+    assert compact.status_code == 200
+    assert compact.headers["etag"] != full.headers["etag"]
+    full_items, compact_items = full.json(), compact.json()
+    assert [item["position"] for item in compact_items] == [item["position"] for item in full_items]
+    for full_item, compact_item in zip(full_items, compact_items):
+        assert set(compact_item) == {"position", "tag", "score", "metric_type", "value_dimension", "usage_30d", "app"}
+        assert compact_item["app"] == {
+            "id": full_item["app"]["id"],
+            "name": full_item["app"]["name"],
+            "company": full_item["app"]["company"] or full_item["app"]["org"],
+        }
+    if full_items:
+        assert len(compact.content) < len(full.content)
+
+    apps = client.get("/api/apps").json()
+    compact_apps = client.get("/api/apps", params={"view": "compact"})
+    assert compact_apps.status_code == 200
+    assert "etag" in compact_apps.headers
+    assert [item["id"] for item in compact_apps.json()] == [item["id"] for item in apps]
+    for item in compact_apps.json():
+        assert "problem_statement" not in item
+        assert len(item["description"]) <= 120
+    assert client.get("/api/apps", params={"view": "bogus"}).status_code == 422
+
+
+def test_stream_fast_path_matches_default_list_responses():
+    headers = auth_headers_for_user("lisi")
+    for path, params in (
+        ("/api/apps", {}),
+        ("/api/submissions", {}),
+        ("/api/app-ranking-settings", {}),
+        ("/api/action-logs", {"limit": 200}),
+    ):
+        default = client.get(path, params=params, headers=headers)
+        streamed = client.get(path, params={**params, "stream": "true"}, headers=headers)
+        assert default.status_code == 200
+        assert streamed.status_code == 200
+        assert streamed.headers["content-type"].startswith("application/json")
+        by_id = lambda items: sorted(items, key=lambda item: item["id"])  # noqa: E731
+        assert by_id(streamed.json()) == by_id(default.json())
+
+
+def test_home_bootstrap_matches_individual_endpoints_and_revalidates():
+    resp = client.get("/api/home")
+    assert resp.status_code == 200
+    home = resp.json()
+    assert home["degraded"] == []
+    assert home["rankings"]["excellent"] == client.get("/api/rankings", params={"ranking_config_id": "excellent"}).json()
+    assert home["rankings"]["trend"] == client.get("/api/rankings", params={"ranking_config_id": "trend"}).json()
+    assert home["ranking_configs"] == client.get("/api/ranking-configs", params={"is_active": "true"}).json()
+    assert home["stats"] == client.get("/api/stats").json()
+    assert home["enums"] == client.get("/api/meta/enums").json()
+    assert home["rules"] == client.get("/api/rules").json()
+    assert home["apps"] == client.get("/api/apps").json()[:24]
+
+    revisit = client.get("/api/home", headers={"If-None-Match": resp.headers["etag"]})
+    assert revisit.status_code == 304
+    compact = client.get("/api/home", params={"view": "compact", "apps_limit": 3}).json()
+    assert len(compact["apps"]) <= 3
+    assert compact["rankings"]["excellent"] == client.get(
+        "/api/rankings", params={"ranking_config_id": "excellent", "view": "compact"}
+    ).json()
+
+    partial = client.get("/api/home", params={"parts": "ranking_configs,stats"})
+    assert partial.headers["etag"] != resp.headers["etag"]
+    assert partial.json()["stats"] == home["stats"]
+    assert partial.json()["rankings"] == {"excellent": None, "trend": None}
+    assert partial.json()["apps"] is None
+    assert client.get("/api/home", params={"parts": "unknown"}).status_code == 422
+
+
+def test_app_profile_aggregates_detail_positions_and_history():
+    client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    items = client.get("/api/rankings", params={"ranking_config_id": "excellent"}).json()
+    assert items
+    app_id = items[0]["app"]["id"]
+
+    resp = client.get(f"/api/apps/{app_id}/profile")
+    assert resp.status_code == 200
+    profile = resp.json()
+    assert profile["app"] == client.get(f"/api/apps/{app_id}").json()
+    positions = {item["ranking_config_id"]: item for item in profile["positions"]}
+    assert positions["excellent"]["position"] == items[0]["position"]
+    assert positions["excellent"]["score"] == items[0]["score"]
+    history = {item["ranking_config_id"]: item for item in profile["history"]}
+    assert history["excellent"]["points"][-1]["position"] == items[0]["position"]
+
+    short = client.get(f"/api/apps/{app_id}/profile", params={"points": 2}).json()
+    assert all(len(item["points"]) <= 2 for item in short["history"])
+    assert client.get(f"/api/apps/{app_id}/profile", headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+    assert client.get("/api/apps/999999/profile").status_code == 404
+
+
+def test_rankings_diff_compares_two_runs_and_marks_dropouts():
+    first = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi")).json()["run_id"]
+    second = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi")).json()["run_id"]
+
+    resp = client.get('/api/rankings/diff', params={"ranking_config_id": "excellent", "from_run": first, "to_run": second})
+    assert resp.status_code == 200
+    diff = resp.json()
+    assert diff["from_run"]["run_id"] == first and diff["to_run"]["run_id"] == second
+    live = client.get('/api/rankings', params={"ranking_config_id": "excellent"}).json()
+    assert [item["to_position"] for item in diff["items"] if item["movement"] != "dropped"] == [
+        row["position"] for row in live
+    ]
+    for item in diff["items"]:
+        if item["movement"] in ("up", "down", "same"):
+            assert item["position_delta"] == item["from_position"] - item["to_position"]
+
+    missing = client.get('/api/rankings/diff', params={"from_run": "missing", "to_run": second})
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["code"] == "ranking_run_not_found"
+
+
+def test_unchanged_sync_reuses_previous_snapshot_instead_of_copying_rows():
+    from app.models import RankingRun
+
+    first = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    second = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    assert first.status_code == 200 and second.status_code == 200
+    first_run_id = first.json()["run_id"]
+    second_run_id = second.json()["run_id"]
+
+    db = SessionLocal()
+    try:
+        second_run = (
+            db.query(RankingRun)
+            .filter(RankingRun.run_id == second_run_id, RankingRun.ranking_config_id == "excellent")
+            .first()
+        )
+        if second_run is None:
+            return
+        first_run = (
+            db.query(RankingRun)
+            .filter(RankingRun.run_id == first_run_id, RankingRun.ranking_config_id == "excellent")
+            .first()
+        )
+        assert second_run.content_hash == first_run.content_hash
+        assert second_run.snapshot_run_id == (first_run.snapshot_run_id or first_run.run_id)
+        assert db.query(HistoricalRanking).filter(HistoricalRanking.run_id == second_run_id).count() == 0
+    finally:
+        db.close()
+
+    latest = client.get(f'/api/rankings/historical?ranking_type=excellent&run_id={second_run_id}').json()
+    assert len(latest) == second_run.row_count
+
+
+def test_realtime_rankings_follow_active_run_pointer_not_working_table():
+    from app.models import RankingActiveRun
+
+    sync_resp = client.post('/api/rankings/sync', headers=auth_headers_for_user("lisi"))
+    assert sync_resp.status_code == 200
+    run_id = sync_resp.json()["run_id"]
+    published = client.get('/api/rankings?ranking_type=excellent').json()
+    if not published:
+        return
+
+    db = SessionLocal()
+    try:
+        pointer = db.get(RankingActiveRun, "excellent")
+        assert pointer is not None
+        assert pointer.run_id == run_id
+        # 模拟同步写入中的工作表：读路径仍返回已切换批次的快照
+        original_scores = {
+            row.app_id: row.score
+            for row in db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").all()
+        }
+        db.query(Ranking).filter(Ranking.ranking_config_id == "excellent").update(
+            {"score": 0}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        assert client.get('/api/rankings?ranking_type=excellent').json() == published
+    finally:
+        db = SessionLocal()
+        try:
+            for app_id, score in original_scores.items():
+                db.query(Ranking).filter(
+                    Ranking.ranking_config_id == "excellent", Ranking.app_id == app_id
+                ).update({"score": score}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
 def test_delete_ranking_config_cleans_downstream_records():
     unique_suffix = uuid.uuid4().hex[:8]
     config_id = f"cfg-{unique_suffix}"
@@ -2265,3 +2997,223 @@ def test_publish_rankings_precheck_requires_enabled_participant():
     assert publish_resp.status_code == 409
     detail = publish_resp.json()["detail"]
     assert detail["code"] == "publish_precheck_failed"
+
+
+def test_concurrent_sync_returns_409_with_running_job_while_lock_is_held(monkeypatch):
+    from app.database import engine
+    from app.models import RankingAuditLog
+    from app.services.ranking_sync_service import _get_named_lock, _release_named_lock, ranking_sync_lock_name
+
+    monkeypatch.setattr(settings, "ranking_sync_lock_wait_seconds", 0)
+    holder = engine.connect()
+    try:
+        # 模拟另一个 worker 正在同步：另开连接持有同名锁
+        assert _get_named_lock(holder, ranking_sync_lock_name(), 0)
+        busy = client.post("/api/rankings/sync", headers=auth_headers_for_user("lisi"))
+        assert busy.status_code == 409
+        assert busy.json()["detail"]["code"] == "ranking_sync_in_progress"
+        assert busy.json()["detail"]["field_errors"][0]["field"] == "sync_job_id"
+    finally:
+        _release_named_lock(holder, ranking_sync_lock_name())
+        holder.close()
+
+    done = client.post("/api/rankings/sync", headers=auth_headers_for_user("lisi"))
+    assert done.status_code == 200
+    assert done.json()["joined"] is False
+
+    db = SessionLocal()
+    try:
+        actions = {
+            row.action
+            for row in db.query(RankingAuditLog)
+            .filter(RankingAuditLog.action.in_(["ranking_sync_lock_timeout", "ranking_sync_lock_released"]))
+            .all()
+        }
+        assert actions == {"ranking_sync_lock_timeout", "ranking_sync_lock_released"}
+        released = (
+            db.query(RankingAuditLog)
+            .filter(RankingAuditLog.action == "ranking_sync_lock_released", RankingAuditLog.run_id == done.json()["run_id"])
+            .one()
+        )
+        assert "lock_wait_ms=" in released.payload_summary
+        assert "lock_hold_ms=" in released.payload_summary
+    finally:
+        db.close()
+
+
+def test_ranking_dimension_scoring_rule_is_validated_and_round_trips():
+    unique_suffix = uuid.uuid4().hex[:8]
+    invalid_resp = client.post(
+        '/api/ranking-dimensions',
+        headers=auth_headers_for_user("lisi"),
+        json={
+            "name": f"非法规则维度-{unique_suffix}",
+            "description": "评分规则引用了非白名单字段",
+            "calculation_method": "自定义规则",
+            "weight": 1.0,
+            "scoring_rule": {"type": "linear", "terms": {"password_hash": 1}},
+        },
+    )
+    assert invalid_resp.status_code == 422
+
+    rule = {"type": "lookup", "field": "status", "scores": {"available": 80}, "default": 20}
+    create_resp = client.post(
+        '/api/ranking-dimensions',
+        headers=auth_headers_for_user("lisi"),
+        json={
+            "name": f"规则维度-{unique_suffix}",
+            "description": "按应用状态评分",
+            "calculation_method": "自定义规则",
+            "weight": 1.0,
+            "scoring_rule": rule,
+        },
+    )
+    assert create_resp.status_code == 200
+    assert create_resp.json()['scoring_rule'] == rule
+    dimension_id = create_resp.json()['id']
+
+    clear_resp = client.put(
+        f'/api/ranking-dimensions/{dimension_id}',
+        headers=auth_headers_for_user("lisi"),
+        json={"scoring_rule": None},
+    )
+    assert clear_resp.status_code == 200
+    assert clear_resp.json()['scoring_rule'] is None
+
+
+def test_simulate_rankings_is_read_only_and_matches_live_board():
+    sync_resp = client.post("/api/rankings/sync", headers=auth_headers_for_user("lisi"))
+    assert sync_resp.status_code == 200
+
+    def table_counts():
+        db = SessionLocal()
+        try:
+            return tuple(db.query(model).count() for model in (Ranking, HistoricalRanking, AppDimensionScore))
+        finally:
+            db.close()
+
+    before = table_counts()
+    resp = client.post(
+        "/api/rankings/simulate",
+        headers=auth_headers_for_user("lisi"),
+        json={"ranking_config_id": "excellent", "limit": 500},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["moved_count"] == 0
+    live = client.get("/api/rankings?ranking_config_id=excellent&limit=500").json()
+    assert [(item["app_id"], item["position"], item["score"]) for item in body["items"]] == [
+        (item["app"]["id"], item["position"], item["score"]) for item in live
+    ]
+
+    reweighted = client.post(
+        "/api/rankings/simulate",
+        headers=auth_headers_for_user("lisi"),
+        json={"ranking_config_id": "excellent", "dimensions": [{"dim_id": 999999, "weight": 1.0}]},
+    )
+    assert reweighted.status_code == 422
+    assert reweighted.json()["detail"]["code"] == "ranking_simulation_invalid"
+    assert table_counts() == before
+
+
+def test_app_keyword_search_ranks_name_hits_first_and_returns_highlights():
+    token = f"检索{uuid.uuid4().hex[:8]}"
+    for name, description in (
+        (f"描述命中应用-{uuid.uuid4().hex[:6]}", f"该应用的说明里提到 {token} 关键词"),
+        (f"{token}助手", "名称命中的应用，用于验证相关度排序"),
+    ):
+        create_resp = client.post(
+            "/api/admin/group-apps",
+            headers=auth_headers_for_user("lisi"),
+            json={
+                "name": name,
+                "org": "测试单位",
+                "category": "前端市场类",
+                "description": description,
+                "status": "available",
+                "monthly_calls": 0,
+                "effectiveness_type": "efficiency_gain",
+            },
+        )
+        assert create_resp.status_code == 200
+
+    public_resp = client.get("/api/apps", params={"q": token})
+    assert public_resp.status_code == 200
+    items = public_resp.json()
+    assert [item["name"] for item in items] == [f"{token}助手", items[1]["name"]]
+    assert items[0]["search_hit"]["highlights"]["name"] == [[0, len(token)]]
+    assert "description" in items[1]["search_hit"]["highlights"]
+    assert items[0]["search_hit"]["relevance"] > items[1]["search_hit"]["relevance"]
+
+    admin_resp = client.get("/api/admin/apps", params={"q": token, "page_size": 1}, headers=auth_headers_for_user("lisi"))
+    assert admin_resp.status_code == 200
+    assert admin_resp.json()["total"] == 2
+    assert admin_resp.json()["items"][0]["name"] == f"{token}助手"
+
+    assert client.get("/api/apps").json()[0]["search_hit"] is None
+
+
+def test_app_suggest_matches_pinyin_initials_and_drops_offline_apps():
+    suffix = uuid.uuid4().hex[:6]
+    create_resp = client.post(
+        "/api/admin/group-apps",
+        headers=auth_headers_for_user("lisi"),
+        json={
+            "name": f"联想验证{suffix}",
+            "org": "测试单位",
+            "category": "前端市场类",
+            "description": "验证搜索框联想",
+            "status": "available",
+            "monthly_calls": 0,
+            "effectiveness_type": "efficiency_gain",
+        },
+    )
+    assert create_resp.status_code == 200
+    app_id = create_resp.json()["id"]
+
+    for prefix in (f"联想验证{suffix}", f"lxyz{suffix}", f"LianXiangYanZheng{suffix}"):
+        resp = client.get("/api/apps/suggest", params={"prefix": prefix})
+        assert resp.status_code == 200
+        assert [item["id"] for item in resp.json()] == [app_id]
+
+    offline_resp = client.put(
+        f"/api/admin/apps/{app_id}/status",
+        headers=auth_headers_for_user("lisi"),
+        json={"status": "offline"},
+    )
+    assert offline_resp.status_code == 200
+    assert client.get("/api/apps/suggest", params={"prefix": f"lxyz{suffix}"}).json() == []
+    assert client.get("/api/apps/suggest", params={"prefix": ""}).status_code == 422
+
+
+def test_app_facets_count_current_filters_and_follow_app_mutations():
+    company = f"分面公司{uuid.uuid4().hex[:6]}"
+    before = client.get("/api/apps/facets", params={"company": company})
+    assert before.status_code == 200
+    assert before.json()["total"] == 0
+
+    create_resp = client.post(
+        "/api/admin/group-apps",
+        headers=auth_headers_for_user("lisi"),
+        json={
+            "name": f"分面验证-{uuid.uuid4().hex[:6]}",
+            "org": company,  # 集团应用录入时 company 取 org
+            "category": "前端市场类",
+            "description": "验证分面计数",
+            "status": "available",
+            "monthly_calls": 0,
+            "effectiveness_type": "efficiency_gain",
+        },
+    )
+    assert create_resp.status_code == 200
+
+    facets = client.get("/api/apps/facets", params={"company": company}).json()
+    assert facets["total"] == 1
+    assert {"value": "前端市场类", "count": 1} in facets["category"]
+    assert {"value": "available", "count": 1} in facets["status"]
+    assert {"value": company, "count": 1} in facets["company"]
+
+    listed = client.get("/api/apps", params={"company": company, "include_facets": "true"}).json()
+    assert [item["id"] for item in listed["items"]] == [create_resp.json()["id"]]
+    assert listed["facets"] == facets
+    assert client.get("/api/apps/facets", params={"status": "bogus"}).status_code == 422
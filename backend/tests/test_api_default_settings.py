@@ -0,0 +1,134 @@
+"""API 用例（默认运行配置）：后台同步队列 + 读缓存开启。
+
+conftest 为其余 API 用例改成 inline 同步、关闭读缓存；本模块把这两项恢复为 `Settings` 的默认值，
+覆盖生产默认路径上的任务登记 / 执行与缓存失效。
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings, settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import App, AppRankingSetting
+from app.services.cache_service import ranking_read_cache
+from app.services.ranking_sync_service import process_due_sync_jobs
+
+
+client = TestClient(app)
+RANKINGS_URL = "/api/rankings?ranking_type=excellent"
+
+
+@pytest.fixture(autouse=True)
+def _default_runtime_settings(monkeypatch):
+    for name in ("ranking_sync_mode", "ranking_cache_enabled"):
+        monkeypatch.setattr(settings, name, Settings.model_fields[name].default)
+    assert settings.ranking_sync_mode == "background"
+    assert settings.ranking_cache_enabled is True
+    ranking_read_cache.clear()
+    yield
+    ranking_read_cache.clear()
+
+
+def admin_headers() -> dict[str, str]:
+    client.cookies.clear()
+    resp = client.post("/api/auth/login", json={"username": "lisi", "password": settings.admin_default_password})
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _item_for(app_id: int) -> dict:
+    resp = client.get(RANKINGS_URL)
+    assert resp.status_code == 200
+    return next(item for item in resp.json() if item["app"]["id"] == app_id)
+
+
+def _drain_jobs() -> None:
+    while process_due_sync_jobs(now=datetime.utcnow() + timedelta(minutes=1)):
+        pass
+
+
+def test_app_edit_invalidates_cached_ranking_body_and_etag():
+    first = client.get(RANKINGS_URL)
+    assert first.status_code == 200
+    if not first.json():
+        return
+    app_id = first.json()[0]["app"]["id"]
+    assert client.get(RANKINGS_URL, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    db = SessionLocal()
+    try:
+        row = db.get(App, app_id)
+        original_name = row.name
+        # 只改应用字段（自增 apps 版本，不动 rankings 版本）：榜单条目内嵌的应用名称也要刷新
+        row.name = f"{original_name}-改名"
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        renamed = client.get(RANKINGS_URL)
+        assert renamed.headers["ETag"] != first.headers["ETag"]
+        assert next(item for item in renamed.json() if item["app"]["id"] == app_id)["app"]["name"] == f"{original_name}-改名"
+    finally:
+        db = SessionLocal()
+        try:
+            db.get(App, app_id).name = original_name
+            db.commit()
+        finally:
+            db.close()
+
+
+def test_chain_mutation_is_queued_then_processed_and_refreshes_cached_board():
+    _drain_jobs()
+    board = {item["app"]["id"]: item for item in client.get(RANKINGS_URL).json() if 0 < item["score"] < 1000}
+    if not board:
+        return
+    db = SessionLocal()
+    try:
+        setting = (
+            db.query(AppRankingSetting)
+            .filter(
+                AppRankingSetting.ranking_config_id == "excellent",
+                AppRankingSetting.is_enabled.is_(True),
+                AppRankingSetting.app_id.in_(list(board)),
+            )
+            .order_by(AppRankingSetting.id.asc())
+            .first()
+        )
+        assert setting is not None
+        app_id, setting_id, weight_factor = setting.app_id, setting.id, setting.weight_factor
+    finally:
+        db.close()
+
+    before = _item_for(app_id)
+    headers = admin_headers()
+    resp = client.put(
+        f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+        headers=headers,
+        json={"weight_factor": weight_factor / 2},
+    )
+    try:
+        assert resp.status_code == 200
+        assert resp.headers["X-Ranking-Sync-Status"] == "queued"
+        job_id = int(resp.headers["X-Ranking-Sync-Job-Id"])
+        queued = client.get(f"/api/rankings/sync-jobs/{job_id}", headers=headers).json()
+        assert queued["status"] == "queued"
+        # 任务尚未执行：榜单仍是变更前的结果
+        assert _item_for(app_id)["score"] == before["score"]
+
+        _drain_jobs()
+        done = client.get(f"/api/rankings/sync-jobs/{job_id}", headers=headers).json()
+        assert done["status"] == "done"
+        # 同步提交自增 rankings 版本，缓存中的旧榜单随之失效
+        assert _item_for(app_id)["score"] < before["score"]
+    finally:
+        restore = client.put(
+            f"/api/apps/{app_id}/ranking-settings/{setting_id}",
+            headers=admin_headers(),
+            json={"weight_factor": weight_factor},
+        )
+        assert restore.status_code == 200
+        _drain_jobs()
@@ -0,0 +1,39 @@
+"""Unit tests for app_facet_service.py."""
+
+from app.services.app_facet_service import compute_facets
+
+ROWS = [
+    ("province", "客户服务类", "分公司A", "available", 3),
+    ("province", "客户服务类", "", "beta", 1),
+    ("province", "云网运营类", "分公司B", "available", 2),
+    ("group", "客户服务类", "分公司A", "approval", 4),
+    ("group", "管理支撑类", "分公司A", "offline", 5),
+]
+
+
+def _counts(facets: dict, field: str) -> list[tuple[str, int]]:
+    return [(item["value"], item["count"]) for item in facets[field]]
+
+
+def test_unfiltered_facets_hide_offline_apps():
+    facets = compute_facets(ROWS, {})
+    assert facets["total"] == 10
+    assert _counts(facets, "section") == [("province", 6), ("group", 4)]
+    assert _counts(facets, "category") == [("客户服务类", 8), ("云网运营类", 2)]
+    assert _counts(facets, "company") == [("分公司A", 7), ("分公司B", 2)]  # 空公司不列出
+    assert _counts(facets, "status") == [("available", 5), ("approval", 4), ("beta", 1)]
+
+
+def test_each_facet_ignores_its_own_filter():
+    facets = compute_facets(ROWS, {"section": "province", "category": "客户服务类"})
+    assert facets["total"] == 4
+    assert _counts(facets, "section") == [("group", 4), ("province", 4)]
+    assert _counts(facets, "category") == [("客户服务类", 4), ("云网运营类", 2)]
+    assert _counts(facets, "status") == [("available", 3), ("beta", 1)]
+
+
+def test_explicit_status_counts_offline_apps():
+    facets = compute_facets(ROWS, {"status": "offline"})
+    assert facets["total"] == 5
+    assert _counts(facets, "category") == [("管理支撑类", 5)]
+    assert _counts(facets, "status") == [("available", 5), ("approval", 4), ("beta", 1)]
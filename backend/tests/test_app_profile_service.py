@@ -0,0 +1,105 @@
+"""Unit tests for app_profile_service.py."""
+
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.cache_utils import VersionedLRUCache
+from app.services import app_profile_service
+from app.config import settings
+from app.routers.apps import router as apps_router
+from app.services.app_profile_service import app_profile_body, downsample
+
+
+def test_downsample_keeps_endpoints_and_short_series():
+    assert downsample(list(range(10)), 4) == [0, 3, 6, 9]
+    assert downsample(list(range(100)), 2) == [0, 99]
+    assert downsample([1, 2, 3], 5) == [1, 2, 3]
+    assert downsample([], 5) == []
+
+
+def test_profile_body_is_cached_per_version_and_missing_app_is_none(monkeypatch):
+    versions = {"apps": 1, "rankings": 1, "ranking_configs": 1}
+    builds = []
+
+    class Profile:
+        def model_dump_json(self):
+            return '{"app":{"id":1}}'
+
+    def build(db, app_id, *, days, points, today):
+        builds.append(app_id)
+        return Profile() if app_id == 1 else None
+
+    monkeypatch.setattr(app_profile_service, "build_app_profile", build)
+    monkeypatch.setattr(app_profile_service.data_version_poller, "current", lambda name: versions[name])
+    monkeypatch.setattr(
+        app_profile_service, "app_profile_cache", VersionedLRUCache("test", max_entries=8, max_bytes=4096)
+    )
+
+    assert app_profile_body(None, 1, days=90, points=60) == b'{"app":{"id":1}}'
+    assert app_profile_body(None, 1, days=90, points=60) == b'{"app":{"id":1}}'
+    assert app_profile_body(None, 2, days=90, points=60) is None
+    assert builds == [1, 2]
+    versions["rankings"] = 2
+    app_profile_body(None, 1, days=90, points=60)
+    assert builds == [1, 2, 1]
+
+
+def test_profile_body_is_rebuilt_after_date_rollover(monkeypatch):
+    builds = []
+
+    class Profile:
+        def __init__(self, today):
+            self.today = today
+
+        def model_dump_json(self):
+            return f'{{"since":"{self.today.isoformat()}"}}'
+
+    def build(db, app_id, *, days, points, today):
+        builds.append(today)
+        return Profile(today)
+
+    monkeypatch.setattr(app_profile_service, "build_app_profile", build)
+    monkeypatch.setattr(app_profile_service.data_version_poller, "current", lambda name: 1)
+    monkeypatch.setattr(
+        app_profile_service, "app_profile_cache", VersionedLRUCache("test", max_entries=8, max_bytes=4096)
+    )
+
+    before, after = date(2026, 10, 16), date(2026, 10, 17)
+    assert app_profile_body(None, 1, days=90, points=60, today=before) == b'{"since":"2026-10-16"}'
+    assert app_profile_body(None, 1, days=90, points=60, today=before) == b'{"since":"2026-10-16"}'
+    # 数据版本不变，跨过零点后仍按新日期重建
+    assert app_profile_body(None, 1, days=90, points=60, today=after) == b'{"since":"2026-10-17"}'
+    assert builds == [before, after]
+
+
+def test_profile_etag_changes_after_date_rollover(monkeypatch):
+    route = next(route for route in apps_router.routes if route.path == "/api/apps/{app_id}/profile")
+    cache_headers = next(dep.call for dep in route.dependant.dependencies if dep.name == "cache_headers")
+    clock = {"now": datetime(2026, 10, 16, 23, 59)}
+
+    class FakeDatetime:
+        @staticmethod
+        def now():
+            return clock["now"]
+
+    monkeypatch.setattr(app_profile_service, "datetime", FakeDatetime)
+    monkeypatch.setattr(app_profile_service.data_version_poller, "current", lambda name: 1)
+    monkeypatch.setattr(settings, "public_cache_enabled", True)
+
+    def request(if_none_match: str | None = None) -> Request:
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        return Request({"type": "http", "method": "GET", "path": "/api/apps/1/profile", "query_string": b"", "headers": headers})
+
+    before = cache_headers(request(), Response())["ETag"]
+    with pytest.raises(HTTPException) as not_modified:
+        cache_headers(request(before), Response())
+    assert not_modified.value.status_code == 304
+
+    # 数据版本不变，跨过零点后旧 ETag 不再命中 304，响应体随新日期重建
+    clock["now"] = datetime(2026, 10, 17, 0, 1)
+    after = cache_headers(request(before), Response())["ETag"]
+    assert after != before
@@ -0,0 +1,73 @@
+"""Unit tests for app_search_service.py."""
+
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Query
+
+from app.models import App
+from app.services.app_search_service import (
+    apply_app_search,
+    build_search_hit,
+    fulltext_phrase,
+    highlight_offsets,
+)
+
+from helpers import make_app
+
+
+def _compiled_sql(q: str) -> str:
+    return str(apply_app_search(Query(App), q).statement.compile(dialect=mysql.dialect()))
+
+
+class TestFulltextPhrase:
+    @pytest.mark.parametrize(
+        "q, expected",
+        [
+            ("智能客服", '"智能客服"'),
+            ("AI助手", '"AI助手"'),
+            ("  智能  客服 ", '"智能 客服"'),
+            ("云", None),  # 短于 ngram 切分长度
+            ("a 助手", None),
+            ("50%", None),  # 标点不进 ngram 索引，回落 LIKE 保证结果一致
+            ('"客服"', None),
+            ("客服 -工单", None),
+            ("", None),
+        ],
+    )
+    def test_phrase_or_like_fallback(self, q, expected):
+        assert fulltext_phrase(q) == expected
+
+
+class TestApplyAppSearch:
+    def test_fulltext_path_uses_match_against_and_relevance_order(self):
+        sql = _compiled_sql("智能客服")
+        assert "MATCH (apps.name, apps.description, apps.org, apps.company, apps.department, apps.category) AGAINST" in sql
+        assert "IN BOOLEAN MODE" in sql
+        assert "LIKE" not in sql
+        assert sql.rstrip().endswith("DESC, apps.id")
+
+    def test_short_keyword_falls_back_to_escaped_like(self):
+        sql = _compiled_sql("云")
+        assert "MATCH" not in sql
+        for field in ("name", "description", "org", "company", "department", "category"):
+            assert f"apps.{field} LIKE concat" in sql
+        assert "ESCAPE" in sql
+
+
+class TestHighlights:
+    def test_offsets_are_case_insensitive_and_non_overlapping(self):
+        assert highlight_offsets("AI 助手 ai助手", "ai") == [[0, 2], [6, 8]]
+        assert highlight_offsets("aaaa", "aa") == [[0, 2], [2, 4]]
+        assert highlight_offsets("", "云") == []
+        assert highlight_offsets(None, "云") == []
+
+    def test_search_hit_lists_matching_fields_only(self):
+        app = make_app(name="智能客服助手", description="面向客服坐席的智能问答", org="客服中心", category="客户服务类")
+        assert build_search_hit(app, "客服", 4.25) == {
+            "relevance": 4.25,
+            "highlights": {
+                "name": [[2, 4]],
+                "description": [[2, 4]],
+                "org": [[0, 2]],
+            },
+        }
@@ -0,0 +1,105 @@
+"""Unit tests for app_suggest_service.py."""
+
+import random
+
+from app.services.app_suggest_service import (
+    AppSuggestIndex,
+    SuggestEntry,
+    normalize_suggest_text,
+    suggest_keys,
+    transliterations,
+)
+
+
+def _entry(id: int, name: str, monthly_calls: float = 0.0, company: str = "") -> SuggestEntry:
+    return SuggestEntry(id=id, name=name, company=company, section="province", category="客户服务类", monthly_calls=monthly_calls)
+
+
+def _ids(entries: list[SuggestEntry]) -> list[int]:
+    return [entry.id for entry in entries]
+
+
+def _brute_force(entries: list[SuggestEntry], prefix: str, limit: int) -> list[int]:
+    key = normalize_suggest_text(prefix)
+    matched = [entry for entry in entries if any(k.startswith(key) for k in suggest_keys(entry))]
+    return _ids(sorted(matched, key=lambda entry: entry.rank)[:limit])
+
+
+class TestSuggestKeys:
+    def test_name_and_company_with_full_pinyin_and_initials(self):
+        assert transliterations("智能客服") == ("zhinengkefu", "znkf")
+        assert suggest_keys(_entry(1, "AI 助手", company="省公司")) == {
+            "ai助手", "aizhushou", "aizs", "省公司", "shenggongsi", "sgs",
+        }
+
+
+class TestAppSuggestIndex:
+    def test_matches_chinese_pinyin_and_initials_ordered_by_calls(self):
+        index = AppSuggestIndex()
+        index.sync([_entry(1, "智能客服", 5.0), _entry(2, "智能质检", 9.0), _entry(3, "工单助手", 50.0)], version=1)
+
+        assert _ids(index.suggest("智能")) == [2, 1]
+        assert _ids(index.suggest("ZhiNeng")) == [2, 1]
+        assert _ids(index.suggest("znkf")) == [1]
+        assert _ids(index.suggest("gd")) == [3]
+        assert index.suggest("不存在") == []
+        assert index.suggest("   ") == []
+
+    def test_top_k_is_bounded_and_matches_brute_force_under_churn(self):
+        rnd = random.Random(7)
+        words = ["智能", "客服", "工单", "质检", "营销", "外呼", "知识库", "问答", "AI"]
+        entries = [_entry(i, "".join(rnd.sample(words, 2)) + str(i), float(rnd.randint(0, 30))) for i in range(1, 301)]
+        index = AppSuggestIndex(top_k=5)
+        index.sync(entries, version=1)
+        probes = ["智", "zn", "zhineng", "kf", "ai", "知识库问", "wd", "1"]
+        for prefix in probes:
+            assert _ids(index.suggest(prefix, 5)) == _brute_force(entries, prefix, 5)
+
+        # 改名、调用量变化、下架（不再出现在可见集合中）
+        entries = [e for e in entries if e.id % 4] + [_entry(4, "全新应用", 99.0)]
+        entries[0] = _entry(entries[0].id, "营销外呼改版", 0.0)
+        assert index.sync(entries, version=2) == (2, 74)  # id=4 改名后仍可见，记为更新
+        assert len(index) == len(entries)
+        for prefix in probes + ["qxyy", "营销外呼改"]:
+            assert _ids(index.suggest(prefix, 5)) == _brute_force(entries, prefix, 5)
+
+    def test_unchanged_version_sync_is_a_no_op(self):
+        index = AppSuggestIndex()
+        entries = [_entry(1, "智能客服")]
+        index.sync(entries, version=1)
+        assert index.sync(entries, version=2) == (0, 0)
+        assert index.version == 2
+
+
+class TestEnsureSuggestIndexCurrent:
+    def _patch(self, monkeypatch, versions: list):
+        import app.services.app_suggest_service as suggest_service
+
+        loads = []
+
+        def current(name):
+            value = versions.pop(0)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        def load(db):
+            loads.append(1)
+            return [_entry(1, "智能客服")]
+
+        monkeypatch.setattr(suggest_service.data_version_poller, "current", current)
+        monkeypatch.setattr(suggest_service, "load_suggest_entries", load)
+        return suggest_service, loads
+
+    def test_poll_failure_before_first_build_builds_once_then_reuses(self, monkeypatch):
+        suggest_service, loads = self._patch(monkeypatch, [RuntimeError("db down")] * 3 + [4, 4])
+        index = AppSuggestIndex()
+        for _ in range(3):
+            assert suggest_service.ensure_suggest_index_current(None, index) is index
+        assert len(loads) == 1
+        assert index.built and index.version is None
+        # 读取恢复后按真实版本刷新一次，此后不再重复加载
+        suggest_service.ensure_suggest_index_current(None, index)
+        suggest_service.ensure_suggest_index_current(None, index)
+        assert len(loads) == 2
+        assert index.version == 4
@@ -0,0 +1,85 @@
+"""Unit tests for auth_session_cache_service.py."""
+
+from types import SimpleNamespace
+
+import pytest
+from app.cache_utils import VersionedTTLCache
+from app.config import settings
+from app.services import auth_session_cache_service
+from app.services.auth_session_cache_service import lookup_auth_session, token_cache_key
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    versions = {"auth_sessions": 1}
+    monkeypatch.setattr(settings, "auth_session_cache_ttl_seconds", 30)
+    monkeypatch.setattr(
+        auth_session_cache_service,
+        "auth_session_cache",
+        VersionedTTLCache("test", max_entries=8, ttl_seconds=30),
+    )
+    monkeypatch.setattr(auth_session_cache_service.data_version_poller, "current", lambda name: versions[name])
+    monkeypatch.setattr(auth_session_cache_service, "snapshot_auth_session", lambda session: session.token)
+    monkeypatch.setattr(
+        auth_session_cache_service,
+        "attach_auth_session",
+        lambda db, snapshot: SimpleNamespace(token=snapshot, attached=True),
+    )
+    return versions
+
+
+def _request():
+    return SimpleNamespace(info={})
+
+
+def test_token_cache_key_does_not_keep_plain_token():
+    key = token_cache_key("secret-token")
+    assert "secret-token" not in key
+    assert key == token_cache_key("secret-token") != token_cache_key("other-token")
+
+
+def test_lookup_memoises_per_request_and_caches_across_requests(versions):
+    loads = []
+
+    def load(db, token):
+        loads.append(token)
+        return SimpleNamespace(token=token, attached=False) if token == "good" else None
+
+    db = _request()
+    assert lookup_auth_session(db, "good", load).attached is False
+    assert lookup_auth_session(db, "good", load).attached is False
+    assert lookup_auth_session(db, "bad", load) is None
+    assert lookup_auth_session(db, "bad", load) is None
+    assert loads == ["good", "bad"]
+
+    # 下一个请求：校验通过的会话命中进程缓存，无效令牌不缓存
+    assert lookup_auth_session(_request(), "good", load).attached is True
+    assert lookup_auth_session(_request(), "bad", load) is None
+    assert loads == ["good", "bad", "bad"]
+
+    # 吊销：版本号变化后回源
+    versions["auth_sessions"] = 2
+    assert lookup_auth_session(_request(), "good", load).attached is False
+    assert loads == ["good", "bad", "bad", "good"]
+
+
+def test_zero_ttl_or_version_poll_failure_loads_every_request(versions, monkeypatch):
+    loads = []
+
+    def load(db, token):
+        loads.append(token)
+        return SimpleNamespace(token=token, attached=False)
+
+    monkeypatch.setattr(settings, "auth_session_cache_ttl_seconds", 0)
+    lookup_auth_session(_request(), "good", load)
+    lookup_auth_session(_request(), "good", load)
+    assert loads == ["good", "good"]
+
+    monkeypatch.setattr(settings, "auth_session_cache_ttl_seconds", 30)
+
+    def broken(name):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(auth_session_cache_service.data_version_poller, "current", broken)
+    assert lookup_auth_session(_request(), "good", load).attached is False
+    assert loads == ["good", "good", "good"]
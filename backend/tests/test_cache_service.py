@@ -0,0 +1,26 @@
+"""Unit tests for cache_service.py."""
+
+from app.cache_utils import VersionedLRUCache
+from app.services import cache_service
+from app.services.cache_service import cached_ranking_body
+
+
+def test_ranking_body_is_rebuilt_when_embedded_app_fields_change(monkeypatch):
+    versions = {"rankings": 1, "apps": 1}
+    builds = []
+
+    def build() -> bytes:
+        builds.append(dict(versions))
+        return b'[{"app":{"name":"a"}}]'
+
+    monkeypatch.setattr(cache_service.settings, "ranking_cache_enabled", True)
+    monkeypatch.setattr(cache_service.data_version_poller, "current", lambda name: versions[name])
+    monkeypatch.setattr(cache_service, "ranking_read_cache", VersionedLRUCache("test", max_entries=8, max_bytes=4096))
+
+    cached_ranking_body(("excellent", "full"), build)
+    cached_ranking_body(("excellent", "full"), build)
+    assert len(builds) == 1
+    # 应用改名只自增 apps 版本，榜单响应体同样要重建
+    versions["apps"] = 2
+    cached_ranking_body(("excellent", "full"), build)
+    assert len(builds) == 2
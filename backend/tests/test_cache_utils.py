@@ -0,0 +1,242 @@
+"""Unit tests for cache_utils.py and the version poller / ETag helpers in cache_service.py."""
+
+import threading
+import time
+
+import pytest
+from app.cache_utils import VersionedLRUCache, VersionedTTLCache
+from app.services import cache_service
+from app.services.cache_service import DataVersionPoller, etag_matches, public_etag
+
+
+def _cache(**overrides) -> VersionedLRUCache:
+    options = {"max_entries": 3, "max_bytes": 1024}
+    options.update(overrides)
+    return VersionedLRUCache("test", **options)
+
+
+class TestVersionedLRUCache:
+    def test_second_lookup_is_a_hit(self):
+        cache = _cache()
+        calls = []
+        for _ in range(2):
+            body = cache.get_or_compute(1, "k", lambda: calls.append(1) or b"[1]")
+            assert body == b"[1]"
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_evicts_least_recently_used_entry_beyond_max_entries(self):
+        cache = _cache(max_entries=2)
+        cache.get_or_compute(1, "a", lambda: b"a")
+        cache.get_or_compute(1, "b", lambda: b"b")
+        cache.get_or_compute(1, "a", lambda: b"a")  # a 变为最近使用
+        cache.get_or_compute(1, "c", lambda: b"c")
+        assert cache.stats()["evictions"] == 1
+        cache.get_or_compute(1, "a", lambda: pytest.fail("a should still be cached"))
+        recomputed = []
+        cache.get_or_compute(1, "b", lambda: recomputed.append(1) or b"b")
+        assert recomputed == [1]
+
+    def test_total_bytes_stay_within_max_bytes(self):
+        cache = _cache(max_entries=10, max_bytes=10)
+        for key in "abcd":
+            cache.get_or_compute(1, key, lambda: b"xxxx")
+        stats = cache.stats()
+        assert stats["bytes"] <= 10
+        assert stats["entries"] == 2
+
+    def test_oversized_entry_is_returned_but_not_stored(self):
+        cache = _cache(max_entry_bytes=4)
+        assert cache.get_or_compute(1, "big", lambda: b"0123456789") == b"0123456789"
+        stats = cache.stats()
+        assert stats["entries"] == 0
+        assert stats["oversized"] == 1
+
+    def test_new_version_drops_entries_of_older_versions(self):
+        cache = _cache()
+        cache.get_or_compute(1, "a", lambda: b"old")
+        assert cache.get_or_compute(2, "a", lambda: b"new") == b"new"
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["version"] == 2
+
+    def test_older_version_does_not_roll_back_current_version(self):
+        cache = _cache()
+        cache.get_or_compute((2, 1), "a", lambda: b"new")
+        # 读到陈旧版本号的请求自行计算，但不清空、不覆盖新版本条目
+        assert cache.get_or_compute((1, 1), "a", lambda: b"stale") == b"stale"
+        assert cache.get_or_compute((2, 1), "a", lambda: b"rebuilt") == b"new"
+        stats = cache.stats()
+        assert (stats["version"], stats["entries"]) == ((2, 1), 1)
+
+    def test_concurrent_misses_for_same_key_compute_once(self):
+        cache = _cache()
+        release = threading.Event()
+        calls = []
+
+        def slow_compute():
+            calls.append(1)
+            release.wait(timeout=5)
+            return b"[]"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute(1, "k", slow_compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert calls == [1]
+        assert results == [b"[]"] * 5
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] + stats["hits"] == 4
+
+    def test_compute_error_is_not_cached(self):
+        cache = _cache()
+
+        def boom():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute(1, "k", boom)
+        assert cache.get_or_compute(1, "k", lambda: b"ok") == b"ok"
+
+    def test_rejects_non_positive_bounds(self):
+        with pytest.raises(ValueError):
+            VersionedLRUCache("bad", max_entries=0, max_bytes=1)
+
+
+class TestVersionedTTLCache:
+    def _cache(self, **overrides):
+        self.now = 0.0
+        options = {"max_entries": 2, "ttl_seconds": 30, "clock": lambda: self.now}
+        options.update(overrides)
+        return VersionedTTLCache("test", **options)
+
+    def test_entry_expires_after_ttl(self):
+        cache = self._cache()
+        cache.put(1, "k", "v")
+        self.now = 29.9
+        assert cache.get(1, "k") == "v"
+        self.now = 30
+        assert cache.get(1, "k") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+    def test_evicts_least_recently_used_entry_beyond_max_entries(self):
+        cache = self._cache()
+        cache.put(1, "a", "A")
+        cache.put(1, "b", "B")
+        assert cache.get(1, "a") == "A"
+        cache.put(1, "c", "C")
+        assert cache.get(1, "b") is None
+        assert (cache.get(1, "a"), cache.get(1, "c")) == ("A", "C")
+        assert cache.stats()["evictions"] == 1
+
+    def test_new_version_drops_entries_and_stale_writes(self):
+        cache = self._cache()
+        cache.put(1, "k", "old")
+        assert cache.get(2, "k") is None
+        # 回源开始于版本 1、写入时已观察到版本 2：丢弃
+        cache.put(1, "k", "stale")
+        assert cache.get(2, "k") is None
+        cache.put(2, "k", "new")
+        assert cache.get(2, "k") == "new"
+        # 更旧的版本号不回退当前版本、不清空条目
+        cache.get(1, "k")
+        assert cache.get(2, "k") == "new"
+        assert cache.stats()["version"] == 2
+
+
+class TestDataVersionPoller:
+    def test_reads_at_most_once_per_poll_interval(self):
+        reads = []
+        poller = DataVersionPoller(60, reader=lambda name: reads.append(name) or 7)
+        assert poller.current("rankings") == 7
+        assert poller.current("rankings") == 7
+        assert reads == ["rankings"]
+
+    def test_expire_forces_next_read(self):
+        versions = iter([1, 2])
+        poller = DataVersionPoller(60, reader=lambda name: next(versions))
+        assert poller.current("rankings") == 1
+        poller.expire("rankings")
+        assert poller.current("rankings") == 2
+
+    def test_late_stale_read_does_not_replace_newer_version(self):
+        reads = []
+
+        def reader(name):
+            reads.append(name)
+            if len(reads) == 1:
+                # 首次读取返回前，另一请求已读到提交后的版本
+                assert poller.current(name) == 6
+                return 5
+            return 6
+
+        poller = DataVersionPoller(60, reader=reader)
+        assert poller.current("rankings") == 6
+        assert poller.current("rankings") == 6
+        assert len(reads) == 2
+
+    def test_read_started_before_expire_is_not_kept(self):
+        reads = []
+
+        def reader(name):
+            reads.append(name)
+            if len(reads) == 1:
+                # 本进程的提交在读取进行中完成
+                poller.expire(name)
+                return 5
+            return 6
+
+        poller = DataVersionPoller(60, reader=reader)
+        assert poller.current("rankings") == 5
+        assert poller.current("rankings") == 6
+        assert poller.current("rankings") == 6
+        assert len(reads) == 2
+
+    def test_zero_interval_polls_every_time(self):
+        reads = []
+        poller = DataVersionPoller(0, reader=lambda name: reads.append(name) or len(reads))
+        assert [poller.current("rankings") for _ in range(3)] == [1, 2, 3]
+
+
+class TestPublicEtag:
+    def test_changes_with_any_version_or_request_key(self, monkeypatch):
+        versions = {"apps": 3, "rankings": 9}
+        monkeypatch.setattr(cache_service, "data_version_poller", DataVersionPoller(0, reader=versions.__getitem__))
+        etag = public_etag("rankings", ("rankings", "apps"), ("/api/rankings", ()))
+        assert etag.startswith('"') and etag.endswith('"')
+        assert public_etag("rankings", ("rankings", "apps"), ("/api/rankings", ())) == etag
+        assert public_etag("rankings", ("rankings", "apps"), ("/api/rankings", (("limit", "5"),))) != etag
+        versions["apps"] = 4
+        assert public_etag("rankings", ("rankings", "apps"), ("/api/rankings", ())) != etag
+
+    def test_version_poll_failure_disables_validators(self, monkeypatch):
+        def reader(name):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(cache_service, "data_version_poller", DataVersionPoller(0, reader=reader))
+        assert public_etag("apps", ("apps",)) is None
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"zzz", "abc"', True),
+            ("*", True),
+            ('"abcd"', False),
+            ("", False),
+            (None, False),
+        ],
+    )
+    def test_if_none_match_uses_weak_comparison(self, header, expected):
+        assert etag_matches(header, '"abc"') is expected
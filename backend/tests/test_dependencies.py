@@ -5,10 +5,14 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
+from fastapi import HTTPException
 
 from app.dependencies import (
     build_audit_payload_summary,
+    decode_page_cursor,
+    encode_page_cursor,
     extract_bearer_token,
+    paginate_keyset,
     paginate_query,
     ranking_audit_actor,
     to_public_user,
@@ -139,6 +143,44 @@ class TestPaginateQuery:
         assert result.total == 20
         assert result.total_pages == 2
 
+    def test_filtered_query_keeps_exact_count_without_include_total(self):
+        query = MagicMock()
+        query.column_descriptions = [{"entity": SimpleNamespace(__table__=SimpleNamespace(name="apps"))}]
+        query.order_by.return_value.count.return_value = 3
+        result = paginate_query(query, page=1, page_size=10, include_total=False)
+        assert result.total == 3
+        assert result.total_is_exact is True
+        query.session.execute.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# paginate_keyset
+# ---------------------------------------------------------------------------
+
+class TestKeysetPagination:
+    def test_cursor_round_trip(self):
+        assert decode_page_cursor(encode_page_cursor(42), int) == 42
+        assert decode_page_cursor(encode_page_cursor("excellent"), str) == "excellent"
+
+    @pytest.mark.parametrize("cursor", ["garbage!", encode_page_cursor("42"), "e30"])
+    def test_invalid_cursor_is_422(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_page_cursor(cursor, int)
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.detail["code"] == "invalid_page_cursor"
+
+    def test_next_cursor_points_after_last_item_of_full_page(self):
+        from app.models import App
+
+        query = MagicMock()
+        page_query = query.filter.return_value.order_by.return_value.order_by.return_value.limit.return_value
+        page_query.all.return_value = [SimpleNamespace(id=i) for i in (11, 12, 13)]
+        query.order_by.return_value.count.return_value = 30
+        result = paginate_keyset(query, App.id, encode_page_cursor(10), page_size=2, include_total=True)
+        assert [item.id for item in result.items] == [11, 12]
+        assert decode_page_cursor(result.next_cursor, int) == 12
+        assert result.total == 30 and result.total_is_exact is True
+
 
 # ---------------------------------------------------------------------------
 # ranking_audit_actor
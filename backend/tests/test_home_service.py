@@ -0,0 +1,64 @@
+"""Unit tests for home_service.py."""
+
+import json
+from unittest.mock import MagicMock
+
+from app.services import home_service
+from app.services.home_service import build_home_payload
+
+
+def _patch_parts(monkeypatch, *, stats=lambda db: b'{"pending":1,"approved_period":2,"total_apps":3}'):
+    def ranking_part(scope_id, view):
+        return lambda db: json.dumps([{"scope": scope_id, "view": view}]).encode()
+
+    monkeypatch.setattr(home_service, "_ranking_part", ranking_part)
+    monkeypatch.setattr(home_service, "_ranking_configs_part", lambda db: b'[{"id":"excellent"}]')
+    monkeypatch.setattr(home_service, "_stats_part", stats)
+    monkeypatch.setattr(home_service, "_apps_part", lambda view, limit: lambda db: json.dumps(list(range(limit))).encode())
+
+
+def test_parts_are_assembled_into_one_document_with_one_session_each(monkeypatch):
+    _patch_parts(monkeypatch)
+    factory = MagicMock()
+    body, degraded = build_home_payload(
+        enums={"app_status": ["available"]}, view="compact", apps_limit=2, session_factory=factory
+    )
+    payload = json.loads(body)
+    assert degraded == []
+    assert payload["rankings"] == {
+        "excellent": [{"scope": "excellent", "view": "compact"}],
+        "trend": [{"scope": "trend", "view": "compact"}],
+    }
+    assert payload["ranking_configs"] == [{"id": "excellent"}]
+    assert payload["stats"]["total_apps"] == 3
+    assert payload["enums"] == {"app_status": ["available"]}
+    assert [rule["title"] for rule in payload["rules"]][0] == "如何申报应用"
+    assert payload["apps"] == [0, 1]
+    assert factory.call_count == 5
+    assert factory.return_value.close.call_count == 5
+
+
+def test_failed_part_is_nulled_and_reported(monkeypatch):
+    def broken(db):
+        raise RuntimeError("db down")
+
+    _patch_parts(monkeypatch, stats=broken)
+    body, degraded = build_home_payload(enums={}, session_factory=MagicMock())
+    payload = json.loads(body)
+    assert degraded == ["stats"]
+    assert payload["stats"] is None
+    assert payload["degraded"] == ["stats"]
+    assert payload["ranking_configs"] == [{"id": "excellent"}]
+
+
+def test_unrequested_parts_are_null_without_opening_sessions(monkeypatch):
+    _patch_parts(monkeypatch)
+    factory = MagicMock()
+    body, degraded = build_home_payload(enums={}, parts=("ranking_configs", "stats"), session_factory=factory)
+    payload = json.loads(body)
+    assert degraded == []
+    assert payload["rankings"] == {"excellent": None, "trend": None}
+    assert payload["apps"] is None
+    assert payload["ranking_configs"] == [{"id": "excellent"}]
+    assert payload["stats"]["total_apps"] == 3
+    assert factory.call_count == 2
@@ -0,0 +1,39 @@
+"""Unit tests for json_stream_service.py."""
+
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.models import ActionLog
+from app.schemas import ActionLogOut
+from app.services.json_stream_service import iter_json_array, schema_columns
+
+
+class _Item(BaseModel):
+    id: int
+    name: str
+
+
+ITEMS_ADAPTER = TypeAdapter(list[_Item])
+
+
+def test_chunks_concatenate_into_the_same_array_as_a_single_dump():
+    rows = [{"id": index, "name": f"应用{index}", "extra": "ignored"} for index in range(7)]
+    chunks = list(iter_json_array(rows, ITEMS_ADAPTER, chunk_rows=3))
+    assert len(chunks) == 5  # "[" + 3 块 + "]"
+    body = b"".join(chunks)
+    assert body == ITEMS_ADAPTER.dump_json(ITEMS_ADAPTER.validate_python(rows))
+    assert json.loads(body)[-1] == {"id": 6, "name": "应用6"}
+
+
+def test_empty_rows_and_row_conversion():
+    assert b"".join(iter_json_array([], ITEMS_ADAPTER)) == b"[]"
+    rows = [SimpleNamespace(id=1, title="a"), SimpleNamespace(id=2, title="b")]
+    body = b"".join(iter_json_array(rows, ITEMS_ADAPTER, to_item=lambda row: {"id": row.id, "name": row.title}))
+    assert json.loads(body) == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+
+def test_schema_columns_follow_schema_order_and_skip_computed_fields():
+    names = [column.name for column in schema_columns(ActionLog, ActionLogOut)]
+    assert names == [field for field in ActionLogOut.model_fields if field != "actor_username"]
@@ -19,8 +19,8 @@ class RecordingQuery:
         self.filters.append(tuple(str(c) for c in conditions))
         return self
 
-    def order_by(self, ordering):
-        self.ordering = str(ordering)
+    def order_by(self, *orderings):
+        self.ordering = ", ".join(str(ordering) for ordering in orderings)
         return self
 
     def first(self):
@@ -102,7 +102,7 @@ def test_resolve_latest_run_id_returns_latest_non_null_run_id():
     resolved = main.resolve_latest_run_id(db, ranking_config_id="excellent", period_date=date(2025, 1, 1))
 
     assert resolved == "run-newest"
-    assert any("historical_rankings.run_id IS NOT NULL" in cond for f in query.filters for cond in f)
+    assert any("ranking_runs.run_id IS NOT NULL" in cond for f in query.filters for cond in f)
 
 
 def test_list_historical_rankings_uses_latest_run_id_in_date_mode(monkeypatch):
@@ -145,6 +145,12 @@ def test_list_historical_rankings_prefers_explicit_run_id_over_latest(monkeypatc
         raise AssertionError("resolve_latest_run_id should not be called when run_id is explicitly provided")
 
     monkeypatch.setattr(rankings_router, "resolve_latest_run_id", _unexpected_call)
+    snapshot_lookups = []
+    monkeypatch.setattr(
+        rankings_router,
+        "resolve_snapshot_run_id",
+        lambda _db, _scope_id, _period_date, run_id: snapshot_lookups.append(run_id) or run_id,
+    )
 
     main.list_historical_rankings(
         ranking_type="excellent",
@@ -153,4 +159,5 @@ def test_list_historical_rankings_prefers_explicit_run_id_over_latest(monkeypatc
         db=db,
     )
 
+    assert snapshot_lookups == ["run-manual"]
     assert any("historical_rankings.run_id = :run_id_1" in cond for f in query.filters for cond in f)
@@ -0,0 +1,101 @@
+"""Unit tests for ranking_read_service.py compact view helpers."""
+
+import json
+from types import SimpleNamespace
+
+from app.services.ranking_read_service import (
+    compact_ranking_items,
+    compute_movement,
+    dump_compact_ranking_rows,
+    partition_live_ranking_rows,
+)
+
+
+def _full_item(position: int, company: str, org: str = "省公司") -> dict:
+    return {
+        "ranking_config_id": "excellent",
+        "position": position,
+        "company_position": 1,
+        "previous_position": None,
+        "position_delta": None,
+        "movement": "new",
+        "tag": "推荐",
+        "score": 100 - position,
+        "likes": None,
+        "metric_type": "composite",
+        "value_dimension": "cost_reduction",
+        "usage_30d": 10 * position,
+        "declared_at": "2026-10-17",
+        "updated_at": None,
+        "app": {"id": position, "name": f"应用{position}", "company": company, "org": org, "description": "很长的简介"},
+    }
+
+
+def test_compact_rows_serialize_only_card_fields():
+    row = SimpleNamespace(
+        position=1,
+        company_position=1,
+        previous_position=3,
+        position_delta=2,
+        movement="up",
+        tag="热门",
+        score=90,
+        metric_type="composite",
+        value_dimension="efficiency_gain",
+        usage_30d=120,
+        app_id=7,
+        app_name="智能客服",
+        app_company="石家庄",
+    )
+    assert json.loads(dump_compact_ranking_rows([row])) == [{
+        "position": 1,
+        "company_position": 1,
+        "previous_position": 3,
+        "position_delta": 2,
+        "movement": "up",
+        "tag": "热门",
+        "score": 90,
+        "metric_type": "composite",
+        "value_dimension": "efficiency_gain",
+        "usage_30d": 120,
+        "app": {"id": 7, "name": "智能客服", "company": "石家庄"},
+    }]
+
+
+def test_full_items_are_trimmed_to_the_same_compact_shape():
+    items = compact_ranking_items([_full_item(1, "石家庄"), _full_item(2, "")])
+    assert [item["app"] for item in items] == [
+        {"id": 1, "name": "应用1", "company": "石家庄"},
+        {"id": 2, "name": "应用2", "company": "省公司"},
+    ]
+    fields = ("position", "company_position", "previous_position", "position_delta", "movement", "tag", "score", "metric_type", "value_dimension", "usage_30d")
+    row = SimpleNamespace(**{key: items[1][key] for key in fields}, app_id=2, app_name="应用2", app_company="省公司")
+    assert json.loads(dump_compact_ranking_rows([row])) == [items[1]]
+
+
+def test_movement_is_measured_against_the_baseline_row():
+    assert compute_movement(4, None) == {
+        "previous_position": None, "previous_score": None, "position_delta": None, "movement": "new",
+    }
+    assert compute_movement(2, SimpleNamespace(position=5, score=70)) == {
+        "previous_position": 5, "previous_score": 70, "position_delta": 3, "movement": "up",
+    }
+    assert compute_movement(6, SimpleNamespace(position=5, score=70))["movement"] == "down"
+    assert compute_movement(5, SimpleNamespace(position=5, score=71))["movement"] == "same"
+
+
+
+def test_partition_matches_company_query_order():
+    def pair(app_id, app_company, company_position, company="", org="省公司"):
+        return (
+            SimpleNamespace(app_company=app_company, company_position=company_position),
+            SimpleNamespace(id=app_id, company=company, org=org),
+        )
+
+    rows = [pair(5, "石家庄", 2), pair(3, "保定", 1), pair(9, "石家庄", 1), pair(4, "石家庄", 1), pair(7, None, None)]
+    groups = partition_live_ranking_rows(rows, snapshot=True)
+    assert sorted(groups) == ["保定", "石家庄"]
+    assert [app.id for _, app in groups["石家庄"]] == [4, 9, 5]
+
+    legacy = partition_live_ranking_rows([pair(2, None, None, company="", org="省公司"), pair(1, None, None, company="唐山")], snapshot=False)
+    assert {company: [app.id for _, app in items] for company, items in legacy.items()} == {"省公司": [2], "唐山": [1]}
@@ -0,0 +1,78 @@
+"""Unit tests for ranking_retention_service.py — snapshot retention planning."""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from app.services.ranking_retention_service import plan_snapshot_purge
+
+DAY = date(2026, 10, 17)
+BASE = datetime(2026, 10, 17, 8, 0, 0)
+
+
+def _run(row_id, run_id, minutes, *, snapshot_run_id=None, published=False, config_id="excellent", period_date=DAY):
+    return SimpleNamespace(
+        id=row_id,
+        ranking_config_id=config_id,
+        period_date=period_date,
+        run_id=run_id,
+        snapshot_run_id=snapshot_run_id or run_id,
+        is_published=published,
+        created_at=BASE + timedelta(minutes=minutes),
+    )
+
+
+class TestPlanSnapshotPurge:
+    def test_keeps_newest_intermediate_runs_per_day(self):
+        runs = [_run(i, f"r{i}", i) for i in range(1, 6)]
+        plan = plan_snapshot_purge(runs, keep_per_day=2)
+        assert plan.run_row_ids == frozenset({1, 2, 3})
+        assert plan.snapshot_keys == frozenset(("excellent", DAY, f"r{i}") for i in (1, 2, 3))
+
+    def test_published_runs_are_always_kept_and_do_not_use_quota(self):
+        runs = [_run(1, "r1", 1, published=True), _run(2, "r2", 2), _run(3, "r3", 3), _run(4, "r4", 4)]
+        plan = plan_snapshot_purge(runs, keep_per_day=2)
+        assert plan.run_row_ids == frozenset({2})
+
+    def test_snapshot_referenced_by_kept_run_is_not_deleted(self):
+        runs = [_run(1, "r1", 1), _run(2, "r2", 2), _run(3, "r3", 3, snapshot_run_id="r1")]
+        plan = plan_snapshot_purge(runs, keep_per_day=1)
+        # r1 的快照仍被 r3 引用：快照行与 r1 的目录行都保留
+        assert plan.run_row_ids == frozenset({2})
+        assert plan.snapshot_keys == frozenset({("excellent", DAY, "r2")})
+
+    def test_shared_snapshot_is_purged_once_no_kept_run_references_it(self):
+        runs = [
+            _run(1, "r1", 1),
+            _run(2, "r2", 2, snapshot_run_id="r1"),
+            _run(3, "r3", 3, snapshot_run_id="r1"),
+        ]
+        first = plan_snapshot_purge(runs, keep_per_day=1)
+        assert first.run_row_ids == frozenset({2})
+        assert first.snapshot_keys == frozenset()
+
+        # 之后出现新快照，r3 也被清理：r1 的快照行经 r3 的 snapshot_run_id 一并清理
+        remaining = [run for run in runs if run.id not in first.run_row_ids] + [_run(4, "r4", 4)]
+        second = plan_snapshot_purge(remaining, keep_per_day=1)
+        assert second.run_row_ids == frozenset({1, 3})
+        assert second.snapshot_keys == frozenset({("excellent", DAY, "r1")})
+
+    def test_groups_are_independent_per_config_and_date(self):
+        runs = [
+            _run(1, "r1", 1),
+            _run(2, "r2", 2),
+            _run(3, "r1", 1, config_id="trend"),
+            _run(4, "r9", 1, period_date=DAY - timedelta(days=1)),
+        ]
+        plan = plan_snapshot_purge(runs, keep_per_day=1)
+        assert plan.run_row_ids == frozenset({1})
+
+    def test_pinned_active_run_is_kept_outside_the_quota(self):
+        runs = [_run(1, "r1", 1), _run(2, "r2", 2), _run(3, "r3", 3)]
+        plan = plan_snapshot_purge(runs, keep_per_day=1, pinned=frozenset({("excellent", DAY, "r1")}))
+        assert plan.run_row_ids == frozenset({2})
+
+    def test_legacy_runs_without_run_id_are_ignored(self):
+        legacy = _run(1, None, 0)
+        legacy.snapshot_run_id = None
+        plan = plan_snapshot_purge([legacy, _run(2, "r2", 2)], keep_per_day=1)
+        assert plan.run_row_ids == frozenset()
@@ -1,20 +1,33 @@
 """Unit tests for ranking_service.py."""
 
+from datetime import date, datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.dialects import mysql
 
 from app.services.ranking_service import (
+    BULK_WRITE_CHUNK_SIZE,
+    RankingSyncScope,
+    SyncPhaseTimer,
+    assign_company_positions,
+    bulk_upsert_rows,
     calculate_app_score,
     calculate_dimension_score,
     calculate_three_layer_score,
     collect_config_dimension_ids,
+    compute_config_scores,
+    compute_snapshot_hash,
+    ranking_sort_key,
+    repair_ranking_order,
     serialize_setting_snapshot,
+    snapshot_content_entry,
     validate_publish_preconditions,
     validate_submission_ranking_fields,
 )
+from app.models import Ranking
 
 from helpers import make_app, make_dimension
 
@@ -293,3 +306,186 @@ class TestValidatePublishPreconditions:
         db.query.return_value.filter.return_value.all.return_value = []
         with pytest.raises(HTTPException, match="无可发布榜单"):
             validate_publish_preconditions(db)
+
+
+# ---------------------------------------------------------------------------
+# 批量同步引擎
+# ---------------------------------------------------------------------------
+
+def _participant(app_id: int, weight_factor: float = 1.0, **app_overrides) -> SimpleNamespace:
+    return SimpleNamespace(app=make_app(id=app_id, **app_overrides), weight_factor=weight_factor, custom_tags="")
+
+
+def _score_row(score: int, detail: str, name: str = "用户满意度", weight: float = 1.0) -> SimpleNamespace:
+    return SimpleNamespace(dimension_name=name, score=score, weight=weight, calculation_detail=detail)
+
+
+class TestComputeConfigScores:
+    def _compute(self, participants, existing=None):
+        return compute_config_scores(
+            "excellent",
+            participants,
+            [{"dim_id": 1, "weight": 1.0}],
+            {1: make_dimension(1, "用户满意度")},
+            existing or {},
+            date(2026, 1, 1),
+            datetime(2026, 1, 1),
+        )
+
+    def test_sorts_by_score_desc_then_app_id_asc(self):
+        app_scores, _, _ = self._compute([
+            _participant(3, monthly_calls=5),
+            _participant(2, monthly_calls=8),
+            _participant(1, monthly_calls=5),
+        ])
+        assert [item["app"].id for item in app_scores] == [2, 1, 3]
+
+    def test_manual_score_overrides_rule(self):
+        existing = {(1, 1): _score_row(99, "手动调整评分: 99分")}
+        app_scores, score_rows, processed = self._compute([_participant(1, monthly_calls=1)], existing)
+        assert app_scores[0]["score"] == 99
+        assert processed == 1
+        assert score_rows == []
+
+    def test_unchanged_auto_score_is_not_rewritten(self):
+        existing = {(1, 1): _score_row(50, "基于月调用量计算：5 * 10 = 50分")}
+        _, score_rows, _ = self._compute([_participant(1, monthly_calls=5)], existing)
+        assert score_rows == []
+
+    def test_changed_auto_score_is_rewritten(self):
+        existing = {(1, 1): _score_row(10, "基于月调用量计算：1 * 10 = 10分")}
+        _, score_rows, _ = self._compute([_participant(1, monthly_calls=5)], existing)
+        assert len(score_rows) == 1
+        assert score_rows[0]["score"] == 50
+
+    def test_weight_factor_is_applied_and_clamped(self):
+        app_scores, _, _ = self._compute([_participant(1, weight_factor=20.0, monthly_calls=10)])
+        assert app_scores[0]["score"] == 1000
+
+
+class TestBulkUpsertRows:
+    def test_empty_rows_skip_execute(self):
+        db = MagicMock()
+        bulk_upsert_rows(db, Ranking.__table__, [], ("position",))
+        db.execute.assert_not_called()
+
+    def test_rows_are_written_in_chunks_with_on_duplicate_key_update(self):
+        db = MagicMock()
+        rows = [{"ranking_config_id": "excellent", "app_id": i, "position": i} for i in range(BULK_WRITE_CHUNK_SIZE + 1)]
+        bulk_upsert_rows(db, Ranking.__table__, rows, ("position",))
+        assert db.execute.call_count == 2
+        stmt, first_chunk = db.execute.call_args_list[0].args
+        assert len(first_chunk) == BULK_WRITE_CHUNK_SIZE
+        assert "ON DUPLICATE KEY UPDATE" in str(stmt.compile(dialect=mysql.dialect()))
+
+
+class TestSyncPhaseTimer:
+    def test_phases_accumulate_and_merge(self):
+        timer = SyncPhaseTimer()
+        with timer.phase("compute"):
+            pass
+        with timer.phase("compute"):
+            pass
+        other = SyncPhaseTimer()
+        with other.phase("write"):
+            pass
+        timer.merge(other)
+        assert set(timer.phases) == {"compute", "write"}
+        assert "compute_ms=" in timer.summary()
+
+
+class TestRepairRankingOrder:
+    CURRENT = [(90, 1), (80, 2), (80, 3), (70, 4), (60, 5)]
+
+    def test_score_increase_moves_up_and_touches_only_moved_range(self):
+        order, first_touched = repair_ranking_order(self.CURRENT, {4}, [(85, 4)])
+        assert order == [1, 4, 2, 3, 5]
+        assert first_touched == 1
+
+    def test_removed_app_closes_gap(self):
+        order, first_touched = repair_ranking_order(self.CURRENT, {2}, [])
+        assert order == [1, 3, 4, 5]
+        assert first_touched == 1
+
+    def test_new_app_follows_tie_break_by_app_id(self):
+        order, first_touched = repair_ranking_order(self.CURRENT, {6}, [(80, 6)])
+        assert order == [1, 2, 3, 6, 4, 5]
+        assert first_touched == 3
+
+    def test_unchanged_score_keeps_order(self):
+        order, first_touched = repair_ranking_order(self.CURRENT, {5}, [(60, 5)])
+        assert order == [1, 2, 3, 4, 5]
+        assert first_touched == 4
+
+    def test_current_order_violating_sort_key_is_fully_resorted(self):
+        # 同分行被存成 app_id 降序（旧数据 / 手工改名次）时按全量同步的排序键整榜重排
+        current = [(90, 1), (80, 3), (80, 2), (70, 4)]
+        order, first_touched = repair_ranking_order(current, {4}, [(80, 4)])
+        assert order == [1, 2, 3, 4]
+        assert first_touched == 0
+
+    def test_matches_full_sort_with_ties(self):
+        import random
+
+        rnd = random.Random(20261017)
+        for _ in range(200):
+            scores = {app_id: rnd.randint(0, 5) * 10 for app_id in range(1, 30)}
+            current = sorted(
+                ((score, app_id) for app_id, score in scores.items()),
+                key=lambda entry: ranking_sort_key(*entry),
+            )
+            changed = set(rnd.sample(sorted(scores), rnd.randint(1, 5))) | {rnd.randint(30, 35)}
+            inserted = [(rnd.randint(0, 5) * 10, app_id) for app_id in sorted(changed) if rnd.random() < 0.7]
+            expected = {app_id: score for app_id, score in scores.items() if app_id not in changed}
+            expected.update({app_id: score for score, app_id in inserted})
+
+            order, first_touched = repair_ranking_order(current, changed, inserted)
+
+            assert order == sorted(expected, key=lambda app_id: ranking_sort_key(expected[app_id], app_id))
+            assert order[:first_touched] == [app_id for _, app_id in current[:first_touched]]
+
+
+class TestRankingSyncScope:
+    def test_for_app_ignores_empty_config_ids(self):
+        scope = RankingSyncScope.for_app(7, "excellent", None, "")
+        assert scope.app_ids == frozenset({7})
+        assert scope.config_ids == frozenset({"excellent"})
+
+    def test_describe_is_stable(self):
+        scope = RankingSyncScope(app_ids=frozenset({3, 1}), config_ids=frozenset({"trend", "excellent"}))
+        assert scope.describe() == "apps=1,3;configs=excellent,trend;dimensions="
+
+
+def test_company_positions_count_within_each_company_in_rank_order():
+    rows = [(101, "公司A"), (102, "公司B"), (103, "公司A"), (104, "公司C"), (105, "公司B"), (106, "公司A")]
+    assert assign_company_positions(rows) == [
+        {"b_id": 101, "b_company_position": 1},
+        {"b_id": 102, "b_company_position": 1},
+        {"b_id": 103, "b_company_position": 2},
+        {"b_id": 104, "b_company_position": 1},
+        {"b_id": 105, "b_company_position": 2},
+        {"b_id": 106, "b_company_position": 3},
+    ]
+
+
+class TestComputeSnapshotHash:
+    ENTRIES = [
+        (1, 10, "应用A", "公司A", "推荐", 90, "composite", "cost_reduction", 100),
+        (2, 11, "应用B", "公司B", "推荐", 80, "composite", "cost_reduction", 50),
+    ]
+
+    def test_identical_content_hashes_equal(self):
+        assert compute_snapshot_hash(list(self.ENTRIES)) == compute_snapshot_hash(list(self.ENTRIES))
+
+    def test_position_swap_changes_hash(self):
+        swapped = [self.ENTRIES[1], self.ENTRIES[0]]
+        assert compute_snapshot_hash(swapped) != compute_snapshot_hash(self.ENTRIES)
+
+    def test_content_entry_uses_current_app_fields_and_company_fallback(self):
+        app = make_app(id=10, name="应用A", org="公司A", company="", effectiveness_type="efficiency_gain")
+        entry = snapshot_content_entry(1, app, tag="推荐", score=90, metric_type="composite", usage_30d=100)
+        assert entry == (1, 10, "应用A", "公司A", "推荐", 90, "composite", "efficiency_gain", 100, "公司A")
+
+    def test_single_field_change_changes_hash(self):
+        changed = [self.ENTRIES[0], (*self.ENTRIES[1][:5], 81, *self.ENTRIES[1][6:])]
+        assert compute_snapshot_hash(changed) != compute_snapshot_hash(self.ENTRIES)
@@ -0,0 +1,161 @@
+"""Unit tests for ranking_simulation_service.py."""
+
+import random
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import ranking_simulation_service as simulation
+from app.services.ranking_service import MANUAL_SCORE_PREFIX, compute_config_scores
+from app.services.ranking_simulation_service import (
+    SimulationBaseCache,
+    build_simulation_base,
+    simulate_rankings,
+)
+
+from helpers import make_app, make_dimension
+
+DIMENSIONS = {
+    i: make_dimension(i, name)
+    for i, name in enumerate(["用户满意度", "业务价值", "技术创新性", "使用活跃度", "市场热度"], start=1)
+}
+PERIOD = date(2026, 10, 17)
+
+
+def _candidates(count: int = 60, seed: int = 5) -> list[SimpleNamespace]:
+    rnd = random.Random(seed)
+    return [
+        SimpleNamespace(
+            app=make_app(
+                id=i,
+                name=f"app-{i}",
+                monthly_calls=rnd.uniform(0, 15),
+                effectiveness_type=rnd.choice(["revenue_growth", "efficiency_gain", "cost_reduction"]),
+                difficulty=rnd.choice(["High", "Medium", "Low"]),
+                search_count=rnd.randint(0, 500),
+            ),
+            is_enabled=rnd.random() < 0.8,
+            weight_factor=rnd.choice([0.5, 1.0, 1.3, 2.0]),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _override(app_id: int, is_enabled: bool | None = None, weight_factor: float | None = None):
+    return SimpleNamespace(app_id=app_id, is_enabled=is_enabled, weight_factor=weight_factor)
+
+
+def _expected_order(candidates, config_dimensions, manual=None):
+    """同步链路（compute_config_scores）给出的 [(app_id, score)]。"""
+    existing = {
+        key: SimpleNamespace(
+            dimension_name="", score=score, weight=0, calculation_detail=f"{MANUAL_SCORE_PREFIX}：{score}"
+        )
+        for key, score in (manual or {}).items()
+    }
+    participants = [setting for setting in candidates if setting.is_enabled]
+    app_scores, _, _ = compute_config_scores(
+        "cfg", participants, config_dimensions, DIMENSIONS, existing, PERIOD, datetime(2026, 10, 17),
+    )
+    return [(item["app"].id, item["score"]) for item in app_scores]
+
+
+def _build(candidates, config_dimensions, manual=None):
+    return build_simulation_base(
+        "cfg",
+        period_date=PERIOD,
+        config_dimensions=config_dimensions,
+        dimension_map=DIMENSIONS,
+        candidates=candidates,
+        manual_scores=manual or {},
+    )
+
+
+class TestSimulateRankings:
+    def test_unchanged_inputs_reproduce_sync_order(self):
+        candidates = _candidates()
+        config_dimensions = [{"dim_id": 2, "weight": 1.5}, {"dim_id": 1, "weight": 0.7}]
+        manual = {(3, 2): 100, (4, 1): 0}
+        result = simulate_rankings(_build(candidates, config_dimensions, manual), limit=1000)
+        assert [(item["app_id"], item["score"]) for item in result["items"]] == _expected_order(
+            candidates, config_dimensions, manual
+        )
+        assert result["moved_count"] == result["entered_count"] == 0
+        assert all(item["position_delta"] == 0 for item in result["items"])
+
+    def test_candidate_weights_match_sync_with_new_config(self):
+        candidates = _candidates(seed=8)
+        base = _build(candidates, [{"dim_id": 1, "weight": 1.0}, {"dim_id": 2, "weight": 1.0}])
+        new_dimensions = [{"dim_id": 4, "weight": 2.5}, {"dim_id": 1, "weight": 0.3}, {"dim_id": 5, "weight": 1.1}]
+        result = simulate_rankings(
+            base, dimensions=[(d["dim_id"], d["weight"]) for d in new_dimensions], limit=1000,
+        )
+        assert [(item["app_id"], item["score"]) for item in result["items"]] == _expected_order(
+            candidates, new_dimensions
+        )
+        for item in result["items"]:
+            assert item["position_delta"] == item["baseline_position"] - item["position"]
+
+    def test_setting_overrides_enter_and_drop_apps(self):
+        candidates = _candidates(seed=13)
+        config_dimensions = [{"dim_id": 1, "weight": 1.0}]
+        base = _build(candidates, config_dimensions)
+        disabled = next(setting.app.id for setting in candidates if not setting.is_enabled)
+        leader = simulate_rankings(base, limit=1)["items"][0]
+
+        result = simulate_rankings(
+            base,
+            app_settings=[_override(disabled, is_enabled=True, weight_factor=10.0), _override(leader["app_id"], is_enabled=False)],
+            limit=1000,
+        )
+        entered = next(item for item in result["items"] if item["app_id"] == disabled)
+        assert entered["baseline_position"] is None and entered["position_delta"] is None
+        assert result["entered_count"] == 1
+        assert result["dropped"] == [
+            {
+                "app_id": leader["app_id"],
+                "app_name": leader["app_name"],
+                "app_org": leader["app_org"],
+                "baseline_position": 1,
+                "baseline_score": leader["score"],
+            }
+        ]
+        assert result["participant_count"] == result["baseline_participant_count"]
+        # 基线数组不被试算改写
+        assert simulate_rankings(base, limit=1)["items"][0] == leader
+
+    def test_unknown_dimension_and_app_are_rejected(self):
+        base = _build(_candidates(10), [{"dim_id": 1, "weight": 1.0}])
+        with pytest.raises(HTTPException) as exc_info:
+            simulate_rankings(base, dimensions=[(99, 1.0)], app_settings=[_override(999, is_enabled=True)])
+        assert exc_info.value.status_code == 422
+        assert [error["field"] for error in exc_info.value.detail["field_errors"]] == [
+            "dimensions[0].dim_id",
+            "app_settings[0].app_id",
+        ]
+
+    def test_empty_candidate_set(self):
+        result = simulate_rankings(_build([], [{"dim_id": 1, "weight": 1.0}]))
+        assert result["items"] == [] and result["participant_count"] == 0
+
+
+class TestSimulationBaseCache:
+    def test_entry_expires_on_version_change_and_ttl(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(simulation, "monotonic", lambda: clock[0])
+        cache = SimulationBaseCache(max_entries=2, ttl_seconds=60)
+        base = object()
+        cache.put("cfg", 1, base)
+        assert cache.get("cfg", 1) is base
+        assert cache.get("cfg", 2) is None
+        clock[0] += 61
+        assert cache.get("cfg", 1) is None
+
+    def test_lru_eviction(self):
+        cache = SimulationBaseCache(max_entries=2, ttl_seconds=60)
+        for config_id in ("a", "b", "c"):
+            cache.put(config_id, 1, config_id)
+        assert cache.get("a", 1) is None
+        assert cache.get("c", 1) == "c"
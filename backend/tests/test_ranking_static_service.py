@@ -0,0 +1,86 @@
+"""Unit tests for ranking_static_service.py."""
+
+import gzip
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.services import ranking_static_service
+from app.services.ranking_static_service import (
+    export_ranking_static_files,
+    prune_ranking_static_versions,
+    read_static_ranking,
+)
+
+
+def _row(position: int, company: str, org: str = "省公司", company_position: int | None = None) -> tuple:
+    row = SimpleNamespace(position=position, app_company=company or org, company_position=company_position or position)
+    return row, SimpleNamespace(id=position, company=company, org=org)
+
+
+def _fake_db(*config_ids: str) -> MagicMock:
+    db = MagicMock()
+    configs = [SimpleNamespace(id=config_id, name=f"{config_id}榜") for config_id in config_ids]
+    db.query.return_value.filter.return_value.order_by.return_value.all.return_value = configs
+    return db
+
+
+def _fake_rows(monkeypatch, rows: dict[str, list[tuple]]):
+    loads = []
+
+    def load(db, scope_id):
+        loads.append(scope_id)
+        return rows[scope_id], True
+
+    def dump(pairs, *, snapshot):
+        return json.dumps([{"position": row.position, "app": {"id": app.id}} for row, app in pairs]).encode("utf-8")
+
+    monkeypatch.setattr(ranking_static_service, "load_live_ranking_rows", load)
+    monkeypatch.setattr(ranking_static_service, "dump_live_ranking_rows", dump)
+    return loads
+
+
+def test_export_writes_overall_and_company_files_with_gzip_and_manifest(tmp_path, monkeypatch):
+    # 公司内名次与整榜名次次序不同：公司榜按公司内名次排序
+    loads = _fake_rows(monkeypatch, {
+        "excellent": [_row(1, "石家庄", company_position=2), _row(2, ""), _row(3, "石家庄", company_position=1)]
+    })
+    root = tmp_path / "rankings"
+
+    manifest = export_ranking_static_files(_fake_db("excellent"), "run-1", root=root)
+
+    entry = manifest["rankings"]["excellent"]
+    assert manifest["version"] == "run-1"
+    assert entry["items"] == 3
+    assert sorted(entry["companies"]) == ["省公司", "石家庄"]
+    overall = (tmp_path / entry["overall"]["path"]).read_bytes()
+    assert gzip.decompress((tmp_path / (entry["overall"]["path"] + ".gz")).read_bytes()) == overall
+    assert json.loads((root / "manifest.json").read_text(encoding="utf-8")) == manifest
+    assert [item["position"] for item in json.loads(read_static_ranking("excellent", "石家庄", root=root))] == [3, 1]
+    # 整榜只查一次，公司榜不再逐公司回查
+    assert loads == ["excellent"]
+    assert read_static_ranking("excellent", root=root) == overall
+    assert read_static_ranking("excellent", "不存在的公司", root=root) == b"[]"
+    assert read_static_ranking("trend", root=root) is None
+    assert not [path for path in root.iterdir() if path.name.startswith(".")]
+
+
+def test_unsafe_version_and_config_ids_are_hashed_into_file_names(tmp_path, monkeypatch):
+    _fake_rows(monkeypatch, {"../榜单": [_row(1, "")]})
+    manifest = export_ranking_static_files(_fake_db("../榜单"), "a/b", root=tmp_path / "rankings")
+    path = manifest["rankings"]["../榜单"]["overall"]["path"]
+    assert ".." not in path and "榜单" not in path
+    assert manifest["version"].startswith("h")
+
+
+def test_prune_keeps_newest_versions_and_current(tmp_path):
+    for index, name in enumerate(["v1", "v2", "v3", "v4"]):
+        (tmp_path / name).mkdir()
+        os.utime(tmp_path / name, (index, index))
+    assert prune_ranking_static_versions(tmp_path, keep=2, current="v1") == ["v3", "v2"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["v1", "v4"]
+
+
+def test_missing_manifest_reads_as_none(tmp_path):
+    assert read_static_ranking("excellent", root=tmp_path) is None
@@ -0,0 +1,296 @@
+"""Unit tests for ranking_sync_service.py."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services.ranking_service import RankingSyncScope
+from app.services.ranking_sync_service import (
+    deserialize_sync_scope,
+    merge_sync_scopes,
+    serialize_sync_job,
+    serialize_sync_scope,
+)
+
+
+def _scope(app_ids=(), config_ids=()) -> RankingSyncScope:
+    return RankingSyncScope(app_ids=frozenset(app_ids), config_ids=frozenset(config_ids))
+
+
+class TestSyncScopeSerialization:
+    def test_full_scope_round_trips_as_empty_string(self):
+        assert serialize_sync_scope(None) == ""
+        assert deserialize_sync_scope("") is None
+
+    def test_scope_round_trip(self):
+        scope = _scope(app_ids={3, 1}, config_ids={"trend"})
+        assert deserialize_sync_scope(serialize_sync_scope(scope)) == scope
+
+
+class TestMergeSyncScopes:
+    def test_full_scope_absorbs_everything(self):
+        assert merge_sync_scopes(None, _scope(app_ids={1})) is None
+        assert merge_sync_scopes(_scope(config_ids={"excellent"}), None) is None
+
+    def test_app_scopes_union_apps_and_configs(self):
+        merged = merge_sync_scopes(_scope({1}, {"excellent"}), _scope({2}, {"trend"}))
+        assert merged == _scope({1, 2}, {"excellent", "trend"})
+
+    def test_mixed_scopes_escalate_to_config_recompute(self):
+        merged = merge_sync_scopes(_scope({1}, {"excellent"}), _scope((), {"trend"}))
+        assert merged == _scope((), {"excellent", "trend"})
+
+
+class TestSerializeSyncJob:
+    def test_wait_and_duration_are_derived_from_timestamps(self):
+        created = datetime(2026, 10, 1, 8, 0, 0)
+        job = SimpleNamespace(
+            id=7,
+            status="done",
+            triggers="app_ranking_setting_updated,ranking_config_updated",
+            scope_json="",
+            coalesced_count=3,
+            actor="admin",
+            run_id="run-7",
+            updated_count=12,
+            timings_summary="total_ms=10.0",
+            error_message="",
+            not_before=created + timedelta(milliseconds=800),
+            created_at=created,
+            started_at=created + timedelta(seconds=1),
+            finished_at=created + timedelta(seconds=1, milliseconds=250),
+        )
+        payload = serialize_sync_job(job)
+        assert payload["triggers"] == ["app_ranking_setting_updated", "ranking_config_updated"]
+        assert payload["scope"] == "full"
+        assert payload["queue_wait_ms"] == 1000
+        assert payload["duration_ms"] == 250
+
+
+class _FakeLockServer:
+    """模拟 MySQL 命名锁：记录 GET_LOCK 的调用超时，按预设结果返回。"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.timeouts = []
+        self.released = 0
+        self.closed = 0
+
+    def connect(self):
+        server = self
+
+        class _Connection:
+            def close(self):
+                server.closed += 1
+
+        return _Connection()
+
+
+def _install_fake_lock(monkeypatch, results):
+    import app.services.ranking_sync_service as sync_service
+
+    server = _FakeLockServer(results)
+    audits = []
+
+    def fake_get(connection, name, timeout):
+        server.timeouts.append(timeout)
+        return server.results.pop(0)
+
+    def fake_release(connection, name):
+        server.released += 1
+
+    monkeypatch.setattr(sync_service._database, "engine", SimpleNamespace(connect=server.connect, url=SimpleNamespace(database="ai_app_square")))
+    monkeypatch.setattr(sync_service, "_get_named_lock", fake_get)
+    monkeypatch.setattr(sync_service, "_release_named_lock", fake_release)
+    monkeypatch.setattr(
+        sync_service,
+        "write_sync_lock_audit",
+        lambda action, owner, *, run_id=None, payload="": audits.append((action, owner, run_id, payload)),
+    )
+    monkeypatch.setattr(sync_service, "find_running_sync_job_id", lambda db: 42)
+    return sync_service, server, audits
+
+
+class TestRankingSyncLock:
+    def test_lock_name_is_scoped_to_database(self, monkeypatch):
+        sync_service, _, _ = _install_fake_lock(monkeypatch, [])
+        assert sync_service.ranking_sync_lock_name() == "ranking_sync:ai_app_square"
+
+    def test_uncontended_acquire_releases_and_audits_hold_time(self, monkeypatch):
+        sync_service, server, audits = _install_fake_lock(monkeypatch, [True])
+        with sync_service.acquire_ranking_sync_lock("lisi", wait_seconds=5) as lock:
+            assert lock.contended is False
+            lock.run_id = "run-1"
+        assert server.timeouts == [0]
+        assert server.released == 1
+        assert server.closed == 1
+        action, owner, run_id, payload = audits[0]
+        assert (action, owner, run_id) == ("ranking_sync_lock_released", "lisi", "run-1")
+        assert "lock_wait_ms=" in payload and "lock_hold_ms=" in payload and "contended=0" in payload
+
+    def test_contended_acquire_waits_with_configured_timeout(self, monkeypatch):
+        sync_service, server, audits = _install_fake_lock(monkeypatch, [False, True])
+        monkeypatch.setattr(sync_service.settings, "ranking_sync_lock_wait_seconds", 7)
+        with sync_service.acquire_ranking_sync_lock("lisi") as lock:
+            assert lock.contended is True
+        assert server.timeouts == [0, 7]
+        assert "contended=1" in audits[0][3]
+
+    def test_lock_is_released_when_body_raises(self, monkeypatch):
+        sync_service, server, _ = _install_fake_lock(monkeypatch, [True])
+        try:
+            with sync_service.acquire_ranking_sync_lock("lisi", wait_seconds=0):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert server.released == 1
+        assert server.closed == 1
+
+    def test_zero_wait_does_not_block_when_busy(self, monkeypatch):
+        sync_service, server, audits = _install_fake_lock(monkeypatch, [False])
+        try:
+            with sync_service.acquire_ranking_sync_lock("sync_worker", wait_seconds=0):
+                raise AssertionError("should not enter")
+        except sync_service.RankingSyncLockBusy:
+            pass
+        assert server.timeouts == [0]
+        assert server.released == 0
+        assert server.closed == 1
+        assert audits == []
+
+    def test_guard_turns_timeout_into_409_with_running_job(self, monkeypatch):
+        from fastapi import HTTPException
+
+        sync_service, server, audits = _install_fake_lock(monkeypatch, [False, False])
+        try:
+            with sync_service.ranking_sync_guard(SimpleNamespace(), "lisi", wait_seconds=1):
+                raise AssertionError("should not enter")
+        except HTTPException as exc:
+            assert exc.status_code == 409
+            assert exc.detail["code"] == "ranking_sync_in_progress"
+            assert exc.detail["field_errors"] == [{"field": "sync_job_id", "message": "42"}]
+            assert exc.headers == {"X-Ranking-Sync-Job-Id": "42"}
+        else:
+            raise AssertionError("expected 409")
+        assert server.timeouts == [0, 1]
+        assert audits[0][0] == "ranking_sync_lock_timeout"
+        assert "running_job_id=42" in audits[0][3]
+
+
+class TestRunLockedFullSync:
+    def test_contended_request_joins_sync_finished_while_waiting(self, monkeypatch):
+        import app.services.ranking_sync_service as sync_service
+
+        joined_job = SimpleNamespace(id=9, run_id="run-joined", status="done")
+        monkeypatch.setattr(sync_service, "find_joinable_sync_job", lambda db, triggers, since: joined_job)
+        lock = sync_service.RankingSyncLockHandle("lisi", wait_ms=120.0, contended=True)
+        job, joined = sync_service.run_locked_full_sync(
+            SimpleNamespace(), lock, "manual_sync", "lisi",
+            requested_at=datetime(2026, 10, 17), joinable_triggers=("manual_sync",),
+        )
+        assert (job, joined) == (joined_job, True)
+        assert lock.run_id == "run-joined"
+
+    def test_explicit_run_id_never_joins(self, monkeypatch):
+        import app.services.ranking_sync_service as sync_service
+
+        def fail_lookup(db, triggers, since):
+            raise AssertionError("explicit run_id must not join another run")
+
+        monkeypatch.setattr(sync_service, "find_joinable_sync_job", fail_lookup)
+        executed = SimpleNamespace(id=3, run_id="run-explicit", status="done")
+        monkeypatch.setattr(sync_service, "_new_running_job", lambda db, trigger, actor, scope_json, run_id=None: SimpleNamespace(id=3, run_id=run_id))
+        monkeypatch.setattr(sync_service, "execute_sync_job", lambda db, job_id: executed)
+        lock = sync_service.RankingSyncLockHandle("lisi", wait_ms=120.0, contended=True)
+        db = SimpleNamespace(commit=lambda: None)
+        job, joined = sync_service.run_locked_full_sync(
+            db, lock, "manual_sync", "lisi",
+            requested_at=datetime(2026, 10, 17), run_id="run-explicit", joinable_triggers=("manual_sync",),
+        )
+        assert (job, joined) == (executed, False)
+        assert lock.run_id == "run-explicit"
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def flush(self):
+        self.calls.append("flush")
+
+    def commit(self):
+        self.calls.append("commit")
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+
+class TestInlineChainMutationSync:
+    def _install(self, monkeypatch, lock_results):
+        sync_service, server, audits = _install_fake_lock(monkeypatch, lock_results)
+        monkeypatch.setattr(sync_service.settings, "ranking_sync_mode", "inline")
+        job = SimpleNamespace(id=5, run_id="run-5", not_before=None)
+        monkeypatch.setattr(sync_service, "enqueue_ranking_sync", lambda db, trigger, actor, scope: job)
+        monkeypatch.setattr(sync_service, "bump_data_version", lambda db, name: db.calls.append(f"bump:{name}"))
+        return sync_service, server, audits, job
+
+    def test_edit_and_job_are_committed_before_waiting_for_lock(self, monkeypatch):
+        sync_service, server, audits, job = self._install(monkeypatch, [False, False])
+        db = _RecordingSession()
+        ticket = sync_service.sync_after_chain_mutation(db, "ranking_config_updated", actor="lisi")
+        assert db.calls == ["flush", "bump:rankings", "commit"]
+        assert job.not_before is not None
+        assert ticket == sync_service.RankingSyncTicket(job_id=5, status="queued", updated_count=0, run_id="run-5")
+        assert audits[0][0] == "ranking_sync_lock_timeout"
+        assert "queued_job_id=5" in audits[0][3]
+
+    def test_claimed_job_runs_inside_request(self, monkeypatch):
+        sync_service, server, _, _ = self._install(monkeypatch, [True])
+        monkeypatch.setattr(sync_service, "claim_sync_job", lambda db, job_id: True)
+        executed = SimpleNamespace(id=5, run_id="run-5", status="done", updated_count=7)
+        monkeypatch.setattr(sync_service, "execute_sync_job", lambda db, job_id: executed)
+        ticket = sync_service.sync_after_chain_mutation(_RecordingSession(), "ranking_config_updated", actor="lisi")
+        assert (ticket.status, ticket.updated_count) == ("done", 7)
+        assert server.released == 1
+
+
+class TestScheduledSnapshotPurge:
+    def _install(self, monkeypatch, last_purged_at):
+        from unittest.mock import MagicMock
+
+        sync_service, server, _ = _install_fake_lock(monkeypatch, [True])
+        db = MagicMock()
+        db.query.return_value.filter.return_value.scalar.return_value = last_purged_at
+        purges, bumps = [], []
+        monkeypatch.setattr(sync_service, "purge_ranking_snapshots", lambda factory: purges.append(factory))
+        monkeypatch.setattr(sync_service, "bump_data_version", lambda session, name: bumps.append(name))
+        return sync_service, server, db, purges, bumps
+
+    def test_skips_when_another_worker_purged_within_interval(self, monkeypatch):
+        now = datetime(2026, 10, 17, 12, 0)
+        sync_service, server, db, purges, bumps = self._install(monkeypatch, now - timedelta(minutes=20))
+        assert sync_service.run_scheduled_snapshot_purge(3600, session_factory=lambda: db, now=now) is False
+        assert purges == [] and bumps == []
+        assert server.released == 1
+        db.close.assert_called_once()
+
+    def test_purges_and_records_marker_when_due(self, monkeypatch):
+        now = datetime(2026, 10, 17, 12, 0)
+        sync_service, _, db, purges, bumps = self._install(monkeypatch, now - timedelta(hours=2))
+        assert sync_service.run_scheduled_snapshot_purge(3600, session_factory=lambda: db, now=now) is True
+        assert len(purges) == 1
+        assert bumps == [sync_service.SNAPSHOT_PURGE_MARKER]
+        db.commit.assert_called_once()
+
+    def test_busy_lock_is_raised_without_touching_the_database(self, monkeypatch):
+        sync_service, server, audits = _install_fake_lock(monkeypatch, [False])
+
+        def factory():
+            raise AssertionError("must not open a session while the lock is busy")
+
+        try:
+            sync_service.run_scheduled_snapshot_purge(3600, session_factory=factory)
+        except sync_service.RankingSyncLockBusy:
+            pass
+        else:
+            raise AssertionError("expected RankingSyncLockBusy")
+        assert server.timeouts == [0]
@@ -0,0 +1,203 @@
+"""Unit tests for scoring_engine.py."""
+
+import json
+import random
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.scoring_rules import SCORE_LIMIT
+from app.services.ranking_service import calculate_dimension_score, calculate_three_layer_score
+from app.services.scoring_engine import (
+    AppColumns,
+    BUILTIN_RULE_SPECS,
+    compile_scoring_rule,
+    parse_scoring_rule,
+    rule_for_dimension,
+    score_dimension_matrix,
+    weighted_final_scores,
+)
+
+from helpers import make_app, make_dimension
+
+DIMENSION_NAMES = [*BUILTIN_RULE_SPECS, "未知维度"]
+
+
+def _random_apps(count: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [
+        make_app(
+            id=i,
+            monthly_calls=rnd.choice([0, 0.1, 0.7, 1.15, 3.3, 9.99, 10, 12.5, 250.0, rnd.uniform(0, 30)]),
+            effectiveness_type=rnd.choice(["revenue_growth", "efficiency_gain", "cost_reduction", "perception_uplift"]),
+            difficulty=rnd.choice(["High", "Medium", "Low", None]),
+            status=rnd.choice(["available", "beta", "approval", "offline"]),
+            last_month_calls=rnd.choice([None, 0, 0.5, 4.0, rnd.uniform(0, 30)]),
+            new_users_count=rnd.choice([None, 0, 7, 95, rnd.randint(0, 2000)]),
+            search_count=rnd.randint(0, 500),
+            share_count=rnd.randint(0, 100),
+            favorite_count=rnd.choice([None, rnd.randint(0, 100)]),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class TestScoreDimensionMatrix:
+    def test_matches_scalar_rules_for_every_cell(self):
+        apps = _random_apps(300)
+        dimensions = [make_dimension(i, name) for i, name in enumerate(DIMENSION_NAMES, start=1)]
+        matrix = score_dimension_matrix(AppColumns(apps), dimensions)
+        assert matrix.scores.shape == (len(apps), len(dimensions))
+        for row, app in enumerate(apps):
+            for col, dimension in enumerate(dimensions):
+                assert (int(matrix.scores[row, col]), matrix.detail(row, col)) == calculate_dimension_score(app, dimension)
+
+    def test_details_are_built_on_demand(self):
+        matrix = score_dimension_matrix(AppColumns(_random_apps(50)), [make_dimension(1, "用户满意度")])
+        assert matrix._details == {}
+        matrix.detail(3, 0)
+        assert list(matrix._details) == [0]
+
+    def test_only_columns_used_by_rules_are_loaded(self):
+        columns = AppColumns(_random_apps(10))
+        score_dimension_matrix(columns, [make_dimension(1, "业务价值")])
+        assert set(columns._categorical) == {"effectiveness_type"}
+        assert columns._numeric == {}
+
+    def test_empty_app_set(self):
+        matrix = score_dimension_matrix(AppColumns([]), [make_dimension(1, "技术创新性")])
+        assert matrix.scores.shape == (0, 1)
+
+
+class TestWeightedFinalScores:
+    def test_matches_three_layer_score_bit_for_bit(self):
+        rnd = random.Random(11)
+        apps = _random_apps(300, seed=3)
+        dimensions = [make_dimension(i, name) for i, name in enumerate(DIMENSION_NAMES, start=1)]
+        weights = [rnd.choice([1.0, 0.3, 1.7, 2, 0.15]) for _ in dimensions]
+        factors = [rnd.choice([1.0, 0.1, 1.3, 7.77, 10.0]) for _ in apps]
+        config_dimensions = [{"dim_id": d.id, "weight": w} for d, w in zip(dimensions, weights)]
+        dimension_map = {d.id: d for d in dimensions}
+
+        matrix = score_dimension_matrix(AppColumns(apps), dimensions)
+        finals = weighted_final_scores(matrix.scores, weights, np.array(factors))
+        expected = [
+            calculate_three_layer_score(app, config_dimensions, dimension_map, weight_factor=factor)
+            for app, factor in zip(apps, factors)
+        ]
+        assert finals.tolist() == expected
+
+    def test_clamps_to_score_range(self):
+        scores = np.array([[100], [0]], dtype=np.int64)
+        assert weighted_final_scores(scores, [50.0], np.array([1.0, -1.0])).tolist() == [1000, 0]
+
+
+def _rule_dimension(rule: dict, id: int = 1, **overrides):
+    return make_dimension(id, "自定义维度", scoring_rule=json.dumps(rule), updated_at=datetime(2026, 10, 17), **overrides)
+
+
+class TestDeclarativeRules:
+    def test_growth_dimensions_follow_legacy_seed_formulas(self):
+        for app in _random_apps(300, seed=5):
+            previous = app.last_month_calls or 0
+            if previous > 0:
+                growth = min(max(int((app.monthly_calls - previous) / previous * 100), 0), 100)
+            else:
+                growth = 50
+            heat = app.search_count + app.share_count * 2 + (app.favorite_count or 0) * 3
+            assert calculate_dimension_score(app, make_dimension(1, "增长趋势"))[0] == growth
+            assert calculate_dimension_score(app, make_dimension(1, "用户增长"))[0] == min(int((app.new_users_count or 0) / 10), 100)
+            assert calculate_dimension_score(app, make_dimension(1, "市场热度"))[0] == min(int(heat / 10), 100)
+
+    def test_explicit_rule_overrides_builtin_of_same_name(self):
+        dimension = make_dimension(1, "用户满意度", scoring_rule=json.dumps({"type": "constant", "score": 7}))
+        assert calculate_dimension_score(make_app(monthly_calls=50), dimension) == (7, "固定评分7分")
+
+    def test_lookup_rule_with_default_templates(self):
+        rule = {"type": "lookup", "field": "category", "scores": {"客户服务类": 90}, "default": 30}
+        dimension = _rule_dimension(rule)
+        assert calculate_dimension_score(make_app(category="客户服务类"), dimension) == (90, "应用分类为客户服务类，获得90分")
+        assert calculate_dimension_score(make_app(category="管理支撑类"), dimension) == (30, "应用分类为管理支撑类，获得30分")
+
+    def test_linear_rule_clamps_both_ends(self):
+        rule = {"type": "linear", "terms": {"monthly_calls": 1, "last_month_calls": -1}, "divisor": 0.5, "min": 0, "max": 100}
+        dimension = _rule_dimension(rule)
+        assert calculate_dimension_score(make_app(monthly_calls=10, last_month_calls=30), dimension)[0] == 0
+        assert calculate_dimension_score(make_app(monthly_calls=30, last_month_calls=10), dimension)[0] == 40
+        assert calculate_dimension_score(make_app(monthly_calls=300, last_month_calls=0), dimension)[0] == 100
+
+    def test_matrix_matches_scalar_for_custom_rules(self):
+        rules = [
+            {"type": "linear", "terms": {"share_count": 3, "search_count": 0.5}, "divisor": 7, "max": 100},
+            {"type": "growth_ratio", "field": "new_users_count", "baseline": "search_count", "scale": 50, "min": -10, "max": 60},
+            {"type": "lookup", "field": "status", "scores": {"beta": 5}, "default": 1, "default_detail": "其他:{value}"},
+        ]
+        dimensions = [_rule_dimension(rule, id=i) for i, rule in enumerate(rules, start=1)]
+        apps = _random_apps(200, seed=9)
+        matrix = score_dimension_matrix(AppColumns(apps), dimensions)
+        for row, app in enumerate(apps):
+            for col, dimension in enumerate(dimensions):
+                assert (int(matrix.scores[row, col]), matrix.detail(row, col)) == calculate_dimension_score(app, dimension)
+
+    def test_compiled_rule_is_cached_until_dimension_changes(self):
+        dimension = _rule_dimension({"type": "constant", "score": 10})
+        first = rule_for_dimension(dimension)
+        assert rule_for_dimension(dimension) is first
+        dimension.scoring_rule = json.dumps({"type": "constant", "score": 20})
+        dimension.updated_at = datetime(2026, 10, 18)
+        assert rule_for_dimension(dimension).score_one(make_app()) == 20
+
+    @pytest.mark.parametrize(
+        "rule, message",
+        [
+            ({"type": "script"}, "scoring_rule.type"),
+            ({"type": "linear", "terms": {"password_hash": 1}}, "scoring_rule.terms"),
+            ({"type": "linear", "terms": {"monthly_calls": 1}, "divisor": 0}, "divisor"),
+            ({"type": "lookup", "field": "status", "scores": {"beta": "high"}, "default": 1}, "scores values"),
+            ({"type": "lookup", "field": "status", "scores": {"beta": 1}}, "scoring_rule.default is required"),
+            ({"type": "constant", "score": 1, "detail": "{unknown}"}, "invalid placeholder"),
+        ],
+    )
+    def test_invalid_rules_are_rejected(self, rule, message):
+        with pytest.raises(ValueError, match=message):
+            compile_scoring_rule(rule)
+
+    def test_parse_accepts_json_text_and_empty(self):
+        assert parse_scoring_rule(None) is None
+        assert parse_scoring_rule("") is None
+        assert parse_scoring_rule('{"type": "constant", "score": 3}') == {"type": "constant", "score": 3}
+
+
+class TestUnboundedRules:
+    def test_linear_rule_without_max_saturates_instead_of_overflowing(self):
+        # 1e9 × 1e12 超出 int64，未配置 max 时也应饱和到 SCORE_LIMIT 而不是溢出回绕
+        rule = {"type": "linear", "terms": {"monthly_calls": 1e12}}
+        dimension = _rule_dimension(rule)
+        apps = [make_app(id=1, monthly_calls=1e9), make_app(id=2, monthly_calls=0)]
+        assert calculate_dimension_score(apps[0], dimension)[0] == SCORE_LIMIT
+        matrix = score_dimension_matrix(AppColumns(apps), [dimension])
+        assert matrix.scores[:, 0].tolist() == [SCORE_LIMIT, 0]
+
+    @pytest.mark.parametrize(
+        "rule",
+        [
+            {"type": "linear", "terms": {"monthly_calls": float("inf")}},
+            {"type": "constant", "score": 2**40},
+            {"type": "lookup", "field": "status", "scores": {"beta": 2**63}, "default": 1},
+        ],
+    )
+    def test_non_finite_or_out_of_range_numbers_are_rejected(self, rule):
+        with pytest.raises(ValueError):
+            compile_scoring_rule(rule)
+
+    def test_schemas_validate_rules_without_importing_services(self):
+        code = "import sys, app.schemas; print(sorted(m for m in sys.modules if m.startswith('app.services')))"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[1],
+        )
+        assert result.stdout.strip() == "[]"
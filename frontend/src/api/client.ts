@@ -4,11 +4,13 @@ import type {
   AdminUserCreatePayload,
   AdminUserUpdatePayload,
   AppItem,
+  AppProfile,
   AppChangeRequest,
   AuthProviderInfo,
   AuthLoginResponse,
   AuthMeResponse,
   AuthUser,
+  RankingDiff,
   RankingItem,
   Recommendation,
   RuleLink,
@@ -21,7 +23,10 @@ import type {
   PaginatedResponse,
   RankingConfigRecord,
   Submission,
-  HistoricalRanking
+  HistoricalRanking,
+  HomeBootstrap,
+  HomePart,
+  RankingSyncJob
 } from '../types'
 
 const client = axios.create({ baseURL: '/', withCredentials: true })
@@ -122,6 +127,11 @@ export async function fetchAppDetail(appId: number) {
   return data
 }
 
+export async function fetchAppProfile(appId: number, params?: { days?: number; points?: number }) {
+  const { data } = await client.get<AppProfile>(`${apiBasePath}/apps/${appId}/profile`, { params })
+  return data
+}
+
 export async function fetchRankings(
   ranking_type: 'excellent' | 'trend',
   company?: string
@@ -147,6 +157,17 @@ export async function fetchRules() {
   return data
 }
 
+export async function fetchHome<View extends 'full' | 'compact' = 'full'>(params?: {
+  view?: View
+  apps_limit?: number
+  parts?: HomePart[]
+}) {
+  const { data } = await client.get<HomeBootstrap<View>>(`${apiBasePath}/home`, {
+    params: { ...params, parts: params?.parts?.join(',') },
+  })
+  return data
+}
+
 export async function fetchMetaEnums() {
   const { data } = await client.get<MetaEnums>(`${apiBasePath}/meta/enums`)
   return data
@@ -295,6 +316,11 @@ export async function publishRankings() {
   return data
 }
 
+export async function fetchRankingSyncJob(jobId: number) {
+  const { data } = await client.get<RankingSyncJob>(`${apiBasePath}/rankings/sync-jobs/${jobId}`)
+  return data
+}
+
 export async function batchUpdateRankingParams(
   apps: number[],
   params: {
@@ -643,6 +669,14 @@ export async function fetchRankingsByConfig(configId: string, company?: string)
   return data
 }
 
+// 对比同一榜单两个批次的名次变化
+export async function fetchRankingDiff(configId: string, fromRun: string, toRun: string) {
+  const { data } = await client.get<RankingDiff>(`${apiBasePath}/rankings/diff`, {
+    params: { ranking_config_id: configId, from_run: fromRun, to_run: toRun },
+  })
+  return data
+}
+
 // 获取应用在各维度的得分（用于榜单详情页展示）
 export async function fetchAppDimensionScoresForConfig(
   appId: number,
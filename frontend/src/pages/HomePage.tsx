@@ -4,10 +4,10 @@ import {
   auditEvent,
   fetchApps,
   fetchHistoricalRankings,
+  fetchHome,
   fetchStats,
   fetchRankingDimensions,
   fetchDimensionScores,
-  fetchRankingConfigs,
 } from '../api/client'
 import type { AppItem, AuthUser, RankingItem, Stats, RankingDimension } from '../types'
 import {
@@ -93,25 +93,27 @@ function HomePage({
       .then((data) => setRankingDimensions(data.filter((item) => item.is_active)))
       .catch((error) => console.error('Failed to fetch ranking dimensions:', error))
 
-    fetchRankingConfigs(true)
-      .then((data) => setRankingConfigs(data))
-      .catch((error) => console.error('Failed to fetch ranking configs:', error))
-
-    const loadStats = async () => {
+    // 启用榜单配置与统计随首页聚合接口一次取回；榜单展示已发布快照、应用列表随筛选加载，不取其余部分
+    const loadHome = async () => {
       try {
         setStatsLoading(true)
         setStatsError(null)
-        const data = await fetchStats()
-        setStats(data)
+        const home = await fetchHome({ parts: ['ranking_configs', 'stats'] })
+        if (home.ranking_configs) setRankingConfigs(home.ranking_configs)
+        if (home.stats) {
+          setStats(home.stats)
+        } else {
+          setStatsError('获取统计数据失败')
+        }
       } catch (error) {
-        console.error('Failed to fetch stats:', error)
+        console.error('Failed to fetch home bootstrap:', error)
         setStatsError('获取统计数据失败')
       } finally {
         setStatsLoading(false)
       }
     }
 
-    loadStats()
+    loadHome()
   }, [])
 
   // 自动打开申报弹窗
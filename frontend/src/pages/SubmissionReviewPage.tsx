@@ -44,6 +44,13 @@ function resolveAdminError(err: unknown, fallback: string): string {
   return fallback
 }
 
+function describeRankingSync(result: { run_id?: string; sync_job_id?: number | null; sync_status?: string | null }): string {
+  if (result.sync_status === 'queued' && result.sync_job_id) {
+    return `榜单同步任务 #${result.sync_job_id} 已排队（run_id: ${result.run_id}）`
+  }
+  return `已完成链路同步（run_id: ${result.run_id}）`
+}
+
 function getEmptyReviewMessage(filter: 'all' | 'pending' | 'approved' | 'rejected' | 'withdrawn', total: number): string {
   if (total === 0) return '当前还没有应用申报。用户提交申报后，会在这里进入审核流转。'
   if (filter === 'pending') return '当前没有待审核申报，可以切换到其他状态查看历史记录。'
@@ -131,7 +138,7 @@ export default function SubmissionReviewPage() {
             }
           : undefined
       )
-      alert(`审核通过！应用已创建并完成链路同步（run_id: ${approveResult.run_id}）。`)
+      alert(`审核通过！应用已创建，${describeRankingSync(approveResult)}。`)
       setSelectedSubmission(null)
       loadSubmissions() // 刷新列表
     } catch (err) {
@@ -150,7 +157,7 @@ export default function SubmissionReviewPage() {
     try {
       setProcessing(true)
       const result = await approveAppChangeRequest(id)
-      alert(`应用变更已通过并完成链路同步（run_id: ${result.run_id}）。`)
+      alert(`应用变更已通过，${describeRankingSync(result)}。`)
       setSelectedChangeRequest(null)
       loadSubmissions()
     } catch (err) {
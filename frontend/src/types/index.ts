@@ -35,9 +35,17 @@ export type AppItem = {
   last_ranking_update: string | null
 }
 
+export type RankingMovement = 'new' | 'up' | 'down' | 'same'
+
 export type RankingItem = {
   ranking_config_id?: string | null
   position: number
+  // 公司内名次：实时榜单快照发布时物化，旧数据为 null
+  company_position?: number | null
+  // 相对基准批次（更早日期最近一次发布）的变动；position_delta 正数为上升
+  previous_position?: number | null
+  position_delta?: number | null
+  movement?: RankingMovement | null
   tag: string
   score: number
   likes: number | null
@@ -50,6 +58,29 @@ export type RankingItem = {
   dimensionScore?: number  // 用于维度筛选排序
 }
 
+// GET /api/rankings?view=compact：只含榜单卡片字段，app.company 已按 company 为空回落 org
+export type RankingItemCompact = Pick<
+  RankingItem,
+  | 'position'
+  | 'company_position'
+  | 'previous_position'
+  | 'position_delta'
+  | 'movement'
+  | 'tag'
+  | 'score'
+  | 'metric_type'
+  | 'value_dimension'
+  | 'usage_30d'
+> & {
+  app: { id: number; name: string; company: string }
+}
+
+// GET /api/apps?view=compact：目录卡片字段，description 截断为 120 字
+export type AppCompact = Pick<
+  AppItem,
+  'id' | 'name' | 'org' | 'company' | 'department' | 'section' | 'category' | 'description' | 'status' | 'monthly_calls' | 'release_date' | 'cover_image_url'
+>
+
 export type Recommendation = {
   title: string
   scene: string
@@ -81,6 +112,15 @@ export type PaginatedResponse<T> = {
   page_size: number
   total: number
   total_pages: number
+  total_is_exact?: boolean
+}
+
+export type CursorPaginatedResponse<T> = {
+  items: T[]
+  page_size: number
+  next_cursor: string | null
+  total: number | null
+  total_is_exact: boolean
 }
 
 export type UserRole = 'user' | 'admin'
@@ -314,3 +354,84 @@ export type HistoricalRanking = {
   usage_30d: number
   created_at: string
 }
+
+// 榜单同步任务（链路变更后台去抖合并）
+export type RankingSyncJobStatus = 'queued' | 'running' | 'done' | 'failed'
+
+export type RankingSyncJob = {
+  id: number
+  status: RankingSyncJobStatus
+  triggers: string[]
+  scope: string
+  coalesced_count: number
+  actor: string
+  run_id: string
+  updated_count: number
+  timings_summary: string
+  error_message: string
+  not_before: string
+  created_at: string | null
+  started_at: string | null
+  finished_at: string | null
+  queue_wait_ms: number | null
+  duration_ms: number | null
+}
+
+// GET /api/home 的 parts 参数可选的部分；未请求的部分返回 null
+export type HomePart = 'rankings' | 'ranking_configs' | 'stats' | 'apps'
+
+// GET /api/home：首页所需数据一次返回；degraded 列出读取失败而置空的部分
+export type HomeBootstrap<View extends 'full' | 'compact' = 'full'> = {
+  rankings: Record<'excellent' | 'trend', (View extends 'compact' ? RankingItemCompact : RankingItem)[] | null>
+  ranking_configs: RankingConfigRecord[] | null
+  stats: Stats | null
+  enums: MetaEnums
+  rules: RuleLink[]
+  apps: (View extends 'compact' ? AppCompact : AppItem)[] | null
+  degraded: string[]
+}
+
+// GET /api/rankings/diff：两个批次逐应用对比，跌出的应用 movement 为 dropped
+export type RankingDiff = {
+  ranking_config_id: string
+  from_run: { run_id: string; period_date: string }
+  to_run: { run_id: string; period_date: string }
+  items: {
+    app_id: number
+    app_name: string
+    app_org: string
+    from_position: number | null
+    to_position: number | null
+    from_score: number | null
+    to_score: number | null
+    position_delta: number | null
+    score_delta: number | null
+    movement: RankingMovement | 'dropped'
+  }[]
+}
+
+// GET /api/apps/{id}/profile：详情页聚合；未上榜的榜单 position / score 为 null，历史走势已降采样
+export type AppProfile = {
+  app: AppItem
+  positions: {
+    ranking_config_id: string
+    ranking_config_name: string
+    position: number | null
+    score: number | null
+    tag: string | null
+    period_date: string | null
+  }[]
+  dimension_period_date: string | null
+  dimension_scores: {
+    ranking_config_id: string | null
+    dimension_id: number
+    dimension_name: string
+    score: number
+    weight: number
+  }[]
+  history: {
+    ranking_config_id: string
+    total_points: number
+    points: { period_date: string; position: number; score: number }[]
+  }[]
+}